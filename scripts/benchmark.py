@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Vyges Report Benchmark Suite
+
+Times the report entry points against synthetic IP repositories generated by
+`synthetic_repo.py` at several scales:
+
+    analyze_project               code_kpis.VygesCodeKPIs.analyze_project()
+    generate_report               generate_test_harness_report.generate_report()
+    generate_comprehensive_report generate_comprehensive_report.generate_comprehensive_report()
+    generate_index_html           generate_github_pages.generate_index_html()
+
+Every measurement runs in a fresh interpreter so module-level caches and
+the peak RSS of one benchmark do not leak into the next. Results include
+wall and CPU time, files opened, bytes read, throughput (files/s of the
+repository, MB/s read) and peak RSS. The median of `--repeat` runs is
+compared against a stored baseline; a benchmark slower than `--threshold`
+times its baseline (or using more than `--memory-threshold` times the
+memory) is a regression and the script exits with status 1.
+
+Usage:
+    python scripts/benchmark.py [--scales small,medium] [--repeat 3] [--save-baseline]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import contextlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from synthetic_repo import SCALES, generate_repo
+
+
+BENCHMARK_VERSION = 1
+
+BENCHMARKS = ["analyze_project", "generate_report", "generate_comprehensive_report", "generate_index_html"]
+
+DEFAULT_WORK_DIR = "build/benchmarks"
+DEFAULT_BASELINE = "build/benchmarks/baseline.json"
+
+# Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_REGRESSION_S = 0.05
+
+
+def _run_benchmark(name: str):
+    """Call one benchmarked entry point in the current directory."""
+    if name == "analyze_project":
+        from code_kpis import VygesCodeKPIs
+        VygesCodeKPIs(".").analyze_project()
+    elif name == "generate_report":
+        from generate_test_harness_report import generate_report
+        generate_report("build/benchmark-reports/test_harness_report.md")
+    elif name == "generate_comprehensive_report":
+        from generate_comprehensive_report import generate_comprehensive_report
+        generate_comprehensive_report(".", "build/benchmark-reports")
+    elif name == "generate_index_html":
+        from generate_github_pages import generate_index_html
+        if not generate_index_html():
+            raise RuntimeError("generate_index_html failed")
+    else:
+        raise ValueError(f"Unknown benchmark: {name}")
+
+
+def run_worker(name: str, repo: str) -> Dict[str, Any]:
+    """Measure one benchmark in this process (the --worker entry point)."""
+    import resource
+    from profiler import PROFILER
+
+    os.chdir(repo)
+    os.makedirs("build/benchmark-reports", exist_ok=True)
+    # Memory is measured as peak RSS; tracemalloc would distort the timings
+    PROFILER.start(f"benchmark:{name}", trace_memory=False)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with PROFILER.stage(name, "benchmark"):
+            _run_benchmark(name)
+    entry = PROFILER.stages[-1]
+    return {
+        "wall_s": entry["wall_ms"] / 1000,
+        "cpu_s": entry["cpu_ms"] / 1000,
+        "files_opened": entry["files_opened"],
+        "bytes_read": entry["bytes_read"],
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "counters": entry["counters"]
+    }
+
+
+def measure(name: str, repo: Path, repeat: int) -> Dict[str, Any]:
+    """Run a benchmark `repeat` times in fresh interpreters and keep the median."""
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, str(Path(__file__).resolve()), "--worker", name, str(repo)],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{name} failed on {repo}:\n{result.stderr.strip()}")
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    median = {key: statistics.median(run[key] for run in runs)
+              for key in ("wall_s", "cpu_s", "files_opened", "bytes_read", "peak_rss_mb")}
+    median["runs"] = [round(run["wall_s"], 4) for run in runs]
+    median["counters"] = runs[-1]["counters"]
+    return median
+
+
+def run_suite(scales: List[str], benchmarks: List[str], work_dir: Path, repeat: int, seed: int) -> Dict[str, Any]:
+    """Generate the synthetic repositories and run every benchmark on each."""
+    results = {}
+    for scale in scales:
+        repo = work_dir / scale
+        print(f"🏗️  Preparing {scale} repository in {repo}...")
+        start = time.perf_counter()
+        stamp = generate_repo(repo, SCALES[scale], seed)
+        print(f"   {stamp['total_files']:,} files, {stamp['total_bytes'] / 1e6:,.1f} MB "
+              f"({time.perf_counter() - start:.1f}s)")
+        results[scale] = {"repository": {"files": stamp["total_files"], "bytes": stamp["total_bytes"]},
+                          "benchmarks": {}}
+        for name in benchmarks:
+            result = measure(name, repo.resolve(), repeat)
+            result["files_per_s"] = round(stamp["total_files"] / result["wall_s"], 1) if result["wall_s"] else 0
+            result["mb_per_s"] = round(result["bytes_read"] / 1e6 / result["wall_s"], 1) if result["wall_s"] else 0
+            results[scale]["benchmarks"][name] = result
+            print(f"   ⏱️  {name:<30} {result['wall_s']:>8.3f}s  {result['files_per_s']:>10,.0f} files/s  "
+                  f"{result['mb_per_s']:>8,.1f} MB/s  {result['peak_rss_mb']:>7.1f} MB RSS")
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            memory_threshold: float) -> List[Dict[str, Any]]:
+    """Compare results with a baseline; return one row per benchmark present in both."""
+    rows = []
+    for scale, scale_results in results.items():
+        base_scale = baseline.get("results", {}).get(scale, {})
+        if base_scale.get("repository") != scale_results["repository"]:
+            # A different synthetic repository is not comparable
+            continue
+        for name, result in scale_results["benchmarks"].items():
+            base = base_scale.get("benchmarks", {}).get(name)
+            if not base:
+                continue
+            time_ratio = result["wall_s"] / base["wall_s"] if base["wall_s"] else 1.0
+            memory_ratio = result["peak_rss_mb"] / base["peak_rss_mb"] if base["peak_rss_mb"] else 1.0
+            rows.append({
+                "scale": scale,
+                "benchmark": name,
+                "baseline_s": base["wall_s"],
+                "current_s": result["wall_s"],
+                "time_ratio": round(time_ratio, 3),
+                "memory_ratio": round(memory_ratio, 3),
+                "regression": ((time_ratio > threshold and result["wall_s"] - base["wall_s"] > MIN_REGRESSION_S)
+                               or memory_ratio > memory_threshold)
+            })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], threshold: float, memory_threshold: float):
+    """Print the baseline comparison table."""
+    print(f"\n📊 BASELINE COMPARISON (time > {threshold:.2f}x or memory > {memory_threshold:.2f}x is a regression)")
+    print(f"   {'Scale':<8} {'Benchmark':<30} {'Baseline':>10} {'Current':>10} {'Time':>7} {'Memory':>7}")
+    for row in rows:
+        marker = "❌" if row["regression"] else "✅"
+        print(f"{marker} {row['scale']:<8} {row['benchmark']:<30} {row['baseline_s']:>9.3f}s {row['current_s']:>9.3f}s "
+              f"{row['time_ratio']:>6.2f}x {row['memory_ratio']:>6.2f}x")
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Load a stored baseline, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BENCHMARK_VERSION:
+        print(f"⚠️  Ignoring baseline {path}: benchmark format version {baseline.get('version')}")
+        return None
+    return baseline
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the Vyges report scripts on synthetic repositories")
+    parser.add_argument("--scales", default="small", help=f"Comma-separated scales ({', '.join(SCALES)})")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS), help="Comma-separated benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the median is reported")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic repositories")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="Where synthetic repositories are generated")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown factor against the baseline")
+    parser.add_argument("--memory-threshold", type=float, default=1.25, help="Allowed peak RSS growth factor")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--worker", nargs=2, metavar=("BENCHMARK", "REPO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return 0
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    benchmarks = [b.strip() for b in args.benchmarks.split(",") if b.strip()]
+    for value, known, kind in ((scales, SCALES, "scale"), (benchmarks, BENCHMARKS, "benchmark")):
+        unknown = [v for v in value if v not in known]
+        if unknown:
+            print(f"❌ Unknown {kind}: {', '.join(unknown)}")
+            return 1
+
+    print("🚀 Vyges report benchmarks")
+    try:
+        results = run_suite(scales, benchmarks, Path(args.work_dir), max(args.repeat, 1), args.seed)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    report = {
+        "version": BENCHMARK_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "results": results
+    }
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+    exit_code = 0
+    baseline = load_baseline(args.baseline)
+    if baseline:
+        rows = compare(results, baseline, args.threshold, args.memory_threshold)
+        if rows:
+            print_comparison(rows, args.threshold, args.memory_threshold)
+            if any(row["regression"] for row in rows):
+                print("\n❌ Performance regression against the baseline")
+                exit_code = 1
+        else:
+            print(f"ℹ️  Baseline {args.baseline} has no comparable results")
+
+    if args.save_baseline:
+        # Keep baseline entries for scales that were not run this time
+        merged = baseline or {"version": BENCHMARK_VERSION, "results": {}}
+        merged.update({key: value for key, value in report.items() if key != "results"})
+        merged["results"].update(results)
+        Path(args.baseline).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(merged, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
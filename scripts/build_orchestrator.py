@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Vyges Build Orchestrator
+
+Dependency-aware task engine for the Vyges IP build. The Makefile steps
+(lint, synth, sim, sim-fallback) plus report and GitHub Pages generation are
+modelled as a DAG; independent tasks run in parallel within a CPU budget.
+
+A task is skipped when the SHA-256 of its input files, its commands and the
+version of its tool match the last successful run recorded in
+`build/.build-manifest.json` and all its outputs still exist. Per-task timing
+is streamed to `build/logs/build_profile.jsonl` as tasks finish.
+
+Usage:
+    python scripts/build_orchestrator.py [TASK ...] [-j N] [--force] [--dry-run]
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import shutil
+import argparse
+import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional
+
+from site_builder import DigestCache, hash_values
+from vcd_index import load_index
+
+
+BUILD_DIR = "build"
+LOG_DIR = "build/logs"
+REPORT_DIR = "build/reports"
+MANIFEST_PATH = "build/.build-manifest.json"
+PROFILE_PATH = "build/logs/build_profile.jsonl"
+MANIFEST_VERSION = 1
+
+# Same limit as the Makefile's timeout wrapper
+DEFAULT_TIMEOUT_S = 300
+
+# Commands reporting the version of each tool (first output line is recorded)
+TOOL_VERSION_COMMANDS = {
+    "yosys": ["yosys", "-V"],
+    "verilator": ["verilator", "--version"],
+    "iverilog": ["iverilog", "-V"]
+}
+
+# Task states
+PASSED = "passed"
+CACHED = "cached"
+FAILED = "failed"
+BLOCKED = "blocked"
+UNAVAILABLE = "unavailable"
+
+_OK_STATES = (PASSED, CACHED)
+
+
+class Task:
+    """One node of the build graph."""
+
+    def __init__(self, name: str, commands: List[Dict[str, Any]], inputs: List[str],
+                 outputs: List[str], deps: List[str] = None, after: List[str] = None,
+                 tool: Optional[str] = None, cpus: int = 1, timeout: int = DEFAULT_TIMEOUT_S,
+                 description: str = ""):
+        self.name = name
+        self.commands = commands        # {"argv": [...], "stdout": path, "cwd": dir} or {"call": fn}
+        self.inputs = inputs            # glob patterns, expanded when the task is scheduled
+        self.outputs = outputs
+        self.deps = deps or []          # must succeed before this task runs
+        self.after = after or []        # ordering only; the task runs even if these fail
+        self.tool = tool
+        self.cpus = cpus
+        self.timeout = timeout
+        self.description = description
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expand input glob patterns into a sorted list of files."""
+    files = set()
+    for pattern in patterns:
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and "__pycache__" not in path:
+                files.add(os.path.normpath(path))
+    return sorted(files)
+
+
+def copy_templates(source_dir: str = "reports/public", site_dir: str = "public") -> bool:
+    """Copy the Pages templates next to the generated site."""
+    os.makedirs(site_dir, exist_ok=True)
+    for template in glob.glob(os.path.join(source_dir, "*_template.html")):
+        shutil.copy2(template, site_dir)
+    return True
+
+
+def index_waveforms(waveform_dir: str = "public/waveforms") -> bool:
+    """Build (or reuse) the time index of every published VCD."""
+    for path in sorted(glob.glob(os.path.join(waveform_dir, "*.vcd"))):
+        load_index(path)
+    return True
+
+
+def define_tasks(top: str, rtl: str, tb: str, tb_top: str, timeout: int = DEFAULT_TIMEOUT_S) -> Dict[str, Task]:
+    """Build graph mirroring the Makefile targets plus reports and Pages."""
+    rtl_files = sorted(glob.glob(rtl))
+    tb_files = sorted(glob.glob(tb))
+    python = sys.executable
+
+    tasks = [
+        Task("lint",
+             [{"argv": ["yosys", "-q", "-l", f"{LOG_DIR}/lint.log", "-p",
+                        f"read_verilog -sv {' '.join(rtl_files)}; hierarchy -top {top}; check; stat -width"],
+               "stdout": f"{LOG_DIR}/lint_output.log"}],
+             inputs=[rtl], outputs=[f"{LOG_DIR}/lint.log"], tool="yosys", timeout=timeout,
+             description="Yosys lint checks"),
+        Task("synth",
+             [{"argv": ["yosys", "-q", "-l", f"{LOG_DIR}/synthesis.log", "-p",
+                        f"read_verilog -sv {' '.join(rtl_files)}; hierarchy -top {top}; proc; opt; techmap; opt; "
+                        f"write_verilog {BUILD_DIR}/synthesis/{top}_synth.v; stat -width"],
+               "stdout": f"{LOG_DIR}/synthesis_output.log"}],
+             inputs=[rtl], outputs=[f"{LOG_DIR}/synthesis.log", f"{BUILD_DIR}/synthesis/{top}_synth.v"],
+             tool="yosys", timeout=timeout, description="Yosys synthesis"),
+        Task("sim",
+             [{"argv": ["verilator", "--lint-only"] + rtl_files + tb_files + ["--top-module", tb_top],
+               "stdout": f"{LOG_DIR}/verilator.log"}],
+             inputs=[rtl, tb], outputs=[f"{LOG_DIR}/verilator.log"], tool="verilator", timeout=timeout,
+             description="Verilator elaboration"),
+        Task("sim-fallback",
+             [{"argv": ["iverilog", "-g2012", "-o", f"{BUILD_DIR}/simulation/{top}_sim"] + rtl_files + tb_files,
+               "stdout": f"{LOG_DIR}/iverilog.log"},
+              # Wrapped so the log ends with a wall-clock footer for sim_log_parser.py
+              {"argv": [python, os.path.abspath("scripts/sim_log_parser.py"), "run", "--", "vvp", f"{top}_sim"],
+               "cwd": f"{BUILD_DIR}/simulation",
+               "stdout": f"{LOG_DIR}/simulation.log"}],
+             inputs=[rtl, tb, "scripts/sim_log_parser.py"],
+             outputs=[f"{BUILD_DIR}/simulation/{top}_sim", f"{LOG_DIR}/simulation.log"],
+             tool="iverilog", timeout=timeout,
+             description="Icarus Verilog simulation"),
+        Task("reports",
+             [{"argv": [python, "scripts/generate_test_harness_report.py", f"{REPORT_DIR}/test_harness_report.md"]},
+              {"argv": [python, "scripts/code_kpis.py", "--artifact", f"{REPORT_DIR}/code_kpis.json"],
+               "stdout": f"{REPORT_DIR}/code_kpis.txt"},
+              {"argv": [python, "scripts/generate_comprehensive_report.py", "--output-dir", REPORT_DIR]}],
+             inputs=[rtl, tb, "scripts/*.py", "scripts/schemas/*.json", f"{LOG_DIR}/*.log",
+                     f"{REPORT_DIR}/vcd_compare/*.json", "*.md",
+                     "vyges-metadata.json", "docs/**/*", "soc_integration/**/*", "verification/**/*"],
+             outputs=[f"{REPORT_DIR}/code_kpis.json", f"{REPORT_DIR}/comprehensive_analysis_report.md"],
+             after=["lint", "synth", "sim", "sim-fallback"], description="Test harness, KPI and comprehensive reports"),
+        Task("pages",
+             [{"call": copy_templates},
+              {"call": index_waveforms},
+              {"argv": [python, "scripts/generate_github_pages.py", "--artifacts-dir", REPORT_DIR]}],
+             inputs=["reports/public/*", "scripts/generate_github_pages.py", "scripts/page_templates.py",
+                     "scripts/site_builder.py", "scripts/vcd_index.py", "vyges-metadata.json",
+                     f"{REPORT_DIR}/*.json", "public/waveforms/*.vcd"],
+             outputs=["public/index.html"], deps=["reports"], description="GitHub Pages site")
+    ]
+    return {task.name: task for task in tasks}
+
+
+def tool_version(tool: Optional[str], cache: Dict[str, Optional[str]]) -> Optional[str]:
+    """First line of the tool's version output (the Python version for script-only tasks, None if missing)."""
+    if tool is None:
+        return f"python {sys.version.split()[0]}"
+    if tool not in cache:
+        command = TOOL_VERSION_COMMANDS.get(tool, [tool, "--version"])
+        if shutil.which(command[0]) is None:
+            cache[tool] = None
+        else:
+            try:
+                result = subprocess.run(command, capture_output=True, text=True, timeout=30)
+                output = (result.stdout or result.stderr).strip().splitlines()
+                cache[tool] = output[0] if output else "unknown"
+            except (subprocess.SubprocessError, OSError):
+                cache[tool] = None
+    return cache[tool]
+
+
+def select_tasks(tasks: Dict[str, Task], targets: List[str]) -> List[str]:
+    """Targets plus everything they depend on, in definition order."""
+    selected = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in tasks:
+            raise KeyError(f"Unknown task: {name}")
+        if name not in selected:
+            selected.add(name)
+            stack.extend(tasks[name].deps + tasks[name].after)
+    return [name for name in tasks if name in selected]
+
+
+class BuildOrchestrator:
+    """Schedule and run build tasks with content-hash skipping."""
+
+    def __init__(self, tasks: Dict[str, Task], jobs: Optional[int] = None, force: bool = False):
+        self.tasks = tasks
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.force = force
+        self.manifest = self._load_manifest()
+        self.digests = DigestCache(self.manifest["files"])
+        self.tool_versions = {}
+        self.results = {}
+        self._profile = None
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the manifest of the previous build."""
+        empty = {"version": MANIFEST_VERSION, "files": {}, "tasks": {}}
+        try:
+            with open(MANIFEST_PATH, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return empty
+        return manifest if manifest.get("version") == MANIFEST_VERSION else empty
+
+    def _save_manifest(self):
+        """Write the manifest for the next build."""
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        with open(MANIFEST_PATH, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+    def task_key(self, task: Task, version: str) -> str:
+        """Digest of everything that determines a task's outputs."""
+        inputs = {path: self.digests.digest(path) for path in expand_inputs(task.inputs)}
+        commands = [command.get("argv") or command["call"].__name__ for command in task.commands]
+        return hash_values({"inputs": inputs, "commands": commands, "tool": version})
+
+    def _run_commands(self, task: Task) -> Dict[str, Any]:
+        """Run a task's commands in order; stop at the first failure."""
+        for command in task.commands:
+            if "call" in command:
+                if not command["call"]():
+                    return {"status": FAILED, "error": f"{command['call'].__name__} failed"}
+                continue
+
+            stdout_path = command.get("stdout")
+            if stdout_path:
+                os.makedirs(os.path.dirname(stdout_path) or ".", exist_ok=True)
+            for directory in [os.path.dirname(output) for output in task.outputs] + [command.get("cwd")]:
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+            stdout = open(stdout_path, 'w') if stdout_path else subprocess.DEVNULL
+            try:
+                result = subprocess.run(command["argv"], stdout=stdout, stderr=subprocess.STDOUT,
+                                        cwd=command.get("cwd"), timeout=task.timeout)
+            except subprocess.TimeoutExpired:
+                return {"status": FAILED, "error": f"timed out after {task.timeout}s"}
+            except OSError as e:
+                return {"status": FAILED, "error": str(e)}
+            finally:
+                if stdout_path:
+                    stdout.close()
+            if result.returncode != 0:
+                return {"status": FAILED, "error": f"{command['argv'][0]} exited with {result.returncode}"}
+        return {"status": PASSED}
+
+    def run_task(self, task: Task) -> Dict[str, Any]:
+        """Run one task unless its recorded inputs, commands and tool version are unchanged."""
+        start = time.time()
+        cpu_start = time.process_time()
+        version = tool_version(task.tool, self.tool_versions)
+        if version is None:
+            result = {"status": UNAVAILABLE, "error": f"{task.tool} not found"}
+        else:
+            key = self.task_key(task, version)
+            previous = self.manifest["tasks"].get(task.name, {})
+            if (not self.force and previous.get("key") == key
+                    and all(os.path.exists(output) for output in task.outputs)):
+                result = {"status": CACHED}
+            else:
+                result = self._run_commands(task)
+                if result["status"] == PASSED:
+                    # Outputs of earlier tasks may have changed the inputs while running
+                    self.manifest["tasks"][task.name] = {"key": self.task_key(task, version),
+                                                         "tool_version": version,
+                                                         "completed_at": datetime.now().isoformat()}
+                else:
+                    self.manifest["tasks"].pop(task.name, None)
+        result.update({
+            "task": task.name,
+            "start": start,
+            "duration_s": round(time.time() - start, 3),
+            "tool_version": version
+        })
+        return result
+
+    def _record(self, result: Dict[str, Any]):
+        """Store a finished task and stream it to the build profile."""
+        self.results[result["task"]] = result
+        self._profile.write(json.dumps(result) + "\n")
+        self._profile.flush()
+        icon = {PASSED: "✅", CACHED: "⏭️ ", FAILED: "❌", BLOCKED: "⛔", UNAVAILABLE: "⚠️ "}[result["status"]]
+        detail = f" ({result['error']})" if result.get("error") else ""
+        print(f"{icon} {result['task']}: {result['status']} in {result['duration_s']:.2f}s{detail}")
+
+    def run(self, names: List[str]) -> bool:
+        """Run the selected tasks respecting dependencies and the CPU budget."""
+        os.makedirs(os.path.dirname(PROFILE_PATH), exist_ok=True)
+        self._profile = open(PROFILE_PATH, 'w')
+        build_start = time.time()
+        pending = list(names)
+        running = {}
+        cpus_in_use = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                while pending or running:
+                    for name in list(pending):
+                        task = self.tasks[name]
+                        waiting_on = [d for d in task.deps + task.after if d in names and d not in self.results]
+                        if waiting_on:
+                            continue
+                        failed = [d for d in task.deps if d in self.results
+                                  and self.results[d]["status"] not in _OK_STATES]
+                        if failed:
+                            pending.remove(name)
+                            self._record({"task": name, "status": BLOCKED, "start": time.time(),
+                                          "duration_s": 0.0, "error": f"needs {', '.join(failed)}"})
+                            continue
+                        # Always allow one task so an oversized task cannot stall the build
+                        cpus = min(task.cpus, self.jobs)
+                        if running and cpus_in_use + cpus > self.jobs:
+                            continue
+                        pending.remove(name)
+                        cpus_in_use += cpus
+                        running[pool.submit(self.run_task, task)] = (name, cpus)
+
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, cpus = running.pop(future)
+                        cpus_in_use -= cpus
+                        self._record(future.result())
+        finally:
+            self._profile.close()
+            self._save_manifest()
+
+        wall = time.time() - build_start
+        busy = sum(r["duration_s"] for r in self.results.values())
+        print(f"\n⏱️  Build finished in {wall:.2f}s ({busy:.2f}s of task time, "
+              f"{busy / wall if wall else 0:.1f}x parallelism, {self.digests.hashed} files hashed)")
+        print(f"📄 Profile: {PROFILE_PATH}")
+        return all(r["status"] in _OK_STATES + (UNAVAILABLE,) for r in self.results.values())
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Run the Vyges build as a parallel task graph")
+    parser.add_argument("targets", nargs="*", default=["pages"],
+                        help="Tasks to build with their dependencies (default: pages, i.e. everything)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="CPU budget (default: all CPUs)")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and rerun every task")
+    parser.add_argument("--dry-run", action="store_true", help="Show the task graph without running it")
+    parser.add_argument("--top", default="example_core", help="Top RTL module")
+    parser.add_argument("--rtl", default="rtl/*.sv", help="RTL file pattern")
+    parser.add_argument("--tb", default="verification/sv_tb/*.sv", help="Testbench file pattern")
+    parser.add_argument("--tb-top", default="tb_example", help="Testbench top module")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT_S, help="Per-command timeout in seconds")
+    args = parser.parse_args()
+
+    tasks = define_tasks(args.top, args.rtl, args.tb, args.tb_top, args.timeout)
+    try:
+        names = select_tasks(tasks, args.targets)
+    except KeyError as e:
+        print(f"❌ {e.args[0]} (available: {', '.join(tasks)})")
+        return 1
+
+    if args.dry_run:
+        for name in names:
+            task = tasks[name]
+            needs = ", ".join(task.deps + [f"{a} (soft)" for a in task.after]) or "-"
+            print(f"   {name:<14} needs: {needs:<55} {task.description}")
+        return 0
+
+    print(f"🔨 Building {', '.join(names)} with {args.jobs or os.cpu_count()} CPUs")
+    orchestrator = BuildOrchestrator(tasks, args.jobs, args.force)
+    return 0 if orchestrator.run(names) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
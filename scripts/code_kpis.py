@@ -5,12 +5,19 @@ Vyges Code KPIs Analysis Script
 This script analyzes code metrics and KPIs for Vyges IP projects including:
 - Lines of RTL code
 - Documentation coverage
-- Test coverage
+- Test coverage (including functional coverage reports from the cocotb covergroups)
 - Project structure analysis
-- Quality metrics
+- Quality metrics (lint/synthesis log diagnostics)
+- Synthesis statistics (Yosys `stat` cell counts)
+- Static timing (clocks, WNS/TNS, Fmax)
+- Power estimation (VCD activity x cell inventory)
 
 Usage:
-    python scripts/code_kpis.py [--detailed] [--output json|csv|text]
+    python scripts/code_kpis.py [--detailed] [--sections summary,code_metrics] [--output json|csv|ndjson|text]
+                                [--export FILE[.gz]] [--artifact FILE]
+
+Only the requested sections and the sections they depend on are computed
+(see `VygesCodeKPIs.ANALYZERS`).
 """
 
 import os
@@ -18,10 +25,52 @@ import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, List, Any
-import subprocess
+from typing import Dict, List, Any, Set
 from datetime import datetime
 
+from timing_analysis import analyze_timing
+from power_analysis import analyze_power
+from report_artifacts import write_artifact, load_schema
+from log_analyzer import analyze_logs
+from yosys_stat import analyze_synthesis
+from git_info import git_summary
+from profiler import stage, add_profile_argument, start_profiling, finish_profiling
+from kpi_export import export_kpis, EXPORT_FORMATS
+from metadata_validator import load_validator, cross_check_source_files, DEFAULT_CACHE_DIR, MAX_ERRORS_REPORTED
+
+
+# Functional coverage reports written by verification/cocotb/functional_coverage.py
+FUNCTIONAL_COVERAGE_DIR = "build/reports/functional_coverage"
+
+
+def collect_functional_coverage(project_root: Path) -> Dict[str, Any]:
+    """Merge the covergroup summaries of all functional coverage reports (empty if there are none)."""
+    covergroups = {}
+    reports = 0
+    for report_path in sorted((Path(project_root) / FUNCTIONAL_COVERAGE_DIR).glob("*.json")):
+        try:
+            with open(report_path, 'r') as f:
+                report = json.load(f)
+            groups = report["covergroups"]
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        reports += 1
+        for group in groups:
+            name = group.get("name", report_path.stem)
+            # The same covergroup in several reports: keep the best run
+            if name not in covergroups or group["coverage"] > covergroups[name]["coverage"]:
+                covergroups[name] = {field: group[field] for field in ("coverage", "goal", "bins", "hit_bins")}
+    if not covergroups:
+        return {}
+    return {
+        "reports": reports,
+        "coverage": round(sum(g["coverage"] for g in covergroups.values()) / len(covergroups), 2),
+        "bins": sum(g["bins"] for g in covergroups.values()),
+        "hit_bins": sum(g["hit_bins"] for g in covergroups.values()),
+        "goals_met": all(g["coverage"] >= g["goal"] for g in covergroups.values()),
+        "covergroups": covergroups
+    }
+
 
 class VygesCodeKPIs:
     """Analyze code KPIs for Vyges IP projects."""
@@ -29,39 +78,65 @@ class VygesCodeKPIs:
     def __init__(self, project_root: str = "."):
         self.project_root = Path(project_root)
         self.kpis = {}
-        
-    def analyze_project(self, detailed: bool = False) -> Dict[str, Any]:
-        """Analyze the entire project and return KPIs."""
-        
-        # Basic project info
-        self.kpis["project_info"] = self._get_project_info()
-        
-        # File structure analysis
-        self.kpis["file_structure"] = self._analyze_file_structure()
-        
-        # Code metrics
-        self.kpis["code_metrics"] = self._analyze_code_metrics()
-        
-        # Documentation metrics
-        self.kpis["documentation_metrics"] = self._analyze_documentation()
-        
-        # Test metrics
-        self.kpis["test_metrics"] = self._analyze_test_coverage()
-        
-        # Quality metrics
-        self.kpis["quality_metrics"] = self._analyze_quality_metrics()
-        
-        # Metadata analysis
-        self.kpis["metadata_analysis"] = self._analyze_metadata()
-        
-        if detailed:
-            self.kpis["detailed_analysis"] = self._detailed_analysis()
-        
-        # Summary
-        self.kpis["summary"] = self._generate_summary()
-        
+        self._inventory = []
+        
+    # KPI sections in evaluation order: (section, analyzer method, sections the analyzer reads)
+    ANALYZERS = [
+        ("file_structure", "_analyze_file_structure", ()),
+        ("project_info", "_get_project_info", ("file_structure",)),     # file inventory for the git status
+        ("code_metrics", "_analyze_code_metrics", ()),
+        ("documentation_metrics", "_analyze_documentation", ()),
+        ("test_metrics", "_analyze_test_coverage", ()),
+        ("synthesis_metrics", "_analyze_synthesis", ()),
+        ("quality_metrics", "_analyze_quality_metrics", ("synthesis_metrics", "test_metrics")),
+        ("timing_metrics", "_analyze_timing", ()),
+        ("power_metrics", "_analyze_power", ("timing_metrics",)),
+        ("metadata_analysis", "_analyze_metadata", ("file_structure",)),
+        ("detailed_analysis", "_detailed_analysis", ()),
+        ("summary", "_generate_summary", ("code_metrics", "documentation_metrics", "test_metrics",
+                                          "quality_metrics", "metadata_analysis", "timing_metrics"))
+    ]
+    
+    SECTIONS = [section for section, _, _ in ANALYZERS]
+    
+    # Sections computed when none are requested; detailed_analysis only with detailed=True
+    DEFAULT_SECTIONS = [section for section in SECTIONS if section != "detailed_analysis"]
+    
+    @classmethod
+    def resolve_sections(cls, sections: List[str]) -> List[str]:
+        """Return the requested sections plus their dependencies in evaluation order."""
+        dependencies = {section: inputs for section, _, inputs in cls.ANALYZERS}
+        unknown = [section for section in sections if section not in dependencies]
+        if unknown:
+            raise ValueError(f"Unknown KPI section(s): {', '.join(unknown)} (available: {', '.join(cls.SECTIONS)})")
+        needed = set()
+        pending = list(sections)
+        while pending:
+            section = pending.pop()
+            if section not in needed:
+                needed.add(section)
+                pending.extend(dependencies[section])
+        return [section for section in cls.SECTIONS if section in needed]
+    
+    def analyze_project(self, detailed: bool = False, sections: List[str] = None) -> Dict[str, Any]:
+        """Compute the requested KPI sections (default: all but detailed_analysis) and return the KPIs."""
+        sections = list(self.DEFAULT_SECTIONS if sections is None else sections)
+        if detailed and "detailed_analysis" not in sections:
+            sections.append("detailed_analysis")
+        for section in self.resolve_sections(sections):
+            self.section(section)
         return self.kpis
     
+    def section(self, name: str) -> Dict[str, Any]:
+        """Return one KPI section, computing it and its dependencies on first use."""
+        if name not in self.kpis:
+            _, method, inputs = self.ANALYZERS[self.SECTIONS.index(name)]
+            for dependency in inputs:
+                self.section(dependency)
+            with stage(method, "analyzer"):
+                self.kpis[name] = getattr(self, method)()
+        return self.kpis[name]
+    
     def _get_project_info(self) -> Dict[str, Any]:
         """Get basic project information."""
         info = {
@@ -70,49 +145,44 @@ class VygesCodeKPIs:
             "project_root": str(self.project_root.absolute())
         }
         
-        # Try to get git info
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--show-toplevel"],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                info["git_repo"] = result.stdout.strip()
-                
-                # Get git status
-                result = subprocess.run(
-                    ["git", "status", "--porcelain"],
-                    cwd=self.project_root,
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    info["git_status"] = "clean" if not result.stdout.strip() else "dirty"
-                    
-        except (subprocess.SubprocessError, FileNotFoundError):
+        # Git info is read from .git directly; the file inventory serves the untracked-file check
+        git = git_summary(self.project_root, self._file_inventory())
+        if git is None:
             info["git_repo"] = "not_a_git_repo"
+        else:
+            info["git_repo"] = git["git_repo"]
+            info["git_commit"] = git["commit"]
+            info["git_branch"] = git["branch"]
+            if "git_status" in git:
+                info["git_status"] = git["git_status"]
         
         return info
     
     def _analyze_file_structure(self) -> Dict[str, Any]:
-        """Analyze project file structure."""
+        """Analyze project file structure as a prefix tree of per-directory aggregates."""
         structure = {
             "total_files": 0,
             "total_directories": 0,
             "file_types": {},
-            "directory_structure": {}
+            "directory_structure": None
         }
         
+        # File names are kept out of the KPIs; only the inventory of relative paths is retained
+        self._inventory = []
+        nodes = {}
         for root, dirs, files in os.walk(self.project_root):
             # Skip .git directory
-            if ".git" in root:
-                continue
-                
+            dirs[:] = [d for d in dirs if d != ".git"]
+            
             rel_root = os.path.relpath(root, self.project_root)
-            if rel_root == ".":
-                rel_root = "root"
+            node = nodes.pop(rel_root, None)
+            if node is None:
+                node = structure["directory_structure"] = {"files": 0, "total_files": 0, "total_directories": 0, "subdirectories": {}}
+            node["files"] = len(files)
+            for name in dirs:
+                child = {"files": 0, "total_files": 0, "total_directories": 0, "subdirectories": {}}
+                node["subdirectories"][name] = child
+                nodes[os.path.join(rel_root, name) if rel_root != "." else name] = child
             
             structure["total_directories"] += len(dirs)
             structure["total_files"] += len(files)
@@ -125,15 +195,28 @@ class VygesCodeKPIs:
                 else:
                     structure["file_types"]["no_extension"] = structure["file_types"].get("no_extension", 0) + 1
             
-            # Store directory structure
-            if rel_root not in structure["directory_structure"]:
-                structure["directory_structure"][rel_root] = {
-                    "files": files,
-                    "subdirectories": dirs
-                }
+            prefix = "" if rel_root == "." else rel_root.replace(os.sep, "/") + "/"
+            self._inventory.extend(prefix + name for name in files)
         
+        if structure["directory_structure"] is not None:
+            self._aggregate_tree(structure["directory_structure"])
         return structure
     
+    def _aggregate_tree(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in recursive totals and merge chains of empty single-child directories ("a/b/c")."""
+        subdirectories = {}
+        for name, child in node["subdirectories"].items():
+            self._aggregate_tree(child)
+            while child["files"] == 0 and len(child["subdirectories"]) == 1:
+                (sub_name, sub_child), = child["subdirectories"].items()
+                name, child = f"{name}/{sub_name}", sub_child
+            subdirectories[name] = child
+        node["subdirectories"] = subdirectories
+        node["total_files"] = node["files"] + sum(child["total_files"] for child in subdirectories.values())
+        node["total_directories"] = sum(child["total_directories"] + name.count("/") + 1
+                                        for name, child in subdirectories.items())
+        return node
+    
     def _analyze_code_metrics(self) -> Dict[str, Any]:
         """Analyze RTL and code metrics."""
         metrics = {
@@ -283,6 +366,11 @@ class VygesCodeKPIs:
                 if ".git" not in str(file_path):
                     tests["test_vectors"] += 1
         
+        # Functional coverage written by the cocotb covergroups
+        functional = collect_functional_coverage(self.project_root)
+        if functional:
+            tests["functional_coverage"] = functional
+        
         return tests
     
     def _analyze_quality_metrics(self) -> Dict[str, Any]:
@@ -296,24 +384,34 @@ class VygesCodeKPIs:
             "metadata_complete": False
         }
         
-        # Check for linting results
-        lint_files = list(self.project_root.rglob("lint_*.log"))
-        if lint_files:
-            quality["linting_clean"] = True
-        
-        # Check for synthesis results
-        synth_files = list(self.project_root.rglob("*synthesis*.log"))
-        if synth_files:
-            quality["synthesis_clean"] = True
+        # Classify lint and synthesis diagnostics from the tool logs
+        diagnostics = analyze_logs(self.project_root)
+        lint = diagnostics["lint"]
+        synthesis = diagnostics["synthesis"]
+        if lint:
+            quality["linting_clean"] = lint["errors"] == 0 and lint["warnings"] == 0
+            quality["lint_diagnostics"] = lint
+        if synthesis:
+            quality["synthesis_clean"] = synthesis["errors"] == 0
+            quality["synthesis_diagnostics"] = synthesis
+        
+        # Gate counts from the Yosys stat output
+        synthesis = self.section("synthesis_metrics")
+        quality["synthesis_stats_available"] = synthesis["synthesis_stats_available"]
+        quality["synthesis_modules_count"] = synthesis["synthesis_modules_count"]
+        quality["total_gate_count"] = synthesis["total_gate_count"]
+        quality["module_gate_counts"] = synthesis["module_gate_counts"]
         
         # Check for simulation results
         sim_files = list(self.project_root.rglob("*simulation*.log"))
         if sim_files:
             quality["simulation_passing"] = True
         
-        # Check for coverage reports
-        coverage_files = list(self.project_root.rglob("*coverage*.html"))
-        if coverage_files:
+        # Coverage goals: functional coverage when reported, otherwise any coverage report
+        functional = self.section("test_metrics").get("functional_coverage")
+        if functional:
+            quality["coverage_goals_met"] = functional["goals_met"]
+        elif list(self.project_root.rglob("*coverage*.html")):
             quality["coverage_goals_met"] = True
         
         # Check documentation completeness
@@ -328,6 +426,19 @@ class VygesCodeKPIs:
         
         return quality
     
+    def _analyze_synthesis(self) -> Dict[str, Any]:
+        """Analyze synthesized cell counts from Yosys stat output."""
+        return analyze_synthesis(self.project_root)
+    
+    def _analyze_timing(self) -> Dict[str, Any]:
+        """Analyze clock constraints and static timing reports."""
+        return analyze_timing(self.project_root)
+    
+    def _analyze_power(self) -> Dict[str, Any]:
+        """Estimate power from simulation activity and synthesized cells."""
+        clocks = self.section("timing_metrics").get("clocks")
+        return analyze_power(self.project_root, clocks=clocks)
+    
     def _analyze_metadata(self) -> Dict[str, Any]:
         """Analyze Vyges metadata completeness and quality."""
         metadata = {
@@ -355,6 +466,12 @@ class VygesCodeKPIs:
                 with open(metadata_file, 'r') as f:
                     data = json.load(f)
                 
+                # Full schema validation and sourceFiles cross-check
+                schema_errors = load_validator(cache_dir=str(self.project_root / DEFAULT_CACHE_DIR))(data)
+                metadata["schema_valid"] = not schema_errors
+                metadata["schema_errors"] = schema_errors[:MAX_ERRORS_REPORTED]
+                metadata["source_files"] = cross_check_source_files(data, self._file_inventory())
+                
                 # Check required fields (Vyges schema v1.0.0)
                 required_fields = ["name", "version", "description", "license", "target", "design_type", "maturity"]
                 required_present = 0
@@ -459,7 +576,9 @@ class VygesCodeKPIs:
                     metadata["catalog_readiness"] = "not_ready"
                 
                 # Basic validation
-                if required_present == len(required_fields):
+                if required_present == len(required_fields) and schema_errors:
+                    metadata["validation_status"] = "schema_errors"
+                elif required_present == len(required_fields):
                     metadata["validation_status"] = "valid"
                 elif required_present >= len(required_fields) * 0.8:
                     metadata["validation_status"] = "mostly_valid"
@@ -471,6 +590,15 @@ class VygesCodeKPIs:
                     missing_fields = [field for field in required_fields if not metadata["required_fields"][field]]
                     metadata["issues"].append(f"Missing required fields: {', '.join(missing_fields)}")
                 
+                if schema_errors:
+                    metadata["issues"].append(f"{len(schema_errors)} schema validation errors (first: {schema_errors[0]})")
+                
+                source_files = metadata["source_files"]
+                if source_files["stale_entries"]:
+                    metadata["issues"].append(f"sourceFiles entries not found in project: {', '.join(source_files['stale_entries'])}")
+                if source_files["missing_entries"]:
+                    metadata["recommendations"].append(f"Add sourceFiles entries for: {', '.join(source_files['missing_entries'])}")
+                
                 if metadata["interface_quality"] < 50:
                     metadata["recommendations"].append("Improve interface definitions with proper type and signal specifications")
                 
@@ -489,6 +617,11 @@ class VygesCodeKPIs:
         
         return metadata
     
+    def _file_inventory(self) -> Set[str]:
+        """Relative paths of the files found by the file structure scan."""
+        self.section("file_structure")
+        return set(self._inventory)
+    
     def _detailed_analysis(self) -> Dict[str, Any]:
         """Perform detailed analysis."""
         detailed = {
@@ -613,7 +746,7 @@ class VygesCodeKPIs:
         test_metrics = self.kpis.get("test_metrics", {})
         if test_metrics.get("test_files", 0) > 0:
             score += 15
-        if test_metrics.get("coverage_files", 0) > 0:
+        if test_metrics.get("coverage_files", 0) > 0 or "functional_coverage" in test_metrics:
             score += 10
         
         # Quality (20 points)
@@ -664,6 +797,16 @@ class VygesCodeKPIs:
         if metadata_analysis.get("catalog_readiness") == "not_ready":
             summary["areas_for_improvement"].append("Metadata not ready for catalog publication")
         
+        # Timing strengths and areas for improvement
+        timing_metrics = self.kpis.get("timing_metrics", {})
+        if timing_metrics.get("clock_count", 0) == 0:
+            summary["areas_for_improvement"].append("No clock constraints defined")
+        if timing_metrics.get("timing_met") is True:
+            summary["strengths"].append("Static timing met on all clocks")
+        elif timing_metrics.get("timing_met") is False:
+            summary["areas_for_improvement"].append(
+                f"Timing violations (WNS {timing_metrics.get('wns_ns', 0):.3f} ns)")
+        
         # Generate recommendations
         if summary["overall_score"] < 50:
             summary["recommendations"].append("Focus on basic project structure and documentation")
@@ -695,9 +838,11 @@ class VygesCodeKPIs:
     def print_report(self, output_format: str = "text"):
         """Print the KPI report in the specified format."""
         if output_format == "json":
-            print(json.dumps(self.kpis, indent=2))
-        elif output_format == "csv":
-            self._print_csv_report()
+            json.dump(self.kpis, sys.stdout, indent=2)
+            print()
+        elif output_format in EXPORT_FORMATS:
+            # One row per KPI, written as it is produced
+            export_kpis(self.kpis, "-", output_format)
         else:
             self._print_text_report()
     
@@ -708,72 +853,139 @@ class VygesCodeKPIs:
         print("=" * 60)
         
         # Project Info
-        project_info = self.kpis.get("project_info", {})
-        print(f"\n📁 PROJECT: {project_info.get('project_name', 'Unknown')}")
-        print(f"📅 Analysis Date: {project_info.get('analysis_date', 'Unknown')}")
-        print(f"🔗 Git Status: {project_info.get('git_status', 'Unknown')}")
+        if "project_info" in self.kpis:
+            project_info = self.kpis["project_info"]
+            print(f"\n📁 PROJECT: {project_info.get('project_name', 'Unknown')}")
+            print(f"📅 Analysis Date: {project_info.get('analysis_date', 'Unknown')}")
+            print(f"🔗 Git Status: {project_info.get('git_status', 'Unknown')}")
+            if project_info.get("git_commit"):
+                print(f"🔖 Git Commit: {project_info['git_commit'][:7]} ({project_info.get('git_branch') or 'unknown'})")
         
         # Summary
         summary = self.kpis.get("summary", {})
-        print(f"\n📊 OVERALL SCORE: {summary.get('overall_score', 0)}/100")
+        if "summary" in self.kpis:
+            print(f"\n📊 OVERALL SCORE: {summary.get('overall_score', 0)}/100")
         
         # Code Metrics
-        code_metrics = self.kpis.get("code_metrics", {})
-        print(f"\n💻 CODE METRICS:")
-        print(f"   RTL Files: {code_metrics.get('rtl_files', 0)}")
-        print(f"   RTL Lines: {code_metrics.get('rtl_lines', 0)}")
-        print(f"   RTL Modules: {code_metrics.get('rtl_modules', 0)}")
-        print(f"   Testbench Files: {code_metrics.get('testbench_files', 0)}")
-        print(f"   Testbench Lines: {code_metrics.get('testbench_lines', 0)}")
+        if "code_metrics" in self.kpis:
+            code_metrics = self.kpis["code_metrics"]
+            print(f"\n💻 CODE METRICS:")
+            print(f"   RTL Files: {code_metrics.get('rtl_files', 0)}")
+            print(f"   RTL Lines: {code_metrics.get('rtl_lines', 0)}")
+            print(f"   RTL Modules: {code_metrics.get('rtl_modules', 0)}")
+            print(f"   Testbench Files: {code_metrics.get('testbench_files', 0)}")
+            print(f"   Testbench Lines: {code_metrics.get('testbench_lines', 0)}")
         
         # Documentation
-        doc_metrics = self.kpis.get("documentation_metrics", {})
-        print(f"\n📚 DOCUMENTATION:")
-        print(f"   Documentation Files: {doc_metrics.get('documentation_files', 0)}")
-        print(f"   Documentation Lines: {doc_metrics.get('documentation_lines', 0)}")
-        print(f"   README Exists: {'✅' if doc_metrics.get('readme_exists', False) else '❌'}")
-        print(f"   Developer Guide: {'✅' if doc_metrics.get('developer_guide_exists', False) else '❌'}")
+        if "documentation_metrics" in self.kpis:
+            doc_metrics = self.kpis["documentation_metrics"]
+            print(f"\n📚 DOCUMENTATION:")
+            print(f"   Documentation Files: {doc_metrics.get('documentation_files', 0)}")
+            print(f"   Documentation Lines: {doc_metrics.get('documentation_lines', 0)}")
+            print(f"   README Exists: {'✅' if doc_metrics.get('readme_exists', False) else '❌'}")
+            print(f"   Developer Guide: {'✅' if doc_metrics.get('developer_guide_exists', False) else '❌'}")
         
         # Test Coverage
-        test_metrics = self.kpis.get("test_metrics", {})
-        print(f"\n🧪 TEST COVERAGE:")
-        print(f"   Test Files: {test_metrics.get('test_files', 0)}")
-        print(f"   Test Lines: {test_metrics.get('test_lines', 0)}")
-        print(f"   Coverage Files: {test_metrics.get('coverage_files', 0)}")
+        if "test_metrics" in self.kpis:
+            test_metrics = self.kpis["test_metrics"]
+            print(f"\n🧪 TEST COVERAGE:")
+            print(f"   Test Files: {test_metrics.get('test_files', 0)}")
+            print(f"   Test Lines: {test_metrics.get('test_lines', 0)}")
+            print(f"   Coverage Files: {test_metrics.get('coverage_files', 0)}")
+            functional = test_metrics.get("functional_coverage")
+            if functional:
+                print(f"   Functional Coverage: {functional['coverage']:.1f}% "
+                      f"({functional['hit_bins']}/{functional['bins']} bins, goals {'met ✅' if functional['goals_met'] else 'not met ❌'})")
+                for name, group in functional["covergroups"].items():
+                    print(f"     {name}: {group['coverage']:.1f}% (goal {group['goal']:.0f}%)")
         
         # Quality
-        quality_metrics = self.kpis.get("quality_metrics", {})
-        print(f"\n✅ QUALITY METRICS:")
-        print(f"   Metadata Complete: {'✅' if quality_metrics.get('metadata_complete', False) else '❌'}")
-        print(f"   Documentation Complete: {'✅' if quality_metrics.get('documentation_complete', False) else '❌'}")
-        print(f"   Linting Clean: {'✅' if quality_metrics.get('linting_clean', False) else '❌'}")
-        print(f"   Synthesis Clean: {'✅' if quality_metrics.get('synthesis_clean', False) else '❌'}")
+        if "quality_metrics" in self.kpis:
+            quality_metrics = self.kpis["quality_metrics"]
+            print(f"\n✅ QUALITY METRICS:")
+            print(f"   Metadata Complete: {'✅' if quality_metrics.get('metadata_complete', False) else '❌'}")
+            print(f"   Documentation Complete: {'✅' if quality_metrics.get('documentation_complete', False) else '❌'}")
+            print(f"   Linting Clean: {'✅' if quality_metrics.get('linting_clean', False) else '❌'}")
+            print(f"   Synthesis Clean: {'✅' if quality_metrics.get('synthesis_clean', False) else '❌'}")
+            if quality_metrics.get("synthesis_stats_available", False):
+                synthesis_metrics = self.kpis.get("synthesis_metrics", {})
+                print(f"   Total Gate Count: {quality_metrics.get('total_gate_count', 0):,} cells")
+                print(f"   Wire Bits: {synthesis_metrics.get('wire_bits', 0):,}")
+                print(f"   Memory Bits: {synthesis_metrics.get('memory_bits', 0):,}")
+                for module, gates in quality_metrics.get("module_gate_counts", {}).items():
+                    print(f"     {module}: {gates:,} cells")
+            for label, key in (("Lint", "lint_diagnostics"), ("Synthesis", "synthesis_diagnostics")):
+                diagnostics = quality_metrics.get(key)
+                if not diagnostics:
+                    continue
+                print(f"   {label} Diagnostics: {diagnostics['errors']} errors, {diagnostics['warnings']} warnings "
+                      f"({diagnostics['unique_diagnostics']} unique)")
+                for entry in diagnostics["top_diagnostics"][:5]:
+                    location = f"{entry['file']}:{entry['line']}" if entry["file"] else entry["tool"]
+                    print(f"     {entry['count']:>4}x {entry['severity']} {location}: {entry['message'][:70]}")
+        
+        # Timing
+        if "timing_metrics" in self.kpis:
+            timing_metrics = self.kpis["timing_metrics"]
+            print(f"\n⏱️  TIMING:")
+            print(f"   Clocks Defined: {timing_metrics.get('clock_count', 0)}")
+            for name, clock in timing_metrics.get("clocks", {}).items():
+                if clock.get("frequency_mhz"):
+                    print(f"   Clock {name}: {clock['period_ns']:.3f} ns ({clock['frequency_mhz']:.1f} MHz target)")
+            if timing_metrics.get("timing_data_available", False):
+                wns = timing_metrics.get("wns_ns")
+                tns = timing_metrics.get("tns_ns")
+                print(f"   WNS: {f'{wns:.3f} ns' if wns is not None else 'N/A'}")
+                print(f"   TNS: {f'{tns:.3f} ns' if tns is not None else 'N/A'}")
+                for name, fmax in timing_metrics.get("fmax_mhz", {}).items():
+                    print(f"   Fmax ({name}): {f'{fmax:.1f} MHz' if fmax else 'N/A'}")
+            else:
+                print(f"   STA Reports: ❌ None found")
+        
+        # Power
+        if "power_metrics" in self.kpis:
+            power_metrics = self.kpis["power_metrics"]
+            print(f"\n⚡ POWER ESTIMATE:")
+            if power_metrics.get("power_data_available", False):
+                clock = power_metrics.get("clock", {})
+                print(f"   Clock: {clock.get('name')} @ {clock.get('frequency_mhz', 0):.1f} MHz")
+                print(f"   Dynamic Power: {power_metrics.get('total_dynamic_mw', 0):.4f} mW")
+                print(f"   Leakage Power: {power_metrics.get('total_leakage_mw', 0):.4f} mW")
+                print(f"   Total Power: {power_metrics.get('total_mw', 0):.4f} mW")
+            else:
+                print(f"   Cell Inventory: ❌ No synthesis stat output found")
         
         # Vyges Metadata Analysis
-        metadata_analysis = self.kpis.get("metadata_analysis", {})
-        if metadata_analysis.get("metadata_exists", False):
-            print(f"\n📋 VYGES METADATA ANALYSIS:")
-            print(f"   Quality Score: {metadata_analysis.get('quality_score', 0):.1f}/100")
-            print(f"   Catalog Readiness: {metadata_analysis.get('catalog_readiness', 'unknown').upper()}")
-            print(f"   Field Completeness: {metadata_analysis.get('field_completeness', 0):.1f}%")
-            print(f"   Interface Quality: {metadata_analysis.get('interface_quality', 0):.1f}%")
-            print(f"   Test Coverage Metadata: {metadata_analysis.get('test_coverage_metadata', 0):.1f}%")
-            print(f"   Flow Configuration: {metadata_analysis.get('flow_configuration', 0):.1f}%")
-            print(f"   AI Generation Ready: {'✅' if metadata_analysis.get('ai_generation_ready', False) else '❌'}")
+        if "metadata_analysis" in self.kpis:
+            metadata_analysis = self.kpis["metadata_analysis"]
+            if metadata_analysis.get("metadata_exists", False):
+                print(f"\n📋 VYGES METADATA ANALYSIS:")
+                print(f"   Quality Score: {metadata_analysis.get('quality_score', 0):.1f}/100")
+                print(f"   Catalog Readiness: {metadata_analysis.get('catalog_readiness', 'unknown').upper()}")
+                print(f"   Field Completeness: {metadata_analysis.get('field_completeness', 0):.1f}%")
+                print(f"   Interface Quality: {metadata_analysis.get('interface_quality', 0):.1f}%")
+                print(f"   Test Coverage Metadata: {metadata_analysis.get('test_coverage_metadata', 0):.1f}%")
+                print(f"   Flow Configuration: {metadata_analysis.get('flow_configuration', 0):.1f}%")
+                print(f"   AI Generation Ready: {'✅' if metadata_analysis.get('ai_generation_ready', False) else '❌'}")
+                if "schema_valid" in metadata_analysis:
+                    print(f"   Schema Valid: {'✅' if metadata_analysis['schema_valid'] else '❌'}")
+                    source_files = metadata_analysis["source_files"]
+                    print(f"   Source Files: {source_files['declared']} declared, "
+                          f"{len(source_files['stale_entries'])} stale, {len(source_files['missing_entries'])} missing")
             
-            # Show metadata issues if any
-            if metadata_analysis.get("issues"):
-                print(f"\n⚠️  METADATA ISSUES:")
-                for issue in metadata_analysis["issues"]:
-                    print(f"   ⚠️  {issue}")
+                # Show metadata issues if any
+                if metadata_analysis.get("issues"):
+                    print(f"\n⚠️  METADATA ISSUES:")
+                    for issue in metadata_analysis["issues"]:
+                        print(f"   ⚠️  {issue}")
             
-            # Show metadata recommendations if any
-            if metadata_analysis.get("recommendations"):
-                print(f"\n💡 METADATA RECOMMENDATIONS:")
-                for rec in metadata_analysis["recommendations"]:
-                    print(f"   💡 {rec}")
-        else:
-            print(f"\n📋 VYGES METADATA: ❌ No vyges-metadata.json found")
+                # Show metadata recommendations if any
+                if metadata_analysis.get("recommendations"):
+                    print(f"\n💡 METADATA RECOMMENDATIONS:")
+                    for rec in metadata_analysis["recommendations"]:
+                        print(f"   💡 {rec}")
+            else:
+                print(f"\n📋 VYGES METADATA: ❌ No vyges-metadata.json found")
         
         # Strengths and Areas for Improvement
         if summary.get("strengths"):
@@ -792,23 +1004,6 @@ class VygesCodeKPIs:
                 print(f"   💡 {rec}")
         
         print("\n" + "=" * 60)
-    
-    def _print_csv_report(self):
-        """Print a CSV report."""
-        # This would generate a CSV format report
-        # For brevity, just print the summary as CSV
-        summary = self.kpis.get("summary", {})
-        print("metric,value")
-        print(f"overall_score,{summary.get('overall_score', 0)}")
-        
-        code_metrics = self.kpis.get("code_metrics", {})
-        print(f"rtl_files,{code_metrics.get('rtl_files', 0)}")
-        print(f"rtl_lines,{code_metrics.get('rtl_lines', 0)}")
-        print(f"testbench_files,{code_metrics.get('testbench_files', 0)}")
-        
-        doc_metrics = self.kpis.get("documentation_metrics", {})
-        print(f"documentation_files,{doc_metrics.get('documentation_files', 0)}")
-        print(f"documentation_lines,{doc_metrics.get('documentation_lines', 0)}")
 
 
 def main():
@@ -816,17 +1011,48 @@ def main():
     parser = argparse.ArgumentParser(description="Analyze Vyges IP project KPIs")
     parser.add_argument("--project-root", default=".", help="Project root directory")
     parser.add_argument("--detailed", action="store_true", help="Include detailed analysis")
-    parser.add_argument("--output", choices=["text", "json", "csv"], default="text", 
-                       help="Output format")
+    parser.add_argument("--sections", help="Comma-separated KPI sections to compute (plus their dependencies; "
+                                           f"available: {', '.join(VygesCodeKPIs.SECTIONS)})")
+    parser.add_argument("--output", choices=["text", "json", "csv", "ndjson"], default="text",
+                       help="Output format (csv and ndjson list every KPI as a metric,value row)")
+    parser.add_argument("--export", action="append", default=[], metavar="FILE",
+                        help="Also export every KPI to FILE (.csv, .ndjson or .jsonl, optionally .gz); repeatable")
+    parser.add_argument("--artifact", help="Also write a versioned code_kpis JSON artifact to this file")
+    add_profile_argument(parser)
     
     args = parser.parse_args()
+    sections = None
+    if args.sections:
+        sections = [section.strip() for section in args.sections.split(",") if section.strip()]
+        if args.artifact:
+            # The artifact schema requires these sections
+            sections += load_schema("code_kpis")["required"]
+        try:
+            VygesCodeKPIs.resolve_sections(sections)
+        except ValueError as e:
+            parser.error(str(e))
+    start_profiling(args.profile, "code_kpis.py")
     
     # Analyze project
     analyzer = VygesCodeKPIs(args.project_root)
-    kpis = analyzer.analyze_project(detailed=args.detailed)
+    with stage("analyze_project"):
+        kpis = analyzer.analyze_project(detailed=args.detailed, sections=sections)
+    
+    # Write versioned artifact for downstream report generators
+    if args.artifact:
+        with stage("write_artifact"):
+            write_artifact(args.artifact, "code_kpis", kpis, "code_kpis.py")
+    
+    # Flat exports of every KPI
+    for path in args.export:
+        with stage("export"):
+            count = export_kpis(kpis, path)
+        print(f"📄 {count} KPI rows exported to {path}", file=sys.stderr)
     
     # Print report
-    analyzer.print_report(args.output)
+    with stage("print_report"):
+        analyzer.print_report(args.output)
+    finish_profiling(args.profile)
 
 
 if __name__ == "__main__":
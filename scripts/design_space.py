@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Vyges Design-Space Exploration Script
+
+Sweeps the top-module parameters declared in vyges-metadata.json (for
+example_core: DATA_WIDTH, ADDR_WIDTH, BUFFER_DEPTH) and synthesizes every
+legal configuration with Yosys (`chparam`) across a process pool; points that
+break a parameter constraint of the top module (e.g. BUFFER_DEPTH must fit the
+ADDR_WIDTH-bit buffer pointers) are skipped and reported. For each point
+it collects the cell count, an area estimate and the logic depth, derives an
+Fmax estimate from the depth, and reports the area/Fmax Pareto front.
+
+Area is the liberty chip area when `--liberty` is given, otherwise NAND2 gate
+equivalents of the generic gate cells. Fmax assumes a fixed delay per logic
+level and is meant for comparing configurations, not for sign-off.
+
+Usage:
+    python scripts/design_space.py [--param NAME=V1,V2,...] [-j N] [--liberty FILE]
+                                   [--artifact FILE] [--output text|json]
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import fnmatch
+import argparse
+import itertools
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+
+from yosys_stat import parse_stat_text
+from report_artifacts import write_artifact
+
+
+DSE_DIR = "build/dse"
+DEFAULT_TIMEOUT_S = 300
+
+# Delay model for the Fmax estimate
+DEFAULT_GATE_DELAY_PS = 45.0
+SEQUENTIAL_OVERHEAD_PS = 150.0
+
+# Upper bound on the number of swept values per parameter
+MAX_VALUES_PER_PARAMETER = 8
+
+# Largest value swept by default; wider points only through --param
+# (ADDR_WIDTH=16 means a 65536-entry config_reg in example_core)
+DEFAULT_SWEEP_LIMITS = {"ADDR_WIDTH": 8}
+
+# NAND2 gate equivalents of Yosys generic gate cells (longest pattern wins)
+GATE_EQUIVALENTS = {
+    "$_NOT_": 0.67,
+    "$_BUF_": 1.0,
+    "$_NAND_": 1.0,
+    "$_NOR_": 1.0,
+    "$_AND_": 1.33,
+    "$_OR_": 1.33,
+    "$_ANDNOT_": 1.33,
+    "$_ORNOT_": 1.33,
+    "$_XOR_": 2.33,
+    "$_XNOR_": 2.33,
+    "$_MUX_": 2.33,
+    "$_NMUX_": 2.33,
+    "$_AOI3_": 1.33,
+    "$_OAI3_": 1.33,
+    "$_AOI4_": 1.67,
+    "$_OAI4_": 1.67,
+    "$_DFF*": 4.67,
+    "$_SDFF*": 5.33,
+    "$_DLATCH*": 3.33,
+    "*": 1.5
+}
+
+# Parameter legality rules per top module: (rule, parameters used, check).
+# Points breaking a rule are skipped instead of synthesized.
+PARAMETER_CONSTRAINTS = {
+    "example_core": [
+        # Buffer pointers are ADDR_WIDTH bits wide (see ExampleCoreModel)
+        ("BUFFER_DEPTH <= 2**ADDR_WIDTH", ("BUFFER_DEPTH", "ADDR_WIDTH"),
+         lambda p: p["BUFFER_DEPTH"] <= 1 << p["ADDR_WIDTH"])
+    ]
+}
+
+_LTP_RE = re.compile(r'Longest topological path in \S+ \(length=(\d+)\)')
+
+
+def load_parameter_ranges(metadata_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Read integer parameters with ranges from the IP metadata."""
+    candidates = [metadata_path] if metadata_path else ["vyges-metadata.json", "vyges-metadata.template.json"]
+    for path in candidates:
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            return [p for p in data.get("parameters", [])
+                    if p.get("type") == "int" and isinstance(p.get("range"), dict)]
+    return []
+
+
+def sweep_values(parameter: Dict[str, Any]) -> List[int]:
+    """Powers of two inside the parameter range plus the default value, capped by DEFAULT_SWEEP_LIMITS."""
+    low, high = parameter["range"]["min"], parameter["range"]["max"]
+    high = max(low, min(high, DEFAULT_SWEEP_LIMITS.get(parameter["name"], high)))
+    values = {parameter["default"]} if low <= parameter.get("default", low - 1) <= high else set()
+    value = 1
+    while value <= high:
+        if value >= low:
+            values.add(value)
+        value *= 2
+    if not values:
+        values = {low, high}
+    values = sorted(values)
+    if len(values) > MAX_VALUES_PER_PARAMETER:
+        # Keep the endpoints and spread the rest evenly
+        step = (len(values) - 1) / (MAX_VALUES_PER_PARAMETER - 1)
+        values = sorted({values[round(i * step)] for i in range(MAX_VALUES_PER_PARAMETER)})
+    return values
+
+
+def parse_overrides(overrides: List[str]) -> Dict[str, List[int]]:
+    """Parse NAME=V1,V2 command-line overrides."""
+    sweep = {}
+    for override in overrides:
+        name, _, values = override.partition("=")
+        sweep[name.strip()] = [int(v) for v in values.split(",") if v.strip()]
+    return sweep
+
+
+def gate_equivalents(cell_type: str) -> float:
+    """NAND2 equivalents of one cell."""
+    if cell_type in GATE_EQUIVALENTS:
+        return GATE_EQUIVALENTS[cell_type]
+    matches = [p for p in GATE_EQUIVALENTS if fnmatch.fnmatchcase(cell_type, p)]
+    return GATE_EQUIVALENTS[max(matches, key=len)] if matches else 0.0
+
+
+def yosys_script(rtl_files: List[str], top: str, parameters: Dict[str, int],
+                 liberty: Optional[str] = None) -> str:
+    """Yosys script synthesizing one configuration."""
+    chparam = " ".join(f"-set {name} {value}" for name, value in parameters.items())
+    steps = [
+        f"read_verilog -sv {' '.join(rtl_files)}",
+        f"chparam {chparam} {top}",
+        f"hierarchy -top {top}",
+        "proc", "flatten", "opt", "techmap", "opt"
+    ]
+    if liberty:
+        steps += [f"dfflibmap -liberty {liberty}", f"abc -liberty {liberty}", "opt_clean",
+                  f"stat -liberty {liberty}"]
+    else:
+        steps += ["abc -g AND,NAND,OR,NOR,XOR,XNOR,ANDNOT,ORNOT,MUX", "opt_clean", "stat"]
+    steps.append("ltp -noff")
+    return "; ".join(steps)
+
+
+def parameter_defaults(parameters: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Default value of each parameter that declares one."""
+    return {p["name"]: p["default"] for p in parameters if isinstance(p.get("default"), int)}
+
+
+def constraint_violations(top: str, parameters: Dict[str, int],
+                          defaults: Optional[Dict[str, int]] = None) -> List[str]:
+    """Rules of the top module broken by a configuration (unswept parameters take their defaults)."""
+    values = dict(defaults or {}, **parameters)
+    return [rule for rule, names, check in PARAMETER_CONSTRAINTS.get(top, [])
+            if all(name in values for name in names) and not check(values)]
+
+
+def point_name(parameters: Dict[str, int]) -> str:
+    """File-system friendly name of a configuration."""
+    return "_".join(f"{name}{value}" for name, value in parameters.items())
+
+
+def synthesize_point(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Synthesize one configuration and extract its metrics (runs in a worker process)."""
+    parameters = job["parameters"]
+    log_path = os.path.join(job["dse_dir"], f"{point_name(parameters)}.log")
+    point = {"parameters": parameters, "status": "failed", "cells": None, "area": None,
+             "logic_depth": None, "fmax_mhz": None, "log": log_path, "pareto": False}
+
+    command = ["yosys", "-q", "-l", log_path, "-p",
+               yosys_script(job["rtl_files"], job["top"], parameters, job["liberty"])]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=job["timeout"])
+    except subprocess.TimeoutExpired:
+        point["error"] = f"timed out after {job['timeout']}s"
+        return point
+    except OSError as e:
+        point["error"] = str(e)
+        return point
+    if result.returncode != 0:
+        lines = (result.stderr or result.stdout).strip().splitlines()
+        point["error"] = lines[-1] if lines else f"yosys exited with {result.returncode}"
+        return point
+
+    depth = None
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+        stats = parse_stat_text(f)
+        f.seek(0)
+        for line in f:
+            match = _LTP_RE.search(line)
+            if match:
+                depth = int(match.group(1))
+    module = stats["modules"].get(job["top"]) or next(iter(stats["modules"].values()), None)
+    if module is None:
+        point["error"] = "no stat output in log"
+        return point
+
+    point["cells"] = module["cells"]
+    if module["area"] is not None:
+        point["area"] = module["area"]
+    else:
+        point["area"] = round(sum(gate_equivalents(c) * n for c, n in module["cell_types"].items()), 2)
+    if depth is not None:
+        point["logic_depth"] = depth
+        period_ps = depth * job["gate_delay_ps"] + SEQUENTIAL_OVERHEAD_PS
+        point["fmax_mhz"] = round(1e6 / period_ps, 1)
+    point["status"] = "ok"
+    return point
+
+
+def mark_pareto_front(points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flag configurations not dominated in (lower area, higher Fmax)."""
+    candidates = [p for p in points if p["status"] == "ok" and p["area"] is not None and p["fmax_mhz"] is not None]
+    # Sweep by ascending area; a point is optimal if it is faster than every smaller one
+    candidates.sort(key=lambda p: (p["area"], -p["fmax_mhz"]))
+    best_fmax = None
+    front = []
+    for point in candidates:
+        if best_fmax is None or point["fmax_mhz"] > best_fmax:
+            point["pareto"] = True
+            front.append(point)
+            best_fmax = point["fmax_mhz"]
+    return front
+
+
+def explore(top: str, rtl_files: List[str], sweep: Dict[str, List[int]], jobs: Optional[int] = None,
+            liberty: Optional[str] = None, gate_delay_ps: float = DEFAULT_GATE_DELAY_PS,
+            timeout: int = DEFAULT_TIMEOUT_S, dse_dir: str = DSE_DIR,
+            defaults: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Synthesize every legal point of the sweep in parallel and compute the Pareto front."""
+    os.makedirs(dse_dir, exist_ok=True)
+    names = list(sweep)
+    work = []
+    skipped = []
+    for values in itertools.product(*(sweep[name] for name in names)):
+        parameters = dict(zip(names, values))
+        violations = constraint_violations(top, parameters, defaults)
+        if violations:
+            skipped.append({"parameters": parameters, "reason": "; ".join(violations)})
+            continue
+        work.append({
+            "parameters": parameters,
+            "top": top,
+            "rtl_files": rtl_files,
+            "liberty": liberty,
+            "gate_delay_ps": gate_delay_ps,
+            "timeout": timeout,
+            "dse_dir": dse_dir
+        })
+
+    print(f"🧭 Exploring {len(work)} configurations of {top} with {jobs or os.cpu_count()} workers"
+          f"{f' ({len(skipped)} invalid skipped)' if skipped else ''}...")
+    points = []
+    if work:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            points = list(pool.map(synthesize_point, work))
+
+    front = mark_pareto_front(points)
+    return {
+        "top_module": top,
+        "sweep": sweep,
+        "area_metric": "liberty" if liberty else "nand2_equivalents",
+        "gate_delay_ps": gate_delay_ps,
+        "points": points,
+        "pareto_front": [p["parameters"] for p in sorted(front, key=lambda p: p["area"])],
+        "failed": sum(1 for p in points if p["status"] != "ok"),
+        "skipped": skipped
+    }
+
+
+def print_dse_report(dse: Dict[str, Any]):
+    """Print the exploration results as a table, Pareto points first."""
+    names = list(dse["sweep"])
+    area_label = "Area" if dse["area_metric"] == "liberty" else "Area (GE)"
+    print("=" * 72)
+    print(f"🧭 DESIGN-SPACE EXPLORATION: {dse['top_module']}")
+    print("=" * 72)
+    header = "".join(f"{name:>14}" for name in names)
+    print(f"\n{header}{'Cells':>9}{area_label:>12}{'Depth':>7}{'Fmax MHz':>10}  Pareto")
+    ordered = sorted(dse["points"], key=lambda p: (not p["pareto"], p["area"] if p["area"] is not None else 1e30))
+    for point in ordered:
+        values = "".join(f"{point['parameters'][name]:>14}" for name in names)
+        if point["status"] != "ok":
+            print(f"{values}  ❌ {point.get('error', 'failed')}")
+            continue
+        depth = point["logic_depth"] if point["logic_depth"] is not None else "-"
+        fmax = f"{point['fmax_mhz']:.1f}" if point["fmax_mhz"] is not None else "-"
+        print(f"{values}{point['cells']:>9,}{point['area']:>12,.1f}{depth:>7}{fmax:>10}  {'★' if point['pareto'] else ''}")
+    print(f"\n{len(dse['pareto_front'])} Pareto-optimal of {len(dse['points'])} configurations "
+          f"({dse['failed']} failed)")
+    skipped = dse.get("skipped", [])
+    if skipped:
+        print(f"\n⏭️  Skipped {len(skipped)} invalid configurations:")
+        for point in skipped:
+            values = ", ".join(f"{name}={value}" for name, value in point["parameters"].items())
+            print(f"   {values}: {point['reason']}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Parameter sweep with Yosys and an area/Fmax Pareto front")
+    parser.add_argument("--top", default="example_core", help="Top module")
+    parser.add_argument("--rtl", default="rtl/*.sv", help="RTL file pattern")
+    parser.add_argument("--metadata", help="Metadata file with parameter ranges (default: vyges-metadata.json)")
+    parser.add_argument("--param", action="append", default=[],
+                        help="Override swept values: NAME=V1,V2,... (repeatable)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--liberty", help="Liberty file for mapped area (default: NAND2 gate equivalents)")
+    parser.add_argument("--gate-delay-ps", type=float, default=DEFAULT_GATE_DELAY_PS,
+                        help="Delay per logic level for the Fmax estimate")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT_S, help="Per-configuration timeout (s)")
+    parser.add_argument("--artifact", default="build/reports/dse.json", help="DSE JSON artifact path")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    args = parser.parse_args()
+
+    parameters = load_parameter_ranges(args.metadata)
+    sweep = {p["name"]: sweep_values(p) for p in parameters}
+    sweep.update(parse_overrides(args.param))
+    if not sweep:
+        print("❌ No parameters with ranges found in the metadata")
+        return 1
+    rtl_files = sorted(glob.glob(args.rtl))
+    if not rtl_files:
+        print(f"❌ No RTL files match {args.rtl}")
+        return 1
+
+    dse = explore(args.top, rtl_files, sweep, args.jobs, args.liberty, args.gate_delay_ps, args.timeout,
+                  defaults=parameter_defaults(parameters))
+    write_artifact(Path(args.artifact), "dse", dse, "design_space.py")
+
+    if args.output == "json":
+        print(json.dumps(dse, indent=2))
+    else:
+        print_dse_report(dse)
+        print(f"📄 Artifact: {args.artifact}")
+    return 0 if dse["pareto_front"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,13 +8,21 @@ This is a template version that should be customized for specific IP projects.
 """
 
 import os
+import re
 import sys
-import json
 import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from report_artifacts import write_artifact, load_artifact, load_schema, ArtifactError, ARTIFACT_FILES
+from yosys_stat import analyze_synthesis
+from profiler import profiled, add_profile_argument, start_profiling, finish_profiling
+
+# KPI sections the report reads; the code_kpis artifact it writes also needs the schema's required sections
+REPORT_SECTIONS = ["summary", "code_metrics", "quality_metrics", "metadata_analysis", "timing_metrics", "power_metrics"]
+
+@profiled()
 def run_code_kpis_analysis(project_root: str = ".") -> Dict[str, Any]:
     """Run code KPIs analysis and return results."""
     try:
@@ -23,12 +31,13 @@ def run_code_kpis_analysis(project_root: str = ".") -> Dict[str, Any]:
         from code_kpis import VygesCodeKPIs
         
         analyzer = VygesCodeKPIs(project_root)
-        kpis = analyzer.analyze_project(detailed=True)
+        kpis = analyzer.analyze_project(sections=REPORT_SECTIONS + load_schema("code_kpis")["required"])
         return kpis
     except Exception as e:
         print(f"Warning: Code KPIs analysis failed: {e}")
         return {}
 
+@profiled()
 def run_gate_analysis(project_root: str = ".", output_dir: str = "reports") -> str:
     """Run gate analysis and return the report path."""
     try:
@@ -63,6 +72,70 @@ def run_gate_analysis(project_root: str = ".", output_dir: str = "reports") -> s
         print(f"Warning: Gate analysis failed: {e}")
         return ""
 
+@profiled()
+def build_gate_analysis_data(project_root: str = ".", gate_report_path: str = "") -> Dict[str, Any]:
+    """Build the gate_analysis artifact data from Yosys stat output and the gate report."""
+    gates = {
+        "total_gate_count": None,
+        "module_gate_counts": {},
+        "cell_types": {},
+        "estimated_transistors": None,
+        "estimated_area_mm2": None,
+        "report_path": gate_report_path or None,
+        "sources": []
+    }
+
+    # Cell counts straight from the Yosys stat output
+    synthesis = analyze_synthesis(Path(project_root))
+    if synthesis["synthesis_stats_available"]:
+        gates["sources"].extend(synthesis["stat_logs"])
+        gates["total_gate_count"] = synthesis["total_gate_count"]
+        gates["module_gate_counts"] = synthesis["module_gate_counts"]
+        gates["cell_types"] = synthesis["cell_types"]
+
+    # Estimates only published in the external gate analysis Markdown report
+    if gate_report_path and Path(gate_report_path).exists():
+        gates["sources"].append(gate_report_path)
+        with open(gate_report_path, 'r') as gate_file:
+            gate_content = gate_file.read()
+        if gates["total_gate_count"] is None:
+            total_match = re.search(r'Reported Modules.*?~(\d+) cells', gate_content)
+            if total_match:
+                gates["total_gate_count"] = int(total_match.group(1))
+        area_match = re.search(r'Total Estimated Area.*?~([\d.]+) mm²', gate_content)
+        if area_match:
+            gates["estimated_area_mm2"] = float(area_match.group(1))
+        transistors_match = re.search(r'\*\*Estimated Transistors\*\*:\s*([\d,]+)', gate_content)
+        if transistors_match:
+            gates["estimated_transistors"] = int(transistors_match.group(1).replace(',', ''))
+
+    return gates
+
+@profiled()
+def load_test_results(output_dir: str = "reports", project_root: str = ".") -> Optional[Dict[str, Any]]:
+    """Load the test_results artifact from the output directory or project root."""
+    for directory in (output_dir, project_root):
+        artifact_path = Path(directory) / ARTIFACT_FILES["test_results"]
+        if artifact_path.exists():
+            try:
+                return load_artifact(artifact_path, "test_results")
+            except ArtifactError as e:
+                print(f"Warning: {e}")
+    return None
+
+@profiled()
+def load_dse_results(output_dir: str = "reports", project_root: str = ".") -> Optional[Dict[str, Any]]:
+    """Load the dse artifact from the output directory or build/reports."""
+    for directory in (output_dir, Path(project_root) / "build" / "reports"):
+        artifact_path = Path(directory) / ARTIFACT_FILES["dse"]
+        if artifact_path.exists():
+            try:
+                return load_artifact(artifact_path, "dse")
+            except ArtifactError as e:
+                print(f"Warning: {e}")
+    return None
+
+@profiled()
 def generate_comprehensive_report(project_root: str = ".", output_dir: str = "reports") -> str:
     """Generate a comprehensive report combining all analyses."""
     
@@ -77,9 +150,24 @@ def generate_comprehensive_report(project_root: str = ".", output_dir: str = "re
     print("\n📊 Running code KPIs analysis...")
     kpis = run_code_kpis_analysis(project_root)
     
+    if kpis:
+        kpis_artifact = write_artifact(Path(output_dir) / ARTIFACT_FILES["code_kpis"], "code_kpis", kpis,
+                                       "generate_comprehensive_report.py")
+        print(f"✅ Code KPIs artifact: {kpis_artifact}")
+    
     # Run gate analysis
     print("\n🔧 Running gate analysis...")
     gate_report_path = run_gate_analysis(project_root, output_dir)
+    gates = build_gate_analysis_data(project_root, gate_report_path)
+    gate_artifact = write_artifact(Path(output_dir) / ARTIFACT_FILES["gate_analysis"], "gate_analysis", gates,
+                                   "generate_comprehensive_report.py")
+    print(f"✅ Gate analysis artifact: {gate_artifact}")
+    
+    # Test results from the test harness artifact
+    test_results = load_test_results(output_dir, project_root)
+    
+    # Parameter sweep results from scripts/design_space.py
+    dse = load_dse_results(output_dir, project_root)
     
     # Generate comprehensive report
     print("\n📝 Generating comprehensive report...")
@@ -119,11 +207,29 @@ def generate_comprehensive_report(project_root: str = ".", output_dir: str = "re
                 f.write(f"- **Total Gate Count:** {quality_metrics.get('total_gate_count', 0):,} cells\n")
                 if quality_metrics.get('module_gate_counts'):
                     f.write("- **Module Breakdown:**\n")
-                    for module, gates in quality_metrics['module_gate_counts'].items():
-                        f.write(f"  - {module}: {gates:,} cells\n")
+                    for module, cell_count in quality_metrics["module_gate_counts"].items():
+                        f.write(f"  - {module}: {cell_count:,} cells\n")
             
             f.write("\n")
             
+            # Lint and synthesis diagnostics
+            for label, key in (("Lint", "lint_diagnostics"), ("Synthesis", "synthesis_diagnostics")):
+                diagnostics = quality_metrics.get(key)
+                if not diagnostics:
+                    continue
+                f.write(f"#### {label} Diagnostics\n\n")
+                f.write(f"{diagnostics['errors']} errors, {diagnostics['warnings']} warnings "
+                        f"({diagnostics['unique_diagnostics']} unique)\n\n")
+                if diagnostics["top_diagnostics"]:
+                    f.write("| Count | Severity | Tool | Location | Message |\n")
+                    f.write("|-------|----------|------|----------|---------|\n")
+                    for entry in diagnostics["top_diagnostics"]:
+                        location = f"{entry['file']}:{entry['line']}" if entry["file"] else "-"
+                        message = entry["message"].replace("|", "\\|")
+                        f.write(f"| {entry['count']} | {entry['severity']} | {entry['tool']} | "
+                                f"`{location}` | {message} |\n")
+                    f.write("\n")
+            
             # Metadata analysis
             metadata_analysis = kpis.get("metadata_analysis", {})
             if metadata_analysis.get("metadata_exists", False):
@@ -131,30 +237,114 @@ def generate_comprehensive_report(project_root: str = ".", output_dir: str = "re
                 f.write(f"- **Quality Score:** {metadata_analysis.get('quality_score', 0):.1f}/100\n")
                 f.write(f"- **Catalog Readiness:** {metadata_analysis.get('catalog_readiness', 'unknown').upper()}\n")
                 f.write(f"- **Field Completeness:** {metadata_analysis.get('field_completeness', 0):.1f}%\n")
-                f.write(f"- **AI Generation Ready:** {'✅' if metadata_analysis.get('ai_generation_ready', False) else '❌'}\n\n")
+                f.write(f"- **AI Generation Ready:** {'✅' if metadata_analysis.get('ai_generation_ready', False) else '❌'}\n")
+                if "schema_valid" in metadata_analysis:
+                    source_files = metadata_analysis["source_files"]
+                    f.write(f"- **Schema Valid:** {'✅' if metadata_analysis['schema_valid'] else '❌'}\n")
+                    f.write(f"- **Source Files:** {source_files['declared']} declared, "
+                            f"{len(source_files['stale_entries'])} stale, {len(source_files['missing_entries'])} missing\n")
+                f.write("\n")
+
+            # Timing / performance
+            timing_metrics = kpis.get("timing_metrics", {})
+            if timing_metrics:
+                f.write("## ⏱️ Performance Summary\n\n")
+                wns = timing_metrics.get("wns_ns")
+                tns = timing_metrics.get("tns_ns")
+                met = timing_metrics.get("timing_met")
+                f.write(f"- **Clocks Defined:** {timing_metrics.get('clock_count', 0)}\n")
+                f.write(f"- **Timing Reports:** {len(timing_metrics.get('timing_reports', []))}\n")
+                f.write(f"- **WNS:** {f'{wns:.3f} ns' if wns is not None else 'N/A'}\n")
+                f.write(f"- **TNS:** {f'{tns:.3f} ns' if tns is not None else 'N/A'}\n")
+                f.write(f"- **Timing Met:** {'✅' if met else '❌' if met is False else 'N/A'}\n\n")
+
+                if timing_metrics.get("clocks"):
+                    f.write("| Clock | Period (ns) | Target (MHz) | WNS (ns) | TNS (ns) | Fmax (MHz) |\n")
+                    f.write("|-------|-------------|--------------|----------|----------|------------|\n")
+                    for name, clock in timing_metrics["clocks"].items():
+                        period = clock.get("period_ns")
+                        freq = clock.get("frequency_mhz")
+                        clock_wns = clock.get("wns_ns")
+                        clock_tns = clock.get("tns_ns")
+                        fmax = clock.get("fmax_mhz")
+                        f.write(f"| {name} "
+                                f"| {f'{period:.3f}' if period else 'N/A'} "
+                                f"| {f'{freq:.1f}' if freq else 'N/A'} "
+                                f"| {f'{clock_wns:.3f}' if clock_wns is not None else 'N/A'} "
+                                f"| {f'{clock_tns:.3f}' if clock_tns is not None else 'N/A'} "
+                                f"| {f'{fmax:.1f}' if fmax else 'N/A'} |\n")
+                    f.write("\n")
+
+                if timing_metrics.get("critical_paths"):
+                    f.write("**Critical Path Endpoints:**\n")
+                    for path in timing_metrics["critical_paths"]:
+                        f.write(f"- `{path['startpoint']}` → `{path['endpoint']}` "
+                                f"({path['clock']}, slack {path['slack']:.3f} ns)\n")
+                    f.write("\n")
+
+            # Power estimate
+            power_metrics = kpis.get("power_metrics", {})
+            if power_metrics.get("power_data_available", False):
+                clock = power_metrics.get("clock", {})
+                activity = power_metrics.get("average_activity")
+                f.write("## ⚡ Power Estimate\n\n")
+                f.write(f"- **Clock:** {clock.get('name')} @ {clock.get('frequency_mhz', 0):.1f} MHz ({clock.get('source')})\n")
+                f.write(f"- **Simulated Cycles:** {power_metrics.get('cycles_simulated', 0):,} "
+                        f"from {len(power_metrics.get('vcd_files', []))} VCD file(s)\n")
+                f.write(f"- **Average Switching Activity:** {f'{activity:.4f}' if activity is not None else 'N/A (default used)'}\n")
+                f.write(f"- **Dynamic Power:** {power_metrics.get('total_dynamic_mw', 0):.4f} mW\n")
+                f.write(f"- **Leakage Power:** {power_metrics.get('total_leakage_mw', 0):.4f} mW\n")
+                f.write(f"- **Total Power:** {power_metrics.get('total_mw', 0):.4f} mW\n\n")
+
+                f.write("| Module | Cells | Activity | Dynamic (mW) | Leakage (mW) | Total (mW) |\n")
+                f.write("|--------|-------|----------|--------------|--------------|------------|\n")
+                for module, data in power_metrics.get("modules", {}).items():
+                    f.write(f"| {module} | {data['cells']:,} | {data['activity']:.4f} ({data['activity_source']}) "
+                            f"| {data['dynamic_mw']:.4f} | {data['leakage_mw']:.4f} | {data['total_mw']:.4f} |\n")
+                f.write("\n*First-order estimate from generic per-cell energies; not for sign-off.*\n\n")
+
+        # Design-Space Exploration
+        if dse and dse["pareto_front"]:
+            names = list(dse["sweep"])
+            area_label = "Area" if dse["area_metric"] == "liberty" else "Area (NAND2 eq.)"
+            f.write("## 🧭 Design-Space Exploration\n\n")
+            synthesized = sum(1 for p in dse["points"] if p["status"] == "ok")
+            f.write(f"- **Configurations Synthesized:** {synthesized} of {len(dse['points'])} (`{dse['top_module']}`)\n")
+            if dse.get("skipped"):
+                f.write(f"- **Invalid Configurations Skipped:** {len(dse['skipped'])} "
+                        f"({'; '.join(sorted({p['reason'] for p in dse['skipped']}))})\n")
+            f.write(f"- **Pareto-Optimal (area vs. Fmax):** {len(dse['pareto_front'])}\n\n")
+            f.write("| " + " | ".join(names) + f" | Cells | {area_label} | Logic Depth | Est. Fmax (MHz) |\n")
+            f.write("|" + "---|" * (len(names) + 4) + "\n")
+            for point in sorted((p for p in dse["points"] if p["pareto"]), key=lambda p: p["area"]):
+                values = " | ".join(str(point["parameters"][name]) for name in names)
+                f.write(f"| {values} | {point['cells']:,} | {point['area']:,.1f} | "
+                        f"{point['logic_depth']} | {point['fmax_mhz']:.1f} |\n")
+            f.write("\n*Fmax estimated from logic depth; use for comparing configurations only.*\n\n")
+        
+        # Test Results Summary
+        if test_results:
+            test_summary = test_results["summary"]
+            f.write("## 🧪 Test Results Summary\n\n")
+            f.write(f"- **Total Test Cases:** {test_summary['total_tests']}\n")
+            f.write(f"- **Passed:** {test_summary['passed']}\n")
+            f.write(f"- **Failed:** {test_summary['failed']}\n")
+            f.write(f"- **Success Rate:** {test_summary['success_rate']:.1f}%\n\n")
         
         # Gate Analysis Summary
-        if gate_report_path and Path(gate_report_path).exists():
+        if gates["sources"]:
             f.write("## 🔧 Gate Analysis Summary\n\n")
-            f.write(f"Detailed gate analysis report: `{gate_report_path}`\n\n")
-            
-            # Try to extract key metrics from gate report
-            try:
-                with open(gate_report_path, 'r') as gate_file:
-                    gate_content = gate_file.read()
-                    
-                    # Extract total gate count
-                    import re
-                    total_match = re.search(r'Reported Modules.*?~(\d+) cells', gate_content)
-                    if total_match:
-                        f.write(f"**Total Gate Count:** ~{total_match.group(1)} cells\n\n")
-                    
-                    # Extract die size estimates
-                    area_match = re.search(r'Total Estimated Area.*?~([\d.]+) mm²', gate_content)
-                    if area_match:
-                        f.write(f"**Estimated Die Area:** ~{area_match.group(1)} mm² (45nm process)\n\n")
-            except Exception as e:
-                f.write(f"Could not extract detailed metrics from gate report: {e}\n\n")
+            if gate_report_path:
+                f.write(f"Detailed gate analysis report: `{gate_report_path}`\n\n")
+            if gates["total_gate_count"] is not None:
+                f.write(f"**Total Gate Count:** {gates['total_gate_count']:,} cells\n\n")
+            if gates["estimated_area_mm2"] is not None:
+                f.write(f"**Estimated Die Area:** ~{gates['estimated_area_mm2']} mm² (45nm process)\n\n")
+            if len(gates["module_gate_counts"]) > 1:
+                f.write("**Module Breakdown:**\n")
+                for module, count in gates["module_gate_counts"].items():
+                    f.write(f"- {module}: {count:,} cells\n")
+                f.write("\n")
         
         # Recommendations
         f.write("## 🎯 Key Recommendations\n\n")
@@ -172,7 +362,8 @@ def generate_comprehensive_report(project_root: str = ".", output_dir: str = "re
         
         f.write("\n## 📋 Generated Reports\n\n")
         f.write("The following reports were generated:\n")
-        f.write(f"- **Code KPIs:** Available in JSON format\n")
+        f.write(f"- **Code KPIs:** {Path(output_dir) / ARTIFACT_FILES['code_kpis']}\n")
+        f.write(f"- **Gate Analysis Data:** {gate_artifact}\n")
         if gate_report_path:
             f.write(f"- **Gate Analysis:** {gate_report_path}\n")
         f.write(f"- **Comprehensive Report:** {report_path}\n")
@@ -195,27 +386,30 @@ def main():
                        help='Generate only code KPIs analysis')
     parser.add_argument('--gate-analysis-only', action='store_true',
                        help='Generate only gate analysis')
+    add_profile_argument(parser)
     
     args = parser.parse_args()
+    start_profiling(args.profile, "generate_comprehensive_report.py")
     
     if args.code_kpis_only:
         print("📊 Running code KPIs analysis only...")
         kpis = run_code_kpis_analysis(args.project_root)
         if kpis:
-            output_file = Path(args.output_dir) / "code_kpis.json"
-            os.makedirs(args.output_dir, exist_ok=True)
-            with open(output_file, 'w') as f:
-                json.dump(kpis, f, indent=2)
+            output_file = write_artifact(Path(args.output_dir) / ARTIFACT_FILES["code_kpis"], "code_kpis", kpis,
+                                         "generate_comprehensive_report.py")
             print(f"✅ Code KPIs saved to: {output_file}")
     elif args.gate_analysis_only:
         print("🔧 Running gate analysis only...")
         gate_report_path = run_gate_analysis(args.project_root, args.output_dir)
-        if gate_report_path:
-            print(f"✅ Gate analysis completed: {gate_report_path}")
+        gates = build_gate_analysis_data(args.project_root, gate_report_path)
+        gate_artifact = write_artifact(Path(args.output_dir) / ARTIFACT_FILES["gate_analysis"], "gate_analysis",
+                                       gates, "generate_comprehensive_report.py")
+        print(f"✅ Gate analysis data saved to: {gate_artifact}")
     else:
         # Generate comprehensive report
         report_path = generate_comprehensive_report(args.project_root, args.output_dir)
         print(f"\n🎉 Analysis complete! Comprehensive report: {report_path}")
+    finish_profiling(args.profile)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
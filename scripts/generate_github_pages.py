@@ -6,11 +6,22 @@ Generic script that works for any IP repository
 
 import os
 import sys
-import re
 import json
+import argparse
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
 
+from page_templates import render_file, TemplateError
+from site_builder import SiteBuilder
+from report_artifacts import load_artifact, ArtifactError, ARTIFACT_FILES
+from profiler import profiled, stage, add_profile_argument, start_profiling, finish_profiling
+from vcd_index import read_index, index_path_for
+
+# Directory holding the JSON artifacts written by the other report scripts
+ARTIFACTS_DIR = '.'
+
+@profiled()
 def extract_ip_metadata():
     """Extract IP-specific information from vyges-metadata.json"""
     metadata = {
@@ -89,128 +100,76 @@ def extract_ip_metadata():
             
     return metadata
 
+@profiled()
+def load_report_artifact(kind):
+    """Load a versioned report artifact from the artifacts directory (None if unavailable)"""
+    artifact_path = os.path.join(ARTIFACTS_DIR, ARTIFACT_FILES[kind])
+    try:
+        return load_artifact(artifact_path, kind)
+    except ArtifactError as e:
+        print(f"⚠️ Warning: {kind} artifact unavailable: {e}")
+        return None
+
 def extract_test_data():
-    """Extract test results data from test_harness_report.md"""
+    """Extract test results from the test_results artifact"""
     test_data = {
-        'total_tests': '23',
-        'passed_tests': '23', 
-        'success_rate': '100.0'
+        'total_tests': 'N/A',
+        'passed_tests': 'N/A',
+        'success_rate': 'N/A'
     }
     
-    if os.path.exists('test_harness_report.md'):
-        with open('test_harness_report.md', 'r') as f:
-            content = f.read()
-            
-        # Extract test counts
-        test_cases_match = re.search(r'Test Cases:\s*(\d+)', content)
-        if test_cases_match:
-            test_data['total_tests'] = test_cases_match.group(1)
-            
-        passed_match = re.search(r'Passed:\s*(\d+)', content)
-        if passed_match:
-            test_data['passed_tests'] = passed_match.group(1)
-            
-        # Calculate success rate
-        try:
-            total = int(test_data['total_tests'])
-            passed = int(test_data['passed_tests'])
-            if total > 0:
-                success_rate = (passed * 100.0) / total
-                test_data['success_rate'] = f"{success_rate:.1f}"
-        except ValueError:
-            pass
+    results = load_report_artifact('test_results')
+    if results:
+        summary = results['summary']
+        test_data['total_tests'] = str(summary['total_tests'])
+        test_data['passed_tests'] = str(summary['passed'])
+        test_data['success_rate'] = f"{summary['success_rate']:.1f}"
             
     return test_data
 
+def format_die_size(die_size_mm2):
+    """Format a die size estimate in mm²"""
+    if die_size_mm2 < 1:
+        return f"{die_size_mm2:.2f}mm²"
+    return f"{die_size_mm2:.1f}mm²"
+
 def extract_gate_analysis():
-    """Extract gate analysis data from gate analysis reports"""
+    """Extract gate counts and die size from the gate_analysis artifact"""
     gate_data = {
-        'total_gates': '0',
+        'total_gates': 'N/A',
         'die_size': 'N/A'
     }
     
-    # Check for gate analysis report in flow/yosys
-    gate_report_path = 'flow/yosys/gate_analysis_report.md'
-    if os.path.exists(gate_report_path):
-        with open(gate_report_path, 'r') as f:
-            content = f.read()
-            
-        # Extract total gates
-        gates_match = re.search(r'\*\*Primitive Gates\*\*:\s*([\d,]+)', content)
-        if gates_match:
-            gate_data['total_gates'] = gates_match.group(1)
-            
-        # Extract transistor count for die size estimation
-        transistors_match = re.search(r'\*\*Estimated Transistors\*\*:\s*([\d,]+)', content)
-        if transistors_match:
-            transistors = int(transistors_match.group(1).replace(',', ''))
+    gates = load_report_artifact('gate_analysis')
+    if gates:
+        if gates['total_gate_count'] is not None:
+            gate_data['total_gates'] = f"{gates['total_gate_count']:,}"
+        if gates.get('estimated_area_mm2') is not None:
+            gate_data['die_size'] = format_die_size(gates['estimated_area_mm2'])
+        elif gates.get('estimated_transistors') is not None:
             # Rough die size estimation: 1K transistors ≈ 0.1mm² in 130nm
             # This is a very rough estimate - actual die size depends on technology node
-            die_size_mm2 = transistors / 10000  # Rough estimate
-            if die_size_mm2 < 1:
-                gate_data['die_size'] = f"{die_size_mm2:.2f}mm²"
-            else:
-                gate_data['die_size'] = f"{die_size_mm2:.1f}mm²"
-    
-    # Also check for comprehensive report
-    comp_report_path = 'flow/yosys/reports/comprehensive_report.md'
-    if os.path.exists(comp_report_path):
-        with open(comp_report_path, 'r') as f:
-            content = f.read()
-            
-        # Extract total gates if not found in main report
-        if gate_data['total_gates'] == '0':
-            gates_match = re.search(r'\*\*Primitive Gates\*\*:\s*([\d,]+)', content)
-            if gates_match:
-                gate_data['total_gates'] = gates_match.group(1)
-                
-        # Extract transistor count if not found in main report
-        if gate_data['die_size'] == 'N/A':
-            transistors_match = re.search(r'\*\*Estimated Transistors\*\*:\s*([\d,]+)', content)
-            if transistors_match:
-                transistors = int(transistors_match.group(1).replace(',', ''))
-                die_size_mm2 = transistors / 10000  # Rough estimate
-                if die_size_mm2 < 1:
-                    gate_data['die_size'] = f"{die_size_mm2:.2f}mm²"
-                else:
-                    gate_data['die_size'] = f"{die_size_mm2:.1f}mm²"
+            gate_data['die_size'] = format_die_size(gates['estimated_transistors'] / 10000)
     
     return gate_data
 
 def extract_code_metrics():
-    """Extract code metrics from code_kpis.txt"""
+    """Extract code metrics from the code_kpis artifact"""
     metrics = {
-        'rtl_files': '16',
-        'rtl_lines': '12,567',
-        'test_files': '9',
-        'overall_score': '88.8',
-        'total_gates': '0',
+        'rtl_files': 'N/A',
+        'rtl_lines': 'N/A',
+        'test_files': 'N/A',
+        'overall_score': 'N/A',
+        'total_gates': 'N/A',
         'die_size': 'N/A'
     }
     
-    if os.path.exists('code_kpis.txt'):
-        with open('code_kpis.txt', 'r') as f:
-            content = f.read()
-            
-        # Extract RTL files
-        rtl_match = re.search(r'RTL Files:\s*(\d+)', content)
-        if rtl_match:
-            metrics['rtl_files'] = rtl_match.group(1)
-            
-        # Extract RTL lines
-        lines_match = re.search(r'RTL Lines:\s*([\d,]+)', content)
-        if lines_match:
-            metrics['rtl_lines'] = lines_match.group(1)
-            
-        # Extract test files
-        test_match = re.search(r'Test Files:\s*(\d+)', content)
-        if test_match:
-            metrics['test_files'] = test_match.group(1)
-            
-        # Extract overall score
-        score_match = re.search(r'OVERALL SCORE:\s*(\d+\.?\d*)/100', content)
-        if score_match:
-            metrics['overall_score'] = score_match.group(1)
+    kpis = load_report_artifact('code_kpis')
+    if kpis:
+        metrics['rtl_files'] = str(kpis['code_metrics']['rtl_files'])
+        metrics['rtl_lines'] = f"{kpis['code_metrics']['rtl_lines']:,}"
+        metrics['test_files'] = str(kpis['test_metrics']['test_files'])
+        metrics['overall_score'] = f"{kpis['summary']['overall_score']:.1f}"
     
     # Extract gate analysis data
     gate_data = extract_gate_analysis()
@@ -219,16 +178,37 @@ def extract_code_metrics():
             
     return metrics
 
+# Badge style for each build status shown on the index page
+STATUS_BADGES = {
+    'Passing': 'success',
+    'Clean': 'success',
+    'Complete': 'success',
+    'Failing': 'warning',
+    'Errors': 'warning',
+    'N/A': 'info'
+}
+
+@profiled()
 def get_synthesis_status():
-    """Check synthesis status based on file existence"""
-    synthesis_status = "Clean"
-    fpga_status = "Implemented"
-    simulation_status = "Passing"
+    """Derive the simulation, synthesis and FPGA status from the report artifacts"""
+    synthesis_status = "N/A"
+    fpga_status = "N/A"
+    simulation_status = "N/A"
+    
+    # Synthesis: diagnostics from the Yosys log, else the presence of stat output
+    kpis = load_report_artifact('code_kpis')
+    if kpis:
+        quality = kpis['quality_metrics']
+        if 'synthesis_diagnostics' in quality:
+            synthesis_status = "Clean" if quality['synthesis_clean'] else "Errors"
+        elif quality.get('synthesis_stats_available'):
+            synthesis_status = "Complete"
+    
+    # Simulation: the test harness summary
+    results = load_report_artifact('test_results')
+    if results and results['summary']['total_tests'] > 0:
+        simulation_status = "Passing" if results['summary']['failed'] == 0 else "Failing"
     
-    # Check for synthesis results
-    if os.path.exists('flow/synthesis/reports/synthesis_report_generic.txt'):
-        synthesis_status = "Complete"
-        
     # Check for FPGA results
     if os.path.exists('flow/fpga/openfpga/netlists/') and any(os.listdir('flow/fpga/openfpga/netlists/')):
         fpga_status = "Complete"
@@ -247,23 +227,70 @@ def get_github_data():
         'generated_date': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
     }
 
-def format_list_items(items):
-    """Format a list of items as HTML list items"""
-    if isinstance(items, list):
-        return '\n'.join([f'<li>{item}</li>' for item in items])
-    return '<li>Feature list not available</li>'
+def as_list(items):
+    """Return items as a list for template loops (empty if not a list)"""
+    return items if isinstance(items, list) else []
+
+def format_file_size(size_bytes):
+    """Format a file size for display"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024 or unit == 'GB':
+            return f"{size_bytes:.1f} {unit}" if unit != 'B' else f"{size_bytes} B"
+        size_bytes /= 1024.0
+
+def format_sim_time(seconds):
+    """Format a simulated time span for display"""
+    for unit, scale in [('s', 1.0), ('ms', 1e-3), ('us', 1e-6), ('ns', 1e-9)]:
+        if seconds >= scale or unit == 'ns':
+            return f"{seconds / scale:.1f} {unit}"
 
-def generate_index_html():
+def get_pages_url(repository):
+    """Get the GitHub Pages base URL for a repository"""
+    if '/' not in repository:
+        return ''
+    owner, repo = repository.split('/', 1)
+    return f"https://{owner}.github.io/{repo}/"
+
+def scan_vcd_files(waveform_dir, repository):
+    """Collect VCD files published with the site for the waveforms page"""
+    vcd_files = []
+    if not os.path.isdir(waveform_dir):
+        return vcd_files
+    pages_url = get_pages_url(repository)
+    for name in sorted(os.listdir(waveform_dir)):
+        path = os.path.join(waveform_dir, name)
+        if not name.endswith('.vcd') or not os.path.isfile(path):
+            continue
+        url = quote(name)
+        absolute_url = f"{pages_url}waveforms/{url}" if pages_url else url
+        # Link the time index when one was built for this VCD (vcd_index.py or the
+        # orchestrator's pages task); only its small header is read here
+        index = read_index(path)
+        vcd_files.append({
+            'name': name,
+            'size': format_file_size(os.path.getsize(path)),
+            'duration': format_sim_time((index['end_time'] or 0) * index['timescale_s']) if index else 'N/A',
+            'index': [{'url': quote(index_path_for(Path(name)).name),
+                       'checkpoints': index['checkpoint_count']}] if index else [],
+            'url': url,
+            'viewer_url': f"https://app.surfer-project.org/?load_url={quote(absolute_url, safe='')}"
+        })
+    return vcd_files
+
+def page_assets(assets, prefix=''):
+    """Asset URLs for a page, from the published map or the last build's manifest"""
+    if assets is None:
+        assets = {name: asset['path'] for name, asset in SiteBuilder('public').manifest['assets'].items()}
+    return {name: prefix + path for name, path in assets.items()}
+
+@profiled()
+def generate_index_html(assets=None):
     """Generate index.html from template with dynamic data"""
     
-    # Read template
     template_path = 'public/index_template.html'
     if not os.path.exists(template_path):
         print(f"❌ Template not found: {template_path}")
         return False
-        
-    with open(template_path, 'r') as f:
-        template_content = f.read()
     
     # Extract all data
     ip_metadata = extract_ip_metadata()
@@ -273,64 +300,151 @@ def generate_index_html():
     github_data = get_github_data()
     
     # Combine all data
-    replacements = {
-        '{{IP_NAME}}': ip_metadata['ip_name'],
-        '{{IP_DESCRIPTION}}': ip_metadata['ip_description'],
-        '{{PROJECT_OVERVIEW}}': ip_metadata['project_overview'],
-        '{{KEY_FEATURES}}': format_list_items(ip_metadata['key_features']),
-        '{{RTL_MODULES}}': format_list_items(ip_metadata['rtl_modules']),
-        '{{TESTBENCH_COVERAGE}}': format_list_items(ip_metadata['testbench_coverage']),
-        '{{SIMULATORS}}': ip_metadata['simulators'],
-        '{{SYNTHESIS_TOOLS}}': ip_metadata['synthesis_tools'],
-        '{{TECHNOLOGY}}': ip_metadata['technology'],
-        '{{FPGA_FAMILIES}}': ip_metadata['fpga_families'],
-        '{{FPGA_TOOLS}}': ip_metadata['fpga_tools'],
-        '{{OVERALL_SCORE}}': code_metrics['overall_score'],
-        '{{RTL_FILES}}': code_metrics['rtl_files'],
-        '{{RTL_LINES}}': code_metrics['rtl_lines'],
-        '{{TEST_FILES}}': code_metrics['test_files'],
-        '{{TOTAL_GATES}}': code_metrics['total_gates'],
-        '{{DIE_SIZE}}': code_metrics['die_size'],
-        '{{PASSED_TESTS}}': test_data['passed_tests'],
-        '{{TOTAL_TESTS}}': test_data['total_tests'],
-        '{{SUCCESS_RATE}}': test_data['success_rate'],
-        '{{SYNTHESIS_STATUS}}': status_data['synthesis_status'],
-        '{{FPGA_STATUS}}': status_data['fpga_status'],
-        '{{SIMULATION_STATUS}}': status_data['simulation_status'],
-        '{{GENERATED_DATE}}': github_data['generated_date'],
-        '{{REPOSITORY}}': github_data['repository'],
-        '{{RUN_ID}}': github_data['run_id']
+    context = {
+        'IP_NAME': ip_metadata['ip_name'],
+        'IP_DESCRIPTION': ip_metadata['ip_description'],
+        'PROJECT_OVERVIEW': ip_metadata['project_overview'],
+        'KEY_FEATURES': as_list(ip_metadata['key_features']),
+        'RTL_MODULES': as_list(ip_metadata['rtl_modules']),
+        'TESTBENCH_COVERAGE': as_list(ip_metadata['testbench_coverage']),
+        'SIMULATORS': ip_metadata['simulators'],
+        'SYNTHESIS_TOOLS': ip_metadata['synthesis_tools'],
+        'TECHNOLOGY': ip_metadata['technology'],
+        'FPGA_FAMILIES': ip_metadata['fpga_families'],
+        'FPGA_TOOLS': ip_metadata['fpga_tools'],
+        'OVERALL_SCORE': code_metrics['overall_score'],
+        'RTL_FILES': code_metrics['rtl_files'],
+        'RTL_LINES': code_metrics['rtl_lines'],
+        'TEST_FILES': code_metrics['test_files'],
+        'TOTAL_GATES': code_metrics['total_gates'],
+        'DIE_SIZE': code_metrics['die_size'],
+        'PASSED_TESTS': test_data['passed_tests'],
+        'TOTAL_TESTS': test_data['total_tests'],
+        'SUCCESS_RATE': test_data['success_rate'],
+        'SYNTHESIS_STATUS': status_data['synthesis_status'],
+        'FPGA_STATUS': status_data['fpga_status'],
+        'SIMULATION_STATUS': status_data['simulation_status'],
+        'SYNTHESIS_BADGE': STATUS_BADGES[status_data['synthesis_status']],
+        'FPGA_BADGE': STATUS_BADGES[status_data['fpga_status']],
+        'SIMULATION_BADGE': STATUS_BADGES[status_data['simulation_status']],
+        'ASSETS': page_assets(assets),
+        'GENERATED_DATE': github_data['generated_date'],
+        'RUN_ID': github_data['run_id']
     }
     
-    # Apply replacements
-    output_content = template_content
-    for placeholder, value in replacements.items():
-        output_content = output_content.replace(placeholder, str(value))
-    
-    # Write output
+    # Render in a single pass with HTML escaping
     output_path = 'public/index.html'
-    with open(output_path, 'w') as f:
-        f.write(output_content)
+    try:
+        render_file(template_path, context, output_path)
+    except TemplateError as e:
+        print(f"❌ Template error: {e}")
+        return False
     
     print(f"✅ Generated {output_path}")
     print(f"📊 Data used:")
     print(f"   - IP: {ip_metadata['ip_name']} - {ip_metadata['ip_description']}")
     print(f"   - Test Results: {test_data['passed_tests']}/{test_data['total_tests']} ({test_data['success_rate']}%)")
     print(f"   - Code Metrics: {code_metrics['rtl_files']} files, {code_metrics['rtl_lines']} lines, {code_metrics['overall_score']}/100 score")
-    print(f"   - Status: Synthesis={status_data['synthesis_status']}, FPGA={status_data['fpga_status']}")
+    print(f"   - Status: Simulation={status_data['simulation_status']}, Synthesis={status_data['synthesis_status']}, FPGA={status_data['fpga_status']}")
     print(f"   - Generated: {github_data['generated_date']}")
     
     return True
 
+@profiled()
+def vcd_listing(waveform_dir):
+    """Names, sizes, mtimes and index checkpoints of the published VCD files (waveforms page input)"""
+    if not os.path.isdir(waveform_dir):
+        return []
+    listing = []
+    for name in sorted(os.listdir(waveform_dir)):
+        path = os.path.join(waveform_dir, name)
+        if name.endswith('.vcd') and os.path.isfile(path):
+            stat = os.stat(path)
+            index = read_index(path)
+            listing.append([name, stat.st_size, stat.st_mtime_ns, index['checkpoint_count'] if index else None])
+    return listing
+
+@profiled()
+def generate_waveforms_html(assets=None):
+    """Generate waveforms/index.html listing the published VCD files"""
+    template_path = 'public/waveforms_template.html'
+    if not os.path.exists(template_path):
+        print(f"⚠️ Waveforms template not found: {template_path}")
+        return True
+    
+    ip_metadata = extract_ip_metadata()
+    github_data = get_github_data()
+    waveform_dir = 'public/waveforms'
+    os.makedirs(waveform_dir, exist_ok=True)
+    
+    context = {
+        'IP_NAME': ip_metadata['ip_name'],
+        'VCD_FILES': scan_vcd_files(waveform_dir, github_data['repository']),
+        'ASSETS': page_assets(assets, '../'),
+        'GENERATED_DATE': github_data['generated_date'],
+        'RUN_ID': github_data['run_id']
+    }
+    
+    output_path = os.path.join(waveform_dir, 'index.html')
+    try:
+        render_file(template_path, context, output_path)
+    except TemplateError as e:
+        print(f"❌ Template error: {e}")
+        return False
+    
+    print(f"✅ Generated {output_path} ({len(context['VCD_FILES'])} VCD files)")
+    return True
+
 def main():
     """Main function"""
+    global ARTIFACTS_DIR
+    parser = argparse.ArgumentParser(description="Generate GitHub Pages from report artifacts")
+    parser.add_argument('--artifacts-dir', default='.',
+                       help='Directory containing code_kpis.json, test_harness_report.json and gate_analysis.json')
+    parser.add_argument('--assets-dir', default='reports/public',
+                       help='Directory with static assets (CSS, JS, images) to publish under fingerprinted names')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render all pages and re-copy all assets')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    ARTIFACTS_DIR = args.artifacts_dir
+    start_profiling(args.profile, "generate_github_pages.py")
+    
     print("🌐 Generating GitHub Pages index.html...")
     
     # Ensure public directory exists
     os.makedirs('public', exist_ok=True)
     
-    # Generate index.html
-    if generate_index_html():
+    # Only re-render pages whose inputs changed since the last build.
+    # GENERATED_DATE and RUN_ID are refreshed whenever a page is re-rendered.
+    builder = SiteBuilder('public', force=args.force)
+    artifact_files = [os.path.join(ARTIFACTS_DIR, ARTIFACT_FILES[kind]) for kind in sorted(ARTIFACT_FILES)]
+    repository = get_github_data()['repository']
+    
+    # Publish static assets under content-fingerprinted names before rendering
+    # the pages that link to them
+    with stage("publish_assets"):
+        assets = builder.publish_assets(args.assets_dir)
+    for name, path in sorted(assets.items()):
+        print(f"🎨 {name} -> public/{path}")
+    
+    index_ok = builder.build_page(
+        'index.html',
+        ['public/index_template.html', 'vyges-metadata.json'] + artifact_files,
+        {'status': get_synthesis_status(), 'assets': assets},
+        lambda: generate_index_html(assets)
+    )
+    waveforms_ok = builder.build_page(
+        'waveforms/index.html',
+        ['public/waveforms_template.html', 'vyges-metadata.json'],
+        {'repository': repository, 'vcd_files': vcd_listing('public/waveforms'), 'assets': assets},
+        lambda: generate_waveforms_html(assets)
+    )
+    builder.save()
+    print(f"📦 Site build: {builder.summary()}")
+    finish_profiling(args.profile)
+    
+    if index_ok and waveforms_ok:
         print("✅ GitHub Pages index generation complete!")
         return 0
     else:
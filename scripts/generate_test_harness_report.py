@@ -19,9 +19,24 @@ import sys
 import json
 import datetime
 import glob
+import argparse
 import subprocess
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from report_artifacts import write_artifact, load_artifact, ArtifactError
+from git_info import git_summary
+from profiler import profiled, add_profile_argument, start_profiling, finish_profiling
+from sim_log_parser import analyze_simulations
+from vcd_compare import COMPARE_REPORT_DIR
+from timing_scheduler import timing_summary, format_ratio
+from impact_analysis import load_selection, SELECTION_FILE
+
+# Per-testbench fields copied from the parsed simulation logs into the artifact
+TESTBENCH_RESULT_FIELDS = ["testbench", "simulator", "log", "status", "passed", "failed", "assertion_failures",
+                           "errors", "finish_time_ns", "wall_time_s", "simulated_cycles", "cycles_per_second",
+                           "messages"]
+
 # Enhanced template for Vyges IP projects (Template Version)
 REPORT_TEMPLATE = """
 # Vyges IP Project - Test Harness Report (Template)
@@ -69,6 +84,21 @@ REPORT_TEMPLATE = """
 ### Cocotb Simulation
 {cocotb_results}
 
+### Testbench Results
+{testbench_results}
+
+### Simulation Speed
+{simulation_speed}
+
+### Test Durations
+{test_durations}
+
+### Test Selection
+{test_selection}
+
+### Waveform Comparison
+{waveform_comparisons}
+
 ### Overall Test Summary
 - **Total Test Cases**: {total_tests}
 - **Passed**: {pass_count}
@@ -110,15 +140,15 @@ REPORT_TEMPLATE = """
 ---
 """
 
+@profiled()
 def get_git_info():
     """Get git commit and branch information"""
-    try:
-        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
-        branch = subprocess.check_output(['git', 'rev-parse', '--abbrev-ref', 'HEAD'], text=True).strip()
-        return commit, branch
-    except:
+    git = git_summary(Path("."))
+    if git is None:
         return "unknown", "unknown"
+    return git["short_commit"] or "unknown", git["branch"] or "unknown"
 
+@profiled()
 def scan_simulation_results():
     """Scan for simulation results from Icarus and Verilator"""
     icarus_results = []
@@ -168,6 +198,7 @@ def scan_simulation_results():
     
     return icarus_results, verilator_results, cocotb_results
 
+@profiled()
 def scan_synthesis_results():
     """Scan for synthesis results"""
     asic_results = []
@@ -190,6 +221,7 @@ def scan_synthesis_results():
     
     return asic_results, fpga_results
 
+@profiled()
 def scan_testbenches():
     """Scan for testbench files"""
     sv_testbenches = []
@@ -215,81 +247,90 @@ def scan_testbenches():
     
     return sv_testbenches, uvm_testbenches, cocotb_testbenches
 
+@profiled()
 def get_implementation_summary():
-    """Get summary of IP implementations"""
+    """Get the IP implementation files"""
     implementations = []
     
     if os.path.exists("rtl"):
         for file in glob.glob("rtl/*.sv"):
-            implementations.append(f"- **{os.path.basename(file)}**: IP module")
+            implementations.append(os.path.basename(file))
         for file in glob.glob("rtl/*.v"):
-            implementations.append(f"- **{os.path.basename(file)}**: IP module")
+            implementations.append(os.path.basename(file))
     
-    return "\n".join(implementations) if implementations else "- No RTL files found"
+    return implementations
 
-def parse_test_results():
-    """Parse actual test results from simulation logs"""
+@profiled()
+def parse_test_results(analysis):
+    """Count test results from the parsed simulation logs and cocotb results"""
     total_tests = 0
     pass_count = 0
     fail_count = 0
     
-    # Count SystemVerilog testbenches and their test categories
-    if os.path.exists("tb/sv_tb"):
-        sv_testbenches = glob.glob("tb/sv_tb/tb_*.sv") + glob.glob("tb/sv_tb/tb_*.v")
-        for file in sv_testbenches:
-            try:
-                with open(file, 'r') as f:
-                    content = f.read()
-                    # Count test categories based on our enhanced testbench
-                    test_categories = [
-                        "Basic functionality",
-                        "Interface testing", 
-                        "Edge cases",
-                        "Error conditions",
-                        "Performance testing",
-                        "Coverage testing",
-                        "Integration testing"
-                    ]
-                    total_tests += len(test_categories)
-                    # Assume all passed if testbench exists and has comprehensive tests
-                    if "test_basic" in content and "test_random" in content:
-                        pass_count += len(test_categories)
-                    else:
-                        pass_count += 1  # At least basic test
-            except:
+    # SystemVerilog testbenches: every PASS/FAIL check counts; a run without checks counts once
+    for run in analysis["runs"]:
+        if run["passed"] or run["failed"]:
+            total_tests += run["passed"] + run["failed"]
+            pass_count += run["passed"]
+            fail_count += run["failed"]
+            if run["status"] == "failed" and not run["failed"]:
+                # Assertion failures, errors or a timeout despite passing checks
                 total_tests += 1
+                fail_count += 1
+        elif run["status"] != "incomplete":
+            total_tests += 1
+            if run["status"] == "passed":
                 pass_count += 1
+            else:
+                fail_count += 1
     
-    # Count Cocotb test files and their test functions
-    if os.path.exists("tb/cocotb"):
-        cocotb_files = glob.glob("tb/cocotb/test_*.py")
-        for file in cocotb_files:
-            try:
-                with open(file, 'r') as f:
-                    content = f.read()
-                    # Count @cocotb.test() decorators
-                    import re
-                    test_functions = re.findall(r'@cocotb\.test\(\)', content)
-                    total_tests += len(test_functions)
-                    pass_count += len(test_functions)  # Assume all passed if files exist
-            except:
-                pass
-    
-    # If no tests found, provide default counts based on known structure
-    if total_tests == 0:
-        # Based on our enhanced testbench: 7 test categories
-        total_tests = 7
-        pass_count = 7
-        fail_count = 0
+    # cocotb tests from results.xml (skipped tests are not counted)
+    for test in analysis["cocotb_tests"]:
+        if test["status"] == "skipped":
+            continue
+        total_tests += 1
+        if test["status"] == "passed":
+            pass_count += 1
+        else:
+            fail_count += 1
     
     return total_tests, pass_count, fail_count
 
-def generate_report(output_file="test_harness_report.md"):
+def collect_waveform_comparisons():
+    """Summaries of the golden-vs-current VCD comparisons written by vcd_compare.py"""
+    comparisons = []
+    for path in sorted(glob.glob(os.path.join(COMPARE_REPORT_DIR, "*.json"))):
+        try:
+            data = load_artifact(Path(path), "waveform_compare")
+        except ArtifactError as e:
+            print(f"⚠️  Skipping waveform comparison {e}")
+            continue
+        comparisons.append({
+            "report": path,
+            "golden": data["golden"],
+            "current": data["current"],
+            "status": data["status"],
+            "compared_signals": data["compared_signals"],
+            "divergence_count": data["divergence_count"],
+            "first_divergence": data["divergences"][0] if data["divergences"] else None
+        })
+    return comparisons
+
+def summarize_cocotb(tests):
+    """Aggregate cocotb test results"""
+    return {
+        "tests": len(tests),
+        "passed": sum(1 for t in tests if t["status"] == "passed"),
+        "failed": sum(1 for t in tests if t["status"] == "failed"),
+        "skipped": sum(1 for t in tests if t["status"] == "skipped"),
+        "wall_time_s": round(sum(t["wall_time_s"] for t in tests), 3)
+    }
+
+@profiled()
+def collect_test_results():
+    """Collect all test harness data into the test_results artifact structure"""
     # Load metadata
     metadata = load_metadata("vyges-metadata.json")
-    ip_name = metadata.get("name", "Vyges IP Project")
-    version = metadata.get("version", "1.0")
-    author = metadata.get("author", "Vyges Team")
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
     
     # Get system information
@@ -306,52 +347,211 @@ def generate_report(output_file="test_harness_report.md"):
     sv_testbenches, uvm_testbenches, cocotb_testbenches = scan_testbenches()
     implementations = get_implementation_summary()
     
-    # Parse actual test results
-    total_tests, pass_count, fail_count = parse_test_results()
+    # Parse actual test results from the simulation logs
+    analysis = analyze_simulations(Path("."))
+    total_tests, pass_count, fail_count = parse_test_results(analysis)
     success_rate = (pass_count / total_tests * 100) if total_tests > 0 else 0
     
-    # Format results
-    icarus_text = "\n".join([f"- {result}" for result in icarus_results]) if icarus_results else "- No Icarus results found"
-    verilator_text = "\n".join([f"- {result}" for result in verilator_results]) if verilator_results else "- No Verilator results found"
-    cocotb_text = "\n".join([f"- {result}" for result in cocotb_results]) if cocotb_results else "- No cocotb results found"
-    asic_text = "\n".join([f"- {result}" for result in asic_results]) if asic_results else "- No ASIC synthesis results found"
-    fpga_text = "\n".join([f"- {result}" for result in fpga_results]) if fpga_results else "- No FPGA synthesis results found"
-    
-    sv_text = ", ".join([os.path.basename(f) for f in sv_testbenches]) if sv_testbenches else "None found"
-    uvm_text = ", ".join([os.path.basename(f) for f in uvm_testbenches]) if uvm_testbenches else "None found"
-    cocotb_text = ", ".join([os.path.basename(f) for f in cocotb_testbenches]) if cocotb_testbenches else "None found"
+    return {
+        "ip_name": str(metadata.get("name", "Vyges IP Project")),
+        "version": str(metadata.get("version", "1.0")),
+        "author": str(metadata.get("author", "Vyges Team")),
+        "timestamp": timestamp,
+        "environment": {
+            "platform": platform,
+            "python_version": python_version,
+            "git_commit": git_commit,
+            "git_branch": git_branch
+        },
+        "implementations": implementations,
+        "testbenches": {
+            "systemverilog": sv_testbenches,
+            "uvm": uvm_testbenches,
+            "cocotb": cocotb_testbenches
+        },
+        "simulation": {
+            "icarus": icarus_results,
+            "verilator": verilator_results,
+            "cocotb": cocotb_results
+        },
+        "synthesis": {
+            "asic": asic_results,
+            "fpga": fpga_results
+        },
+        "testbench_results": [
+            {key: run[key] for key in TESTBENCH_RESULT_FIELDS} for run in analysis["runs"]
+        ],
+        "cocotb_results": summarize_cocotb(analysis["cocotb_tests"]),
+        "simulation_speed": analysis["speed"],
+        "test_timings": timing_summary(analysis),
+        "test_selection": load_selection(),
+        "waveform_comparisons": collect_waveform_comparisons(),
+        "summary": {
+            "total_tests": total_tests,
+            "passed": pass_count,
+            "failed": fail_count,
+            "success_rate": success_rate
+        },
+        "linting": ["Verilator linting completed with warning suppression"],
+        "validation": ["Project structure validated with enhanced testbench"],
+        "known_issues": ["No known issues detected"],
+        "notes": "Auto-generated comprehensive test report for Vyges IP project. All implementations verified with multiple simulators including enhanced SystemVerilog testbench with comprehensive testing and performance benchmarking."
+    }
+
+def format_items(items, empty_text):
+    """Format a list of strings as Markdown bullet points"""
+    return "\n".join([f"- {item}" for item in items]) if items else f"- {empty_text}"
+
+def format_names(files):
+    """Format a list of file paths as a comma-separated list of base names"""
+    return ", ".join([os.path.basename(f) for f in files]) if files else "None found"
+
+def format_testbench_results(runs, cocotb):
+    """Format per-testbench results as a Markdown table"""
+    if not runs and not cocotb.get("tests"):
+        return "- No simulation logs found"
+    lines = ["| Testbench | Simulator | Status | Passed | Failed | Assertions | $finish | Wall Time | Cycles/s |",
+             "|-----------|-----------|--------|--------|--------|------------|---------|-----------|----------|"]
+    icons = {"passed": "✅ Passed", "failed": "❌ Failed", "incomplete": "⚠️ Incomplete"}
+    for run in runs:
+        finish = f"{run['finish_time_ns']:,.1f} ns" if run["finish_time_ns"] is not None else "-"
+        wall = f"{run['wall_time_s']:.3f} s" if run["wall_time_s"] is not None else "-"
+        speed = f"{run['cycles_per_second']:,.0f}" if run["cycles_per_second"] else "-"
+        lines.append(f"| {run['testbench']} | {run['simulator']} | {icons.get(run['status'], run['status'])} | "
+                     f"{run['passed']} | {run['failed']} | {run['assertion_failures']} | {finish} | {wall} | {speed} |")
+    if cocotb.get("tests"):
+        status = icons["failed"] if cocotb["failed"] else icons["passed"]
+        lines.append(f"| cocotb ({cocotb['tests']} tests) | cocotb | {status} | {cocotb['passed']} | "
+                     f"{cocotb['failed']} | - | - | {cocotb['wall_time_s']:.3f} s | - |")
+    messages = [f"- `{run['testbench']}` ({run['simulator']}): {message}"
+                for run in runs for message in run["messages"][:3]]
+    if messages:
+        lines += [""] + messages
+    return "\n".join(lines)
+
+def format_simulation_speed(speed):
+    """Format simulated cycles per second per simulator"""
+    items = []
+    for simulator, totals in speed.items():
+        if totals["cycles_per_second"]:
+            items.append(f"**{simulator}**: {totals['cycles_per_second']:,.0f} cycles/s "
+                         f"({totals['simulated_cycles']:,} cycles in {totals['wall_time_s']:.3f} s, "
+                         f"{totals['timed_runs']} timed run(s))")
+        else:
+            items.append(f"**{simulator}**: no wall-clock timing recorded ({totals['runs']} run(s))")
+    return format_items(items, "No simulation runs found")
+
+def format_test_durations(timings):
+    """Format the recorded test durations and the timing outliers"""
+    if not timings or not timings["tests_with_history"]:
+        return "- No test durations recorded yet"
+    items = [f"**History**: {timings['tests_with_history']} test(s) in `{timings['database']}`, "
+             f"{timings['recorded_runs']} run(s) recorded now, estimated serial time "
+             f"{timings['estimated_total_s']:,.1f} s"]
+    items += [f"**Slowest**: " + ", ".join(f"`{t['test']}` ({t['estimate_s']:,.1f} s)" for t in timings["slowest"])]
+    if not timings["outliers"]:
+        items.append("✅ No timing outliers")
+        return format_items(items, "")
+    lines = [format_items(items, ""), "",
+             "| Slowed-down Test | Latest | Median | Ratio | Previous Runs |",
+             "|------------------|--------|--------|-------|---------------|"]
+    for outlier in timings["outliers"]:
+        lines.append(f"| 🐢 `{outlier['test']}` | {outlier['latest_s']:,.3f} s | {outlier['baseline_s']:,.3f} s | "
+                     f"{format_ratio(outlier)} | {outlier['samples']} |")
+    return "\n".join(lines)
+
+def format_test_selection(selection):
+    """Format which tests the impact analysis selected and why"""
+    if not selection:
+        return f"- No test selection recorded; every test ran (run `scripts/impact_analysis.py select` to write {SELECTION_FILE})"
+    since = f" since `{selection['base']}`" if selection["base"] else ""
+    items = [f"**Mode**: {selection['mode']}, {len(selection['tests'])} of {selection['total_tests']} tests "
+             f"for {len(selection['changed_files'])} changed file(s){since}"]
+    if selection["stale"]:
+        commit = (selection["commit"] or "unknown")[:7]
+        items.append(f"⚠️ **Stale**: selected at `{commit}` on {selection['created_at']}; HEAD has moved since, "
+                     f"so this is not the selection for the reported commit")
+    items += [f"⚠️ Run all: {reason}" for reason in selection["fallback"]]
+    if selection["mode"] == "selected":
+        items += [f"`{test}`: " + "; ".join(selection["reasons"][test]) for test in selection["tests"]]
+    if selection["ignored"]:
+        items.append("Ignored (documentation): " + ", ".join(f"`{path}`" for path in selection["ignored"]))
+    if selection["unused"]:
+        items.append("Not used by any test: " + ", ".join(f"`{path}`" for path in selection["unused"]))
+    return format_items(items, "")
+
+def format_waveform_comparisons(comparisons, report_dir):
+    """Format the VCD comparisons as a Markdown table linking each comparison report"""
+    if not comparisons:
+        return f"- No waveform comparisons found (run `scripts/vcd_compare.py --artifact {COMPARE_REPORT_DIR}/NAME.json`)"
+    lines = ["| Current VCD | Golden VCD | Status | Signals | Divergences | First Divergence | Report |",
+             "|-------------|------------|--------|---------|-------------|------------------|--------|"]
+    for comparison in comparisons:
+        status = "✅ Match" if comparison["status"] == "match" else "❌ Diverged"
+        first = comparison["first_divergence"]
+        first_text = f"`{first['signal']}` @ {first['time_ns']:,} ns" if first else "-"
+        link = os.path.relpath(comparison["report"], report_dir)
+        lines.append(f"| `{comparison['current']}` | `{comparison['golden']}` | {status} | "
+                     f"{comparison['compared_signals']} | {comparison['divergence_count']} | {first_text} | "
+                     f"[{Path(comparison['report']).name}]({link}) |")
+    return "\n".join(lines)
+
+@profiled()
+def render_markdown(results, report_dir="."):
+    """Render the test harness Markdown report from the test_results data"""
+    environment = results["environment"]
+    testbenches = results["testbenches"]
+    simulation = results["simulation"]
+    synthesis = results["synthesis"]
+    summary = results["summary"]
+    implementations = [f"**{name}**: IP module" for name in results["implementations"]]
     
-    report = REPORT_TEMPLATE.format(
-        ip_name=ip_name,
-        version=version,
-        timestamp=timestamp,
-        author=author,
-        platform=platform,
-        python_version=python_version,
-        git_commit=git_commit,
-        git_branch=git_branch,
-        implementations=implementations,
-        sv_testbenches=sv_text,
-        uvm_testbenches=uvm_text,
-        cocotb_testbenches=cocotb_text,
-        icarus_results=icarus_text,
-        verilator_results=verilator_text,
-        cocotb_results=cocotb_text,
-        total_tests=total_tests,
-        pass_count=pass_count,
-        fail_count=fail_count,
-        success_rate=success_rate,
-        asic_results=asic_text,
-        fpga_results=fpga_text,
-        linting_results="- Verilator linting completed with warning suppression",
-        validation_results="- Project structure validated with enhanced testbench",
-        known_issues="- No known issues detected",
-        notes="Auto-generated comprehensive test report for Vyges IP project. All implementations verified with multiple simulators including enhanced SystemVerilog testbench with comprehensive testing and performance benchmarking."
+    return REPORT_TEMPLATE.format(
+        ip_name=results["ip_name"],
+        version=results["version"],
+        timestamp=results["timestamp"],
+        author=results["author"],
+        platform=environment["platform"],
+        python_version=environment["python_version"],
+        git_commit=environment["git_commit"],
+        git_branch=environment["git_branch"],
+        implementations=format_items(implementations, "No RTL files found"),
+        sv_testbenches=format_names(testbenches["systemverilog"]),
+        uvm_testbenches=format_names(testbenches["uvm"]),
+        cocotb_testbenches=format_names(testbenches["cocotb"]),
+        icarus_results=format_items(simulation["icarus"], "No Icarus results found"),
+        verilator_results=format_items(simulation["verilator"], "No Verilator results found"),
+        cocotb_results=format_items(simulation["cocotb"], "No cocotb results found"),
+        testbench_results=format_testbench_results(results.get("testbench_results", []),
+                                                   results.get("cocotb_results", {})),
+        simulation_speed=format_simulation_speed(results.get("simulation_speed", {})),
+        test_durations=format_test_durations(results.get("test_timings")),
+        test_selection=format_test_selection(results.get("test_selection")),
+        waveform_comparisons=format_waveform_comparisons(results.get("waveform_comparisons", []), report_dir),
+        total_tests=summary["total_tests"],
+        pass_count=summary["passed"],
+        fail_count=summary["failed"],
+        success_rate=summary["success_rate"],
+        asic_results=format_items(synthesis["asic"], "No ASIC synthesis results found"),
+        fpga_results=format_items(synthesis["fpga"], "No FPGA synthesis results found"),
+        linting_results=format_items(results.get("linting", []), "No linting results found"),
+        validation_results=format_items(results.get("validation", []), "No validation results found"),
+        known_issues=format_items(results.get("known_issues", []), "No known issues detected"),
+        notes=results.get("notes", "")
     )
 
+def generate_report(output_file="test_harness_report.md", artifact_file=None):
+    """Write the test_results JSON artifact and the Markdown report rendered from it"""
+    results = collect_test_results()
+    
+    if artifact_file is None:
+        artifact_file = str(Path(output_file).with_suffix(".json"))
+    write_artifact(artifact_file, "test_results", results, "generate_test_harness_report.py")
+    
     with open(output_file, 'w') as f:
-        f.write(report)
+        f.write(render_markdown(results, os.path.dirname(output_file) or "."))
     print(f"[✓] Vyges Test Harness Report written to: {output_file}")
+    print(f"[✓] Test results artifact written to: {artifact_file}")
     print(f"[✓] Generated by Vyges Test Harness Report Generator v1.0")
 
 def load_metadata(meta_file):
@@ -360,5 +560,16 @@ def load_metadata(meta_file):
     with open(meta_file, 'r') as f:
         return json.load(f)
 
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Generate the Vyges test harness report")
+    parser.add_argument("output", nargs="?", default="test_harness_report.md",
+                        help="Markdown report path (the JSON artifact is written next to it)")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profiling(args.profile, "generate_test_harness_report.py")
+    generate_report(args.output)
+    finish_profiling(args.profile)
+
 if __name__ == "__main__":
-    generate_report() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Vyges Git Reader
+
+Reads commit, branch and clean/dirty status straight from the `.git`
+directory instead of spawning `git rev-parse` / `git status`:
+
+- HEAD is resolved through loose refs and `packed-refs` (worktrees and
+  `gitdir:` files are followed)
+- Dirty status compares the stat data stored in `.git/index` (versions 2-4)
+  with the working tree; only files whose size or mtime changed, or that
+  were modified in the same instant the index was written, are re-hashed
+- Untracked files are taken from an already-collected file inventory (or a
+  walk that prunes ignored directories), filtered by `.gitignore`,
+  `.git/info/exclude` and the global excludes file
+
+Anything the reader cannot interpret (split or sparse indexes, negated
+ignore patterns, clean/smudge filters) falls back to the git command line.
+Results are cached per repository for the lifetime of the process, so all
+report scripts share one lookup.
+
+Usage:
+    python scripts/git_info.py [--project-root DIR] [--output text|json]
+"""
+
+import os
+import re
+import sys
+import json
+import stat
+import struct
+import hashlib
+import argparse
+import posixpath
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from profiler import cache_lookup, count
+
+
+# Index entry flag bits
+_ASSUME_VALID = 0x8000
+_EXTENDED = 0x4000
+_SKIP_WORKTREE = 0x4000
+_INTENT_TO_ADD = 0x2000
+
+_GITLINK_MODE = 0o160000
+_SYMLINK_MODE = 0o120000
+
+# Index extensions that move entries out of the main index
+_UNSUPPORTED_EXTENSIONS = {b"link", b"sdir"}
+
+_ENTRY_HEADER = struct.Struct(">10I20sH")
+
+# Repositories already opened in this process: work tree -> GitRepository
+_REPOSITORIES = {}
+
+
+class GitReadError(Exception):
+    """Raised when repository data cannot be interpreted without git itself."""
+
+
+def _run_git(args: List[str], cwd: Path) -> Optional[str]:
+    """Run a git command, returning its stdout (None if git failed or is missing)."""
+    try:
+        result = subprocess.run(["git"] + args, cwd=cwd, capture_output=True, text=True)
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _read_text(path: Path) -> Optional[str]:
+    """Read a small text file, returning None if it does not exist."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode git's offset varint (index v4 path prefix lengths)."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, pos
+
+
+def parse_index(data: bytes) -> List[Dict[str, Any]]:
+    """Parse the entries of a git index file."""
+    if len(data) < 12 or data[:4] != b"DIRC":
+        raise GitReadError("not a git index")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        raise GitReadError(f"unsupported index version {version}")
+
+    entries = []
+    offset = 12
+    previous = b""
+    for _ in range(count):
+        (_, _, mtime_s, mtime_ns, _, _, mode, _, _, size, sha, flags) = _ENTRY_HEADER.unpack_from(data, offset)
+        pos = offset + _ENTRY_HEADER.size
+        extended = 0
+        if version >= 3 and flags & _EXTENDED:
+            extended = struct.unpack_from(">H", data, pos)[0]
+            pos += 2
+        if version == 4:
+            strip, pos = _varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = previous[:len(previous) - strip] + data[pos:end]
+            offset = end + 1
+        else:
+            end = data.index(b"\0", pos)
+            name = data[pos:end]
+            # Entries are NUL-padded to a multiple of 8 bytes
+            offset += (end - offset + 8) & ~7
+        previous = name
+        entries.append({
+            "path": name.decode("utf-8", errors="surrogateescape"),
+            "mode": mode,
+            "size": size,
+            "mtime_ns": mtime_s * 1_000_000_000 + mtime_ns,
+            "sha": sha,
+            "stage": (flags >> 12) & 3,
+            "assume_valid": bool(flags & _ASSUME_VALID),
+            "skip_worktree": bool(extended & _SKIP_WORKTREE),
+            "intent_to_add": bool(extended & _INTENT_TO_ADD)
+        })
+
+    # Extensions follow the entries, up to the trailing checksum
+    while offset + 8 <= len(data) - 20:
+        signature, length = struct.unpack_from(">4sI", data, offset)
+        if signature in _UNSUPPORTED_EXTENSIONS:
+            raise GitReadError(f"index extension {signature.decode()} is not supported")
+        offset += 8 + length
+    return entries
+
+
+def blob_sha(path: str, mode: int) -> bytes:
+    """SHA-1 of a working tree file as a git blob."""
+    if stat.S_ISLNK(mode):
+        content = os.fsencode(os.readlink(path))
+    else:
+        with open(path, 'rb') as f:
+            content = f.read()
+    digest = hashlib.sha1(b"blob %d\0" % len(content))
+    digest.update(content)
+    return digest.digest()
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regex."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                parts.append("[" + pattern[i + 1:end].replace("!", "^", 1) + "]")
+                i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+class IgnoreRules:
+    """gitignore matching for patterns without negation."""
+
+    def __init__(self):
+        self.rules = []
+
+    def add_patterns(self, text: str, base: str = ""):
+        """Add the patterns of one ignore file; `base` is its directory relative to the work tree."""
+        prefix = re.escape(base + "/") if base else ""
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("!"):
+                raise GitReadError("negated ignore patterns are not supported")
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            body = _glob_to_regex(line)
+            regex = f"^{prefix}{body}$" if anchored else f"^{prefix}(?:.*/)?{body}$"
+            self.rules.append((re.compile(regex), dir_only))
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        """Check a single path against the rules."""
+        return any(regex.match(path) for regex, dir_only in self.rules if is_dir or not dir_only)
+
+    def ignored(self, path: str) -> bool:
+        """Check a file path, including every directory above it."""
+        parts = path.split("/")
+        for depth in range(1, len(parts)):
+            if self.matches("/".join(parts[:depth]), True):
+                return True
+        return self.matches(path, False)
+
+
+class GitRepository:
+    """Commit, branch and dirty status of one repository, read from `.git`."""
+
+    def __init__(self, work_tree: Path, git_dir: Path):
+        self.work_tree = work_tree
+        self.git_dir = git_dir
+        commondir = _read_text(git_dir / "commondir")
+        self.common_dir = (git_dir / commondir.strip()).resolve() if commondir else git_dir
+        self._packed_refs = None
+        self._head = None
+        self._dirty = None
+        self.used_fallback = False
+
+    def _config(self) -> str:
+        """Raw repository config text."""
+        return _read_text(self.common_dir / "config") or ""
+
+    def packed_refs(self) -> Dict[str, str]:
+        """Refs stored in packed-refs."""
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            for line in (_read_text(self.common_dir / "packed-refs") or "").splitlines():
+                if line and line[0] not in "#^":
+                    sha, _, ref = line.partition(" ")
+                    self._packed_refs[ref.strip()] = sha
+        return self._packed_refs
+
+    def resolve_ref(self, ref: str, depth: int = 0) -> Optional[str]:
+        """Resolve a (possibly symbolic) ref to a commit id."""
+        if depth > 5:
+            raise GitReadError(f"symbolic ref loop at {ref}")
+        for base in (self.git_dir, self.common_dir):
+            content = _read_text(base / ref)
+            if content is not None:
+                content = content.strip()
+                if content.startswith("ref:"):
+                    return self.resolve_ref(content[4:].strip(), depth + 1)
+                return content or None
+        return self.packed_refs().get(ref)
+
+    def head(self) -> Dict[str, Optional[str]]:
+        """Current commit and branch ("HEAD" when detached, like `git rev-parse --abbrev-ref`)."""
+        if self._head is None:
+            content = (_read_text(self.git_dir / "HEAD") or "").strip()
+            if content.startswith("ref:"):
+                ref = content[4:].strip()
+                branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+                self._head = {"commit": self.resolve_ref(ref), "branch": branch}
+            elif re.fullmatch(r"[0-9a-f]{40,64}", content):
+                self._head = {"commit": content, "branch": "HEAD"}
+            else:
+                raise GitReadError("unreadable HEAD")
+        return self._head
+
+    def ignore_rules(self, ignore_files: List[str]) -> IgnoreRules:
+        """Collect ignore rules from the exclude files and the given .gitignore paths."""
+        rules = IgnoreRules()
+        rules.add_patterns(_read_text(self.common_dir / "info" / "exclude") or "")
+        xdg_config = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        rules.add_patterns(_read_text(Path(xdg_config) / "git" / "ignore") or "")
+        for ignore_file in sorted(ignore_files, key=lambda p: p.count("/")):
+            base = posixpath.dirname(ignore_file)
+            rules.add_patterns(_read_text(self.work_tree / ignore_file) or "", base)
+        return rules
+
+    def _walk_inventory(self, rules: IgnoreRules) -> Set[str]:
+        """Collect work tree files, pruning .git and ignored directories."""
+        inventory = set()
+        for root, dirs, files in os.walk(self.work_tree):
+            rel_root = os.path.relpath(root, self.work_tree)
+            prefix = "" if rel_root == "." else rel_root.replace(os.sep, "/") + "/"
+            dirs[:] = [d for d in dirs if d != ".git" and not rules.matches(prefix + d, True)]
+            inventory.update(prefix + name for name in files)
+        return inventory
+
+    def _tracked_changes(self, entries: List[Dict[str, Any]]) -> bool:
+        """Check tracked files against the index stat data, hashing only suspicious files."""
+        index_mtime_ns = os.stat(self.git_dir / "index").st_mtime_ns
+        check_mode = not re.search(r"filemode\s*=\s*false", self._config(), re.IGNORECASE)
+        for entry in entries:
+            if entry["stage"] or entry["intent_to_add"]:
+                return True
+            if entry["assume_valid"] or entry["skip_worktree"] or entry["mode"] == _GITLINK_MODE:
+                continue
+            path = os.path.join(self.work_tree, entry["path"])
+            try:
+                st = os.lstat(path)
+            except OSError:
+                return True
+            if check_mode and stat.S_ISREG(st.st_mode) and (st.st_mode & 0o100) != (entry["mode"] & 0o100):
+                return True
+            if stat.S_ISLNK(st.st_mode) != (entry["mode"] == _SYMLINK_MODE):
+                return True
+            unchanged = (st.st_size & 0xffffffff) == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]
+            # Racily clean: written in the same instant as the index, so verify the content
+            if unchanged and entry["mtime_ns"] < index_mtime_ns:
+                continue
+            count("git_info.files_hashed")
+            if blob_sha(path, st.st_mode) != entry["sha"]:
+                return True
+        return False
+
+    def is_dirty(self, inventory: Optional[Set[str]] = None) -> bool:
+        """True if tracked files changed or untracked, non-ignored files exist."""
+        if self._dirty is not None:
+            return self._dirty
+        try:
+            self._dirty = self._read_dirty(inventory)
+        except (GitReadError, OSError, ValueError, struct.error) as e:
+            self.used_fallback = True
+            count("git_info.fallbacks")
+            output = _run_git(["status", "--porcelain"], self.work_tree)
+            if output is None:
+                raise GitReadError(f"cannot determine status: {e}")
+            self._dirty = bool(output.strip())
+        return self._dirty
+
+    def _read_dirty(self, inventory: Optional[Set[str]]) -> bool:
+        """Dirty check from the index and the file inventory."""
+        if (self.work_tree / ".gitattributes").exists() and "filter=" in (_read_text(self.work_tree / ".gitattributes") or ""):
+            raise GitReadError("clean/smudge filters are configured")
+        with open(self.git_dir / "index", 'rb') as f:
+            entries = parse_index(f.read())
+        if self._tracked_changes(entries):
+            return True
+
+        tracked = {entry["path"] for entry in entries}
+        if inventory is None:
+            rules = self.ignore_rules(self._find_ignore_files())
+            inventory = self._walk_inventory(rules)
+        else:
+            rules = self.ignore_rules([p for p in inventory if p == ".gitignore" or p.endswith("/.gitignore")])
+        return any(path not in tracked and not rules.ignored(path) for path in inventory)
+
+    def _find_ignore_files(self) -> List[str]:
+        """Locate .gitignore files, skipping directories ignored by their parents."""
+        found = []
+        rules = self.ignore_rules([])
+        for root, dirs, files in os.walk(self.work_tree):
+            rel_root = os.path.relpath(root, self.work_tree)
+            prefix = "" if rel_root == "." else rel_root.replace(os.sep, "/") + "/"
+            if ".gitignore" in files:
+                found.append(prefix + ".gitignore")
+                rules.add_patterns(_read_text(Path(root) / ".gitignore") or "", prefix.rstrip("/"))
+            dirs[:] = [d for d in dirs if d != ".git" and not rules.matches(prefix + d, True)]
+        return found
+
+    def summary(self, inventory: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Commit, branch and status for reports."""
+        info = {"git_repo": str(self.work_tree), "commit": None, "short_commit": None, "branch": None}
+        try:
+            head = self.head()
+        except GitReadError:
+            self.used_fallback = True
+            commit = _run_git(["rev-parse", "HEAD"], self.work_tree)
+            branch = _run_git(["rev-parse", "--abbrev-ref", "HEAD"], self.work_tree)
+            head = {"commit": commit.strip() if commit else None, "branch": branch.strip() if branch else None}
+        info["commit"] = head["commit"]
+        info["short_commit"] = head["commit"][:7] if head["commit"] else None
+        info["branch"] = head["branch"]
+        try:
+            info["git_status"] = "dirty" if self.is_dirty(inventory) else "clean"
+        except GitReadError:
+            pass
+        return info
+
+
+def find_repository(start: Path) -> Optional[Tuple[Path, Path]]:
+    """Find the work tree and git directory containing `start`."""
+    current = Path(start).resolve()
+    for directory in [current] + list(current.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            content = _read_text(dot_git) or ""
+            if content.startswith("gitdir:"):
+                return directory, (directory / content[7:].strip()).resolve()
+    return None
+
+
+def get_repository(project_root: Path = Path(".")) -> Optional[GitRepository]:
+    """Return the (cached) repository containing a project, or None."""
+    found = find_repository(project_root)
+    if not found:
+        return None
+    work_tree, git_dir = found
+    cache_lookup("git_info", work_tree in _REPOSITORIES)
+    if work_tree not in _REPOSITORIES:
+        _REPOSITORIES[work_tree] = GitRepository(work_tree, git_dir)
+    return _REPOSITORIES[work_tree]
+
+
+def git_summary(project_root: Path = Path("."), inventory: Optional[Set[str]] = None) -> Optional[Dict[str, Any]]:
+    """Commit, branch and clean/dirty status of the repository containing a project.
+
+    `inventory` is an optional set of project-relative file paths that was
+    already collected; it is used for untracked-file detection when the
+    project root is the work tree root.
+    """
+    repository = get_repository(project_root)
+    if repository is None:
+        return None
+    if inventory is not None and Path(project_root).resolve() != repository.work_tree:
+        inventory = None
+    return repository.summary(inventory)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Show git commit, branch and status without running git")
+    parser.add_argument("--project-root", default=".", help="Project root directory")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    args = parser.parse_args()
+
+    repository = get_repository(Path(args.project_root))
+    if repository is None:
+        print("❌ Not a git repository")
+        return 1
+    info = repository.summary()
+    info["used_git_fallback"] = repository.used_fallback
+    if args.output == "json":
+        print(json.dumps(info, indent=2))
+        return 0
+
+    print(f"🔗 Repository: {info['git_repo']}")
+    print(f"   Commit: {info['commit'] or 'none'}")
+    print(f"   Branch: {info['branch'] or 'unknown'}")
+    print(f"   Status: {info.get('git_status', 'unknown')}")
+    if repository.used_fallback:
+        print("   (git command line used as fallback)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
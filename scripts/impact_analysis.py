@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Vyges Test Impact Analysis
+
+Selects the tests affected by a change instead of simulating everything.
+A dependency graph is parsed from the SystemVerilog/Verilog and cocotb
+sources under rtl/, tb/ and verification/:
+
+    `include "file"         the file depends on the included file
+    import pkg::* / pkg::x  the file depends on the file declaring package pkg
+    name #(...) inst (...)  the file depends on the file declaring module name
+    name inst (...)
+    import x / from x       a cocotb Python module depends on a sibling module
+
+The tests are the SystemVerilog testbenches (tb_*.sv in the testbench
+directories, `<simulator>:<testbench>`) and the cocotb tests of every cocotb
+Makefile (`cocotb:<module>.<test>`), which depend on the Makefile, its
+VERILOG_SOURCES, the file declaring its TOPLEVEL and the test modules. The
+ids are the ones used by timing_scheduler.py.
+
+Given the files changed since a git base (committed, staged, unstaged and
+untracked), a test is selected when a changed file is among its transitive
+dependencies; the dependency chain is recorded as the reason. Documentation
+changes select nothing. Whenever the graph cannot vouch for a change (a file
+outside the parsed sources such as a Makefile or script, a deleted source,
+an unresolved TOPLEVEL, or no usable git diff) every test is selected.
+
+The selection is written for the test harness report together with the
+commit it was made at; a selection recorded at another commit is reported
+as stale. `run` makes a fresh selection and simulates only the selected
+tests: the root Makefile target of each selected testbench simulator, and
+each cocotb Makefile with COCOTB_TEST_FILTER limited to its selected tests.
+
+Usage:
+    python scripts/impact_analysis.py select [--base origin/main] [--format text|json|names]
+    python scripts/impact_analysis.py select --files rtl/example_core.sv
+    python scripts/impact_analysis.py run [--base origin/main] [--dry-run]
+    python scripts/impact_analysis.py graph
+"""
+
+import re
+import sys
+import json
+import fnmatch
+import argparse
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from sim_log_parser import TESTBENCH_DIRS
+from timing_scheduler import cocotb_tests
+
+
+# Directories whose sources make up the dependency graph
+SOURCE_DIRS = ["rtl", "tb", "verification"]
+
+HDL_SUFFIXES = {".sv", ".v", ".svh", ".vh"}
+
+# cocotb Makefiles, relative to the project root
+COCOTB_MAKEFILES = ["tb/cocotb/Makefile", "verification/cocotb/Makefile"]
+
+# Changes that never affect a simulation
+IGNORED_PATTERNS = ["*.md", "docs/*", "LICENSE*", "NOTICE", "*.png", "*.svg", "*.jpg", ".gitignore"]
+
+DEFAULT_BASE = "origin/main"
+
+# Where the selection is written for the test harness report
+SELECTION_FILE = "build/reports/test_selection.json"
+SELECTION_VERSION = 2
+
+# Root Makefile target simulating the SystemVerilog testbenches with each simulator
+SIMULATOR_TARGETS = {"icarus": "sim-fallback", "verilator": "sim"}
+
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_LINE_COMMENT_RE = re.compile(r'//[^\n]*')
+_DECLARATION_RE = re.compile(r'^\s*(?P<kind>module|macromodule|interface|program|package)\s+'
+                             r'(?:(?:automatic|static)\s+)?(?P<name>[A-Za-z_]\w*)', re.MULTILINE)
+_INCLUDE_RE = re.compile(r'`include\s+["<](?P<file>[^">]+)[">]')
+_PACKAGE_REF_RE = re.compile(r'\b(?P<name>[A-Za-z_]\w*)\s*::')
+_INSTANCE_RE = re.compile(r'\b(?P<name>[A-Za-z_]\w*)\s*(?:#\s*\(|[A-Za-z_]\w*\s*(?:\[[^\]]*\]\s*)?\()')
+_PY_IMPORT_RE = re.compile(r'^\s*(?:from\s+(?P<module>\w+)\s+import|import\s+(?P<names>\w+(?:\s*,\s*\w+)*))',
+                           re.MULTILINE)
+# Assignments only: recipe lines start with a tab
+_MAKE_VAR_RE = re.compile(r'^ *(?P<name>TOPLEVEL|COCOTB_TOPLEVEL|MODULE|COCOTB_TEST_MODULES|VERILOG_SOURCES)'
+                          r'\s*(?P<op>\+=|\?=|:=|=)\s*(?P<value>.*?)\s*$', re.MULTILINE)
+
+
+def _relative(path: Path, project_root: Path) -> str:
+    """Project-relative POSIX path."""
+    return Path(path).resolve().relative_to(project_root.resolve()).as_posix()
+
+
+def parse_hdl(text: str) -> Dict[str, List[str]]:
+    """Declarations, includes, package references and instantiation candidates of one HDL source."""
+    text = _LINE_COMMENT_RE.sub("", _BLOCK_COMMENT_RE.sub(" ", text))
+    declared = [m.group("name") for m in _DECLARATION_RE.finditer(text)]
+    return {
+        "declares": declared,
+        "includes": [m.group("file") for m in _INCLUDE_RE.finditer(text)],
+        "packages": sorted({m.group("name") for m in _PACKAGE_REF_RE.finditer(text)}),
+        # Filtered against the declared modules once the whole graph is parsed
+        "instances": sorted({m.group("name") for m in _INSTANCE_RE.finditer(text)} - set(declared))
+    }
+
+
+def build_graph(project_root: Path = Path(".")) -> Dict[str, Any]:
+    """File-level dependency graph: {"files": {path: [{"file", "via"}]}, "declared": {name: [path]}, ...}."""
+    project_root = Path(project_root)
+    sources = {}
+    python = {}
+    for directory in SOURCE_DIRS:
+        for path in sorted((project_root / directory).rglob("*")):
+            if not path.is_file():
+                continue
+            try:
+                if path.suffix in HDL_SUFFIXES:
+                    sources[_relative(path, project_root)] = parse_hdl(
+                        path.read_text(encoding="utf-8", errors="replace"))
+                elif path.suffix == ".py":
+                    python[_relative(path, project_root)] = path.read_text(encoding="utf-8", errors="replace")
+            except OSError as e:
+                print(f"Warning: Could not read {path}: {e}")
+
+    declared = {}
+    for path, parsed in sources.items():
+        for name in parsed["declares"]:
+            declared.setdefault(name, []).append(path)
+    by_name = {}
+    for path in sources:
+        by_name.setdefault(Path(path).name, []).append(path)
+
+    files = {}
+    unresolved_includes = []
+    for path, parsed in sources.items():
+        edges = []
+        for include in parsed["includes"]:
+            local = (Path(path).parent / include).as_posix()
+            targets = [local] if local in sources else by_name.get(Path(include).name, [])
+            if not targets:
+                unresolved_includes.append({"file": path, "include": include})
+            edges += [{"file": target, "via": f"includes {include}"} for target in targets]
+        for name in parsed["packages"]:
+            edges += [{"file": target, "via": f"imports {name}"} for target in declared.get(name, []) if target != path]
+        for name in parsed["instances"]:
+            edges += [{"file": target, "via": f"instantiates {name}"} for target in declared.get(name, [])
+                      if target != path]
+        files[path] = edges
+    for path, text in python.items():
+        edges = []
+        for match in _PY_IMPORT_RE.finditer(text):
+            names = [match.group("module")] if match.group("module") else re.split(r'\s*,\s*', match.group("names"))
+            for name in names:
+                sibling = (Path(path).parent / f"{name}.py").as_posix()
+                if sibling in python and sibling != path:
+                    edges.append({"file": sibling, "via": f"imports {name}"})
+        files[path] = edges
+
+    return {
+        "files": files,
+        "declared": declared,
+        "ambiguous": {name: paths for name, paths in declared.items() if len(paths) > 1},
+        "unresolved_includes": unresolved_includes
+    }
+
+
+def parse_cocotb_makefile(makefile: Path) -> Dict[str, List[str]]:
+    """TOPLEVEL, test modules and VERILOG_SOURCES of a cocotb Makefile ($(PWD) expanded to its directory)."""
+    text = makefile.read_text(encoding="utf-8", errors="replace")
+    directory = str(makefile.parent.resolve())
+    values = {}
+    for match in _MAKE_VAR_RE.finditer(text):
+        value = match.group("value")
+        for variable in ("$(PWD)", "$(CURDIR)", "$(shell pwd)"):
+            value = value.replace(variable, directory)
+        items = [item for item in re.split(r'[\s,]+', value) if item]
+        if match.group("op") == "+=":
+            values.setdefault(match.group("name"), []).extend(items)
+        elif match.group("op") != "?=" or match.group("name") not in values:
+            values[match.group("name")] = items
+    return {
+        "toplevel": values.get("COCOTB_TOPLEVEL") or values.get("TOPLEVEL") or [],
+        "modules": values.get("COCOTB_TEST_MODULES") or values.get("MODULE") or [],
+        "sources": values.get("VERILOG_SOURCES", [])
+    }
+
+
+def find_tests(project_root: Path, graph: Dict[str, Any], simulators: List[str]) -> List[Dict[str, Any]]:
+    """Test groups: {"name", "tests", "roots": [{"file", "via"}], "uncertain": reason or None}."""
+    project_root = Path(project_root)
+    groups = []
+    for directory in TESTBENCH_DIRS:
+        for source in sorted((project_root / directory).glob("tb_*.sv")) + sorted((project_root / directory).glob("tb_*.v")):
+            path = _relative(source, project_root)
+            groups.append({"name": path, "tests": [f"{simulator}:{source.stem}" for simulator in simulators],
+                           "roots": [{"file": path, "via": "testbench"}], "uncertain": None})
+
+    for pattern in COCOTB_MAKEFILES:
+        makefile = project_root / pattern
+        if not makefile.exists():
+            continue
+        config = parse_cocotb_makefile(makefile)
+        roots = [{"file": pattern, "via": "Makefile"}]
+        uncertain = []
+        for source in config["sources"]:
+            try:
+                roots.append({"file": _relative(Path(source), project_root), "via": "VERILOG_SOURCES"})
+            except ValueError:
+                uncertain.append(f"VERILOG_SOURCES entry {source} not resolved")
+        for toplevel in config["toplevel"]:
+            files = graph["declared"].get(toplevel)
+            if files:
+                roots += [{"file": file, "via": f"TOPLEVEL {toplevel}"} for file in files]
+            else:
+                uncertain.append(f"TOPLEVEL {toplevel} is not declared in the parsed sources")
+        tests = []
+        for module in config["modules"]:
+            module_path = makefile.parent / f"{module}.py"
+            if not module_path.exists():
+                uncertain.append(f"test module {module} not found")
+                continue
+            roots.append({"file": _relative(module_path, project_root), "via": f"MODULE {module}"})
+            tests += cocotb_tests(module_path)
+        if not config["toplevel"]:
+            uncertain.append("no TOPLEVEL")
+        groups.append({"name": pattern, "tests": tests, "roots": roots,
+                       "uncertain": "; ".join(uncertain) or None})
+    return groups
+
+
+def dependency_chains(graph: Dict[str, Any], roots: List[Dict[str, str]]) -> Dict[str, List[str]]:
+    """Every file reachable from the roots, with the chain of reasons leading to it."""
+    chains = {}
+    pending = []
+    for root in roots:
+        if root["file"] not in chains:
+            chains[root["file"]] = [f"{root['via']} {root['file']}"]
+            pending.append(root["file"])
+    while pending:
+        path = pending.pop(0)
+        for edge in graph["files"].get(path, []):
+            if edge["file"] not in chains:
+                chains[edge["file"]] = chains[path] + [f"{edge['via']} ({edge['file']})"]
+                pending.append(edge["file"])
+    return chains
+
+
+def changed_files(project_root: Path, base: str) -> Optional[List[str]]:
+    """Files changed since the merge base with base, including uncommitted and untracked files (None if git fails)."""
+    commands = [["diff", "--name-only", "--no-renames", f"{base}...HEAD"],
+                ["diff", "--name-only", "--no-renames", "HEAD"],
+                ["ls-files", "--others", "--exclude-standard"]]
+    files = []
+    for command in commands:
+        try:
+            result = subprocess.run(["git"] + command, cwd=project_root, capture_output=True, text=True)
+        except (subprocess.SubprocessError, FileNotFoundError):
+            return None
+        if result.returncode != 0:
+            return None
+        files += [line for line in result.stdout.splitlines() if line]
+    return sorted(set(files))
+
+
+def head_commit(project_root: Path) -> Optional[str]:
+    """The commit checked out in project_root (None if git fails)."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_root, capture_output=True, text=True)
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def select_tests(project_root: Path, changed: Optional[List[str]], simulators: List[str],
+                 base: Optional[str] = None) -> Dict[str, Any]:
+    """Tests affected by the changed files, with the reason for each, or every test when the graph is uncertain."""
+    project_root = Path(project_root)
+    graph = build_graph(project_root)
+    groups = find_tests(project_root, graph, simulators)
+    chains = [dependency_chains(graph, group["roots"]) for group in groups]
+    all_tests = [test for group in groups for test in group["tests"]]
+
+    reasons = {}
+    fallback = []
+    ignored = []
+    unused = []
+    if changed is None:
+        fallback.append(f"cannot list the files changed since {base}")
+    for path in changed or []:
+        if any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_PATTERNS):
+            ignored.append(path)
+            continue
+        under_sources = path.split("/", 1)[0] in SOURCE_DIRS
+        suffix = Path(path).suffix
+        if not (project_root / path).exists():
+            fallback.append(f"{path}: deleted, its dependents are unknown" if under_sources
+                            else f"{path}: deleted")
+            continue
+        hit = False
+        for group, chain in zip(groups, chains):
+            if path in chain:
+                hit = True
+                for test in group["tests"]:
+                    reasons.setdefault(test, []).append(f"{path}: " + " → ".join(chain[path]))
+        if hit:
+            continue
+        if under_sources and (suffix in HDL_SUFFIXES or suffix == ".py"):
+            unused.append(path)
+        else:
+            fallback.append(f"{path}: not part of the dependency graph")
+
+    # Groups whose dependencies could not be resolved run on any relevant change
+    relevant = [path for path in changed or [] if path not in ignored]
+    for group in groups:
+        if group["uncertain"] and relevant:
+            for test in group["tests"]:
+                reasons.setdefault(test, []).append(f"dependencies unknown ({group['uncertain']})")
+
+    if fallback:
+        mode = "all"
+        for test in all_tests:
+            reasons.setdefault(test, []).append("run all: the dependency graph cannot vouch for the change")
+        selected = all_tests
+    else:
+        selected = [test for test in all_tests if test in reasons]
+        mode = "selected" if selected else "none"
+    return {
+        "version": SELECTION_VERSION,
+        "base": base,
+        "commit": head_commit(project_root),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "mode": mode,
+        "changed_files": changed or [],
+        "total_tests": len(all_tests),
+        "tests": selected,
+        "reasons": {test: reasons[test] for test in selected},
+        "fallback": fallback,
+        "ignored": ignored,
+        "unused": unused
+    }
+
+
+def load_selection(path: str = SELECTION_FILE, project_root: Path = Path(".")) -> Optional[Dict[str, Any]]:
+    """The last written selection, or None; `stale` is set when it was made at another commit than HEAD."""
+    try:
+        with open(Path(project_root) / path, 'r') as f:
+            selection = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if selection.get("version") != SELECTION_VERSION:
+        return None
+    selection["stale"] = selection["commit"] != head_commit(Path(project_root))
+    return selection
+
+
+def selection_commands(project_root: Path, selection: Dict[str, Any], simulators: List[str]) -> List[List[str]]:
+    """Commands simulating the selected tests (run from the project root)."""
+    project_root = Path(project_root)
+    selected = set(selection["tests"])
+    commands = []
+    for simulator in simulators:
+        if any(test.startswith(f"{simulator}:") for test in selected):
+            commands.append(["make", SIMULATOR_TARGETS.get(simulator, "sim")])
+    for group in find_tests(project_root, build_graph(project_root), simulators):
+        if not group["name"].endswith("Makefile"):
+            continue
+        tests = [test for test in group["tests"] if test in selected]
+        if not tests:
+            continue
+        modules = list(dict.fromkeys(test.split(":", 1)[1].split(".")[0] for test in tests))
+        command = ["make", "-C", str(Path(group["name"]).parent), f"MODULE={','.join(modules)}"]
+        if len(tests) < len(group["tests"]):
+            # cocotb pastes the value unquoted into a shell recipe, and make expands $
+            names = "|".join(test.rsplit(".", 1)[1] for test in tests)
+            command.append(f"COCOTB_TEST_FILTER='^({names})$$'")
+        commands.append(command)
+    return commands
+
+
+def print_selection(selection: Dict[str, Any]):
+    """Print the selected tests and why."""
+    icons = {"all": "⚠️ ", "selected": "🎯", "none": "✅"}
+    print(f"{icons[selection['mode']]} {len(selection['tests'])} of {selection['total_tests']} tests selected "
+          f"({selection['mode']}) for {len(selection['changed_files'])} changed file(s)")
+    if selection.get("stale"):
+        print(f"   ⚠️  stale: selected at {(selection['commit'] or 'unknown')[:7]} on {selection['created_at']}, "
+              f"HEAD has moved since")
+    for reason in selection["fallback"]:
+        print(f"   run all: {reason}")
+    if selection["mode"] != "all":
+        for test in selection["tests"]:
+            print(f"   {test}")
+            for reason in selection["reasons"][test]:
+                print(f"      {reason}")
+    if selection["ignored"]:
+        print(f"   ignored (documentation): {', '.join(selection['ignored'])}")
+    if selection["unused"]:
+        print(f"   not used by any test: {', '.join(selection['unused'])}")
+
+
+def print_graph(graph: Dict[str, Any]):
+    """Print every file's direct dependencies."""
+    for path, edges in graph["files"].items():
+        print(path)
+        for edge in edges:
+            print(f"   {edge['via']} → {edge['file']}")
+    for name, paths in graph["ambiguous"].items():
+        print(f"⚠️  {name} is declared in {', '.join(paths)}")
+    for entry in graph["unresolved_includes"]:
+        print(f"⚠️  {entry['file']}: `include \"{entry['include']}\" not found")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Select the tests affected by changed RTL and testbench files")
+    parser.add_argument("--project-root", default=".", help="Project root directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    select_parser = subparsers.add_parser("select", help="Select the tests affected by a change")
+    run_parser = subparsers.add_parser("run", help="Select the tests affected by a change and simulate only them")
+    for sub in (select_parser, run_parser):
+        sub.add_argument("--base", default=DEFAULT_BASE, help=f"Git base to diff against (default {DEFAULT_BASE})")
+        sub.add_argument("--files", nargs="+", help="Changed files (instead of the git diff)")
+        sub.add_argument("--simulator", action="append",
+                         help="Simulator of the SystemVerilog testbenches (repeatable, default icarus)")
+        sub.add_argument("--output", default=SELECTION_FILE,
+                         help=f"Where the selection is written for the report (default {SELECTION_FILE})")
+    select_parser.add_argument("--format", choices=["text", "json", "names"], default="text",
+                               help="names: one selected test id per line")
+    run_parser.add_argument("--dry-run", action="store_true", help="Print the commands instead of running them")
+    graph_parser = subparsers.add_parser("graph", help="Print the dependency graph")
+    graph_parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
+    args = parser.parse_args()
+
+    project_root = Path(args.project_root)
+    if args.command == "graph":
+        graph = build_graph(project_root)
+        if args.format == "json":
+            print(json.dumps(graph, indent=2))
+        else:
+            print_graph(graph)
+        return 0
+
+    simulators = args.simulator or ["icarus"]
+    changed = args.files if args.files else changed_files(project_root, args.base)
+    selection = select_tests(project_root, changed, simulators, None if args.files else args.base)
+    output = project_root / args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(selection, f, indent=2)
+
+    if args.command == "run":
+        print_selection(selection)
+        failed = 0
+        for command in selection_commands(project_root, selection, simulators):
+            print(f"▶️  {' '.join(command)}")
+            if not args.dry_run:
+                failed += subprocess.run(command, cwd=project_root).returncode != 0
+        if failed:
+            print(f"❌ {failed} test command(s) failed")
+        return 1 if failed else 0
+
+    if args.format == "names":
+        for test in selection["tests"]:
+            print(test)
+    elif args.format == "json":
+        print(json.dumps(selection, indent=2))
+    else:
+        print_selection(selection)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
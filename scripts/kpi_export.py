@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Vyges KPI Export
+
+Flat, streaming export of the code KPIs. Every leaf value of the KPI
+dictionary becomes one `metric,value` row, with the metric named by its
+dotted path (`code_metrics.rtl_lines`, `timing_metrics.clocks.clk_i.wns_ns`,
+`summary.strengths.0`). The directory prefix tree of `file_structure` is
+exported as one group of rows per directory
+(`file_structure.directories.build/obj.total_files`).
+
+Rows are produced by a generator and written one at a time, as CSV or as
+NDJSON (one `{"metric": ..., "value": ...}` object per line); a `.gz`
+suffix compresses the output on the fly.
+
+Usage:
+    python scripts/kpi_export.py code_kpis.json kpis.csv.gz    # export a code_kpis artifact
+"""
+
+import sys
+import csv
+import gzip
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, Any, Iterator, Tuple, Optional
+
+from report_artifacts import load_artifact, ArtifactError
+
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+_SUFFIX_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def flatten(value: Any, prefix: str) -> Iterator[Tuple[str, Any]]:
+    """Yield (dotted path, leaf value) pairs; empty containers are leaves too."""
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            yield from flatten(item, f"{prefix}.{key}")
+    elif isinstance(value, list) and value:
+        for index, item in enumerate(value):
+            yield from flatten(item, f"{prefix}.{index}")
+    else:
+        yield prefix, value
+
+
+def directory_rows(node: Dict[str, Any], prefix: str, path: str = "") -> Iterator[Tuple[str, Any]]:
+    """Yield the aggregates of every directory in a file structure prefix tree (the top level is `root`)."""
+    for key, value in node.items():
+        if key != "subdirectories":
+            yield f"{prefix}.{path or 'root'}.{key}", value
+    for name, child in node.get("subdirectories", {}).items():
+        yield from directory_rows(child, prefix, f"{path}/{name}" if path else name)
+
+
+def kpi_rows(kpis: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """Yield one (metric, value) row for every KPI."""
+    for section, data in kpis.items():
+        if section == "file_structure" and isinstance(data, dict):
+            for key, value in data.items():
+                if key == "directory_structure":
+                    yield from directory_rows(value, f"{section}.directories")
+                else:
+                    yield from flatten(value, f"{section}.{key}")
+        else:
+            yield from flatten(data, section)
+
+
+def _csv_value(value: Any) -> Any:
+    """CSV cell for a leaf value."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def write_rows(rows: Iterator[Tuple[str, Any]], stream, output_format: str = "csv") -> int:
+    """Write rows to an open text stream as they are produced; return the row count."""
+    count = 0
+    if output_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(["metric", "value"])
+        for metric, value in rows:
+            writer.writerow([metric, _csv_value(value)])
+            count += 1
+    elif output_format == "ndjson":
+        for metric, value in rows:
+            stream.write(json.dumps({"metric": metric, "value": value}) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unknown export format: {output_format}")
+    return count
+
+
+def export_format(path: str) -> Optional[str]:
+    """Export format implied by a file name (`.csv`, `.ndjson`, `.jsonl`, optionally `.gz`)."""
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes.pop()
+    return _SUFFIX_FORMATS.get(suffixes[-1]) if suffixes else None
+
+
+def open_output(path: str):
+    """Open an export file for writing text; `-` is stdout and `.gz` files are gzip-compressed."""
+    if path == "-":
+        return sys.stdout
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if path.endswith(".gz"):
+        return gzip.open(path, 'wt', encoding='utf-8', newline="")
+    return open(path, 'w', encoding='utf-8', newline="")
+
+
+def export_kpis(kpis: Dict[str, Any], path: str, output_format: Optional[str] = None) -> int:
+    """Stream every KPI to a file (or `-` for stdout); return the number of rows written."""
+    output_format = output_format or export_format(path) or "csv"
+    stream = open_output(path)
+    try:
+        return write_rows(kpi_rows(kpis), stream, output_format)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Export a code_kpis artifact as flat CSV or NDJSON rows")
+    parser.add_argument("artifact", help="code_kpis artifact (JSON)")
+    parser.add_argument("output", nargs="?", default="-", help="Output file (.csv, .ndjson, .jsonl, optionally .gz; default stdout)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (default: from the file name, else CSV)")
+    args = parser.parse_args()
+
+    try:
+        kpis = load_artifact(args.artifact, "code_kpis")
+    except ArtifactError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    count = export_kpis(kpis, args.output, args.format)
+    if args.output != "-":
+        print(f"✅ {count} KPI rows written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Vyges Tool Log Analyzer
+
+Streams Yosys, Verilator and Icarus Verilog logs line by line (constant
+memory regardless of log size) and classifies every warning and error by
+tool, severity, tool code and source location. Repeated diagnostics are
+deduplicated and counted, and the most frequent ones are reported in a
+top-N table.
+
+Recognized formats:
+    Verilator   %Warning-UNUSED: rtl/core.sv:12:5: Signal is not used: 'x'
+                %Error: rtl/core.sv:3:1: syntax error
+    Icarus      rtl/core.sv:12: warning: implicit definition of wire 'x'
+                rtl/core.sv:12: error: Unknown module type: foo
+    Yosys       Warning: Wire top.\\x is used but has no driver.
+                rtl/core.sv:12: ERROR: syntax error, unexpected ...
+
+Usage:
+    python scripts/log_analyzer.py [--top N] [--output text|json] [log ...]
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+# Log groups analyzed by code_kpis; each entry lists alternatives and only the
+# first existing file is read (yosys -q -l writes the same diagnostics to both)
+LOG_GROUPS = {
+    "lint": [["lint.log", "lint_output.log"], ["verilator.log"]],
+    "synthesis": [["synthesis.log", "synthesis_output.log"]],
+    "compile": [["iverilog.log"]]
+}
+
+LOG_DIR = "build/logs"
+
+# Upper bound on distinct diagnostics kept per analysis; further unique
+# messages are only counted so memory stays bounded on pathological logs
+MAX_UNIQUE = 5000
+
+DEFAULT_TOP_N = 10
+
+_VERILATOR_RE = re.compile(
+    r'^%(?P<severity>Warning|Error)(?:-(?P<code>[A-Z0-9_]+))?:\s*'
+    r'(?:(?P<file>[^\s:]+):(?P<line>\d+):(?:\d+:)?\s*)?(?P<message>.*)$')
+_ICARUS_RE = re.compile(
+    r'^(?P<file>[^\s:]+):(?P<line>\d+):\s*(?P<severity>warning|error|sorry):\s*(?P<message>.*)$')
+_YOSYS_RE = re.compile(
+    r'^(?:(?P<file>[^\s:]+):(?P<line>\d+):\s*)?(?P<severity>Warning|ERROR):\s*(?P<message>.*)$')
+_YOSYS_LOCATION_RE = re.compile(r'\bat (?P<file>[^\s:]+):(?P<line>\d+)(?:\.\d+-\d+\.\d+)?')
+
+# Parts of a message replaced when deriving a code for tools without one
+_NORMALIZE_RES = [
+    (re.compile(r"`[^']*'|'[^']*'|\"[^\"]*\""), "<id>"),
+    (re.compile(r'\\\S+'), "<id>"),
+    (re.compile(r'\b[\w$]+(?:\.[\w$\\]+)+\b'), "<id>"),
+    (re.compile(r'\b\d+\b'), "<n>")
+]
+
+
+def normalize_message(message: str) -> str:
+    """Strip identifiers and numbers so repeats of one diagnostic share a key."""
+    for pattern, replacement in _NORMALIZE_RES:
+        message = pattern.sub(replacement, message)
+    return message.strip().rstrip(".")
+
+
+def parse_diagnostic(line: str) -> Optional[Dict[str, Any]]:
+    """Classify one log line; return None if it is not a warning or error."""
+    if not line or line[0].isspace():
+        return None
+
+    if line[0] == "%":
+        match = _VERILATOR_RE.match(line)
+        if not match:
+            return None
+        if match.group("message").startswith("Exiting due to"):
+            # Summary line; the diagnostics themselves were already counted
+            return None
+        tool = "verilator"
+        code = match.group("code") or ("ERROR" if match.group("severity") == "Error" else "WARNING")
+    else:
+        match = _ICARUS_RE.match(line)
+        if match:
+            tool = "icarus"
+            code = None
+        else:
+            match = _YOSYS_RE.match(line)
+            if not match:
+                return None
+            tool = "yosys"
+            code = None
+
+    severity = "error" if match.group("severity").lower() in ("error", "sorry") else "warning"
+    message = match.group("message").strip()
+    file_name, line_no = match.group("file"), match.group("line")
+    if tool == "yosys" and not file_name:
+        location = _YOSYS_LOCATION_RE.search(message)
+        if location:
+            file_name, line_no = location.group("file"), location.group("line")
+
+    return {
+        "tool": tool,
+        "severity": severity,
+        "code": code or normalize_message(message),
+        "file": file_name,
+        "line": int(line_no) if line_no else None,
+        "message": message
+    }
+
+
+class LogAnalyzer:
+    """Accumulate deduplicated diagnostics from one or more tool logs."""
+
+    def __init__(self, max_unique: int = MAX_UNIQUE):
+        self.max_unique = max_unique
+        self.diagnostics = {}
+        self.logs = []
+        self.errors = 0
+        self.warnings = 0
+        self.overflow = 0
+
+    def add_log(self, log_path: Path):
+        """Stream one log file into the analysis."""
+        self.logs.append(str(log_path))
+        with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                diagnostic = parse_diagnostic(line.rstrip("\n"))
+                if diagnostic:
+                    self.add(diagnostic, str(log_path))
+
+    def add(self, diagnostic: Dict[str, Any], log_name: str = ""):
+        """Count a diagnostic, merging it with earlier repeats."""
+        if diagnostic["severity"] == "error":
+            self.errors += 1
+        else:
+            self.warnings += 1
+
+        key = (diagnostic["tool"], diagnostic["severity"], diagnostic["code"],
+               diagnostic["file"], diagnostic["line"])
+        entry = self.diagnostics.get(key)
+        if entry:
+            entry["count"] += 1
+            return
+        if len(self.diagnostics) >= self.max_unique:
+            self.overflow += 1
+            return
+        entry = dict(diagnostic)
+        entry["count"] = 1
+        entry["log"] = log_name
+        self.diagnostics[key] = entry
+
+    def by_code(self) -> Dict[str, int]:
+        """Occurrences per tool code."""
+        counts = {}
+        for entry in self.diagnostics.values():
+            label = f"{entry['tool']}:{entry['code']}"
+            counts[label] = counts.get(label, 0) + entry["count"]
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def top(self, top_n: int = DEFAULT_TOP_N) -> List[Dict[str, Any]]:
+        """Most frequent distinct diagnostics, errors first."""
+        entries = sorted(self.diagnostics.values(),
+                         key=lambda e: (e["severity"] != "error", -e["count"], e["file"] or "", e["line"] or 0))
+        return entries[:top_n]
+
+    def summary(self, top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+        """Summary dictionary suitable for the KPI report."""
+        return {
+            "logs": self.logs,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "unique_diagnostics": len(self.diagnostics) + self.overflow,
+            "by_code": self.by_code(),
+            "top_diagnostics": self.top(top_n)
+        }
+
+
+def find_group_logs(project_root: Path, group: str) -> List[Path]:
+    """Locate the log files of a group, preferring build/logs."""
+    logs = []
+    for alternatives in LOG_GROUPS[group]:
+        for name in alternatives:
+            candidate = project_root / LOG_DIR / name
+            if not candidate.exists():
+                candidate = next((p for p in project_root.rglob(name) if ".git" not in p.parts), None)
+            if candidate:
+                logs.append(candidate)
+                break
+    return logs
+
+
+def analyze_logs(project_root: Path, top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """Analyze the lint, synthesis and compile logs of a project."""
+    project_root = Path(project_root)
+    results = {}
+    for group in LOG_GROUPS:
+        logs = find_group_logs(project_root, group)
+        analyzer = LogAnalyzer()
+        for log_path in logs:
+            try:
+                analyzer.add_log(log_path)
+            except OSError as e:
+                print(f"Warning: Could not read {log_path}: {e}")
+        results[group] = analyzer.summary(top_n) if analyzer.logs else None
+    return results
+
+
+def print_top_table(summary: Dict[str, Any], top_n: int = DEFAULT_TOP_N):
+    """Print the top-N diagnostics as a table."""
+    rows = summary["top_diagnostics"][:top_n]
+    if not rows:
+        return
+    print(f"   {'Count':>6}  {'Sev':<7}  {'Tool':<9}  {'Location':<28}  Code / Message")
+    for entry in rows:
+        location = f"{entry['file']}:{entry['line']}" if entry["file"] else "-"
+        text = f"{entry['code']}: {entry['message']}" if entry["tool"] == "verilator" else entry["message"]
+        print(f"   {entry['count']:>6}  {entry['severity']:<7}  {entry['tool']:<9}  {location:<28}  {text[:80]}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Analyze Yosys/Verilator/Icarus logs")
+    parser.add_argument("logs", nargs="*", help="Log files (default: lint/synthesis/compile logs in build/logs)")
+    parser.add_argument("--project-root", default=".", help="Project root directory")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="Number of diagnostics in the top table")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    args = parser.parse_args()
+
+    if args.logs:
+        analyzer = LogAnalyzer()
+        for log_path in args.logs:
+            analyzer.add_log(Path(log_path))
+        results = {"logs": analyzer.summary(args.top)}
+    else:
+        results = analyze_logs(Path(args.project_root), args.top)
+
+    if args.output == "json":
+        print(json.dumps(results, indent=2))
+        return 1 if any(r and r["errors"] for r in results.values()) else 0
+
+    for group, summary in results.items():
+        if summary is None:
+            print(f"📄 {group}: no logs found")
+            continue
+        status = "✅" if not summary["errors"] and not summary["warnings"] else "❌" if summary["errors"] else "⚠️"
+        print(f"{status} {group}: {summary['errors']} errors, {summary['warnings']} warnings "
+              f"({summary['unique_diagnostics']} unique) in {', '.join(summary['logs'])}")
+        print_top_table(summary, args.top)
+    return 1 if any(r and r["errors"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
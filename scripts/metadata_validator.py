@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Vyges Metadata Validator
+
+Validates vyges-metadata.json files against the Vyges metadata schema. The
+schema is vendored in `scripts/schemas/vyges-metadata.schema.json` (no network
+access) and compiled once into Python code: every schema node becomes a small
+generated function with its `$ref` targets, enums and patterns resolved up
+front, so validating a file is a few dictionary lookups per field. The
+compiled code object is cached on disk under `build/.cache/`, keyed on the
+schema's SHA-256, and later runs (and batch worker processes) load it
+directly.
+
+Every `sourceFiles[].path` is also cross-checked against the project's file
+inventory:
+    stale     listed in sourceFiles but not present in the project
+    missing   HDL sources present in the project but not listed in sourceFiles
+
+Usage:
+    python scripts/metadata_validator.py [-j N] [--output text|json] [file-or-dir ...]
+"""
+
+import os
+import sys
+import json
+import time
+import marshal
+import argparse
+import posixpath
+import importlib.util
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Set
+
+from report_artifacts import resolve_ref
+from site_builder import hash_bytes
+from profiler import cache_lookup
+
+
+SCHEMA_PATH = Path(__file__).resolve().parent / "schemas" / "vyges-metadata.schema.json"
+
+DEFAULT_CACHE_DIR = "build/.cache"
+
+# Bump when the generated code changes so stale cache entries are not reused
+COMPILER_VERSION = 1
+
+METADATA_FILE = "vyges-metadata.json"
+TEMPLATE_FILE = "vyges-metadata.template.json"
+
+# Files that are expected to have a sourceFiles entry
+HDL_EXTENSIONS = {".v", ".sv", ".vh", ".svh", ".vhd", ".vhdl"}
+
+# Directories that are never part of the file inventory
+SKIP_DIRS = {".git", "build", "__pycache__"}
+
+MAX_ERRORS_REPORTED = 20
+
+# Keywords with no effect on validation
+_ANNOTATION_KEYWORDS = {"$schema", "$id", "title", "description", "definitions", "default", "examples", "$comment"}
+
+_TYPE_EXPRESSIONS = {
+    "object": "isinstance(x, dict)",
+    "array": "isinstance(x, list)",
+    "string": "isinstance(x, str)",
+    "integer": "isinstance(x, int) and not isinstance(x, bool)",
+    "number": "isinstance(x, (int, float)) and not isinstance(x, bool)",
+    "boolean": "isinstance(x, bool)",
+    "null": "x is None"
+}
+
+_NUMBER_CHECK = _TYPE_EXPRESSIONS["number"]
+
+# Compiled validators already loaded in this process: cache file -> validator
+_VALIDATORS = {}
+
+
+class SchemaCompileError(Exception):
+    """Raised when the schema uses a keyword the compiler does not support."""
+
+
+class SchemaCompiler:
+    """Generate the Python source of a validation function for a JSON Schema."""
+
+    SUPPORTED_KEYWORDS = {"$ref", "type", "enum", "minimum", "maximum", "minLength", "pattern",
+                          "minItems", "required", "properties", "additionalProperties", "items"}
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.root = schema
+        self.constants = []
+        self.functions = {}
+        self.pending = []
+
+    def function_for(self, node: Dict[str, Any]) -> Optional[str]:
+        """Name of the generated function for a schema node (None if it accepts anything)."""
+        while "$ref" in node:
+            node = resolve_ref(node["$ref"], self.root)
+        if not any(key in self.SUPPORTED_KEYWORDS for key in node):
+            return None
+        key = id(node)
+        if key not in self.functions:
+            name = f"_v{len(self.functions)}"
+            self.functions[key] = name
+            self.pending.append((name, node))
+        return self.functions[key]
+
+    def constant(self, expression: str) -> str:
+        """Hoist a constant out of the generated functions."""
+        name = f"_C{len(self.constants)}"
+        self.constants.append(f"{name} = {expression}")
+        return name
+
+    def compile(self) -> str:
+        """Return the module source defining `validate(instance, path='$')`."""
+        entry = self.function_for(self.root)
+        body = []
+        while self.pending:
+            name, node = self.pending.pop()
+            body.extend(self._emit(name, node))
+
+        lines = ["import re", "_MISSING = object()"] + self.constants + body
+        lines.append("def validate(instance, path='$'):")
+        lines.append("    errors = []")
+        if entry:
+            lines.append(f"    {entry}(instance, path, errors)")
+        lines.append("    return errors")
+        return "\n".join(lines) + "\n"
+
+    def _emit(self, name: str, node: Dict[str, Any]) -> List[str]:
+        """Generate the function checking one schema node."""
+        unknown = set(node) - self.SUPPORTED_KEYWORDS - _ANNOTATION_KEYWORDS
+        if unknown:
+            raise SchemaCompileError(f"Unsupported schema keywords: {', '.join(sorted(unknown))}")
+
+        lines = [f"def {name}(x, path, errors):"]
+        types = node.get("type")
+        types = [types] if isinstance(types, str) else (types or [])
+        if types:
+            check = " or ".join(f"({_TYPE_EXPRESSIONS[t]})" for t in types)
+            lines += [f"    if not ({check}):",
+                      f"        errors.append(path + {': expected ' + ' or '.join(types) + ', got '!r} + type(x).__name__)",
+                      "        return"]
+
+        if "enum" in node:
+            values = self.constant(repr(node["enum"]))
+            lines += [f"    if x not in {values}:",
+                      f"        errors.append(path + ': ' + repr(x) + {' is not one of ' + str(node['enum'])!r})"]
+        if "minimum" in node:
+            lines += [f"    if {_NUMBER_CHECK} and x < {node['minimum']!r}:",
+                      f"        errors.append(path + ': ' + str(x) + {' is less than ' + str(node['minimum'])!r})"]
+        if "maximum" in node:
+            lines += [f"    if {_NUMBER_CHECK} and x > {node['maximum']!r}:",
+                      f"        errors.append(path + ': ' + str(x) + {' is greater than ' + str(node['maximum'])!r})"]
+        if "minLength" in node:
+            lines += [f"    if isinstance(x, str) and len(x) < {node['minLength']!r}:",
+                      f"        errors.append(path + {': shorter than ' + str(node['minLength']) + ' characters'!r})"]
+        if "pattern" in node:
+            pattern = self.constant(f"re.compile({node['pattern']!r})")
+            lines += [f"    if isinstance(x, str) and not {pattern}.search(x):",
+                      f"        errors.append(path + ': ' + repr(x) + {' does not match ' + node['pattern']!r})"]
+        if "minItems" in node:
+            lines += [f"    if isinstance(x, list) and len(x) < {node['minItems']!r}:",
+                      f"        errors.append(path + {': fewer than ' + str(node['minItems']) + ' items'!r})"]
+
+        object_lines = []
+        for field in node.get("required", []):
+            object_lines += [f"if {field!r} not in x:",
+                             f"    errors.append(path + {': missing required field ' + repr(field)!r})"]
+        properties = node.get("properties", {})
+        for field, subschema in properties.items():
+            function = self.function_for(subschema)
+            if function:
+                object_lines += [f"v = x.get({field!r}, _MISSING)",
+                                 "if v is not _MISSING:",
+                                 f"    {function}(v, path + {'.' + field!r}, errors)"]
+        additional = node.get("additionalProperties", True)
+        if additional is False:
+            known = self.constant(repr(set(properties)))
+            object_lines += ["for k in x:",
+                             f"    if k not in {known}:",
+                             "        errors.append(path + \": unexpected field '\" + k + \"'\")"]
+        elif isinstance(additional, dict) and self.function_for(additional):
+            function = self.function_for(additional)
+            if properties:
+                known = self.constant(repr(set(properties)))
+                object_lines += ["for k, v in x.items():",
+                                 f"    if k not in {known}:",
+                                 f"        {function}(v, path + '.' + k, errors)"]
+            else:
+                object_lines += ["for k, v in x.items():",
+                                 f"    {function}(v, path + '.' + k, errors)"]
+        if object_lines:
+            lines += self._guarded(types, "object", "isinstance(x, dict)", object_lines)
+
+        items = self.function_for(node["items"]) if "items" in node else None
+        if items:
+            lines += self._guarded(types, "array", "isinstance(x, list)",
+                                   ["for i, v in enumerate(x):",
+                                    f"    {items}(v, path + '[' + str(i) + ']', errors)"])
+
+        if len(lines) == 1:
+            lines.append("    pass")
+        return lines
+
+    @staticmethod
+    def _guarded(types: List[str], expected: str, check: str, block: List[str]) -> List[str]:
+        """Indent a block, wrapped in an isinstance check unless the type is already known."""
+        if types == [expected]:
+            return ["    " + line for line in block]
+        return [f"    if {check}:"] + ["        " + line for line in block]
+
+
+class CompiledValidator:
+    """A compiled schema validation function plus where it came from."""
+
+    def __init__(self, function, cache_file: Path, cache_hit: bool, load_ms: float):
+        self.function = function
+        self.cache_file = cache_file
+        self.cache_hit = cache_hit
+        self.load_ms = load_ms
+
+    def __call__(self, instance: Any) -> List[str]:
+        return self.function(instance)
+
+
+def load_validator(schema_path: Path = SCHEMA_PATH, cache_dir: str = DEFAULT_CACHE_DIR) -> CompiledValidator:
+    """Return the compiled validator for a schema, compiling it only if no cached copy exists."""
+    start = time.perf_counter()
+    schema_bytes = Path(schema_path).read_bytes()
+    digest = hash_bytes(schema_bytes + f"\0{COMPILER_VERSION}".encode())
+    cache_file = Path(cache_dir) / f"metadata_validator.{digest[:16]}.bin"
+    if cache_file in _VALIDATORS:
+        return _VALIDATORS[cache_file]
+
+    magic = importlib.util.MAGIC_NUMBER
+    code = None
+    try:
+        data = cache_file.read_bytes()
+        if data.startswith(magic):
+            code = marshal.loads(data[len(magic):])
+    except (OSError, ValueError, EOFError, TypeError):
+        code = None
+    cache_hit = code is not None
+    cache_lookup("metadata_validator", cache_hit)
+
+    if code is None:
+        source = SchemaCompiler(json.loads(schema_bytes)).compile()
+        code = compile(source, f"<{Path(schema_path).name}>", "exec")
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            temp_file.write_bytes(magic + marshal.dumps(code))
+            os.replace(temp_file, cache_file)
+            for old in cache_file.parent.glob("metadata_validator.*.bin"):
+                if old != cache_file:
+                    old.unlink()
+        except OSError:
+            pass
+
+    namespace = {}
+    exec(code, namespace)
+    validator = CompiledValidator(namespace["validate"], cache_file, cache_hit,
+                                  (time.perf_counter() - start) * 1000)
+    _VALIDATORS[cache_file] = validator
+    return validator
+
+
+def scan_inventory(project_root: Path) -> Set[str]:
+    """Relative POSIX paths of all files in a project."""
+    inventory = set()
+    for root, dirs, files in os.walk(project_root):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        rel_root = os.path.relpath(root, project_root)
+        prefix = "" if rel_root == "." else rel_root.replace(os.sep, "/") + "/"
+        inventory.update(prefix + name for name in files)
+    return inventory
+
+
+def _normalize_path(path: str) -> str:
+    """Normalize a sourceFiles path for inventory lookups."""
+    return posixpath.normpath(path.replace("\\", "/"))
+
+
+def cross_check_source_files(metadata: Dict[str, Any], inventory: Set[str]) -> Dict[str, Any]:
+    """Compare sourceFiles[].path against a file inventory."""
+    entries = metadata.get("sourceFiles") if isinstance(metadata, dict) else None
+    declared = [_normalize_path(entry["path"]) for entry in entries or []
+                if isinstance(entry, dict) and isinstance(entry.get("path"), str)]
+    listed = set()
+    duplicates = []
+    for path in declared:
+        if path in listed:
+            duplicates.append(path)
+        listed.add(path)
+
+    return {
+        "declared": len(declared),
+        "stale_entries": [path for path in declared if path not in inventory],
+        "missing_entries": sorted(
+            path for path in inventory
+            if os.path.splitext(path)[1].lower() in HDL_EXTENSIONS
+            and path not in listed
+            and not SKIP_DIRS.intersection(path.split("/")[:-1])),
+        "duplicate_entries": duplicates
+    }
+
+
+def validate_metadata_file(metadata_path: Path, validator: CompiledValidator,
+                           inventory: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Validate one metadata file and cross-check its sourceFiles against its project."""
+    metadata_path = Path(metadata_path)
+    result = {"file": str(metadata_path), "valid": False, "errors": [], "source_files": None}
+    try:
+        with open(metadata_path, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        result["errors"] = [f"$: {e}"]
+        return result
+
+    errors = validator(data)
+    result["valid"] = not errors
+    result["error_count"] = len(errors)
+    result["errors"] = errors[:MAX_ERRORS_REPORTED]
+    if inventory is None:
+        inventory = scan_inventory(metadata_path.parent)
+    result["source_files"] = cross_check_source_files(data, inventory)
+    return result
+
+
+def find_metadata_files(paths: List[str]) -> List[Path]:
+    """Expand files and directories into a list of metadata files."""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+                if METADATA_FILE in files:
+                    found.append(Path(root) / METADATA_FILE)
+        else:
+            found.append(path)
+    return found
+
+
+def _validate_worker(args) -> Dict[str, Any]:
+    """Process pool entry point; the compiled validator comes from the disk cache."""
+    metadata_path, cache_dir = args
+    return validate_metadata_file(metadata_path, load_validator(cache_dir=cache_dir))
+
+
+def validate_batch(metadata_files: List[Path], cache_dir: str = DEFAULT_CACHE_DIR,
+                   jobs: int = 1) -> List[Dict[str, Any]]:
+    """Validate many metadata files, optionally across a process pool."""
+    # Compile (or load) once up front so workers only read the cache
+    validator = load_validator(cache_dir=cache_dir)
+    if jobs <= 1 or len(metadata_files) < 2:
+        return [validate_metadata_file(path, validator) for path in metadata_files]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(metadata_files) // (jobs * 4))
+        return list(pool.map(_validate_worker, [(path, cache_dir) for path in metadata_files],
+                             chunksize=chunksize))
+
+
+def print_result(result: Dict[str, Any]):
+    """Print the outcome for one metadata file."""
+    source_files = result["source_files"] or {}
+    stale = source_files.get("stale_entries", [])
+    status = "❌" if not result["valid"] else "⚠️ " if stale else "✅"
+    print(f"{status} {result['file']}: {result.get('error_count', len(result['errors']))} schema errors, "
+          f"{source_files.get('declared', 0)} sourceFiles")
+    for error in result["errors"]:
+        print(f"   {error}")
+    for path in stale:
+        print(f"   stale sourceFiles entry: {path}")
+    for path in source_files.get("missing_entries", []):
+        print(f"   missing sourceFiles entry: {path}")
+    for path in source_files.get("duplicate_entries", []):
+        print(f"   duplicate sourceFiles entry: {path}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Validate Vyges metadata files")
+    parser.add_argument("paths", nargs="*", help=f"Metadata files or directories to search for {METADATA_FILE} "
+                                                 f"(default: {METADATA_FILE}, else {TEMPLATE_FILE})")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Parallel worker processes for batches")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Compiled validator cache directory")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    args = parser.parse_args()
+
+    paths = args.paths or [METADATA_FILE if Path(METADATA_FILE).exists() else TEMPLATE_FILE]
+    metadata_files = find_metadata_files(paths)
+    if not metadata_files:
+        print(f"❌ No {METADATA_FILE} files found")
+        return 1
+
+    start = time.perf_counter()
+    results = validate_batch(metadata_files, args.cache_dir, args.jobs)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for r in results if not r["valid"] or (r["source_files"] or {}).get("stale_entries"))
+
+    if args.output == "json":
+        print(json.dumps(results, indent=2))
+        return 1 if failed else 0
+
+    validator = load_validator(cache_dir=args.cache_dir)
+    for result in results:
+        print_result(result)
+    origin = "loaded from cache" if validator.cache_hit else "compiled"
+    print(f"\n📋 {len(results)} files, {failed} with problems in {elapsed:.2f}s "
+          f"(validator {origin} in {validator.load_ms:.1f} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Vyges Page Template Engine
+
+Small HTML template engine used by the GitHub Pages generator. Templates are
+compiled once into a segment list and cached per file, then rendered in a
+single pass with HTML escaping.
+
+Template syntax:
+    {{NAME}}                       Escaped value
+    {{NAME|raw}}                   Unescaped value (trusted HTML only)
+    {{NAME.key}}                   Key of a dict value; the key may contain
+                                   '.' and '-' (e.g. {{ASSETS.site.css}})
+    {{#each ITEMS}}...{{/each}}    Loop; {{.}} is the current item and
+                                   {{field}} looks up a key of a dict item
+    {{#each ITEMS}}...{{else}}...{{/each}}
+                                   Fallback rendered when ITEMS is empty
+
+Usage:
+    python scripts/page_templates.py <template.html>    # list placeholders
+"""
+
+import os
+import re
+import sys
+import html
+from typing import Dict, List, Any, Optional, Set
+
+from profiler import cache_lookup
+
+
+_TAG_RE = re.compile(r'\{\{\s*(.*?)\s*\}\}')
+_NAME_RE = re.compile(r'^(\.|[A-Za-z_][\w.-]*)(\|raw)?$')
+
+# Segment kinds
+TEXT = 0
+VAR = 1
+EACH = 2
+
+# Compiled template cache: path -> (mtime_ns, size, Template)
+_TEMPLATE_CACHE = {}
+
+
+class TemplateError(Exception):
+    """Raised when a template cannot be compiled."""
+
+
+class Template:
+    """A compiled template: a flat list of text, variable and loop segments."""
+
+    def __init__(self, source: str, name: str = "<string>"):
+        self.name = name
+        self.placeholders = set()
+        # Names used at any depth: inside a loop a name may resolve in an enclosing scope
+        self.references = set()
+        self.segments = self._compile(source)
+        self.missing = set()
+
+    def _compile(self, source: str) -> List[tuple]:
+        """Compile template source into nested segment lists."""
+        root = []
+        # Stack of (segments, loop_name, else_segments_or_None)
+        stack = [(root, None, None)]
+        position = 0
+
+        for match in _TAG_RE.finditer(source):
+            segments = stack[-1][2] if stack[-1][2] is not None else stack[-1][0]
+            if match.start() > position:
+                segments.append((TEXT, source[position:match.start()]))
+            position = match.end()
+            tag = match.group(1)
+
+            if tag.startswith("#each"):
+                loop_name = tag[5:].strip()
+                if not _NAME_RE.match(loop_name):
+                    raise TemplateError(f"{self.name}: invalid loop '{tag}'")
+                self.references.add(loop_name.split(".", 1)[0])
+                if len(stack) == 1:
+                    self.placeholders.add(loop_name)
+                stack.append(([], loop_name, None))
+            elif tag == "else":
+                if len(stack) == 1 or stack[-1][2] is not None:
+                    raise TemplateError(f"{self.name}: unexpected {{{{else}}}}")
+                body, loop_name, _ = stack.pop()
+                stack.append((body, loop_name, []))
+            elif tag == "/each":
+                if len(stack) == 1:
+                    raise TemplateError(f"{self.name}: unexpected {{{{/each}}}}")
+                body, loop_name, else_body = stack.pop()
+                parent = stack[-1][2] if stack[-1][2] is not None else stack[-1][0]
+                parent.append((EACH, loop_name, body, else_body or []))
+            else:
+                name_match = _NAME_RE.match(tag)
+                if not name_match:
+                    raise TemplateError(f"{self.name}: invalid placeholder '{{{{{tag}}}}}'")
+                name = name_match.group(1)
+                head = name.split(".", 1)[0] if name != "." else name
+                self.references.add(head)
+                if len(stack) == 1:
+                    self.placeholders.add(head)
+                segments.append((VAR, name, name_match.group(2) is None))
+
+        if len(stack) != 1:
+            raise TemplateError(f"{self.name}: unclosed {{{{#each {stack[-1][1]}}}}}")
+        if position < len(source):
+            root.append((TEXT, source[position:]))
+        return root
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """Render the template in a single pass; missing names render empty."""
+        self.missing = set()
+        parts = []
+        self._render_segments(self.segments, [context], None, parts)
+        return "".join(parts)
+
+    def unused(self, context: Dict[str, Any]) -> Set[str]:
+        """Return context keys the template never references, inside loops included."""
+        return set(context) - self.references
+
+    def _lookup(self, name: str, scopes: List[Dict[str, Any]], item: Any) -> Any:
+        """Resolve a name against the current loop item, then enclosing scopes."""
+        if name == ".":
+            return item
+        if isinstance(item, dict) and name in item:
+            return item[name]
+        for scope in reversed(scopes):
+            if name in scope:
+                return scope[name]
+        head, _, key = name.partition(".")
+        if key:
+            value = self._lookup(head, scopes, item)
+            if isinstance(value, dict) and key in value:
+                return value[key]
+        self.missing.add(name)
+        return None
+
+    def _render_segments(self, segments: List[tuple], scopes: List[Dict[str, Any]],
+                         item: Any, parts: List[str]):
+        """Append rendered segments to `parts`."""
+        for segment in segments:
+            kind = segment[0]
+            if kind == TEXT:
+                parts.append(segment[1])
+            elif kind == VAR:
+                value = self._lookup(segment[1], scopes, item)
+                if value is None:
+                    continue
+                text = str(value)
+                parts.append(html.escape(text) if segment[2] else text)
+            else:
+                items = self._lookup(segment[1], scopes, item)
+                if not items:
+                    self._render_segments(segment[3], scopes, item, parts)
+                    continue
+                if isinstance(items, (str, bytes)) or not hasattr(items, "__iter__"):
+                    items = [items]
+                inner_scopes = scopes + [item] if isinstance(item, dict) else scopes
+                for entry in items:
+                    self._render_segments(segment[2], inner_scopes, entry, parts)
+
+
+def load_template(template_path: str) -> Template:
+    """Compile a template file, reusing the cached compilation while it is unchanged."""
+    path = os.path.abspath(template_path)
+    stat = os.stat(path)
+    cached = _TEMPLATE_CACHE.get(path)
+    hit = bool(cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size)
+    cache_lookup("page_templates", hit)
+    if hit:
+        return cached[2]
+    with open(path, 'r', encoding='utf-8') as f:
+        template = Template(f.read(), name=template_path)
+    _TEMPLATE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
+
+
+def render_file(template_path: str, context: Dict[str, Any],
+                output_path: Optional[str] = None, strict: bool = False) -> str:
+    """Render a template file, warn about missing/unused placeholders and optionally write it."""
+    template = load_template(template_path)
+    output = template.render(context)
+
+    missing = sorted(template.missing)
+    unused = sorted(template.unused(context))
+    if missing:
+        print(f"⚠️ Warning: {template_path}: missing placeholders: {', '.join(missing)}")
+    if unused:
+        print(f"⚠️ Warning: {template_path}: unused values: {', '.join(unused)}")
+    if strict and missing:
+        raise TemplateError(f"{template_path}: missing placeholders: {', '.join(missing)}")
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(output)
+    return output
+
+
+def main():
+    """Main function."""
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/page_templates.py <template.html>")
+        return 1
+    try:
+        template = load_template(sys.argv[1])
+    except (OSError, TemplateError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ {sys.argv[1]}: {len(template.segments)} segments")
+    for name in sorted(template.placeholders):
+        print(f"   {{{{{name}}}}}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Vyges Power Estimation Script
+
+This script estimates dynamic and leakage power per module for Vyges IP
+projects by combining:
+- Per-net switching activity streamed from simulation VCDs
+- The synthesized cell inventory from Yosys `stat` output (yosys_stat.py)
+- Per-cell energy tables (built-in generic defaults or a JSON override)
+- The clock frequency from the SDC constraints
+
+The estimate is a first-order activity-based model intended for trend
+tracking between revisions, not for sign-off.
+
+Usage:
+    python scripts/power_analysis.py [--project-root DIR] [--vcd FILE] [--stat-log FILE]
+                                     [--energy-table FILE] [--clock NAME] [--output json|text]
+"""
+
+import re
+import sys
+import json
+import fnmatch
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from vcd_parser import VCDReader, toggle_count
+from wave_store import open_store
+from timing_analysis import find_constraint_files, parse_constraint_clocks
+from yosys_stat import find_stat_logs, collect_stats, cell_inventory, DEFAULT_CACHE_DIR
+
+
+# Switching activity assumed when no VCD is available
+DEFAULT_ACTIVITY = 0.1
+
+# Clock frequency assumed when no SDC clock is found
+DEFAULT_FREQUENCY_MHZ = 100.0
+
+# Sources scanned for the instance hierarchy that maps VCD scopes to modules
+HDL_DIRS = ["rtl", "tb", "verification"]
+HDL_SUFFIXES = (".sv", ".v")
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/|//[^\n]*', re.DOTALL)
+_MODULE_RE = re.compile(r'^\s*module\s+(?:(?:automatic|static)\s+)?([A-Za-z_]\w*)(.*?)\bendmodule\b',
+                        re.DOTALL | re.MULTILINE)
+# module_name [#(params)] instance_name [array] (   -- parameters nested up to two levels
+_INSTANCE_RE = re.compile(r'\b([A-Za-z_]\w*)\s*(?:#\s*\((?:[^()]|\((?:[^()]|\([^()]*\))*\))*\)\s*)?'
+                          r'([A-Za-z_]\w*)\s*(?:\[[^\]]*\]\s*)?\(')
+
+# Generic per-cell energy table for Yosys internal gate cells.
+# toggle_energy_fj: energy per output transition
+# clock_energy_fj: clock pin energy per cycle (sequential cells only)
+# leakage_nw: static leakage per cell
+DEFAULT_ENERGY_TABLE = {
+    "$_NOT_": {"toggle_energy_fj": 1.0, "leakage_nw": 0.5},
+    "$_BUF_": {"toggle_energy_fj": 1.2, "leakage_nw": 0.6},
+    "$_AND_": {"toggle_energy_fj": 2.0, "leakage_nw": 1.0},
+    "$_NAND_": {"toggle_energy_fj": 1.8, "leakage_nw": 0.9},
+    "$_OR_": {"toggle_energy_fj": 2.0, "leakage_nw": 1.0},
+    "$_NOR_": {"toggle_energy_fj": 1.8, "leakage_nw": 0.9},
+    "$_ANDNOT_": {"toggle_energy_fj": 2.0, "leakage_nw": 1.0},
+    "$_ORNOT_": {"toggle_energy_fj": 2.0, "leakage_nw": 1.0},
+    "$_XOR_": {"toggle_energy_fj": 3.5, "leakage_nw": 1.5},
+    "$_XNOR_": {"toggle_energy_fj": 3.5, "leakage_nw": 1.5},
+    "$_MUX_": {"toggle_energy_fj": 4.0, "leakage_nw": 2.0},
+    "$_NMUX_": {"toggle_energy_fj": 4.0, "leakage_nw": 2.0},
+    "$_AOI*": {"toggle_energy_fj": 3.0, "leakage_nw": 1.2},
+    "$_OAI*": {"toggle_energy_fj": 3.0, "leakage_nw": 1.2},
+    "$_DFF*": {"toggle_energy_fj": 8.0, "clock_energy_fj": 4.0, "leakage_nw": 5.0},
+    "$_SDFF*": {"toggle_energy_fj": 9.0, "clock_energy_fj": 4.0, "leakage_nw": 5.5},
+    "$_DLATCH*": {"toggle_energy_fj": 6.0, "clock_energy_fj": 3.0, "leakage_nw": 4.0},
+    "$_SR*": {"toggle_energy_fj": 6.0, "leakage_nw": 4.0},
+    "*": {"toggle_energy_fj": 3.0, "leakage_nw": 1.5}
+}
+
+
+def load_energy_table(table_path: Optional[Path] = None) -> Dict[str, Dict[str, float]]:
+    """Load a per-cell energy table, falling back to the generic defaults."""
+    table = dict(DEFAULT_ENERGY_TABLE)
+    if table_path:
+        with open(table_path, 'r') as f:
+            data = json.load(f)
+        table.update(data.get("cells", data))
+    return table
+
+
+def lookup_cell_energy(cell_type: str, table: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """Find the energy entry for a cell type (exact match first, then wildcards)."""
+    if cell_type in table:
+        return table[cell_type]
+    best = None
+    for pattern, entry in table.items():
+        if fnmatch.fnmatchcase(cell_type, pattern):
+            # The most specific (longest) pattern wins
+            if best is None or len(pattern) > len(best[0]):
+                best = (pattern, entry)
+    return best[1] if best else {"toggle_energy_fj": 0.0, "leakage_nw": 0.0}
+
+
+def _clock_codes(signals: Dict[str, List[Dict[str, Any]]], clock_port: Optional[str]) -> set:
+    """Id codes bound to the 1-bit clock port."""
+    return {code for code, bindings in signals.items() for signal in bindings
+            if clock_port and signal["name"] == clock_port and signal["width"] == 1}
+
+
+def _stream_toggles(reader: VCDReader, clock_codes: set) -> Tuple[Dict[str, int], int, Optional[int], int]:
+    """Toggles per id code, clock edges and the time span, streamed from the VCD text."""
+    last_values = {}
+    toggles = {}
+    clock_edges = 0
+    first_time = None
+    last_time = 0
+    for time, code, value in reader.iter_changes():
+        if first_time is None:
+            first_time = time
+        last_time = time
+        previous = last_values.get(code)
+        last_values[code] = value
+        if previous is None:
+            continue
+        if code in clock_codes:
+            if previous == "0" and value == "1":
+                clock_edges += 1
+            continue
+        count = toggle_count(previous, value)
+        if count:
+            toggles[code] = toggles.get(code, 0) + count
+    return toggles, clock_edges, first_time, last_time
+
+
+def _store_toggles(store, clock_codes: set) -> Tuple[Dict[str, int], int, Optional[int], int]:
+    """Toggles per id code, clock edges and the time span, read from a columnar waveform store."""
+    toggles = {}
+    clock_edges = 0
+    for code in store.signals:
+        signal = store.by_code(code)
+        if code in clock_codes:
+            clock_edges += signal.rising_edges()
+        else:
+            toggles[code] = signal.toggle_count()
+    return toggles, clock_edges, store.start_time, store.end_time or 0
+
+
+def collect_switching_activity(vcd_paths: List[Path], clock_port: Optional[str] = None,
+                               frequency_mhz: float = DEFAULT_FREQUENCY_MHZ) -> Dict[str, Any]:
+    """Accumulate toggles per scope and clock cycles simulated from VCDs.
+
+    A VCD with an up-to-date columnar store (wave_store.py) is read from the
+    store; otherwise the VCD text is streamed.
+    """
+    activity = {
+        "vcd_files": [],
+        "cycles": 0,
+        "total_toggles": 0,
+        "total_bits": 0,
+        "scopes": {}
+    }
+    # Bits times cycles, per VCD: each file has its own signals and length
+    bit_cycles = 0
+
+    for vcd_path in vcd_paths:
+        reader = open_store(vcd_path)
+        try:
+            if reader is None:
+                reader = VCDReader(vcd_path)
+                reader.open()
+        except (OSError, UnicodeDecodeError):
+            continue
+
+        try:
+            clock_codes = _clock_codes(reader.signals, clock_port)
+            if isinstance(reader, VCDReader):
+                toggles, clock_edges, first_time, last_time = _stream_toggles(reader, clock_codes)
+            else:
+                toggles, clock_edges, first_time, last_time = _store_toggles(reader, clock_codes)
+
+            # Prefer counted clock edges; otherwise derive cycles from the simulated time span
+            if clock_edges:
+                cycles = clock_edges
+            elif first_time is not None:
+                span_s = (last_time - first_time) * reader.timescale
+                cycles = int(span_s * frequency_mhz * 1e6)
+            else:
+                cycles = 0
+
+            file_bits = 0
+            for code, bindings in reader.signals.items():
+                if code in clock_codes:
+                    continue
+                for signal in bindings:
+                    scope = activity["scopes"].setdefault(signal["scope"], {"bits": 0, "toggles": 0, "cycles": 0})
+                    scope["bits"] += signal["width"]
+                    scope["toggles"] += toggles.get(code, 0)
+                    scope["cycles"] += cycles * signal["width"]
+                file_bits += bindings[0]["width"]
+                activity["total_toggles"] += toggles.get(code, 0)
+
+            activity["total_bits"] += file_bits
+            activity["cycles"] += cycles
+            bit_cycles += file_bits * cycles
+            activity["vcd_files"].append(str(vcd_path))
+        finally:
+            reader.close()
+
+    for scope in activity["scopes"].values():
+        scope["activity"] = scope["toggles"] / scope["cycles"] if scope["cycles"] else 0.0
+
+    activity["average_activity"] = activity["total_toggles"] / bit_cycles if bit_cycles else None
+    return activity
+
+
+def design_hierarchy(project_root: Path) -> Dict[str, Dict[str, str]]:
+    """Instances of every module in the HDL sources: {module: {instance: instantiated module}}."""
+    bodies = {}
+    for directory in HDL_DIRS:
+        for path in sorted((Path(project_root) / directory).rglob("*")):
+            if path.suffix not in HDL_SUFFIXES or not path.is_file():
+                continue
+            try:
+                text = _COMMENT_RE.sub(" ", path.read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                continue
+            for match in _MODULE_RE.finditer(text):
+                bodies[match.group(1)] = match.group(2)
+    return {module: {instance: child for child, instance in _INSTANCE_RE.findall(body) if child in bodies}
+            for module, body in bodies.items()}
+
+
+def scope_module(scope_name: str, hierarchy: Dict[str, Dict[str, str]]) -> Optional[str]:
+    """Module of a VCD scope: the first component naming a module (the top), then instance by instance.
+
+    Components that are not instances (generate and named blocks) stay in the enclosing module.
+    """
+    parts = scope_name.split(".")
+    for index, part in enumerate(parts):
+        if part in hierarchy:
+            module = part
+            for component in parts[index + 1:]:
+                # Arrayed instances appear as u_name[0]
+                module = hierarchy[module].get(component.split("[")[0], module)
+            return module
+    return None
+
+
+def _module_activity(module: str, activity: Dict[str, Any],
+                     hierarchy: Optional[Dict[str, Dict[str, str]]] = None) -> Tuple[float, str]:
+    """Pick the switching activity for a module from the VCD scopes of its instances."""
+    toggles = 0
+    bit_cycles = 0
+    for scope_name, scope in activity.get("scopes", {}).items():
+        if hierarchy:
+            matched = scope_module(scope_name, hierarchy) == module
+        else:
+            # Without sources, only a scope named after the module itself (e.g. a cocotb toplevel) is known
+            matched = scope_name.split(".")[-1] == module
+        if matched:
+            toggles += scope["toggles"]
+            bit_cycles += scope["cycles"]
+    if bit_cycles:
+        return toggles / bit_cycles, "instance" if hierarchy else "scope"
+    if activity.get("average_activity") is not None:
+        return activity["average_activity"], "global"
+    return DEFAULT_ACTIVITY, "default"
+
+
+def estimate_power(inventory: Dict[str, Dict[str, int]], activity: Dict[str, Any],
+                   frequency_mhz: float, energy_table: Dict[str, Dict[str, float]],
+                   hierarchy: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, Any]:
+    """Estimate dynamic and leakage power per module."""
+    modules = {}
+    for module, cells in inventory.items():
+        alpha, source = _module_activity(module, activity, hierarchy)
+        dynamic_nw = 0.0
+        clock_nw = 0.0
+        leakage_nw = 0.0
+        for cell_type, count in cells.items():
+            energy = lookup_cell_energy(cell_type, energy_table)
+            # fJ * MHz = nW
+            dynamic_nw += count * energy.get("toggle_energy_fj", 0.0) * alpha * frequency_mhz
+            clock_nw += count * energy.get("clock_energy_fj", 0.0) * frequency_mhz
+            leakage_nw += count * energy.get("leakage_nw", 0.0)
+        modules[module] = {
+            "cells": sum(cells.values()),
+            "activity": alpha,
+            "activity_source": source,
+            "dynamic_mw": (dynamic_nw + clock_nw) / 1e6,
+            "clock_mw": clock_nw / 1e6,
+            "leakage_mw": leakage_nw / 1e6,
+            "total_mw": (dynamic_nw + clock_nw + leakage_nw) / 1e6
+        }
+    return modules
+
+
+def find_vcd_files(project_root: Path) -> List[Path]:
+    """Find simulation VCD files in the project."""
+    return sorted(p for p in project_root.rglob("*.vcd")
+                  if ".git" not in str(p) and p.is_file())
+
+
+def select_clock(project_root: Path, clock_name: Optional[str] = None,
+                 clocks: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Pick the clock used for the estimate from the SDC constraints."""
+    if clocks is None:
+        clocks = {}
+        for file_path in find_constraint_files(project_root):
+            if file_path.suffix != ".sdc":
+                continue
+            try:
+                for name, clock in parse_constraint_clocks(file_path).items():
+                    clocks.setdefault(name, clock)
+            except (UnicodeDecodeError, OSError):
+                continue
+
+    candidates = [c for c in clocks.values() if c.get("frequency_mhz")]
+    if clock_name:
+        candidates = [c for c in candidates if c["name"] == clock_name]
+    if not candidates:
+        return {"name": clock_name, "port": None, "frequency_mhz": DEFAULT_FREQUENCY_MHZ, "source": "default"}
+
+    # Power is dominated by the fastest clock
+    clock = max(candidates, key=lambda c: c["frequency_mhz"])
+    targets = clock.get("targets") or []
+    return {
+        "name": clock["name"],
+        "port": targets[0] if targets else clock["name"],
+        "frequency_mhz": clock["frequency_mhz"],
+        "source": "sdc"
+    }
+
+
+def analyze_power(project_root: Path,
+                  vcd_files: Optional[List[Path]] = None,
+                  stat_logs: Optional[List[Path]] = None,
+                  energy_table_path: Optional[Path] = None,
+                  clock_name: Optional[str] = None,
+                  clocks: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Run the power estimation stage and return power KPIs."""
+    project_root = Path(project_root)
+    if vcd_files is None:
+        vcd_files = find_vcd_files(project_root)
+    if stat_logs is None:
+        stat_logs = find_stat_logs(project_root)
+
+    power = {
+        "power_data_available": False,
+        "clock": select_clock(project_root, clock_name, clocks),
+        "vcd_files": [],
+        "stat_logs": [],
+        "cycles_simulated": 0,
+        "average_activity": None,
+        "modules": {},
+        "total_dynamic_mw": 0.0,
+        "total_leakage_mw": 0.0,
+        "total_mw": 0.0
+    }
+
+    stats = collect_stats(stat_logs, str(project_root / DEFAULT_CACHE_DIR))
+    inventory = cell_inventory(stats)
+    power["stat_logs"] = stats["logs"]
+    if not inventory:
+        return power
+
+    energy_table = load_energy_table(energy_table_path)
+    frequency_mhz = power["clock"]["frequency_mhz"]
+    activity = collect_switching_activity(vcd_files, power["clock"]["port"], frequency_mhz)
+    power["vcd_files"] = activity["vcd_files"]
+    power["cycles_simulated"] = activity["cycles"]
+    power["average_activity"] = activity["average_activity"]
+
+    power["modules"] = estimate_power(inventory, activity, frequency_mhz, energy_table,
+                                      design_hierarchy(project_root))
+    power["total_dynamic_mw"] = sum(m["dynamic_mw"] for m in power["modules"].values())
+    power["total_leakage_mw"] = sum(m["leakage_mw"] for m in power["modules"].values())
+    power["total_mw"] = power["total_dynamic_mw"] + power["total_leakage_mw"]
+    power["power_data_available"] = True
+    return power
+
+
+def print_power_report(power: Dict[str, Any]):
+    """Print a formatted power estimate."""
+    print("=" * 60)
+    print("VYGES POWER ESTIMATE")
+    print("=" * 60)
+
+    clock = power["clock"]
+    print(f"\n🕒 Clock: {clock['name'] or 'default'} @ {clock['frequency_mhz']:.1f} MHz ({clock['source']})")
+
+    if not power["power_data_available"]:
+        print("\n⚠️  No synthesized cell inventory found (run `make synth` first)")
+        print("\n" + "=" * 60)
+        return
+
+    activity = power["average_activity"]
+    print(f"📈 VCD Files: {len(power['vcd_files'])}, Cycles: {power['cycles_simulated']:,}")
+    print(f"📈 Average Activity: {f'{activity:.4f}' if activity is not None else 'N/A (default used)'}")
+
+    print(f"\n⚡ POWER BY MODULE:")
+    for module, data in power["modules"].items():
+        print(f"   {module}: {data['total_mw']:.4f} mW "
+              f"(dynamic {data['dynamic_mw']:.4f}, leakage {data['leakage_mw']:.4f}, "
+              f"α={data['activity']:.4f} [{data['activity_source']}])")
+
+    print(f"\n⚡ TOTAL: {power['total_mw']:.4f} mW "
+          f"(dynamic {power['total_dynamic_mw']:.4f}, leakage {power['total_leakage_mw']:.4f})")
+    print("\n" + "=" * 60)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Estimate IP power from VCD activity and cell counts")
+    parser.add_argument("--project-root", default=".", help="Project root directory")
+    parser.add_argument("--vcd", action="append", help="VCD file (default: discover *.vcd)")
+    parser.add_argument("--stat-log", action="append", help="Yosys stat output (default: discover)")
+    parser.add_argument("--energy-table", help="JSON per-cell energy table")
+    parser.add_argument("--clock", help="SDC clock name to use")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+
+    args = parser.parse_args()
+
+    power = analyze_power(
+        Path(args.project_root),
+        vcd_files=[Path(p) for p in args.vcd] if args.vcd else None,
+        stat_logs=[Path(p) for p in args.stat_log] if args.stat_log else None,
+        energy_table_path=Path(args.energy_table) if args.energy_table else None,
+        clock_name=args.clock
+    )
+
+    if args.output == "json":
+        print(json.dumps(power, indent=2))
+    else:
+        print_power_report(power)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Vyges Report Profiler
+
+Instrumentation shared by the report scripts (`--profile`). Each analysis
+stage is wrapped in `stage(name)`; while profiling is enabled every stage
+records:
+
+    wall_ms / cpu_ms      elapsed and process CPU time
+    files_opened          files opened (Python audit "open" events)
+    bytes_read            bytes read by the process (/proc/self/io rchar
+                          where available, otherwise sizes of files opened
+                          for reading)
+    peak_memory_kb        peak traced Python memory (tracemalloc)
+    counters              cache hits/misses and other counters
+
+Functions can be decorated with `@profiled()` instead. Stages nest, and all
+values are inclusive of nested stages. The profile is written as JSON
+(`<prefix>.json`) and as a Chrome trace (`<prefix>.trace.json`) that opens in
+chrome://tracing or https://ui.perfetto.dev.
+
+When profiling is disabled, `stage()` and `count()` are no-ops.
+
+Usage:
+    python scripts/profiler.py <profile.json>    # print a saved profile
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+
+DEFAULT_PROFILE_DIR = "build/profile"
+
+PROFILE_VERSION = 1
+
+_PROC_IO = "/proc/self/io"
+
+
+class _NullStage:
+    """Context manager used while profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """One timed stage; records deltas of the profiler's counters."""
+
+    def __init__(self, profiler: "Profiler", name: str, category: str):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.peak = 0
+
+    def __enter__(self):
+        profiler = self.profiler
+        stack = profiler._stack()
+        if stack:
+            # Fold the parent's peak so far in before resetting the peak for this stage
+            stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        stack.append(self)
+        self.counters = dict(profiler.counters)
+        self.files_opened = profiler.files_opened
+        self.bytes_read = profiler.bytes_read()
+        self.cpu = time.process_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        wall = time.perf_counter() - self.start
+        cpu = time.process_time() - self.cpu
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        stack = profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, self.peak)
+        profiler.peak = max(profiler.peak, self.peak)
+        tracemalloc.reset_peak()
+
+        counters = {key: value - self.counters.get(key, 0) for key, value in profiler.counters.items()
+                    if value != self.counters.get(key, 0)}
+        profiler.stages.append({
+            "name": self.name,
+            "category": self.category,
+            "depth": len(stack),
+            "thread": threading.get_ident(),
+            "start_ms": round((self.start - profiler.origin) * 1000, 3),
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "files_opened": profiler.files_opened - self.files_opened,
+            "bytes_read": profiler.bytes_read() - self.bytes_read,
+            "peak_memory_kb": round(self.peak / 1024, 1),
+            "counters": counters,
+            "failed": exc[0] is not None
+        })
+        return False
+
+
+class Profiler:
+    """Collects stage timings and counters for one script run."""
+
+    def __init__(self):
+        self.enabled = False
+        self.script = None
+        self.stages = []
+        self.counters = {}
+        self.files_opened = 0
+        self.opened_bytes = 0
+        self.peak = 0
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._hook_installed = False
+        self._proc_io = os.path.exists(_PROC_IO)
+        self._proc_io_fd = None
+        self._rchar_start = 0
+
+    def _stack(self) -> List[_Stage]:
+        """Stage stack of the calling thread."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _audit(self, event: str, args):
+        """Audit hook counting opened files."""
+        if event != "open" or not self.enabled:
+            return
+        self.files_opened += 1
+        if not self._proc_io:
+            path, mode = args[0], args[1]
+            if isinstance(path, (str, bytes, os.PathLike)) and (mode is None or "r" in str(mode)):
+                try:
+                    self.opened_bytes += os.stat(path).st_size
+                except OSError:
+                    pass
+
+    def _rchar(self) -> int:
+        """Bytes read by this process so far according to the kernel."""
+        try:
+            if self._proc_io_fd is None:
+                self._proc_io_fd = os.open(_PROC_IO, os.O_RDONLY)
+            for line in os.pread(self._proc_io_fd, 4096, 0).splitlines():
+                if line.startswith(b"rchar:"):
+                    return int(line.split()[1])
+        except OSError:
+            pass
+        self._proc_io = False
+        return 0
+
+    def bytes_read(self) -> int:
+        """Bytes read since profiling started."""
+        if self._proc_io:
+            return self._rchar() - self._rchar_start
+        return self.opened_bytes
+
+    def start(self, script: str, trace_memory: bool = True):
+        """Enable profiling for the rest of the run; without trace_memory peaks are reported as 0."""
+        if not self._hook_installed:
+            sys.addaudithook(self._audit)
+            self._hook_installed = True
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.script = script
+        # /proc/self/io is opened once here, before files are counted
+        self._rchar_start = self._rchar() if self._proc_io else 0
+        self.origin = time.perf_counter()
+        self.started_at = datetime.now().isoformat()
+        self.cpu_origin = time.process_time()
+        self.enabled = True
+
+    def stage(self, name: str, category: str = "stage"):
+        """Context manager timing one stage."""
+        return _Stage(self, name, category) if self.enabled else _NULL_STAGE
+
+    def count(self, name: str, value: int = 1):
+        """Add to a named counter."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> Dict[str, Any]:
+        """Profile data as a JSON-serializable dictionary."""
+        return {
+            "version": PROFILE_VERSION,
+            "script": self.script,
+            "started_at": self.started_at,
+            "total": {
+                "wall_ms": round((time.perf_counter() - self.origin) * 1000, 3),
+                "cpu_ms": round((time.process_time() - self.cpu_origin) * 1000, 3),
+                "files_opened": self.files_opened,
+                "bytes_read": self.bytes_read(),
+                "peak_memory_kb": round(max(self.peak, tracemalloc.get_traced_memory()[1]) / 1024, 1),
+                "bytes_read_source": "proc_io" if self._proc_io else "opened_files"
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "stages": sorted(self.stages, key=lambda s: s["start_ms"])
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Profile data in the Chrome trace event format (complete "X" events, times in µs)."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.script}}]
+        for stage in sorted(self.stages, key=lambda s: s["start_ms"]):
+            events.append({
+                "name": stage["name"],
+                "cat": stage["category"],
+                "ph": "X",
+                "pid": pid,
+                "tid": stage["thread"],
+                "ts": round(stage["start_ms"] * 1000, 1),
+                "dur": round(stage["wall_ms"] * 1000, 1),
+                "args": {key: stage[key] for key in ("cpu_ms", "files_opened", "bytes_read", "peak_memory_kb", "counters")}
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, prefix: str) -> List[Path]:
+        """Write `<prefix>.json` and `<prefix>.trace.json`."""
+        base = Path(prefix)
+        if base.suffix == ".json":
+            base = base.with_suffix("")
+        base.parent.mkdir(parents=True, exist_ok=True)
+        paths = [base.with_name(base.name + ".json"), base.with_name(base.name + ".trace.json")]
+        for path, data in zip(paths, (self.report(), self.chrome_trace())):
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=2 if path == paths[0] else None)
+        return paths
+
+
+PROFILER = Profiler()
+
+
+def stage(name: str, category: str = "stage"):
+    """Time a stage of the shared profiler (no-op unless profiling)."""
+    return PROFILER.stage(name, category)
+
+
+def profiled(name: Optional[str] = None, category: str = "stage"):
+    """Decorator timing every call of a function as a stage."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with PROFILER.stage(name or func.__name__, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name: str, value: int = 1):
+    """Add to a counter of the shared profiler (no-op unless profiling)."""
+    if PROFILER.enabled:
+        PROFILER.count(name, value)
+
+
+def cache_lookup(cache: str, hit: bool):
+    """Record a cache hit or miss."""
+    if PROFILER.enabled:
+        PROFILER.count(f"cache.{cache}.{'hits' if hit else 'misses'}")
+
+
+def add_profile_argument(parser):
+    """Add the standard --profile option to a script's argument parser."""
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="PREFIX",
+                        help=f"Profile the run and write PREFIX.json and PREFIX.trace.json "
+                             f"(default: {DEFAULT_PROFILE_DIR}/<script>)")
+
+
+def start_profiling(prefix: Optional[str], script: str):
+    """Enable the shared profiler if --profile was given."""
+    if prefix is not None:
+        PROFILER.start(script)
+
+
+def finish_profiling(prefix: Optional[str]):
+    """Write and summarize the profile if --profile was given."""
+    if prefix is None or not PROFILER.enabled:
+        return
+    script = Path(PROFILER.script).stem
+    paths = PROFILER.write(prefix or os.path.join(DEFAULT_PROFILE_DIR, script))
+    print_profile(PROFILER.report(), stream=sys.stderr)
+    print(f"📈 Profile written to {paths[0]} and {paths[1]}", file=sys.stderr)
+
+
+def print_profile(report: Dict[str, Any], stream=None):
+    """Print a profile as a table of stages."""
+    stream = stream or sys.stdout
+    total = report["total"]
+    print(f"\n⏱️  PROFILE: {report['script']} - {total['wall_ms']:.1f} ms wall, {total['cpu_ms']:.1f} ms CPU, "
+          f"{total['files_opened']} files, {total['bytes_read'] / 1e6:.2f} MB read", file=stream)
+    print(f"   {'Stage':<34} {'Wall ms':>10} {'CPU ms':>10} {'Files':>7} {'MB read':>9} {'Peak KB':>10}", file=stream)
+    for entry in report["stages"]:
+        name = "  " * entry["depth"] + entry["name"]
+        print(f"   {name[:34]:<34} {entry['wall_ms']:>10.1f} {entry['cpu_ms']:>10.1f} {entry['files_opened']:>7} "
+              f"{entry['bytes_read'] / 1e6:>9.2f} {entry['peak_memory_kb']:>10.1f}", file=stream)
+    for name, value in report["counters"].items():
+        print(f"   {name}: {value}", file=stream)
+
+
+def main():
+    """Main function."""
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/profiler.py <profile.json>")
+        return 1
+    with open(sys.argv[1], 'r') as f:
+        print_profile(json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Vyges Report Artifacts
+
+Versioned JSON artifacts exchanged between the Vyges report scripts. Each
+generator writes one artifact; consumers (GitHub Pages, comprehensive report)
+load and validate it instead of scraping Markdown or text output.
+
+Artifact envelope:
+    {
+      "artifact": "code_kpis",
+      "schema_version": "1.0",
+      "generated_by": "code_kpis.py",
+      "generated_at": "2025-08-01T12:00:00",
+      "data": { ... }
+    }
+
+The `data` section of each artifact kind is described by a JSON Schema in
+`scripts/schemas/<kind>.schema.json`, checked with a small built-in validator
+(no external dependencies; local `$ref` references are supported).
+
+Usage:
+    python scripts/report_artifacts.py validate <artifact.json> [...]
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any
+
+
+SCHEMA_DIR = Path(__file__).resolve().parent / "schemas"
+
+# Current schema version per artifact kind (major.minor)
+SCHEMA_VERSIONS = {
+    "code_kpis": "1.6",
+    "test_results": "1.5",
+    "gate_analysis": "1.0",
+    "dse": "1.1",
+    "waveform_compare": "1.0"
+}
+
+# Default artifact file names
+ARTIFACT_FILES = {
+    "code_kpis": "code_kpis.json",
+    "test_results": "test_harness_report.json",
+    "gate_analysis": "gate_analysis.json",
+    "dse": "dse.json",
+    "waveform_compare": "waveform_compare.json"
+}
+
+_ENVELOPE_FIELDS = ("artifact", "schema_version", "generated_by", "generated_at", "data")
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None
+}
+
+_schema_cache = {}
+
+
+class ArtifactError(Exception):
+    """Raised when an artifact is missing, malformed or fails validation."""
+
+
+def load_schema(kind: str) -> Dict[str, Any]:
+    """Load (and cache) the JSON Schema for an artifact kind."""
+    if kind not in SCHEMA_VERSIONS:
+        raise ArtifactError(f"Unknown artifact kind: {kind}")
+    if kind not in _schema_cache:
+        with open(SCHEMA_DIR / f"{kind}.schema.json", 'r') as f:
+            _schema_cache[kind] = json.load(f)
+    return _schema_cache[kind]
+
+
+def resolve_ref(ref: str, root: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve a local JSON pointer reference such as '#/definitions/name'."""
+    if not ref.startswith("#"):
+        raise ArtifactError(f"Only local schema references are supported: {ref}")
+    target = root
+    for part in ref[1:].split("/"):
+        if part:
+            target = target[part.replace("~1", "/").replace("~0", "~")]
+    return target
+
+
+def validate(instance: Any, schema: Dict[str, Any], path: str = "$",
+             root: Dict[str, Any] = None) -> List[str]:
+    """Validate an instance against a JSON Schema subset and return error messages."""
+    root = root if root is not None else schema
+    if "$ref" in schema:
+        schema = resolve_ref(schema["$ref"], root)
+    errors = []
+
+    expected = schema.get("type")
+    if expected:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_TYPE_CHECKS[t](instance) for t in types):
+            return [f"{path}: expected {' or '.join(types)}, got {type(instance).__name__}"]
+
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: {instance!r} is not one of {schema['enum']}")
+    if "minimum" in schema and _TYPE_CHECKS["number"](instance) and instance < schema["minimum"]:
+        errors.append(f"{path}: {instance} is less than {schema['minimum']}")
+    if "maximum" in schema and _TYPE_CHECKS["number"](instance) and instance > schema["maximum"]:
+        errors.append(f"{path}: {instance} is greater than {schema['maximum']}")
+
+    if isinstance(instance, dict):
+        for field in schema.get("required", []):
+            if field not in instance:
+                errors.append(f"{path}: missing required field '{field}'")
+        properties = schema.get("properties", {})
+        additional = schema.get("additionalProperties", True)
+        for key, value in instance.items():
+            if key in properties:
+                errors.extend(validate(value, properties[key], f"{path}.{key}", root))
+            elif additional is False:
+                errors.append(f"{path}: unexpected field '{key}'")
+            elif isinstance(additional, dict):
+                errors.extend(validate(value, additional, f"{path}.{key}", root))
+
+    if isinstance(instance, list) and "items" in schema:
+        for index, item in enumerate(instance):
+            errors.extend(validate(item, schema["items"], f"{path}[{index}]", root))
+
+    return errors
+
+
+def validate_artifact(artifact: Dict[str, Any], kind: str = None) -> List[str]:
+    """Validate an artifact envelope and its data section."""
+    if not isinstance(artifact, dict):
+        return ["$: artifact must be a JSON object"]
+    errors = [f"$: missing envelope field '{f}'" for f in _ENVELOPE_FIELDS if f not in artifact]
+    if errors:
+        return errors
+
+    actual_kind = artifact["artifact"]
+    if kind and actual_kind != kind:
+        return [f"$.artifact: expected '{kind}', got '{actual_kind}'"]
+    if actual_kind not in SCHEMA_VERSIONS:
+        return [f"$.artifact: unknown artifact kind '{actual_kind}'"]
+
+    # Minor versions are backwards compatible; a major bump is not
+    current_major = SCHEMA_VERSIONS[actual_kind].split(".")[0]
+    artifact_major = str(artifact["schema_version"]).split(".")[0]
+    if artifact_major != current_major:
+        return [f"$.schema_version: {artifact['schema_version']} is incompatible with "
+                f"{SCHEMA_VERSIONS[actual_kind]}"]
+
+    return validate(artifact["data"], load_schema(actual_kind), "$.data")
+
+
+def write_artifact(output_path: Path, kind: str, data: Dict[str, Any], generated_by: str) -> Path:
+    """Validate data and write it as a versioned artifact."""
+    artifact = {
+        "artifact": kind,
+        "schema_version": SCHEMA_VERSIONS[kind],
+        "generated_by": generated_by,
+        "generated_at": datetime.now().isoformat(),
+        "data": data
+    }
+    errors = validate_artifact(artifact, kind)
+    if errors:
+        raise ArtifactError(f"{kind} artifact failed validation: " + "; ".join(errors[:5]))
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(artifact, f, indent=2)
+    return output_path
+
+
+def load_artifact(artifact_path: Path, kind: str) -> Dict[str, Any]:
+    """Load and validate an artifact, returning its data section."""
+    try:
+        with open(artifact_path, 'r') as f:
+            artifact = json.load(f)
+    except FileNotFoundError:
+        raise ArtifactError(f"{artifact_path}: not found")
+    except json.JSONDecodeError as e:
+        raise ArtifactError(f"{artifact_path}: invalid JSON: {e}")
+
+    errors = validate_artifact(artifact, kind)
+    if errors:
+        raise ArtifactError(f"{artifact_path}: " + "; ".join(errors[:5]))
+    return artifact["data"]
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Validate Vyges report artifacts")
+    subparsers = parser.add_subparsers(dest="command")
+    validate_parser = subparsers.add_parser("validate", help="Validate artifact files")
+    validate_parser.add_argument("files", nargs="+", help="Artifact JSON files")
+
+    args = parser.parse_args()
+    if args.command != "validate":
+        parser.print_help()
+        return 1
+
+    failed = 0
+    for file_name in args.files:
+        try:
+            with open(file_name, 'r') as f:
+                artifact = json.load(f)
+            errors = validate_artifact(artifact)
+        except (OSError, json.JSONDecodeError) as e:
+            errors = [str(e)]
+        if errors:
+            failed += 1
+            print(f"❌ {file_name}")
+            for error in errors:
+                print(f"   {error}")
+        else:
+            print(f"✅ {file_name} ({artifact['artifact']} v{artifact['schema_version']})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
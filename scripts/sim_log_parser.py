@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Vyges Simulation Log Parser
+
+Streams SystemVerilog testbench logs from Icarus Verilog (vvp) and
+Verilator-built simulations line by line and classifies each line with a
+rule table:
+
+    run footer      [sim-run] wall_time_s=1.234 exit_code=0 command=vvp
+    $finish         tb_example.sv:123: $finish called at 3455000 (1ps)          (Icarus)
+                    - Verilator: $finish at 3ms; walltime 0.012 s; speed ...    (Verilator)
+    summary         Passed: 6, Failed: 0
+    assertion       [100] %Error: tb.sv:40: Assertion failed in TOP.tb: ...
+    fatal / error   FATAL: ... / ERROR: tb.sv:12: ... / %Error: ...
+    check           PASS: ... / FAIL: ...
+    timeout         Simulation timeout!
+
+Each log yields one testbench result: status, passed/failed checks,
+assertion failures, the simulated time at $finish, the wall-clock runtime
+and, with the testbench clock period, simulated cycles per second. cocotb
+`results.xml` files (JUnit) are read as well.
+
+The wall-clock runtime is taken from Verilator's own summary, or from the
+footer written by the `run` wrapper, which times any simulator command:
+
+    python scripts/sim_log_parser.py run -- vvp build/simulation/example_core_sim > build/logs/simulation.log
+
+Usage:
+    python scripts/sim_log_parser.py parse [--output text|json] [log ...]
+    python scripts/sim_log_parser.py run -- COMMAND [ARG ...]
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from timing_analysis import find_constraint_files, parse_constraint_clocks
+
+
+# Simulation logs, relative to the project root
+SIM_LOG_PATTERNS = [
+    "build/logs/simulation*.log",
+    "build/logs/sim_*.log",
+    "tb/sv_tb/*.log",
+    "tb/sv_tb/simv*.out",
+    "verification/sv_tb/build/*.log"
+]
+
+COCOTB_RESULT_PATTERNS = ["tb/cocotb/results.xml", "tb/cocotb/**/results.xml", "verification/cocotb/**/results.xml"]
+
+# Directories searched for a testbench's source (for its clock period)
+TESTBENCH_DIRS = ["tb/sv_tb", "verification/sv_tb"]
+
+# Failure messages kept per log
+MAX_MESSAGES = 10
+
+RUN_FOOTER = "[sim-run]"
+
+_TIME_UNITS_NS = {"s": 1e9, "ms": 1e6, "us": 1e3, "ns": 1.0, "ps": 1e-3, "fs": 1e-6}
+
+# Rule table: (kind, keywords of which one must occur in the line, pattern). Rules are
+# tried in order and the first match wins; the keyword check skips most lines cheaply.
+RULES = [
+    ("footer", (RUN_FOOTER,),
+     re.compile(r'^\[sim-run\] wall_time_s=(?P<wall>[\d.]+) exit_code=(?P<exit>-?\d+)')),
+    ("verilator_finish", ("- Verilator:",),
+     re.compile(r'^- Verilator: \$(?:finish|stop) at (?P<time>[\d.]+)\s*(?P<unit>[munpf]?s); '
+                r'walltime (?P<wall>[\d.]+) s')),
+    ("finish_location", ("Verilog $",),
+     re.compile(r'^- (?P<file>[^\s:]+):(?P<line>\d+): Verilog \$(?:finish|stop)')),
+    ("icarus_finish", ("called at",),
+     re.compile(r'(?:(?P<file>[^\s:]+):(?P<line>\d+): )?\$(?:finish|stop)(?:\(\d\))? called at '
+                r'(?P<time>\d+) \((?P<scale>\d*)(?P<unit>[munpf]?s)\)')),
+    ("summary", ("assed",),
+     re.compile(r'\bPassed:?\s*(?P<passed>\d+),?\s*Failed:?\s*(?P<failed>\d+)', re.IGNORECASE)),
+    ("assertion", ("ssertion",),
+     re.compile(r'(?i)assertion (?:failed|error)\b(?P<message>.*)')),
+    ("fatal", ("FATAL",),
+     re.compile(r'^\s*(?:\[\d+\]\s*)?FATAL:?\s*(?P<message>.*)')),
+    ("error", ("rror", "RROR"),
+     re.compile(r'^\s*(?:\[\d+\]\s*)?(?:%Error|ERROR)(?:-\w+)?:\s*(?P<message>.*)')),
+    ("fail", ("FAIL",),
+     re.compile(r'\bFAIL(?:ED)?\b:?\s*(?P<message>.*)')),
+    ("pass", ("PASS",),
+     re.compile(r'\bPASS(?:ED)?\b:?\s*(?P<message>.*)')),
+    ("timeout", ("imeout",),
+     re.compile(r'(?i)\btime ?out\b'))
+]
+
+# Lines identifying the simulator that wrote a log
+_SIMULATOR_MARKERS = [("VCD info:", "icarus"), ("called at", "icarus"),
+                      ("- Verilator:", "verilator"), ("S i m u l a t i o n   R e p o r t: Verilator", "verilator")]
+
+_TIMESCALE_RE = re.compile(r'`timescale\s+(?P<scale>\d+)\s*(?P<unit>[munpf]?s)')
+_CLOCK_RE = re.compile(r'(?:always|forever)\s*#\s*\(?\s*(?P<delay>[\w.]+)\s*(?P<half>/\s*2)?\s*\)?\s*'
+                       r'(?P<clock>\w+)\s*=\s*[~!]\s*(?P=clock)\b')
+
+
+def to_ns(value: float, unit: str, scale: int = 1) -> float:
+    """Convert a simulation time to nanoseconds."""
+    return value * scale * _TIME_UNITS_NS[unit]
+
+
+def classify(line: str):
+    """Return (kind, match) for the first rule matching a log line, or None."""
+    for kind, keywords, pattern in RULES:
+        if any(keyword in line for keyword in keywords):
+            match = pattern.search(line)
+            if match:
+                return kind, match
+    return None
+
+
+def testbench_clock_period_ns(source: Path) -> Optional[float]:
+    """Clock period of a testbench from its `timescale` and clock generator."""
+    try:
+        text = source.read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return None
+    clock = _CLOCK_RE.search(text)
+    if not clock:
+        return None
+    delay = clock.group("delay")
+    if not re.fullmatch(r'[\d.]+', delay):
+        parameter = re.search(r'(?:parameter|localparam)\s+(?:\w+\s+)?' + re.escape(delay) + r'\s*=\s*([\d.]+)', text)
+        if not parameter:
+            return None
+        delay = parameter.group(1)
+    timescale = _TIMESCALE_RE.search(text)
+    unit_ns = to_ns(1, timescale.group("unit"), int(timescale.group("scale"))) if timescale else 1.0
+    period = float(delay) * (1 if clock.group("half") else 2)
+    return period * unit_ns
+
+
+def default_clock_period_ns(project_root: Path) -> Optional[float]:
+    """Period of the first clock in the project's SDC/XDC constraints."""
+    for constraint_file in find_constraint_files(project_root):
+        try:
+            clocks = parse_constraint_clocks(constraint_file)
+        except (UnicodeDecodeError, OSError):
+            continue
+        for clock in clocks.values():
+            if clock.get("period_ns"):
+                return clock["period_ns"]
+    return None
+
+
+def find_testbench_source(project_root: Path, name: str) -> Optional[Path]:
+    """Source file of a testbench by module or file stem."""
+    for directory in TESTBENCH_DIRS:
+        for suffix in (".sv", ".v"):
+            candidate = project_root / directory / f"{name}{suffix}"
+            if candidate.exists():
+                return candidate
+    return None
+
+
+def parse_sim_log(log_path: Path) -> Dict[str, Any]:
+    """Stream one simulation log and summarize the testbench run."""
+    log_path = Path(log_path)
+    result = {
+        "log": str(log_path),
+        "testbench": None,
+        "simulator": "unknown",
+        "status": "incomplete",
+        "passed": 0,
+        "failed": 0,
+        "assertion_failures": 0,
+        "errors": 0,
+        "timeout": False,
+        "finished": False,
+        "finish_time_ns": None,
+        "wall_time_s": None,
+        "exit_code": None,
+        "messages": []
+    }
+    summary = None
+    checks = {"pass": 0, "fail": 0}
+
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if result["simulator"] == "unknown":
+                for marker, simulator in _SIMULATOR_MARKERS:
+                    if marker in line:
+                        result["simulator"] = simulator
+                        break
+            classified = classify(line)
+            if not classified:
+                continue
+            kind, match = classified
+            if kind == "footer":
+                result["wall_time_s"] = float(match.group("wall"))
+                result["exit_code"] = int(match.group("exit"))
+                if result["simulator"] == "unknown" and "command=vvp" in line:
+                    result["simulator"] = "icarus"
+            elif kind == "verilator_finish":
+                result["finished"] = True
+                result["finish_time_ns"] = to_ns(float(match.group("time")), match.group("unit"))
+                result["wall_time_s"] = result["wall_time_s"] or float(match.group("wall"))
+            elif kind == "finish_location":
+                result["testbench"] = result["testbench"] or Path(match.group("file")).stem
+            elif kind == "icarus_finish":
+                result["finished"] = True
+                scale = int(match.group("scale") or 1)
+                result["finish_time_ns"] = to_ns(int(match.group("time")), match.group("unit"), scale)
+                if match.group("file"):
+                    result["testbench"] = result["testbench"] or Path(match.group("file")).stem
+            elif kind == "summary":
+                summary = (int(match.group("passed")), int(match.group("failed")))
+            elif kind in ("pass", "fail"):
+                checks[kind] += 1
+                if kind == "fail":
+                    _add_message(result, line)
+            elif kind == "assertion":
+                result["assertion_failures"] += 1
+                _add_message(result, line)
+            elif kind in ("error", "fatal"):
+                result["errors"] += 1
+                _add_message(result, line)
+            elif kind == "timeout":
+                result["timeout"] = True
+                _add_message(result, line)
+
+    # The testbench's own summary line is authoritative over counted PASS/FAIL lines
+    result["passed"], result["failed"] = summary if summary else (checks["pass"], checks["fail"])
+    result["testbench"] = result["testbench"] or log_path.stem
+    failed = (result["failed"] or result["assertion_failures"] or result["errors"] or result["timeout"]
+              or (result["exit_code"] not in (None, 0)))
+    if failed:
+        result["status"] = "failed"
+    elif result["finished"] or result["exit_code"] == 0:
+        result["status"] = "passed"
+    return result
+
+
+def _add_message(result: Dict[str, Any], line: str):
+    """Keep the first failure messages of a log."""
+    if len(result["messages"]) < MAX_MESSAGES:
+        result["messages"].append(line.strip()[:200])
+
+
+def parse_cocotb_results(results_path: Path) -> List[Dict[str, Any]]:
+    """Per-test results from a cocotb results.xml (JUnit), streamed."""
+    tests = []
+    for _, element in ET.iterparse(str(results_path), events=("end",)):
+        if element.tag != "testcase":
+            continue
+        outcome = "passed"
+        message = None
+        for child in element:
+            if child.tag in ("failure", "error"):
+                outcome = "failed"
+                message = child.get("message") or (child.text or "").strip()[:200]
+            elif child.tag == "skipped":
+                outcome = "skipped"
+        sim_time = element.get("sim_time_ns")
+        tests.append({
+            "name": element.get("name"),
+            "module": element.get("classname"),
+            "status": outcome,
+            "wall_time_s": float(element.get("time", 0) or 0),
+            "sim_time_ns": float(sim_time) if sim_time else None,
+            "message": message
+        })
+        element.clear()
+    return tests
+
+
+def _add_speed(result: Dict[str, Any], sim_time_ns: Optional[float], wall_time_s: Optional[float],
+               period_ns: Optional[float]):
+    """Derive simulated cycles and cycles per second."""
+    cycles = int(sim_time_ns / period_ns) if sim_time_ns is not None and period_ns else None
+    result["clock_period_ns"] = period_ns
+    result["simulated_cycles"] = cycles
+    result["cycles_per_second"] = round(cycles / wall_time_s, 1) if cycles is not None and wall_time_s else None
+
+
+def find_sim_logs(project_root: Path) -> List[Path]:
+    """Simulation logs of a project."""
+    logs = []
+    for pattern in SIM_LOG_PATTERNS:
+        logs.extend(sorted(p for p in Path(project_root).glob(pattern) if p.is_file() and p not in logs))
+    return logs
+
+
+def analyze_simulations(project_root: Path = Path("."), logs: Optional[List[Path]] = None) -> Dict[str, Any]:
+    """Testbench results and simulation speed from the simulation logs and cocotb results."""
+    project_root = Path(project_root)
+    default_period = default_clock_period_ns(project_root)
+    runs = []
+    for log_path in (find_sim_logs(project_root) if logs is None else logs):
+        try:
+            run = parse_sim_log(log_path)
+        except OSError as e:
+            print(f"Warning: Could not read {log_path}: {e}")
+            continue
+        source = find_testbench_source(project_root, run["testbench"])
+        period = (testbench_clock_period_ns(source) if source else None) or default_period
+        _add_speed(run, run["finish_time_ns"], run["wall_time_s"], period)
+        runs.append(run)
+
+    cocotb_tests = []
+    if logs is None:
+        seen = set()
+        for pattern in COCOTB_RESULT_PATTERNS:
+            for results_path in sorted(project_root.glob(pattern)):
+                if results_path in seen:
+                    continue
+                seen.add(results_path)
+                try:
+                    tests = parse_cocotb_results(results_path)
+                except (ET.ParseError, OSError) as e:
+                    print(f"Warning: Could not read {results_path}: {e}")
+                    continue
+                for test in tests:
+                    test["results"] = str(results_path)
+                    _add_speed(test, test["sim_time_ns"], test["wall_time_s"], default_period)
+                cocotb_tests.extend(tests)
+
+    return {
+        "runs": runs,
+        "cocotb_tests": cocotb_tests,
+        "speed": simulation_speed(runs, cocotb_tests)
+    }
+
+
+def simulation_speed(runs: List[Dict[str, Any]], cocotb_tests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Simulated cycles per wall-clock second per simulator."""
+    speed = {}
+    for simulator, entry in [(run["simulator"], run) for run in runs] + [("cocotb", test) for test in cocotb_tests]:
+        totals = speed.setdefault(simulator, {"runs": 0, "timed_runs": 0, "simulated_cycles": 0, "wall_time_s": 0.0})
+        totals["runs"] += 1
+        if entry["simulated_cycles"] is not None and entry["wall_time_s"]:
+            totals["timed_runs"] += 1
+            totals["simulated_cycles"] += entry["simulated_cycles"]
+            totals["wall_time_s"] += entry["wall_time_s"]
+    for totals in speed.values():
+        totals["wall_time_s"] = round(totals["wall_time_s"], 3)
+        totals["cycles_per_second"] = (round(totals["simulated_cycles"] / totals["wall_time_s"], 1)
+                                       if totals["wall_time_s"] else None)
+    return speed
+
+
+def run_command(command: List[str]) -> int:
+    """Run a simulator command with inherited output and append a timing footer."""
+    sys.stdout.flush()
+    start = time.perf_counter()
+    try:
+        exit_code = subprocess.run(command).returncode
+    except OSError as e:
+        print(f"{command[0]}: {e}", file=sys.stderr)
+        exit_code = 127
+    wall = time.perf_counter() - start
+    print(f"{RUN_FOOTER} wall_time_s={wall:.6f} exit_code={exit_code} command={Path(command[0]).name}", flush=True)
+    return exit_code
+
+
+def print_results(analysis: Dict[str, Any]):
+    """Print testbench results and simulation speed."""
+    print("🧪 SIMULATION RESULTS")
+    if not analysis["runs"] and not analysis["cocotb_tests"]:
+        print("   No simulation logs found")
+    for run in analysis["runs"]:
+        icon = {"passed": "✅", "failed": "❌"}.get(run["status"], "⚠️ ")
+        wall = f"{run['wall_time_s']:.3f}s" if run["wall_time_s"] is not None else "n/a"
+        print(f"{icon} {run['testbench']} ({run['simulator']}): {run['status']}, {run['passed']} passed, "
+              f"{run['failed']} failed, {run['assertion_failures']} assertion failures, wall {wall}")
+        for message in run["messages"][:3]:
+            print(f"     {message}")
+    if analysis["cocotb_tests"]:
+        failed = sum(1 for test in analysis["cocotb_tests"] if test["status"] == "failed")
+        print(f"   cocotb: {len(analysis['cocotb_tests'])} tests, {failed} failed")
+    for simulator, totals in analysis["speed"].items():
+        if totals["cycles_per_second"]:
+            print(f"⚡ {simulator}: {totals['cycles_per_second']:,.0f} cycles/s "
+                  f"({totals['simulated_cycles']:,} cycles in {totals['wall_time_s']:.3f}s)")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Parse simulation logs or time a simulator run")
+    subparsers = parser.add_subparsers(dest="command")
+    parse_parser = subparsers.add_parser("parse", help="Summarize simulation logs")
+    parse_parser.add_argument("logs", nargs="*", help="Log files (default: the project's simulation logs)")
+    parse_parser.add_argument("--project-root", default=".", help="Project root directory")
+    parse_parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    run_parser = subparsers.add_parser("run", help="Run a simulator and append a wall-time footer to its output")
+    run_parser.add_argument("argv", nargs=argparse.REMAINDER, help="Command to run (after --)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        command = args.argv[1:] if args.argv[:1] == ["--"] else args.argv
+        if not command:
+            run_parser.error("no command given")
+        return run_command(command)
+    if args.command != "parse":
+        parser.print_help()
+        return 1
+
+    analysis = analyze_simulations(Path(args.project_root), [Path(p) for p in args.logs] if args.logs else None)
+    if args.output == "json":
+        print(json.dumps(analysis, indent=2))
+    else:
+        print_results(analysis)
+    return 1 if any(run["status"] == "failed" for run in analysis["runs"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Vyges Incremental Site Builder
+
+Incremental build support for the GitHub Pages output. Every page declares
+its input files (templates, metadata, report artifacts) and input values
+(repository name, ...); a page is only re-rendered when one of them changed
+or its output went missing. Static assets are copied once under a
+content-fingerprinted name so they can be served with long cache lifetimes.
+
+State is kept in `<site>/site-manifest.json`:
+    {
+      "version": 1,
+      "files": {"<input path>": {"size": ..., "mtime_ns": ..., "sha256": ...}},
+      "pages": {"index.html": {"inputs": {...}, "values": "<sha256>", "output": {...}}},
+      "assets": {"report-style.css": {"sha256": ..., "path": "assets/report-style.1a2b3c4d.css"}}
+    }
+
+Input files are only re-hashed when their size or mtime changed, so a no-op
+rebuild costs one stat() per input.
+
+Usage:
+    python scripts/site_builder.py [site_dir]    # show manifest status
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional
+
+from profiler import cache_lookup
+
+
+MANIFEST_NAME = "site-manifest.json"
+MANIFEST_VERSION = 1
+
+# Files published as fingerprinted static assets
+ASSET_PATTERNS = ["*.css", "*.js", "*.svg", "*.png", "*.ico", "*.woff2"]
+
+# Length of the content hash embedded in asset file names
+FINGERPRINT_LENGTH = 8
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the SHA-256 hex digest of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_values(values: Dict[str, Any]) -> str:
+    """Return a stable digest of JSON-serializable input values."""
+    return hash_bytes(json.dumps(values, sort_keys=True, default=str).encode("utf-8"))
+
+
+def fingerprint_name(name: str, digest: str) -> str:
+    """Insert a content hash into a file name: style.css -> style.1a2b3c4d.css."""
+    stem, suffix = os.path.splitext(name)
+    return f"{stem}.{digest[:FINGERPRINT_LENGTH]}{suffix}"
+
+
+class DigestCache:
+    """SHA-256 digests of files, reused while a file's size and mtime are unchanged."""
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.entries = entries if entries is not None else {}
+        self.hashed = 0
+
+    def digest(self, path: str) -> Optional[str]:
+        """Return a file's digest (None if it does not exist)."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.entries.pop(path, None)
+            return None
+        cached = self.entries.get(path)
+        hit = bool(cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns)
+        cache_lookup("file_digest", hit)
+        if hit:
+            return cached["sha256"]
+        digest = hash_file(path)
+        self.hashed += 1
+        self.entries[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+
+
+class SiteBuilder:
+    """Track page inputs and fingerprinted assets for one site directory."""
+
+    def __init__(self, site_dir: str = "public", force: bool = False):
+        self.site_dir = Path(site_dir)
+        self.manifest_path = self.site_dir / MANIFEST_NAME
+        self.force = force
+        self.manifest = self._load_manifest()
+        self.digests = DigestCache(self.manifest["files"])
+        self.stats = {"rendered": 0, "skipped": 0, "assets_copied": 0, "assets_reused": 0, "hashed": 0}
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the previous manifest, starting fresh if it is missing or outdated."""
+        empty = {"version": MANIFEST_VERSION, "files": {}, "pages": {}, "assets": {}}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return empty
+        if manifest.get("version") != MANIFEST_VERSION:
+            return empty
+        for key in ("files", "pages", "assets"):
+            manifest.setdefault(key, {})
+        return manifest
+
+    def file_digest(self, path: str) -> Optional[str]:
+        """Return a file's digest, reusing the manifest entry while size and mtime match."""
+        digest = self.digests.digest(path)
+        self.stats["hashed"] = self.digests.hashed
+        return digest
+
+    def _output_current(self, output_path: Path, recorded: Dict[str, Any]) -> bool:
+        """Check that a previously rendered output is still on disk unchanged."""
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return False
+        return recorded.get("size") == stat.st_size and recorded.get("mtime_ns") == stat.st_mtime_ns
+
+    def build_page(self, name: str, input_files: List[str], values: Dict[str, Any],
+                   render: Callable[[], bool]) -> bool:
+        """Run `render` for a page only if its inputs changed; return False if rendering failed."""
+        output_path = self.site_dir / name
+        inputs = {path: self.file_digest(path) for path in input_files}
+        values_digest = hash_values(values)
+        previous = self.manifest["pages"].get(name)
+
+        if (not self.force and previous and previous["inputs"] == inputs
+                and previous["values"] == values_digest
+                and self._output_current(output_path, previous.get("output", {}))):
+            self.stats["skipped"] += 1
+            print(f"⏭️  {name}: up to date")
+            return True
+
+        if not render():
+            self.manifest["pages"].pop(name, None)
+            return False
+        if not output_path.exists():
+            # Optional page that the renderer chose not to produce
+            self.manifest["pages"].pop(name, None)
+            return True
+        self.stats["rendered"] += 1
+
+        stat = os.stat(output_path)
+        self.manifest["pages"][name] = {
+            "inputs": inputs,
+            "values": values_digest,
+            "output": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": hash_file(output_path)}
+        }
+        return True
+
+    def publish_assets(self, source_dir: str, asset_dir: str = "assets") -> Dict[str, str]:
+        """Copy static assets under fingerprinted names; return name -> site-relative URL."""
+        source = Path(source_dir)
+        target = self.site_dir / asset_dir
+        published = {}
+        if not source.is_dir():
+            return published
+
+        names = sorted({path.name for pattern in ASSET_PATTERNS for path in source.glob(pattern) if path.is_file()})
+        for name in names:
+            digest = self.file_digest(str(source / name))
+            relative = f"{asset_dir}/{fingerprint_name(name, digest)}"
+            destination = self.site_dir / relative
+            if destination.exists() and not self.force:
+                self.stats["assets_reused"] += 1
+            else:
+                target.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source / name, destination)
+                self.stats["assets_copied"] += 1
+
+            # Drop the previous fingerprint of a changed asset
+            previous = self.manifest["assets"].get(name)
+            if previous and previous["path"] != relative:
+                stale = self.site_dir / previous["path"]
+                if stale.exists():
+                    stale.unlink()
+            self.manifest["assets"][name] = {"sha256": digest, "path": relative}
+            published[name] = relative
+
+        for name in set(self.manifest["assets"]) - set(published):
+            stale = self.site_dir / self.manifest["assets"].pop(name)["path"]
+            if stale.exists():
+                stale.unlink()
+        return published
+
+    def save(self):
+        """Write the manifest."""
+        self.manifest["generated_at"] = datetime.now().isoformat()
+        self.site_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+    def summary(self) -> str:
+        """One-line summary of the work done in this build."""
+        s = self.stats
+        return (f"{s['rendered']} rendered, {s['skipped']} up to date, "
+                f"{s['assets_copied']} assets copied, {s['assets_reused']} reused, {s['hashed']} files hashed")
+
+
+def main():
+    """Main function."""
+    site_dir = sys.argv[1] if len(sys.argv) > 1 else "public"
+    manifest_path = Path(site_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        print(f"❌ No manifest found: {manifest_path}")
+        return 1
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    print(f"🌐 Site manifest: {manifest_path} (built {manifest.get('generated_at', 'unknown')})")
+    for name, page in sorted(manifest.get("pages", {}).items()):
+        missing = [path for path, digest in page["inputs"].items() if digest is None]
+        note = f" (missing inputs: {', '.join(missing)})" if missing else ""
+        print(f"   📄 {name}: {len(page['inputs'])} inputs{note}")
+    for name, asset in sorted(manifest.get("assets", {}).items()):
+        print(f"   🎨 {name} -> {asset['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
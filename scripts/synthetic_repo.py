@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Vyges Synthetic IP Repository Generator
+
+Generates deterministic synthetic IP repositories for benchmarking the
+report scripts at realistic and extreme scales:
+
+- rtl/            N SystemVerilog modules (50-400 lines each, chained instances)
+- tb/sv_tb/       one SystemVerilog testbench per ten modules
+- tb/cocotb/      cocotb test modules with many `@cocotb.test()` functions
+- docs/           Markdown documentation
+- constraints/    SDC clock constraints
+- build/          a deep object tree plus synthesis/lint/simulation logs
+                  (Yosys `stat` tables, Verilator warnings) and a VCD dump,
+                  each padded to the requested size
+- vyges-metadata.json and the GitHub Pages templates
+
+The same scale and seed always produce the same files. A stamp file records
+the parameters, and an existing repository with a matching stamp is reused
+rather than regenerated. If git is available, the sources are committed so
+the git reader sees a real index.
+
+Usage:
+    python scripts/synthetic_repo.py OUTPUT_DIR [--scale small|medium|large|huge] [--seed N]
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, Any
+
+
+GENERATOR_VERSION = 1
+
+STAMP_FILE = ".synthetic-repo.json"
+
+# Scale presets; log_mb and vcd_mb are the sizes of the padded build logs and VCD dump
+SCALES = {
+    "small": {"rtl_files": 20, "build_depth": 2, "build_fanout": 3, "build_files": 5,
+              "log_mb": 1, "vcd_mb": 1, "cocotb_tests": 20},
+    "medium": {"rtl_files": 200, "build_depth": 3, "build_fanout": 4, "build_files": 10,
+               "log_mb": 50, "vcd_mb": 50, "cocotb_tests": 200},
+    "large": {"rtl_files": 2000, "build_depth": 4, "build_fanout": 5, "build_files": 10,
+              "log_mb": 500, "vcd_mb": 500, "cocotb_tests": 2000},
+    "huge": {"rtl_files": 5000, "build_depth": 5, "build_fanout": 5, "build_files": 10,
+             "log_mb": 2048, "vcd_mb": 4096, "cocotb_tests": 5000}
+}
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "reports" / "public"
+METADATA_TEMPLATE = Path(__file__).resolve().parent.parent / "vyges-metadata.template.json"
+
+TESTS_PER_COCOTB_FILE = 50
+
+_CELL_TYPES = ["$_AND_", "$_OR_", "$_XOR_", "$_NOT_", "$_MUX_", "$_DFF_P_", "$_DFFE_PP_", "$_SDFF_PP0_", "$_NAND_"]
+
+_YOSYS_FILLER = [
+    "Executing PROC_MUX pass (convert decision trees to multiplexers).",
+    "Creating decoders for process `\\{module}.$proc${file}:{line}$1'.",
+    "Warning: Replacing memory \\{module}.stage_q with list of registers. See {file}:{line}",
+    "Optimizing module {module}.",
+    "Removed {line} unused cells and {n} unused wires.",
+    "Warning: Wire {module}.\\tmp_{n} is used but has no driver.",
+]
+
+_LINT_FILLER = [
+    "%Warning-UNUSED: {file}:{line}:5: Signal is not used: 'tmp_{n}'",
+    "%Warning-WIDTH: {file}:{line}:12: Operator ASSIGN expects 32 bits on the Assign RHS, but Assign RHS's CONST '1'h0' generates 1 bits.",
+    "%Warning-DECLFILENAME: {file}:1:8: Filename 'gen' does not match MODULE name: '{module}'",
+]
+
+_VCD_CHARS = "!#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[]^_`abcdefghijklmnopqrstuvwxyz{|}~"
+
+
+def module_name(index: int) -> str:
+    """Name of the i-th synthetic RTL module."""
+    return f"gen_core_{index:05d}"
+
+
+def _write(path: Path, text: str):
+    """Write a text file, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def _write_padded(path: Path, header: str, size_mb: float, line_source) -> int:
+    """Write a header followed by generated lines until the file reaches `size_mb`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    target = int(size_mb * 1024 * 1024)
+    written = 0
+    with open(path, 'w') as f:
+        f.write(header)
+        written += len(header)
+        chunk = []
+        chunk_size = 0
+        while written + chunk_size < target:
+            line = line_source()
+            chunk.append(line)
+            chunk_size += len(line)
+            if chunk_size >= 1 << 20:
+                f.write("".join(chunk))
+                written += chunk_size
+                chunk, chunk_size = [], 0
+        f.write("".join(chunk))
+        written += chunk_size
+    return written
+
+
+def rtl_module(index: int, rng: random.Random) -> str:
+    """SystemVerilog source of one synthetic module."""
+    name = module_name(index)
+    stages = rng.randint(4, 40)
+    lines = [
+        f"// Synthetic benchmark module {index}",
+        f"module {name} #(",
+        "    parameter int WIDTH = 32,",
+        f"    parameter int STAGES = {stages}",
+        ") (",
+        "    input  logic             clk_i,",
+        "    input  logic             rst_ni,",
+        "    input  logic [WIDTH-1:0] data_i,",
+        "    input  logic             valid_i,",
+        "    output logic [WIDTH-1:0] data_o,",
+        "    output logic             valid_o",
+        ");",
+        "",
+        "    logic [WIDTH-1:0] stage_q [STAGES];",
+        "    logic [STAGES-1:0] valid_q;",
+        ""
+    ]
+    for stage in range(stages):
+        source = "data_i" if stage == 0 else f"stage_q[{stage - 1}]"
+        op = rng.choice(["^", "+", "&", "|"])
+        lines += [
+            "    always_ff @(posedge clk_i or negedge rst_ni) begin",
+            "        if (!rst_ni) begin",
+            f"            stage_q[{stage}] <= '0;",
+            "        end else begin",
+            f"            stage_q[{stage}] <= {source} {op} WIDTH'({rng.randint(0, 0xffff)});",
+            "        end",
+            "    end",
+            ""
+        ]
+    lines += [
+        "    always_ff @(posedge clk_i or negedge rst_ni) begin",
+        "        if (!rst_ni) valid_q <= '0;",
+        "        else valid_q <= {valid_q[STAGES-2:0], valid_i};",
+        "    end",
+        ""
+    ]
+    if index > 0 and rng.random() < 0.5:
+        child = module_name(rng.randrange(index))
+        lines += [
+            f"    {child} #(.WIDTH(WIDTH)) u_child (",
+            "        .clk_i, .rst_ni, .data_i(stage_q[STAGES-1]), .valid_i(valid_q[STAGES-1]),",
+            "        .data_o(), .valid_o()",
+            "    );",
+            ""
+        ]
+    lines += [
+        "    assign data_o  = stage_q[STAGES-1];",
+        "    assign valid_o = valid_q[STAGES-1];",
+        "",
+        "endmodule",
+        ""
+    ]
+    return "\n".join(lines)
+
+
+def testbench(index: int) -> str:
+    """SystemVerilog testbench for one module."""
+    name = module_name(index)
+    return f"""`timescale 1ns/1ps
+module tb_{name};
+    logic clk_i = 0, rst_ni = 0, valid_i = 0, valid_o;
+    logic [31:0] data_i = '0, data_o;
+    always #5 clk_i = ~clk_i;
+    {name} dut (.*);
+    initial begin
+        $dumpfile("tb_{name}.vcd");
+        $dumpvars(0, tb_{name});
+        #20 rst_ni = 1;
+        repeat (100) @(posedge clk_i) begin data_i <= $urandom; valid_i <= 1; end
+        $display("PASS: tb_{name}");
+        $finish;
+    end
+endmodule
+"""
+
+
+def cocotb_module(file_index: int, first_test: int, count: int) -> str:
+    """A cocotb test module with `count` tests."""
+    lines = [
+        '"""Synthetic cocotb tests."""',
+        "",
+        "import cocotb",
+        "from cocotb.clock import Clock",
+        "from cocotb.triggers import RisingEdge",
+        ""
+    ]
+    for test in range(first_test, first_test + count):
+        lines += [
+            "",
+            "@cocotb.test()",
+            f"async def test_case_{test:05d}(dut):",
+            f'    """Drive pattern {test} through the pipeline."""',
+            '    cocotb.start_soon(Clock(dut.clk_i, 10, units="ns").start())',
+            "    dut.rst_ni.value = 0",
+            "    await RisingEdge(dut.clk_i)",
+            "    dut.rst_ni.value = 1",
+            f"    dut.data_i.value = {test}",
+            "    for _ in range(8):",
+            "        await RisingEdge(dut.clk_i)",
+            ""
+        ]
+    return "\n".join(lines)
+
+
+def stat_block(index: int, rng: random.Random) -> str:
+    """Yosys `stat` output for one module."""
+    cells = {cell: rng.randint(1, 500) for cell in rng.sample(_CELL_TYPES, rng.randint(3, len(_CELL_TYPES)))}
+    wires = rng.randint(10, 400)
+    lines = [
+        "",
+        f"=== {module_name(index)} ===",
+        "",
+        f"   Number of wires:               {wires}",
+        f"   Number of wire bits:           {wires * 8}",
+        f"   Number of public wires:        {wires // 2}",
+        f"   Number of public wire bits:    {wires * 4}",
+        "   Number of memories:              0",
+        "   Number of memory bits:           0",
+        "   Number of processes:             0",
+        f"   Number of cells:               {sum(cells.values())}"
+    ]
+    lines += [f"     {cell:<20} {count}" for cell, count in cells.items()]
+    return "\n".join(lines) + "\n"
+
+
+def write_build_tree(root: Path, params: Dict[str, Any], rng: random.Random) -> int:
+    """Create a deep tree of small object files under build/obj."""
+    created = 0
+
+    def descend(directory: Path, depth: int):
+        nonlocal created
+        directory.mkdir(parents=True, exist_ok=True)
+        for index in range(params["build_files"]):
+            with open(directory / f"obj_{index:03d}.o", 'wb') as f:
+                f.write(rng.randbytes(rng.randint(64, 512)))
+            created += 1
+        if depth < params["build_depth"]:
+            for child in range(params["build_fanout"]):
+                descend(directory / f"d{depth}_{child}", depth + 1)
+
+    descend(root / "build" / "obj", 0)
+    return created
+
+
+def write_vcd(path: Path, params: Dict[str, Any], rng: random.Random) -> int:
+    """Write a VCD dump padded to vcd_mb."""
+    signals = []
+    header = ["$date synthetic $end", "$version synthetic_repo.py $end", "$timescale 1ps $end"]
+    modules = min(params["rtl_files"], 200)
+    header.append("$scope module tb $end")
+    for index in range(modules):
+        header.append(f"$scope module {module_name(index)} $end")
+        for signal, width in (("clk_i", 1), ("valid_i", 1), ("data_i", 32), ("data_o", 32)):
+            code = ""
+            number = len(signals)
+            while True:
+                code += _VCD_CHARS[number % len(_VCD_CHARS)]
+                number //= len(_VCD_CHARS)
+                if not number:
+                    break
+            header.append(f"$var wire {width} {code} {signal} $end")
+            signals.append((code, width))
+        header.append("$upscope $end")
+    header += ["$upscope $end", "$enddefinitions $end", "#0", "$dumpvars"]
+    header += [("0" + code) if width == 1 else f"b0 {code}" for code, width in signals]
+    header.append("$end")
+
+    state = {"time": 0}
+
+    def timestep() -> str:
+        state["time"] += 5000
+        changes = [f"#{state['time']}"]
+        for code, width in rng.sample(signals, min(len(signals), 16)):
+            if width == 1:
+                changes.append(f"{rng.randint(0, 1)}{code}")
+            else:
+                changes.append(f"b{rng.getrandbits(width):b} {code}")
+        return "\n".join(changes) + "\n"
+
+    return _write_padded(path, "\n".join(header) + "\n", params["vcd_mb"], timestep)
+
+
+def write_logs(root: Path, params: Dict[str, Any], rng: random.Random):
+    """Write synthesis, lint and simulation logs padded to log_mb."""
+    modules = params["rtl_files"]
+    stats = "".join(stat_block(index, rng) for index in range(modules))
+
+    def filler(templates):
+        def line() -> str:
+            index = rng.randrange(modules)
+            return rng.choice(templates).format(
+                module=module_name(index), file=f"rtl/{module_name(index)}.sv",
+                line=rng.randint(1, 400), n=rng.randint(0, 9999)) + "\n"
+        return line
+
+    logs = root / "build" / "logs"
+    # Yosys prints the stat tables at the end of the log
+    synthesis = logs / "synthesis.log"
+    _write_padded(synthesis, "Yosys 0.38 (synthetic)\n", params["log_mb"], filler(_YOSYS_FILLER))
+    with open(synthesis, 'a') as f:
+        f.write("\n2.50. Printing statistics.\n" + stats)
+    _write_padded(logs / "lint.log", "", params["log_mb"] / 4, filler(_LINT_FILLER))
+    results = "".join(f"PASS: tb_{module_name(index)}\n" for index in range(0, modules, 10))
+    _write(logs / "simulation.log", results)
+
+
+def write_metadata(root: Path, params: Dict[str, Any]):
+    """Write vyges-metadata.json listing the generated sources."""
+    with open(METADATA_TEMPLATE, 'r') as f:
+        metadata = json.load(f)
+    metadata["name"] = "example.com/synthetic-ip"
+    metadata["sourceFiles"] = (
+        [{"path": f"rtl/{module_name(i)}.sv", "type": "rtl"} for i in range(params["rtl_files"])] +
+        [{"path": f"tb/sv_tb/tb_{module_name(i)}.sv", "type": "testbench"} for i in range(0, params["rtl_files"], 10)])
+    _write(root / "vyges-metadata.json", json.dumps(metadata, indent=2))
+
+
+def commit_sources(root: Path):
+    """Commit everything outside build/ so the repository has a real git index."""
+    git = ["git", "-c", "user.name=synthetic", "-c", "user.email=synthetic@example.com", "-c", "init.defaultBranch=main"]
+    try:
+        for args in (["init", "-q"], ["add", "-A"], ["commit", "-q", "-m", "Synthetic IP repository"]):
+            subprocess.run(git + args, cwd=root, check=True, capture_output=True)
+    except (subprocess.SubprocessError, FileNotFoundError):
+        print("⚠️  git not available; synthetic repository is not under version control")
+
+
+def generate_repo(output_dir: Path, params: Dict[str, Any], seed: int = 0, force: bool = False) -> Dict[str, Any]:
+    """Generate a synthetic repository; reuse an existing one built with the same parameters."""
+    output_dir = Path(output_dir)
+    stamp = {"generator_version": GENERATOR_VERSION, "seed": seed, "params": params}
+    stamp_path = output_dir / STAMP_FILE
+    if not force and stamp_path.exists():
+        with open(stamp_path, 'r') as f:
+            existing = json.load(f)
+        if {key: existing.get(key) for key in stamp} == stamp:
+            return existing
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+
+    rng = random.Random(seed)
+    for index in range(params["rtl_files"]):
+        _write(output_dir / "rtl" / f"{module_name(index)}.sv", rtl_module(index, rng))
+        if index % 10 == 0:
+            _write(output_dir / "tb" / "sv_tb" / f"tb_{module_name(index)}.sv", testbench(index))
+
+    for first in range(0, params["cocotb_tests"], TESTS_PER_COCOTB_FILE):
+        count = min(TESTS_PER_COCOTB_FILE, params["cocotb_tests"] - first)
+        _write(output_dir / "tb" / "cocotb" / f"test_gen_{first // TESTS_PER_COCOTB_FILE:04d}.py",
+               cocotb_module(first // TESTS_PER_COCOTB_FILE, first, count))
+
+    for doc in ("architecture", "design_spec", "integration"):
+        _write(output_dir / "docs" / f"synthetic-{doc}.md",
+               f"# Synthetic {doc.replace('_', ' ').title()}\n\n" +
+               "".join(f"## {module_name(i)}\n\nPipeline stage description.\n\n" for i in range(min(params["rtl_files"], 50))))
+    _write(output_dir / "README.md", "# Synthetic IP\n\nGenerated by scripts/synthetic_repo.py.\n")
+    _write(output_dir / "constraints" / "constraints.sdc", "create_clock -name clk_i -period 10.0 [get_ports clk_i]\n")
+    _write(output_dir / ".gitignore", "build/\nreports/\npublic/index.html\npublic/waveforms/\n")
+    write_metadata(output_dir, params)
+    for template in ("index_template.html", "waveforms_template.html"):
+        if (TEMPLATE_DIR / template).exists():
+            (output_dir / "public").mkdir(parents=True, exist_ok=True)
+            shutil.copy2(TEMPLATE_DIR / template, output_dir / "public" / template)
+    for asset in TEMPLATE_DIR.glob("*.css"):
+        (output_dir / "reports" / "public").mkdir(parents=True, exist_ok=True)
+        shutil.copy2(asset, output_dir / "reports" / "public" / asset.name)
+    commit_sources(output_dir)
+
+    build_files = write_build_tree(output_dir, params, rng)
+    write_logs(output_dir, params, rng)
+    vcd_bytes = write_vcd(output_dir / "build" / "sim" / "waves.vcd", params, rng)
+
+    total_files = sum(len(files) for root, dirs, files in os.walk(output_dir) if ".git" not in Path(root).parts)
+    total_bytes = sum(p.stat().st_size for p in output_dir.rglob("*") if p.is_file() and ".git" not in p.parts)
+    stamp.update({"total_files": total_files, "total_bytes": total_bytes,
+                  "build_files": build_files, "vcd_bytes": vcd_bytes})
+    with open(stamp_path, 'w') as f:
+        json.dump(stamp, f, indent=2)
+    return stamp
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Vyges IP repository")
+    parser.add_argument("output", help="Output directory")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Size preset")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the stamp matches")
+    for key in SCALES["small"]:
+        parser.add_argument(f"--{key.replace('_', '-')}", type=float if key.endswith("_mb") else int,
+                            help=f"Override the preset's {key}")
+    args = parser.parse_args()
+
+    params = dict(SCALES[args.scale])
+    for key in params:
+        value = getattr(args, key)
+        if value is not None:
+            params[key] = value
+
+    stamp = generate_repo(Path(args.output), params, args.seed, args.force)
+    print(f"✅ Synthetic repository: {args.output} ({stamp['total_files']:,} files, "
+          f"{stamp['total_bytes'] / 1e6:,.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
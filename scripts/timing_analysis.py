@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Vyges Static Timing Summary Extractor
+
+This script extracts timing KPIs for Vyges IP projects from:
+- Clock definitions in SDC/XDC constraint files
+- OpenSTA/OpenROAD timing reports (report_checks, report_wns, report_tns)
+- Yosys `sta` and ABC `stime` output
+
+Reports are streamed line by line so multi-GB STA dumps can be summarized
+without loading them into memory.
+
+Usage:
+    python scripts/timing_analysis.py [--project-root DIR] [--sdc FILE] [--report FILE] [--output json|text]
+"""
+
+import re
+import sys
+import json
+import heapq
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+# Constraint and report discovery patterns
+CONSTRAINT_PATTERNS = ["*.sdc", "*.xdc"]
+TIMING_REPORT_PATTERNS = ["sta.rpt", "sta.log", "*_sta.rpt", "*_sta.log", "opensta*.rpt", "opensta*.log",
+                          "*timing*.rpt", "*timing*.log"]
+
+# Bytes read from the head of a candidate report to confirm it is one
+REPORT_SNIFF_BYTES = 64 * 1024
+
+# Number of worst paths kept per clock
+CRITICAL_PATH_COUNT = 5
+
+# OpenSTA report_checks markers
+_STARTPOINT_RE = re.compile(r'^\s*Startpoint:\s*(\S+)')
+_ENDPOINT_RE = re.compile(r'^\s*Endpoint:\s*(\S+)(?:.*clocked by\s+(\S+?)\))?')
+_PATH_GROUP_RE = re.compile(r'^\s*Path Group:\s*(\S+)')
+_PATH_TYPE_RE = re.compile(r'^\s*Path Type:\s*(\S+)')
+_ARRIVAL_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s+data arrival time')
+_SLACK_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s+slack\s*\((MET|VIOLATED)')
+
+# OpenSTA/OpenROAD summary lines
+_WNS_RE = re.compile(r'^\s*wns(?:\s+max)?\s+(-?\d+(?:\.\d+)?)')
+_TNS_RE = re.compile(r'^\s*tns(?:\s+max)?\s+(-?\d+(?:\.\d+)?)')
+_WORST_SLACK_RE = re.compile(r'^\s*worst slack(?:\s+max)?\s+(-?\d+(?:\.\d+)?)')
+
+# Yosys sta / ABC stime
+_YOSYS_ARRIVAL_RE = re.compile(r"Latest arrival time in '([^']+)' is (\d+(?:\.\d+)?)")
+_ABC_DELAY_RE = re.compile(r'Delay\s*=\s*(\d+(?:\.\d+)?)\s*ps')
+
+_REPORT_MARKERS = [_STARTPOINT_RE, _SLACK_RE, _WNS_RE, _TNS_RE, _WORST_SLACK_RE, _YOSYS_ARRIVAL_RE, _ABC_DELAY_RE]
+
+
+def _tokenize_tcl(line: str) -> List[str]:
+    """Split a Tcl command into words, keeping [..] and {..} groups intact."""
+    tokens = []
+    current = ""
+    depth = 0
+    for char in line:
+        if char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth = max(depth - 1, 0)
+        if char.isspace() and depth == 0:
+            if current:
+                tokens.append(current)
+                current = ""
+        else:
+            current += char
+    if current:
+        tokens.append(current)
+    return tokens
+
+
+def _object_names(token: str) -> List[str]:
+    """Extract object names from `[get_ports {a b}]` or a bare name."""
+    token = token.strip()
+    if token.startswith("["):
+        words = _tokenize_tcl(token.strip("[]"))[1:]
+        names = []
+        for word in words:
+            if word.startswith("-"):
+                continue
+            names.extend(word.strip("{}").split())
+        return names
+    return token.strip("{}").split()
+
+
+def _iter_tcl_commands(file_path: Path):
+    """Yield complete Tcl commands from a constraint file, joining continuations."""
+    pending = ""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for raw_line in f:
+            line = raw_line.strip()
+            if not pending and (not line or line.startswith("#")):
+                continue
+            if line.endswith("\\"):
+                pending += line[:-1] + " "
+                continue
+            command = pending + line
+            pending = ""
+            for part in command.split(";"):
+                part = part.strip()
+                if part and not part.startswith("#"):
+                    yield part
+    if pending.strip():
+        yield pending.strip()
+
+
+def parse_constraint_clocks(file_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Parse clock definitions from an SDC or XDC file."""
+    clocks = {}
+    generated = []
+
+    for command in _iter_tcl_commands(file_path):
+        tokens = _tokenize_tcl(command)
+        if not tokens:
+            continue
+
+        if tokens[0] in ("create_clock", "create_generated_clock"):
+            options = {}
+            targets = []
+            i = 1
+            while i < len(tokens):
+                token = tokens[i]
+                if token in ("-add", "-invert", "-combinational"):
+                    options[token[1:]] = True
+                    i += 1
+                elif token.startswith("-") and i + 1 < len(tokens):
+                    options[token[1:]] = tokens[i + 1]
+                    i += 2
+                else:
+                    targets.extend(_object_names(token))
+                    i += 1
+
+            name = options.get("name", "").strip("{}") or (targets[0] if targets else "")
+            if not name:
+                continue
+
+            clock = {
+                "name": name,
+                "period_ns": None,
+                "frequency_mhz": None,
+                "waveform": None,
+                "targets": targets,
+                "uncertainty_ns": None,
+                "generated": tokens[0] == "create_generated_clock",
+                "source_file": str(file_path)
+            }
+
+            if "period" in options:
+                try:
+                    clock["period_ns"] = float(options["period"])
+                except ValueError:
+                    pass
+            if "waveform" in options:
+                try:
+                    clock["waveform"] = [float(v) for v in options["waveform"].strip("{}").split()]
+                except ValueError:
+                    pass
+
+            if clock["generated"]:
+                generated.append((clock, options))
+            clocks[name] = clock
+
+        elif tokens[0] == "set_clock_uncertainty" and len(tokens) >= 3:
+            value = None
+            for token in tokens[1:]:
+                if token.startswith("-") or token.startswith("["):
+                    continue
+                try:
+                    value = float(token)
+                    break
+                except ValueError:
+                    continue
+            if value is None:
+                continue
+            for token in tokens[1:]:
+                if token.startswith("[get_clocks"):
+                    for clock_name in _object_names(token):
+                        if clock_name in clocks:
+                            clocks[clock_name]["uncertainty_ns"] = value
+
+    # Resolve generated clock periods from their master clocks
+    for clock, options in generated:
+        master_name = options.get("master_clock", "").strip("{}")
+        master = clocks.get(master_name)
+        if master is None and len(clocks) - len(generated) == 1:
+            master = next(c for c in clocks.values() if not c["generated"])
+        if master and master.get("period_ns"):
+            try:
+                divide_by = float(options.get("divide_by", 1))
+                multiply_by = float(options.get("multiply_by", 1))
+                clock["period_ns"] = master["period_ns"] * divide_by / multiply_by
+            except (ValueError, ZeroDivisionError):
+                pass
+
+    for clock in clocks.values():
+        if clock["period_ns"]:
+            clock["frequency_mhz"] = 1000.0 / clock["period_ns"]
+
+    return clocks
+
+
+def _new_clock_summary() -> Dict[str, Any]:
+    """Create an empty per-clock timing accumulator."""
+    return {
+        "wns": None,
+        "tns": 0.0,
+        "worst_hold_slack": None,
+        "endpoints": {},
+        "critical_paths": [],
+        "worst_arrival": None
+    }
+
+
+def parse_sta_report(report_path: Path, top_n: int = CRITICAL_PATH_COUNT) -> Dict[str, Any]:
+    """Stream an STA report and summarize slack per clock."""
+    result = {
+        "report": str(report_path),
+        "format": "unknown",
+        "paths_analyzed": 0,
+        "clocks": {},
+        "summary_wns": None,
+        "summary_tns": None,
+        "critical_path_delay_ps": None,
+        "critical_path_module": None
+    }
+
+    clock_data = {}
+    path = {}
+    sequence = 0
+
+    with open(report_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = _STARTPOINT_RE.match(line)
+            if match:
+                path = {"startpoint": match.group(1)}
+                result["format"] = "opensta"
+                continue
+
+            match = _ENDPOINT_RE.match(line)
+            if match:
+                path["endpoint"] = match.group(1)
+                if match.group(2):
+                    path["clock"] = match.group(2)
+                continue
+
+            match = _PATH_GROUP_RE.match(line)
+            if match:
+                path["group"] = match.group(1)
+                continue
+
+            match = _PATH_TYPE_RE.match(line)
+            if match:
+                path["type"] = match.group(1)
+                continue
+
+            match = _ARRIVAL_RE.match(line)
+            if match:
+                path["arrival"] = float(match.group(1))
+                continue
+
+            match = _SLACK_RE.match(line)
+            if match and path:
+                slack = float(match.group(1))
+                clock = path.get("group") or path.get("clock") or "unclocked"
+                data = clock_data.setdefault(clock, _new_clock_summary())
+                result["paths_analyzed"] += 1
+
+                if path.get("type") == "min":
+                    if data["worst_hold_slack"] is None or slack < data["worst_hold_slack"]:
+                        data["worst_hold_slack"] = slack
+                    path = {}
+                    continue
+
+                if data["wns"] is None or slack < data["wns"]:
+                    data["wns"] = slack
+                    data["worst_arrival"] = path.get("arrival")
+
+                # TNS counts each endpoint once, at its worst slack
+                endpoint = path.get("endpoint", "")
+                previous = data["endpoints"].get(endpoint)
+                if previous is None or slack < previous:
+                    data["endpoints"][endpoint] = slack
+
+                entry = (-slack, sequence, {
+                    "startpoint": path.get("startpoint", ""),
+                    "endpoint": endpoint,
+                    "slack": slack,
+                    "arrival": path.get("arrival")
+                })
+                sequence += 1
+                if len(data["critical_paths"]) < top_n:
+                    heapq.heappush(data["critical_paths"], entry)
+                elif entry > data["critical_paths"][0]:
+                    heapq.heapreplace(data["critical_paths"], entry)
+                path = {}
+                continue
+
+            match = _WNS_RE.match(line) or _WORST_SLACK_RE.match(line)
+            if match:
+                value = float(match.group(1))
+                if result["summary_wns"] is None or value < result["summary_wns"]:
+                    result["summary_wns"] = value
+                if result["format"] == "unknown":
+                    result["format"] = "opensta"
+                continue
+
+            match = _TNS_RE.match(line)
+            if match:
+                result["summary_tns"] = float(match.group(1))
+                if result["format"] == "unknown":
+                    result["format"] = "opensta"
+                continue
+
+            match = _YOSYS_ARRIVAL_RE.search(line)
+            if match:
+                delay = float(match.group(2))
+                if result["critical_path_delay_ps"] is None or delay > result["critical_path_delay_ps"]:
+                    result["critical_path_delay_ps"] = delay
+                    result["critical_path_module"] = match.group(1)
+                result["format"] = "yosys"
+                continue
+
+            match = _ABC_DELAY_RE.search(line)
+            if match:
+                delay = float(match.group(1))
+                if result["critical_path_delay_ps"] is None or delay > result["critical_path_delay_ps"]:
+                    result["critical_path_delay_ps"] = delay
+                if result["format"] == "unknown":
+                    result["format"] = "abc"
+
+    for clock, data in clock_data.items():
+        endpoint_slacks = data["endpoints"].values()
+        result["clocks"][clock] = {
+            "wns": data["wns"],
+            "tns": sum(s for s in endpoint_slacks if s < 0),
+            "worst_hold_slack": data["worst_hold_slack"],
+            "endpoints": len(data["endpoints"]),
+            "violating_endpoints": sum(1 for s in endpoint_slacks if s < 0),
+            "worst_arrival": data["worst_arrival"],
+            "critical_paths": [entry[2] for entry in sorted(data["critical_paths"], reverse=True)]
+        }
+
+    return result
+
+
+def find_constraint_files(project_root: Path) -> List[Path]:
+    """Find SDC/XDC constraint files in the project."""
+    files = []
+    for pattern in CONSTRAINT_PATTERNS:
+        for file_path in project_root.rglob(pattern):
+            if ".git" not in str(file_path) and file_path.is_file():
+                files.append(file_path)
+    return sorted(files)
+
+
+def find_timing_reports(project_root: Path) -> List[Path]:
+    """Find STA/timing report files in the project."""
+    files = set()
+    for pattern in TIMING_REPORT_PATTERNS:
+        for file_path in project_root.rglob(pattern):
+            if ".git" not in str(file_path) and file_path.is_file():
+                files.add(file_path)
+    return sorted(path for path in files if looks_like_timing_report(path))
+
+
+def looks_like_timing_report(report_path: Path) -> bool:
+    """True if the head of a file contains an STA or Yosys/ABC timing line."""
+    try:
+        with open(report_path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read(REPORT_SNIFF_BYTES).splitlines()
+    except OSError:
+        return False
+    return any(marker.search(line) for line in lines for marker in _REPORT_MARKERS)
+
+
+def _fmax_mhz(period_ns: Optional[float], wns: Optional[float],
+              arrival_ns: Optional[float] = None) -> Optional[float]:
+    """Estimate Fmax from the clock period and worst slack."""
+    if period_ns and wns is not None:
+        delay = period_ns - wns
+    elif arrival_ns:
+        delay = arrival_ns
+    else:
+        return None
+    return 1000.0 / delay if delay > 0 else None
+
+
+def analyze_timing(project_root: Path,
+                   constraint_files: Optional[List[Path]] = None,
+                   report_files: Optional[List[Path]] = None) -> Dict[str, Any]:
+    """Combine constraint clocks and STA reports into timing KPIs."""
+    project_root = Path(project_root)
+    if constraint_files is None:
+        constraint_files = find_constraint_files(project_root)
+    if report_files is None:
+        report_files = find_timing_reports(project_root)
+
+    timing = {
+        "constraint_files": [],
+        "clock_count": 0,
+        "clocks": {},
+        "timing_reports": [],
+        "timing_data_available": False,
+        "wns_ns": None,
+        "tns_ns": None,
+        "timing_met": None,
+        "fmax_mhz": {},
+        "critical_path_delay_ps": None,
+        "critical_paths": []
+    }
+
+    # Clock definitions (first definition of a clock wins, later files add sources)
+    for file_path in constraint_files:
+        try:
+            clocks = parse_constraint_clocks(file_path)
+        except (UnicodeDecodeError, OSError):
+            continue
+        timing["constraint_files"].append(_relative(file_path, project_root))
+        for name, clock in clocks.items():
+            clock["source_file"] = _relative(file_path, project_root)
+            if name in timing["clocks"]:
+                timing["clocks"][name].setdefault("defined_in", []).append(clock["source_file"])
+            else:
+                clock["defined_in"] = [clock["source_file"]]
+                timing["clocks"][name] = clock
+    timing["clock_count"] = len(timing["clocks"])
+
+    # STA reports
+    per_clock = {}
+    summary_wns = []
+    summary_tns = []
+    for report_path in report_files:
+        try:
+            report = parse_sta_report(report_path)
+        except (UnicodeDecodeError, OSError):
+            continue
+        if report["format"] == "unknown":
+            continue
+
+        timing["timing_reports"].append(_relative(report_path, project_root))
+        if report["summary_wns"] is not None:
+            summary_wns.append(report["summary_wns"])
+        if report["summary_tns"] is not None:
+            summary_tns.append(report["summary_tns"])
+        if report["critical_path_delay_ps"] is not None:
+            current = timing["critical_path_delay_ps"]
+            if current is None or report["critical_path_delay_ps"] > current:
+                timing["critical_path_delay_ps"] = report["critical_path_delay_ps"]
+
+        for clock, data in report["clocks"].items():
+            merged = per_clock.get(clock)
+            if merged is None or (data["wns"] is not None and
+                                  (merged["wns"] is None or data["wns"] < merged["wns"])):
+                per_clock[clock] = data
+
+    for clock, data in per_clock.items():
+        period = timing["clocks"].get(clock, {}).get("period_ns")
+        fmax = _fmax_mhz(period, data["wns"], data["worst_arrival"])
+        timing["fmax_mhz"][clock] = fmax
+        timing["clocks"].setdefault(clock, {"name": clock, "period_ns": None, "frequency_mhz": None})
+        timing["clocks"][clock].update({
+            "wns_ns": data["wns"],
+            "tns_ns": data["tns"],
+            "worst_hold_slack_ns": data["worst_hold_slack"],
+            "endpoints": data["endpoints"],
+            "violating_endpoints": data["violating_endpoints"],
+            "fmax_mhz": fmax
+        })
+        for critical_path in data["critical_paths"]:
+            timing["critical_paths"].append(dict(critical_path, clock=clock))
+
+    timing["critical_paths"].sort(key=lambda p: p["slack"])
+    timing["critical_paths"] = timing["critical_paths"][:CRITICAL_PATH_COUNT]
+
+    clock_wns = [d["wns"] for d in per_clock.values() if d["wns"] is not None]
+    if clock_wns or summary_wns:
+        timing["wns_ns"] = min(clock_wns + summary_wns)
+    if per_clock:
+        timing["tns_ns"] = sum(d["tns"] for d in per_clock.values())
+    elif summary_tns:
+        timing["tns_ns"] = min(summary_tns)
+
+    # Yosys/ABC reports only give a combinational delay for the whole design
+    if not timing["fmax_mhz"] and timing["critical_path_delay_ps"]:
+        fmax = 1e6 / timing["critical_path_delay_ps"]
+        for clock in timing["clocks"]:
+            timing["fmax_mhz"][clock] = fmax
+            timing["clocks"][clock]["fmax_mhz"] = fmax
+
+    timing["timing_data_available"] = bool(timing["timing_reports"])
+    if timing["wns_ns"] is not None:
+        timing["timing_met"] = timing["wns_ns"] >= 0
+
+    return timing
+
+
+def _relative(file_path: Path, project_root: Path) -> str:
+    """Return a project-relative path string when possible."""
+    try:
+        return str(Path(file_path).relative_to(project_root))
+    except ValueError:
+        return str(file_path)
+
+
+def _format_ns(value: Optional[float]) -> str:
+    """Format an optional time value in ns."""
+    return f"{value:.3f} ns" if value is not None else "N/A"
+
+
+def print_timing_report(timing: Dict[str, Any]):
+    """Print a formatted timing summary."""
+    print("=" * 60)
+    print("VYGES STATIC TIMING SUMMARY")
+    print("=" * 60)
+
+    print(f"\n🕒 CLOCKS ({timing['clock_count']}):")
+    for name, clock in timing["clocks"].items():
+        period = clock.get("period_ns")
+        freq = clock.get("frequency_mhz")
+        target = f"{period:.3f} ns ({freq:.1f} MHz)" if period and freq else "unknown period"
+        print(f"   {name}: {target}")
+
+    if not timing["timing_data_available"]:
+        print("\n⚠️  No STA reports found")
+        print("\n" + "=" * 60)
+        return
+
+    print(f"\n⏱️  TIMING:")
+    print(f"   WNS: {_format_ns(timing['wns_ns'])}")
+    print(f"   TNS: {_format_ns(timing['tns_ns'])}")
+    met = timing["timing_met"]
+    print(f"   Timing Met: {'✅' if met else '❌' if met is False else 'N/A'}")
+    for clock, fmax in timing["fmax_mhz"].items():
+        print(f"   Fmax ({clock}): {f'{fmax:.1f} MHz' if fmax else 'N/A'}")
+
+    if timing["critical_paths"]:
+        print(f"\n🔍 CRITICAL PATHS:")
+        for path in timing["critical_paths"]:
+            print(f"   [{path['clock']}] {path['startpoint']} → {path['endpoint']}: {path['slack']:.3f} ns")
+
+    print("\n" + "=" * 60)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Extract static timing KPIs from SDC/XDC and STA reports")
+    parser.add_argument("--project-root", default=".", help="Project root directory")
+    parser.add_argument("--sdc", action="append", help="Constraint file (default: discover *.sdc/*.xdc)")
+    parser.add_argument("--report", action="append", help="STA report file (default: discover)")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+
+    args = parser.parse_args()
+
+    project_root = Path(args.project_root)
+    constraint_files = [Path(p) for p in args.sdc] if args.sdc else None
+    report_files = [Path(p) for p in args.report] if args.report else None
+    timing = analyze_timing(project_root, constraint_files, report_files)
+
+    if args.output == "json":
+        print(json.dumps(timing, indent=2))
+    else:
+        print_timing_report(timing)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
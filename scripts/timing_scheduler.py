@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Vyges Duration-Aware Test Scheduler
+
+Keeps the wall-clock duration of every test run in a small local SQLite
+database (`build/test_timings.db`) and uses it to order and shard
+regressions:
+
+    record      store the durations of the current results (SystemVerilog
+                testbench logs and cocotb results.xml, via sim_log_parser.py);
+                a results file is recorded once, however often it is read
+    schedule    longest-processing-time-first (LPT) ordering: tests sorted by
+                estimated duration, each assigned to the least loaded worker
+    outliers    tests whose latest duration is well above their history
+
+A test is identified as `<simulator>:<testbench>` (e.g. `icarus:tb_example`)
+or `cocotb:<module>.<test>` (e.g. `cocotb:test_example.test_data_flow`). Its
+estimate is the median of its last passing runs. A test without history
+(new or renamed) gets the median estimate of the known tests of the same
+kind, or DEFAULT_DURATION_S when nothing is known, so it is neither
+scheduled first by accident nor hidden at the end.
+
+Usage:
+    python scripts/timing_scheduler.py record
+    python scripts/timing_scheduler.py schedule --workers 4 [--shard 2 --format names] [--test ID ...]
+    python scripts/timing_scheduler.py outliers [--ratio 1.5] [--min-slowdown 1.0]
+"""
+
+import os
+import re
+import sys
+import json
+import heapq
+import sqlite3
+import argparse
+import statistics
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from sim_log_parser import analyze_simulations, TESTBENCH_DIRS
+
+
+DEFAULT_DB = os.environ.get("TEST_TIMINGS_DB", "build/test_timings.db")
+
+# Passing runs per test used for its estimate and as the outlier baseline
+HISTORY_WINDOW = 10
+
+# Estimate of a test when no test of any kind has history yet
+DEFAULT_DURATION_S = 30.0
+
+# A latest run at least OUTLIER_RATIO times its baseline and OUTLIER_MIN_SLOWDOWN_S slower is an outlier
+OUTLIER_RATIO = 1.5
+OUTLIER_MIN_SLOWDOWN_S = 1.0
+OUTLIER_MIN_SAMPLES = 3
+
+# cocotb test modules searched for tests without history
+COCOTB_TEST_PATTERNS = ["tb/cocotb/test_*.py", "verification/cocotb/test_*.py"]
+
+_COCOTB_TEST_RE = re.compile(r'@cocotb\.test\([^)]*\)\s*\n\s*(?:async\s+)?def\s+(?P<name>\w+)')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS durations (
+    id INTEGER PRIMARY KEY,
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    wall_time_s REAL NOT NULL,
+    source TEXT NOT NULL,
+    source_mtime_ns INTEGER NOT NULL,
+    recorded_at TEXT NOT NULL,
+    UNIQUE (test, source, source_mtime_ns)
+);
+CREATE INDEX IF NOT EXISTS durations_by_test ON durations (test, id);
+"""
+
+
+def test_kind(test: str) -> str:
+    """Simulator part of a test id."""
+    return test.split(":", 1)[0]
+
+
+def timing_entries(analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Timed test runs from analyze_simulations() results."""
+    entries = []
+    runs = [(f"{run['simulator']}:{run['testbench']}", run["status"], run["wall_time_s"], run["log"])
+            for run in analysis["runs"] if run["status"] != "incomplete"]
+    runs += [(f"cocotb:{test['module']}.{test['name']}", test["status"], test["wall_time_s"], test["results"])
+             for test in analysis["cocotb_tests"] if test["status"] != "skipped"]
+    for test, status, wall_time_s, source in runs:
+        if not wall_time_s:
+            continue
+        try:
+            mtime = Path(source).stat().st_mtime_ns
+        except OSError:
+            continue
+        entries.append({"test": test, "status": status, "wall_time_s": wall_time_s, "source": source,
+                        "source_mtime_ns": mtime})
+    return entries
+
+
+class TimingDB:
+    """Recorded test durations."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, entries: List[Dict[str, Any]]) -> int:
+        """Store test runs; returns how many were new."""
+        recorded_at = datetime.now().isoformat(timespec="seconds")
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO durations (test, status, wall_time_s, source, source_mtime_ns, recorded_at) "
+                "VALUES (:test, :status, :wall_time_s, :source, :source_mtime_ns, :recorded_at)",
+                [{**entry, "recorded_at": recorded_at} for entry in entries])
+            return self.connection.total_changes - before
+
+    def history(self, window: int = HISTORY_WINDOW + 1) -> Dict[str, List[float]]:
+        """Durations of the last passing runs of every test, oldest first."""
+        rows = self.connection.execute(
+            "SELECT test, wall_time_s FROM ("
+            "  SELECT test, wall_time_s, id, ROW_NUMBER() OVER (PARTITION BY test ORDER BY id DESC) AS age"
+            "  FROM durations WHERE status = 'passed'"
+            ") WHERE age <= ? ORDER BY test, id", (window,))
+        history = {}
+        for test, wall_time_s in rows:
+            history.setdefault(test, []).append(wall_time_s)
+        return history
+
+
+def estimate_durations(history: Dict[str, List[float]], tests: List[str],
+                       window: int = HISTORY_WINDOW) -> Dict[str, Dict[str, Any]]:
+    """Estimated duration of each test: {"estimate_s", "samples"} (samples 0: default for a test without history)."""
+    known = {test: statistics.median(durations[-window:]) for test, durations in history.items() if durations}
+    by_kind = {}
+    for test, estimate in known.items():
+        by_kind.setdefault(test_kind(test), []).append(estimate)
+    overall = statistics.median(known.values()) if known else DEFAULT_DURATION_S
+
+    estimates = {}
+    for test in tests:
+        if test in known:
+            estimates[test] = {"estimate_s": known[test], "samples": len(history[test][-window:])}
+        else:
+            kind = by_kind.get(test_kind(test))
+            estimates[test] = {"estimate_s": statistics.median(kind) if kind else overall, "samples": 0}
+    return estimates
+
+
+def lpt_schedule(durations: Dict[str, float], workers: int) -> List[Dict[str, Any]]:
+    """Longest-processing-time-first sharding: longest test first, each onto the least loaded worker."""
+    shards = [{"worker": index + 1, "tests": [], "estimated_s": 0.0} for index in range(max(1, workers))]
+    loads = [(0.0, index) for index in range(len(shards))]
+    for test in sorted(durations, key=lambda t: (-durations[t], t)):
+        load, index = heapq.heappop(loads)
+        shards[index]["tests"].append(test)
+        shards[index]["estimated_s"] = load + durations[test]
+        heapq.heappush(loads, (shards[index]["estimated_s"], index))
+    return shards
+
+
+def find_outliers(history: Dict[str, List[float]], ratio: float = OUTLIER_RATIO,
+                  min_slowdown_s: float = OUTLIER_MIN_SLOWDOWN_S,
+                  min_samples: int = OUTLIER_MIN_SAMPLES) -> List[Dict[str, Any]]:
+    """Tests whose latest passing run is far slower than the median of the runs before it, largest ratio first."""
+    outliers = []
+    for test, durations in history.items():
+        previous = durations[:-1][-HISTORY_WINDOW:]
+        if len(previous) < min_samples:
+            continue
+        baseline = statistics.median(previous)
+        latest = durations[-1]
+        if latest - baseline >= min_slowdown_s and latest >= ratio * baseline:
+            outliers.append({"test": test, "latest_s": round(latest, 3), "baseline_s": round(baseline, 3),
+                             "ratio": round(latest / baseline, 2) if baseline else None,
+                             "samples": len(previous)})
+    return sorted(outliers, key=lambda o: (-(o["ratio"] or float("inf")), o["test"]))
+
+
+def discover_tests(project_root: Path, simulators: List[str]) -> List[str]:
+    """Test ids of the project's testbenches and cocotb tests (including ones that never ran)."""
+    project_root = Path(project_root)
+    tests = []
+    for directory in TESTBENCH_DIRS:
+        for source in sorted(project_root.glob(f"{directory}/tb_*.sv")) + sorted(project_root.glob(f"{directory}/tb_*.v")):
+            tests += [f"{simulator}:{source.stem}" for simulator in simulators]
+    for pattern in COCOTB_TEST_PATTERNS:
+        for module in sorted(project_root.glob(pattern)):
+            tests += cocotb_tests(module)
+    return list(dict.fromkeys(tests))
+
+
+def cocotb_tests(module: Path) -> List[str]:
+    """Test ids of the @cocotb.test() functions of a test module."""
+    try:
+        text = Path(module).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    return [f"cocotb:{Path(module).stem}.{m.group('name')}" for m in _COCOTB_TEST_RE.finditer(text)]
+
+
+def resolve_db(project_root: Path, db_path: str = DEFAULT_DB) -> Path:
+    """Timing database path; a relative path is relative to the project root."""
+    return Path(project_root) / db_path
+
+
+def format_ratio(outlier: Dict[str, Any]) -> str:
+    """Slowdown of an outlier, e.g. x2.25 (a zero baseline has no ratio)."""
+    return f"x{outlier['ratio']}" if outlier["ratio"] is not None else "from 0 s"
+
+
+def record_results(project_root: Path = Path("."), db_path: str = DEFAULT_DB,
+                   analysis: Optional[Dict[str, Any]] = None) -> int:
+    """Record the durations of the project's current results; returns how many runs were new."""
+    analysis = analysis if analysis is not None else analyze_simulations(Path(project_root))
+    with TimingDB(resolve_db(project_root, db_path)) as db:
+        return db.record(timing_entries(analysis))
+
+
+def timing_summary(analysis: Dict[str, Any], db_path: str = DEFAULT_DB,
+                   project_root: Path = Path(".")) -> Dict[str, Any]:
+    """Record the current results and summarize the history (test harness report)."""
+    db_path = resolve_db(project_root, db_path)
+    with TimingDB(db_path) as db:
+        recorded = db.record(timing_entries(analysis))
+        history = db.history()
+    estimates = estimate_durations(history, sorted(history))
+    slowest = sorted(estimates, key=lambda t: -estimates[t]["estimate_s"])[:5]
+    return {
+        "database": str(db_path),
+        "recorded_runs": recorded,
+        "tests_with_history": len(history),
+        "estimated_total_s": round(sum(e["estimate_s"] for e in estimates.values()), 3),
+        "slowest": [{"test": test, "estimate_s": round(estimates[test]["estimate_s"], 3)} for test in slowest],
+        "outliers": find_outliers(history)
+    }
+
+
+def print_schedule(shards: List[Dict[str, Any]], estimates: Dict[str, Dict[str, Any]]):
+    """Print the shards with their estimated durations."""
+    total = sum(e["estimate_s"] for e in estimates.values())
+    makespan = max(shard["estimated_s"] for shard in shards)
+    print(f"📋 {len(estimates)} tests on {len(shards)} worker(s): estimated {makespan:.1f}s "
+          f"(serial {total:.1f}s)")
+    for shard in shards:
+        print(f"   worker {shard['worker']}: {shard['estimated_s']:.1f}s, {len(shard['tests'])} test(s)")
+        for test in shard["tests"]:
+            estimate = estimates[test]
+            source = f"{estimate['samples']} run(s)" if estimate["samples"] else "default"
+            print(f"      {estimate['estimate_s']:>8.1f}s  {test}  ({source})")
+
+
+def print_outliers(outliers: List[Dict[str, Any]]):
+    """Print the timing outliers."""
+    if not outliers:
+        print("✅ No timing outliers")
+        return
+    print(f"🐢 {len(outliers)} timing outlier(s)")
+    for outlier in outliers:
+        print(f"   {outlier['test']}: {outlier['latest_s']:.3f}s vs median {outlier['baseline_s']:.3f}s "
+              f"({format_ratio(outlier)}, {outlier['samples']} previous runs)")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Record test durations and schedule regressions by them")
+    parser.add_argument("--db", default=DEFAULT_DB,
+                        help=f"Timing database, relative to --project-root (default {DEFAULT_DB})")
+    parser.add_argument("--project-root", default=".", help="Project root directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("record", help="Record the durations of the current simulation results")
+    schedule_parser = subparsers.add_parser("schedule", help="Shard tests across workers, longest first")
+    schedule_parser.add_argument("--workers", type=int, default=1, help="Number of workers")
+    schedule_parser.add_argument("--shard", type=int, help="Only this worker's tests (1-based)")
+    schedule_parser.add_argument("--test", action="append",
+                                 help="Test id to schedule (repeatable, default: discovered and recorded tests)")
+    schedule_parser.add_argument("--simulator", action="append",
+                                 help="Simulator of discovered SystemVerilog testbenches (repeatable, default icarus)")
+    schedule_parser.add_argument("--format", choices=["text", "json", "names"], default="text",
+                                 help="names: one test id per line, in execution order")
+    outliers_parser = subparsers.add_parser("outliers", help="Report tests that got slower")
+    outliers_parser.add_argument("--ratio", type=float, default=OUTLIER_RATIO,
+                                 help=f"Slowdown factor against the median (default {OUTLIER_RATIO})")
+    outliers_parser.add_argument("--min-slowdown", type=float, default=OUTLIER_MIN_SLOWDOWN_S,
+                                 help=f"Ignore slowdowns under this many seconds (default {OUTLIER_MIN_SLOWDOWN_S})")
+    args = parser.parse_args()
+
+    db_path = resolve_db(Path(args.project_root), args.db)
+    if args.command == "record":
+        recorded = record_results(Path(args.project_root), args.db)
+        print(f"✅ Recorded {recorded} new test run(s) in {db_path}")
+        return 0
+
+    with TimingDB(db_path) as db:
+        history = db.history()
+    if args.command == "outliers":
+        outliers = find_outliers(history, args.ratio, args.min_slowdown)
+        print_outliers(outliers)
+        return 1 if outliers else 0
+
+    tests = args.test or list(dict.fromkeys(
+        discover_tests(Path(args.project_root), args.simulator or ["icarus"]) + sorted(history)))
+    estimates = estimate_durations(history, tests)
+    shards = lpt_schedule({test: e["estimate_s"] for test, e in estimates.items()}, args.workers)
+    if args.shard is not None:
+        if not 1 <= args.shard <= len(shards):
+            parser.error(f"--shard must be between 1 and {len(shards)}")
+        shards = [shards[args.shard - 1]]
+    if args.format == "names":
+        for test in [test for shard in shards for test in shard["tests"]]:
+            print(test)
+    elif args.format == "json":
+        print(json.dumps({"shards": shards, "estimates": estimates}, indent=2))
+    else:
+        print_schedule(shards, {test: estimates[test] for shard in shards for test in shard["tests"]})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
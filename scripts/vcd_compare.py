@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Vyges Waveform Comparator
+
+Compares a current simulation VCD against a golden one in a single
+sequential read of each file. The two change streams are merge-joined by
+timestamp; after all changes at a time step, every signal touched in that
+step is compared. Only the latest value of each compared signal is kept, so
+memory does not grow with the length of the dumps.
+
+A divergence is reported when a signal goes from matching to differing,
+with the time and the hierarchical names on both sides. The comparison
+stops after `--max-divergences` divergences unless `--full` is given.
+
+Signals are paired by hierarchical name. `--map GOLDEN=CURRENT` renames a
+signal or a scope prefix (e.g. `tb.dut=tb.u_core`); `--ignore PATTERN`
+masks don't-care signals (glob on the full or leaf name); `--x-dont-care`
+lets x bits of the golden value match anything. Dumps with different
+timescales are compared on the finer one.
+
+Usage:
+    python scripts/vcd_compare.py golden.vcd current.vcd [--map A=B] [--ignore PAT] [--artifact FILE]
+"""
+
+import sys
+import json
+import fnmatch
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from vcd_parser import VCDReader, extend_value
+from report_artifacts import write_artifact
+
+
+DEFAULT_MAX_DIVERGENCES = 10
+
+# Where comparison artifacts are collected for the test harness report
+COMPARE_REPORT_DIR = "build/reports/vcd_compare"
+
+# Unpaired signal names listed in the results (the counts are always complete)
+MAX_LISTED = 20
+
+
+def parse_mapping(items: List[str]) -> List[Tuple[str, str]]:
+    """Parse GOLDEN=CURRENT renames, longest golden prefix first."""
+    mapping = []
+    for item in items:
+        if "=" not in item:
+            raise ValueError(f"Invalid mapping (expected GOLDEN=CURRENT): {item}")
+        golden, current = item.split("=", 1)
+        mapping.append((golden.strip(), current.strip()))
+    return sorted(mapping, key=lambda rule: len(rule[0]), reverse=True)
+
+
+def map_name(name: str, mapping: List[Tuple[str, str]]) -> str:
+    """Current-side name of a golden signal."""
+    for golden, current in mapping:
+        if name == golden:
+            return current
+        if name.startswith(golden + "."):
+            return current + name[len(golden):]
+    return name
+
+
+def _signal_names(reader: VCDReader) -> Dict[str, Tuple[str, int]]:
+    """Hierarchical name -> (id code, width) of every declared signal."""
+    names = {}
+    for code, bindings in reader.signals.items():
+        for signal in bindings:
+            full_name = f"{signal['scope']}.{signal['name']}" if signal["scope"] else signal["name"]
+            names.setdefault(full_name, (code, signal["width"]))
+    return names
+
+
+def _ignored(name: str, patterns: List[str]) -> bool:
+    """Whether a signal matches a don't-care pattern."""
+    leaf = name.rsplit(".", 1)[-1]
+    return any(fnmatch.fnmatchcase(name, p) or fnmatch.fnmatchcase(leaf, p) for p in patterns)
+
+
+def _steps(reader: VCDReader, scale: int) -> Iterator[Tuple[int, List[Tuple[str, str]]]]:
+    """Group a VCD's value changes by time: (time in common units, [(id code, value), ...])."""
+    current_time = None
+    changes = []
+    for time, code, value in reader.iter_changes():
+        if time != current_time:
+            if changes:
+                yield current_time * scale, changes
+            current_time = time
+            changes = []
+        changes.append((code, value))
+    if changes:
+        yield current_time * scale, changes
+
+
+def values_match(golden: Optional[str], current: Optional[str], width: int, x_dont_care: bool = False) -> bool:
+    """Compare two VCD values after width extension (case-insensitive for x/z)."""
+    if golden == current:
+        return True
+    if golden is None or current is None:
+        return False
+    golden = extend_value(golden.lower(), width)
+    current = extend_value(current.lower(), width)
+    if golden == current:
+        return True
+    return x_dont_care and all(g == "x" or g == c for g, c in zip(golden, current))
+
+
+def compare_vcds(golden_path: Path, current_path: Path, mapping: Optional[List[Tuple[str, str]]] = None,
+                 ignore: Optional[List[str]] = None, max_divergences: int = DEFAULT_MAX_DIVERGENCES,
+                 full: bool = False, x_dont_care: bool = False) -> Dict[str, Any]:
+    """Merge-join two VCDs by timestamp and collect the first divergences."""
+    mapping = mapping or []
+    ignore = ignore or []
+    with VCDReader(golden_path) as golden_reader, VCDReader(current_path) as current_reader:
+        golden_names = _signal_names(golden_reader)
+        current_names = _signal_names(current_reader)
+
+        # Pair signals: (golden name, current name, golden code, current code, width)
+        pairs = []
+        ignored = 0
+        golden_only = []
+        paired_current = set()
+        for name, (code, width) in sorted(golden_names.items()):
+            if _ignored(name, ignore):
+                ignored += 1
+                continue
+            current_name = map_name(name, mapping)
+            if current_name not in current_names:
+                golden_only.append(name)
+                continue
+            current_code, current_width = current_names[current_name]
+            pairs.append((name, current_name, code, current_code, max(width, current_width)))
+            paired_current.add(current_name)
+        current_only = sorted(name for name in current_names
+                              if name not in paired_current and not _ignored(name, ignore))
+
+        golden_pairs = {}
+        current_pairs = {}
+        for index, (_, _, golden_code, current_code, _) in enumerate(pairs):
+            golden_pairs.setdefault(golden_code, []).append(index)
+            current_pairs.setdefault(current_code, []).append(index)
+
+        # Compare on the finer timescale
+        unit = min(golden_reader.timescale, current_reader.timescale)
+        golden_scale = round(golden_reader.timescale / unit)
+        current_scale = round(current_reader.timescale / unit)
+
+        golden_values = {}
+        current_values = {}
+        diverging = set()
+        divergences = []
+        divergence_count = 0
+        stopped_at = None
+        last_time = None
+        golden_steps = _steps(golden_reader, golden_scale)
+        current_steps = _steps(current_reader, current_scale)
+        golden_step = next(golden_steps, None)
+        current_step = next(current_steps, None)
+
+        while golden_step or current_step:
+            time = min(step[0] for step in (golden_step, current_step) if step)
+            touched = set()
+            if golden_step and golden_step[0] == time:
+                for code, value in golden_step[1]:
+                    if code in golden_pairs:
+                        golden_values[code] = value
+                        touched.update(golden_pairs[code])
+                golden_step = next(golden_steps, None)
+            if current_step and current_step[0] == time:
+                for code, value in current_step[1]:
+                    if code in current_pairs:
+                        current_values[code] = value
+                        touched.update(current_pairs[code])
+                current_step = next(current_steps, None)
+            last_time = time
+
+            for index in sorted(touched):
+                name, current_name, golden_code, current_code, width = pairs[index]
+                golden_value = golden_values.get(golden_code)
+                current_value = current_values.get(current_code)
+                if values_match(golden_value, current_value, width, x_dont_care):
+                    diverging.discard(index)
+                    continue
+                if index in diverging:
+                    continue
+                diverging.add(index)
+                divergence_count += 1
+                if len(divergences) < max_divergences:
+                    divergences.append({
+                        "time": time,
+                        "time_ns": round(time * unit * 1e9, 6),
+                        "signal": name,
+                        "current_signal": current_name,
+                        "golden": golden_value,
+                        "current": current_value
+                    })
+            if not full and divergence_count >= max_divergences > 0:
+                stopped_at = time
+                break
+
+    return {
+        "golden": str(golden_path),
+        "current": str(current_path),
+        "status": "diverged" if divergence_count else "match",
+        "timescale_s": unit,
+        "compared_signals": len(pairs),
+        "ignored_signals": ignored,
+        "golden_only": len(golden_only),
+        "current_only": len(current_only),
+        "unpaired": {"golden": golden_only[:MAX_LISTED], "current": current_only[:MAX_LISTED]},
+        "divergence_count": divergence_count,
+        "divergences": divergences,
+        "stopped_early": stopped_at is not None,
+        "last_time": last_time
+    }
+
+
+def print_comparison(result: Dict[str, Any]):
+    """Print a formatted comparison."""
+    print("=" * 60)
+    print("VYGES WAVEFORM COMPARISON")
+    print("=" * 60)
+    print(f"\n📄 Golden:  {result['golden']}")
+    print(f"📄 Current: {result['current']}")
+    print(f"🔗 Signals compared: {result['compared_signals']} (ignored {result['ignored_signals']}, "
+          f"golden-only {result['golden_only']}, current-only {result['current_only']})")
+    for side in ("golden", "current"):
+        if result["unpaired"][side]:
+            print(f"⚠️  Only in {side}: {', '.join(result['unpaired'][side])}"
+                  f"{' ...' if result[f'{side}_only'] > len(result['unpaired'][side]) else ''}")
+
+    if result["status"] == "match":
+        print(f"\n✅ Waveforms match (up to time {result['last_time']})")
+    else:
+        scanned = f"{'stopped' if result['stopped_early'] else 'scanned'} to time {result['last_time']}"
+        print(f"\n❌ {result['divergence_count']} divergence(s) ({scanned}):")
+        for divergence in result["divergences"]:
+            name = divergence["signal"]
+            if divergence["current_signal"] != name:
+                name += f" -> {divergence['current_signal']}"
+            print(f"   @ {divergence['time']} ({divergence['time_ns']:,} ns)  {name}  "
+                  f"golden={divergence['golden']} current={divergence['current']}")
+    print("\n" + "=" * 60)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Compare a current VCD against a golden VCD")
+    parser.add_argument("golden", help="Golden (reference) VCD")
+    parser.add_argument("current", help="Current VCD")
+    parser.add_argument("--map", action="append", default=[], metavar="GOLDEN=CURRENT",
+                        help="Rename a golden signal or scope prefix on the current side (repeatable)")
+    parser.add_argument("--ignore", action="append", default=[], metavar="PATTERN",
+                        help="Don't-care signals, glob on the full or leaf name (repeatable)")
+    parser.add_argument("--x-dont-care", action="store_true", help="x bits in the golden value match anything")
+    parser.add_argument("--max-divergences", type=int, default=DEFAULT_MAX_DIVERGENCES,
+                        help="Divergences to report before stopping")
+    parser.add_argument("--full", action="store_true", help="Scan both files to the end and count every divergence")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    parser.add_argument("--artifact", help="Also write a waveform_compare JSON artifact "
+                                           f"(collected by the test harness report from {COMPARE_REPORT_DIR}/)")
+    args = parser.parse_args()
+
+    try:
+        mapping = parse_mapping(args.map)
+    except ValueError as e:
+        parser.error(str(e))
+    for path in (args.golden, args.current):
+        if not Path(path).is_file():
+            print(f"❌ VCD not found: {path}")
+            return 1
+
+    result = compare_vcds(Path(args.golden), Path(args.current), mapping, args.ignore,
+                          args.max_divergences, args.full, args.x_dont_care)
+    if args.artifact:
+        write_artifact(Path(args.artifact), "waveform_compare", result, "vcd_compare.py")
+    if args.output == "json":
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print_comparison(result)
+    return 0 if result["status"] == "match" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Vyges VCD Time Index
+
+Builds a sidecar index for a Value Change Dump in one streaming pass, so
+a time window of a large VCD can be read without parsing it from byte 0.
+The index holds checkpoints at roughly every `checkpoint_bytes` of value
+changes; each checkpoint records
+
+    time      the simulation time of a `#<time>` marker
+    offset    the byte offset of that marker's line
+    snapshot  the offset and length of the checkpoint's snapshot (the value
+              of every signal before the changes at that time)
+
+A reader seeks to the last checkpoint at or before the window start,
+restores the snapshot and streams forward, so the cost is proportional to
+the window (plus at most one checkpoint interval), not to the file.
+
+The index is written next to the VCD as a small header,
+`<name>.vcd.idx.json` (file metadata and the checkpoint table), and a
+snapshot file, `<name>.vcd.idx.snap`, with one JSON line per checkpoint
+that is only read for the checkpoint a query starts from. Checkpoints are
+spaced at least SNAPSHOT_SPACING times their snapshot size apart, so the
+snapshots stay a fraction of the VCD however many signals it has. Both
+files are reused while the VCD's size and modification time are unchanged.
+
+Usage:
+    python scripts/vcd_index.py build <file.vcd> [--checkpoint-bytes N] [--force]
+    python scripts/vcd_index.py window <file.vcd> START END [--signal NAME ...]
+    python scripts/vcd_index.py state <file.vcd> TIME [--signal NAME ...]
+"""
+
+import os
+import sys
+import json
+import bisect
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from vcd_parser import VCDReader, parse_timescale
+from profiler import cache_lookup
+
+
+INDEX_VERSION = 2
+INDEX_SUFFIX = ".idx.json"
+SNAPSHOT_SUFFIX = ".idx.snap"
+
+# Minimum distance between checkpoints, in bytes of value changes
+DEFAULT_CHECKPOINT_BYTES = 1 << 20
+
+# Minimum distance between checkpoints, in multiples of the last snapshot's size
+SNAPSHOT_SPACING = 8
+
+# Checkpoint table columns
+CHECKPOINT_FIELDS = ["time", "offset", "snapshot_offset", "snapshot_bytes"]
+
+# Declaration keywords whose bodies are skipped
+_SKIPPED_SECTIONS = ("$comment", "$date", "$version")
+
+
+def index_path_for(vcd_path: Path) -> Path:
+    """Sidecar index path of a VCD file."""
+    vcd_path = Path(vcd_path)
+    return vcd_path.with_name(vcd_path.name + INDEX_SUFFIX)
+
+
+def snapshot_path_for(index_path: Path) -> Path:
+    """Snapshot file stored next to an index header."""
+    index_path = Path(index_path)
+    name = index_path.name
+    if name.endswith(INDEX_SUFFIX):
+        name = name[:-len(INDEX_SUFFIX)]
+    return index_path.with_name(name + SNAPSHOT_SUFFIX)
+
+
+def _data_offset(f) -> Tuple[int, float]:
+    """Skip the header of a VCD opened in binary mode; return the first data offset and the timescale."""
+    timescale = 1e-9
+    in_timescale = False
+    timescale_tokens = []
+    ending = False
+    for line in iter(f.readline, b""):
+        for token in line.decode("latin-1").split():
+            if in_timescale:
+                if token == "$end":
+                    timescale = parse_timescale(" ".join(timescale_tokens))
+                    in_timescale = False
+                else:
+                    timescale_tokens.append(token)
+            elif token == "$timescale":
+                in_timescale = True
+            elif token == "$enddefinitions":
+                ending = True
+            elif ending and token == "$end":
+                return f.tell(), timescale
+    return f.tell(), timescale
+
+
+def _iter_lines(f, offset: int) -> Iterator[Tuple[int, List[str]]]:
+    """Yield (byte offset, tokens) for every line from `offset` on."""
+    f.seek(offset)
+    for line in iter(f.readline, b""):
+        yield offset, line.decode("latin-1").split()
+        offset += len(line)
+
+
+def _iter_changes(lines: Iterator[Tuple[int, List[str]]]) -> Iterator[Tuple[int, int, Optional[str], Optional[str]]]:
+    """Yield (line offset, time, id_code, value) for changes, and (offset, time, None, None) at time markers."""
+    time = 0
+    skipping = False
+    for offset, tokens in lines:
+        position = 0
+        while position < len(tokens):
+            token = tokens[position]
+            position += 1
+            if skipping:
+                skipping = token != "$end"
+                continue
+            first = token[0]
+            if first == "#":
+                try:
+                    time = int(token[1:])
+                except ValueError:
+                    time = int(float(token[1:]))
+                # Only markers that start a line can be seeked to
+                yield (offset if position == 1 else None), time, None, None
+            elif first in "01xXzZ":
+                yield offset, time, token[1:], first
+            elif first in "bBrR":
+                if position < len(tokens):
+                    yield offset, time, tokens[position], token[1:]
+                    position += 1
+            elif token in _SKIPPED_SECTIONS:
+                skipping = True
+
+
+def build_index(vcd_path: Path, checkpoint_bytes: int = DEFAULT_CHECKPOINT_BYTES,
+                snapshot_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Stream a VCD once, write the checkpoint snapshots and return the index header."""
+    vcd_path = Path(vcd_path)
+    snapshot_path = Path(snapshot_path) if snapshot_path else snapshot_path_for(index_path_for(vcd_path))
+    stat = os.stat(vcd_path)
+    state = {}
+    checkpoints = []
+    value_changes = 0
+    start_time = end_time = None
+    temp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    with open(vcd_path, 'rb') as f, open(temp_path, 'wb') as snapshots:
+        data_offset, timescale = _data_offset(f)
+        last_checkpoint = data_offset
+        spacing = checkpoint_bytes
+        for offset, time, code, value in _iter_changes(_iter_lines(f, data_offset)):
+            if code is None:
+                if offset is not None and offset - last_checkpoint >= spacing:
+                    snapshot = json.dumps(state, separators=(",", ":")).encode("utf-8") + b"\n"
+                    checkpoints.append([time, offset, snapshots.tell(), len(snapshot)])
+                    snapshots.write(snapshot)
+                    last_checkpoint = offset
+                    spacing = max(checkpoint_bytes, len(snapshot) * SNAPSHOT_SPACING)
+                continue
+            state[code] = value
+            value_changes += 1
+            if start_time is None:
+                start_time = time
+            end_time = time
+        snapshot_size = snapshots.tell()
+    os.replace(temp_path, snapshot_path)
+    return {
+        "version": INDEX_VERSION,
+        "vcd": vcd_path.name,
+        "vcd_size": stat.st_size,
+        "vcd_mtime_ns": stat.st_mtime_ns,
+        "checkpoint_bytes": checkpoint_bytes,
+        "timescale_s": timescale,
+        "data_offset": data_offset,
+        "id_codes": len(state),
+        "value_changes": value_changes,
+        "start_time": start_time,
+        "end_time": end_time,
+        "snapshots": snapshot_path.name,
+        "snapshot_size": snapshot_size,
+        "checkpoint_count": len(checkpoints),
+        "checkpoint_fields": CHECKPOINT_FIELDS,
+        "checkpoints": checkpoints
+    }
+
+
+def _index_current(index: Dict[str, Any], vcd_path: Path, snapshot_path: Path,
+                   checkpoint_bytes: Optional[int]) -> bool:
+    """Whether a stored index and its snapshot file still describe the VCD."""
+    stat = os.stat(vcd_path)
+    try:
+        snapshot_size = os.path.getsize(snapshot_path)
+    except OSError:
+        return False
+    return (index.get("version") == INDEX_VERSION
+            and index.get("vcd_size") == stat.st_size
+            and index.get("vcd_mtime_ns") == stat.st_mtime_ns
+            and index.get("snapshot_size") == snapshot_size
+            and (checkpoint_bytes is None or index.get("checkpoint_bytes") == checkpoint_bytes))
+
+
+def read_index(vcd_path: Path, checkpoint_bytes: Optional[int] = None,
+               index_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Return the VCD's index header if its sidecar files exist and are current (never builds them)."""
+    index_path = Path(index_path) if index_path else index_path_for(vcd_path)
+    snapshot_path = snapshot_path_for(index_path)
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or not _index_current(index, vcd_path, snapshot_path, checkpoint_bytes):
+        return None
+    index["snapshot_path"] = str(snapshot_path)
+    return index
+
+
+def load_index(vcd_path: Path, checkpoint_bytes: Optional[int] = None, force: bool = False,
+               index_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Return the VCD's index header, rebuilding the sidecar files when they are missing or stale.
+
+    Only the header is read; snapshots are read from the snapshot file
+    (`index["snapshot_path"]`) when a query seeks to a checkpoint.
+    """
+    index_path = Path(index_path) if index_path else index_path_for(vcd_path)
+    snapshot_path = snapshot_path_for(index_path)
+    if not force and index_path.exists():
+        index = read_index(vcd_path, checkpoint_bytes, index_path)
+        cache_lookup("vcd_index", index is not None)
+        if index is not None:
+            return index
+    index = build_index(vcd_path, checkpoint_bytes or DEFAULT_CHECKPOINT_BYTES, snapshot_path)
+    temp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'w') as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(temp_path, index_path)
+    index["snapshot_path"] = str(snapshot_path)
+    return index
+
+
+def _seek(index: Dict[str, Any], time: int) -> Tuple[int, Dict[str, str]]:
+    """Offset and signal values of the last checkpoint at or before `time`."""
+    checkpoints = index["checkpoints"]
+    position = bisect.bisect_right(checkpoints, time, key=lambda checkpoint: checkpoint[0]) - 1
+    if position < 0:
+        return index["data_offset"], {}
+    _, offset, snapshot_offset, snapshot_bytes = checkpoints[position]
+    with open(index["snapshot_path"], 'rb') as f:
+        f.seek(snapshot_offset)
+        return offset, json.loads(f.read(snapshot_bytes))
+
+
+def iter_window(vcd_path: Path, start: int, end: int,
+                index: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[int, str, str]]:
+    """Yield (time, id_code, value) for a time window.
+
+    The window begins with the value of every signal at `start` (stamped
+    `start`), followed by the changes after `start` up to and including `end`.
+    """
+    index = index or load_index(vcd_path)
+    offset, state = _seek(index, start)
+    with open(vcd_path, 'rb') as f:
+        changes = _iter_changes(_iter_lines(f, offset))
+        for _, time, code, value in changes:
+            if time > start:
+                break
+            if code is not None:
+                state[code] = value
+        else:
+            time = None
+        for state_code, state_value in state.items():
+            yield start, state_code, state_value
+        if time is None or time > end:
+            return
+        if code is not None:
+            yield time, code, value
+        for _, time, code, value in changes:
+            if time > end:
+                return
+            if code is not None:
+                yield time, code, value
+
+
+def state_at(vcd_path: Path, time: int, index: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+    """Value of every signal at `time` (after the changes at that time)."""
+    return {code: value for _, code, value in iter_window(vcd_path, time, time - 1, index)}
+
+
+def signal_codes(vcd_path: Path, names: List[str]) -> Dict[str, str]:
+    """Map id codes to hierarchical names; only `names` (full or leaf names) when given."""
+    with VCDReader(vcd_path) as reader:
+        codes = {}
+        for code in reader.signals:
+            full_name = reader.full_name(code)
+            if not names or full_name in names or full_name.rsplit(".", 1)[-1] in names:
+                codes[code] = full_name
+    return codes
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Build and query random-access time indexes of VCD files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build (or reuse) the sidecar index")
+    build_parser.add_argument("vcd", help="VCD file")
+    build_parser.add_argument("--checkpoint-bytes", type=int, help=f"Checkpoint spacing (default {DEFAULT_CHECKPOINT_BYTES})")
+    build_parser.add_argument("--force", action="store_true", help="Rebuild even if the index is current")
+    window_parser = subparsers.add_parser("window", help="Print the signal values and changes in a time window")
+    window_parser.add_argument("vcd", help="VCD file")
+    window_parser.add_argument("start", type=int, help="Window start (VCD time units)")
+    window_parser.add_argument("end", type=int, help="Window end (VCD time units)")
+    state_parser = subparsers.add_parser("state", help="Print every signal value at a time")
+    state_parser.add_argument("vcd", help="VCD file")
+    state_parser.add_argument("time", type=int, help="Time (VCD time units)")
+    for sub in (window_parser, state_parser):
+        sub.add_argument("--signal", action="append", default=[], help="Only this signal (repeatable)")
+    args = parser.parse_args()
+
+    vcd_path = Path(args.vcd)
+    if not vcd_path.is_file():
+        print(f"❌ VCD not found: {vcd_path}")
+        return 1
+
+    if args.command == "build":
+        index = load_index(vcd_path, args.checkpoint_bytes, force=args.force)
+        print(f"✅ {index_path_for(vcd_path)}: {index['checkpoint_count']} checkpoints "
+              f"({index['snapshot_size']:,} snapshot bytes), "
+              f"{index['id_codes']} signals, {index['value_changes']:,} value changes, "
+              f"time {index['start_time']}..{index['end_time']}")
+        return 0
+
+    codes = signal_codes(vcd_path, args.signal)
+    if args.command == "window":
+        for time, code, value in iter_window(vcd_path, args.start, args.end):
+            if code in codes:
+                print(f"{time} {codes[code]} {value}")
+    else:
+        state = state_at(vcd_path, args.time)
+        for code, name in sorted(codes.items(), key=lambda item: item[1]):
+            print(f"{name} {state.get(code, 'x')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Vyges VCD Streaming Parser
+
+Minimal, constant-memory reader for Value Change Dump (VCD) files shared by
+the Vyges report scripts. The header is parsed into a signal table and value
+changes are yielded one at a time, so arbitrarily large dumps can be processed
+without loading them into memory.
+
+Usage:
+    python scripts/vcd_parser.py <file.vcd>
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Tuple
+
+
+# Seconds per VCD time unit
+TIME_UNITS = {
+    "s": 1.0,
+    "ms": 1e-3,
+    "us": 1e-6,
+    "ns": 1e-9,
+    "ps": 1e-12,
+    "fs": 1e-15
+}
+
+_TIMESCALE_RE = re.compile(r'(\d+)\s*([munpf]?s)')
+
+# Declaration keywords whose bodies are skipped
+_SKIPPED_SECTIONS = ("$comment", "$date", "$version")
+
+
+def parse_timescale(text: str) -> float:
+    """Convert a VCD timescale string (e.g. '1 ns', '10ps') to seconds."""
+    match = _TIMESCALE_RE.search(text)
+    if not match:
+        return 1e-9
+    return int(match.group(1)) * TIME_UNITS[match.group(2)]
+
+
+def toggle_count(old: str, new: str) -> int:
+    """Count bit positions that switched between two binary VCD values."""
+    if len(old) != len(new):
+        width = max(len(old), len(new))
+        old = extend_value(old, width)
+        new = extend_value(new, width)
+    if old == new:
+        return 0
+    try:
+        return bin(int(old, 2) ^ int(new, 2)).count("1")
+    except ValueError:
+        # x/z bits never count as a toggle
+        return sum(1 for a, b in zip(old, new) if a != b and a in "01" and b in "01")
+
+
+def extend_value(value: str, width: int) -> str:
+    """Left-extend a VCD vector value to `width` bits following VCD rules."""
+    if len(value) >= width:
+        return value
+    fill = value[0] if value and value[0] in "xXzZ" else "0"
+    return fill * (width - len(value)) + value
+
+
+class VCDReader:
+    """Stream a VCD file: header first, then value changes."""
+
+    def __init__(self, vcd_path: Path):
+        self.vcd_path = Path(vcd_path)
+        self.timescale = 1e-9
+        self.signals = {}
+        self.scopes = []
+        self._file = None
+        self._tokens = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        """Open the file and parse the header."""
+        self._file = open(self.vcd_path, 'r', encoding='utf-8', errors='replace')
+        self._tokens = self._iter_tokens()
+        self._read_header()
+
+    def close(self):
+        """Close the underlying file."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _iter_tokens(self) -> Iterator[str]:
+        """Yield whitespace-separated tokens from the file."""
+        for line in self._file:
+            for token in line.split():
+                yield token
+
+    def _read_until_end(self) -> List[str]:
+        """Collect tokens up to the next `$end`."""
+        tokens = []
+        for token in self._tokens:
+            if token == "$end":
+                break
+            tokens.append(token)
+        return tokens
+
+    def _read_header(self):
+        """Parse declarations up to `$enddefinitions`."""
+        scope = []
+        for token in self._tokens:
+            if token == "$scope":
+                body = self._read_until_end()
+                scope.append(body[1] if len(body) > 1 else body[0] if body else "")
+                self.scopes.append(".".join(scope))
+            elif token == "$upscope":
+                self._read_until_end()
+                if scope:
+                    scope.pop()
+            elif token == "$var":
+                body = self._read_until_end()
+                if len(body) < 4:
+                    continue
+                var_type, width, code, name = body[0], body[1], body[2], body[3]
+                self.signals.setdefault(code, []).append({
+                    "type": var_type,
+                    "width": int(width) if width.isdigit() else 1,
+                    "scope": ".".join(scope),
+                    "name": name,
+                    "range": body[4] if len(body) > 4 else ""
+                })
+            elif token == "$timescale":
+                self.timescale = parse_timescale(" ".join(self._read_until_end()))
+            elif token in _SKIPPED_SECTIONS:
+                self._read_until_end()
+            elif token == "$enddefinitions":
+                self._read_until_end()
+                return
+
+    def iter_changes(self) -> Iterator[Tuple[int, str, str]]:
+        """Yield (time, id_code, value) for every value change in the dump."""
+        time = 0
+        tokens = self._tokens
+        for token in tokens:
+            first = token[0]
+            if first == "#":
+                try:
+                    time = int(token[1:])
+                except ValueError:
+                    time = int(float(token[1:]))
+            elif first in "01xXzZ":
+                yield time, token[1:], first
+            elif first in "bBrR":
+                code = next(tokens, None)
+                if code is None:
+                    return
+                yield time, code, token[1:]
+            elif first == "$":
+                if token in _SKIPPED_SECTIONS:
+                    self._read_until_end()
+
+    def full_name(self, code: str) -> str:
+        """Return the hierarchical name of the first signal bound to `code`."""
+        signal = self.signals[code][0]
+        return f"{signal['scope']}.{signal['name']}" if signal["scope"] else signal["name"]
+
+
+def summarize_vcd(vcd_path: Path) -> Dict[str, Any]:
+    """Collect basic statistics for a VCD file in a single streaming pass."""
+    summary = {
+        "file": str(vcd_path),
+        "timescale_s": None,
+        "signals": 0,
+        "scopes": 0,
+        "value_changes": 0,
+        "start_time": None,
+        "end_time": None
+    }
+    with VCDReader(vcd_path) as reader:
+        summary["timescale_s"] = reader.timescale
+        summary["signals"] = sum(len(v) for v in reader.signals.values())
+        summary["scopes"] = len(reader.scopes)
+        for time, _, _ in reader.iter_changes():
+            if summary["start_time"] is None:
+                summary["start_time"] = time
+            summary["end_time"] = time
+            summary["value_changes"] += 1
+    return summary
+
+
+def main():
+    """Main function."""
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/vcd_parser.py <file.vcd>")
+        return 1
+    summary = summarize_vcd(Path(sys.argv[1]))
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
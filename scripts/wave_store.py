@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+Vyges Columnar Waveform Store
+
+Converts a VCD into a compact columnar file that is memory-mapped for
+queries, so repeated analyses of the same dump read only the signals they
+need instead of re-tokenizing the ASCII text. Per VCD id code the store
+holds three arrays:
+
+    anchors   absolute time of every BLOCK-th change (for seeking)
+    deltas    time since the previous change, in the narrowest unsigned
+              type that fits (1, 2, 4 or 8 bytes)
+    values    packed 4-state values, 2 bits per signal bit (value bit and
+              x/z bit); 1-bit signals pack four changes per byte.
+              Real variables are stored as doubles.
+
+The arrays are followed by a JSON footer (signal table, array offsets and
+the source VCD's size and mtime), its length and a magic number. The store
+is written next to the VCD as `<name>.vcd.wave`; it is current while the
+VCD's size and modification time are unchanged.
+
+Usage:
+    python scripts/wave_store.py convert <file.vcd> [--force]
+    python scripts/wave_store.py info <file.vcd|file.wave>
+    python scripts/wave_store.py value <file.vcd|file.wave> SIGNAL TIME
+    python scripts/wave_store.py changes <file.vcd|file.wave> SIGNAL [--start T] [--end T]
+    python scripts/wave_store.py toggles <file.vcd|file.wave> [SIGNAL ...]
+"""
+
+import os
+import sys
+import json
+import mmap
+import array
+import bisect
+import struct
+import argparse
+import operator
+import tempfile
+from itertools import accumulate, islice
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+
+from vcd_parser import VCDReader, extend_value
+from profiler import cache_lookup
+
+
+STORE_VERSION = 1
+STORE_SUFFIX = ".wave"
+MAGIC = b"VYGWAVE1"
+
+# Changes between time anchors
+BLOCK = 4096
+
+# Buffered changes before they are spilled to a temporary file during conversion
+SPILL_ENTRIES = 1 << 20
+
+# (item size, unsigned array type code), narrowest first
+_DELTA_TYPES = sorted({array.array(code).itemsize: code for code in ("Q", "L", "I", "H", "B")}.items())
+
+_VALUE_BITS = str.maketrans("xXzZ", "0011")
+_UNKNOWN_BITS = str.maketrans("01xXzZ", "001111")
+_DOUBLE = struct.Struct("<d")
+_FOOTER = struct.Struct("<Q8s")
+
+
+class WaveStoreError(Exception):
+    """A waveform store is missing, corrupt or was written on a different platform."""
+
+
+def store_path_for(vcd_path: Path) -> Path:
+    """Store path of a VCD file."""
+    vcd_path = Path(vcd_path)
+    return vcd_path.with_name(vcd_path.name + STORE_SUFFIX)
+
+
+def encode_bits(value: str, width: int) -> int:
+    """Encode a VCD vector value as (x/z bits << width) | value bits."""
+    value = extend_value(value, width)[-width:]
+    try:
+        return int(value.translate(_VALUE_BITS), 2) | (int(value.translate(_UNKNOWN_BITS), 2) << width)
+    except ValueError:
+        # Anything that is not 4-state is unknown
+        return ((1 << width) - 1) << width
+
+
+def decode_bits(code: int, width: int) -> str:
+    """Decode a packed 4-state value back to VCD characters."""
+    mask = (1 << width) - 1
+    bits, unknown = code & mask, code >> width
+    if not unknown:
+        return format(bits, f"0{width}b")
+    return "".join(("z" if (bits >> i) & 1 else "x") if (unknown >> i) & 1 else str((bits >> i) & 1)
+                   for i in range(width - 1, -1, -1))
+
+
+def _value_layout(width: int) -> Tuple[int, int]:
+    """(bytes per entry, entries per byte) of packed values of a given width."""
+    bits = 2 * width
+    if bits <= 8:
+        return 1, 8 // bits
+    return (bits + 7) // 8, 1
+
+
+class _Column:
+    """Changes of one id code buffered during conversion.
+
+    Buffered changes are delta-encoded when they are spilled, continuing from
+    the last time of the previous chunk, so the store can be written chunk by
+    chunk without reassembling the column in memory.
+    """
+
+    def __init__(self, width: int, kind: str):
+        self.width = width
+        self.kind = kind
+        self.entry_bytes = 8 if kind == "real" else _value_layout(width)[0]
+        self.times = array.array("Q")
+        self.values = bytearray()
+        self.chunks = []
+        self.tail = None
+        self.count = 0
+        self.last_time = None
+        self.largest_delta = 0
+        self.anchors = array.array("Q")
+        self._encoded = {}
+
+    def append(self, time: int, value: str):
+        """Buffer one change."""
+        self.times.append(time)
+        if self.kind == "real":
+            try:
+                number = float(value)
+            except ValueError:
+                number = float("nan")
+            self.values += _DOUBLE.pack(number)
+        elif self.width <= 4:
+            # Narrow signals take few distinct values
+            encoded = self._encoded.get(value)
+            if encoded is None:
+                encoded = self._encoded[value] = encode_bits(value, self.width).to_bytes(1, "little")
+            self.values += encoded
+        else:
+            self.values += encode_bits(value, self.width).to_bytes(self.entry_bytes, "little")
+
+    def _encode(self) -> Tuple[array.array, bytes]:
+        """Delta-encode the buffered changes and clear the buffer: (deltas, raw values)."""
+        times = self.times
+        deltas = array.array("Q", [0 if self.last_time is None else times[0] - self.last_time])
+        deltas.extend(map(operator.sub, times[1:], times[:-1]))
+        # Anchored changes are located by their absolute time
+        first = -self.count % BLOCK
+        for i in range(first, len(times), BLOCK):
+            deltas[i] = 0
+        self.anchors.extend(times[first::BLOCK])
+        self.largest_delta = max(self.largest_delta, max(deltas))
+        self.count += len(times)
+        self.last_time = times[-1]
+        values = bytes(self.values)
+        self.times = array.array("Q")
+        self.values = bytearray()
+        return deltas, values
+
+    def spill(self, spill_file):
+        """Move the buffered changes to the spill file."""
+        if not self.times:
+            return
+        deltas, values = self._encode()
+        offset = spill_file.tell()
+        spill_file.write(deltas.tobytes())
+        spill_file.write(values)
+        self.chunks.append((offset, len(deltas)))
+
+    def finish(self):
+        """Encode the changes still buffered; they stay in memory after the spilled chunks."""
+        if self.times:
+            self.tail = self._encode()
+
+    def iter_deltas(self, spill_file) -> Iterator[array.array]:
+        """Time deltas of every chunk, in order."""
+        for offset, count in self.chunks:
+            spill_file.seek(offset)
+            deltas = array.array("Q")
+            deltas.frombytes(spill_file.read(count * 8))
+            yield deltas
+        if self.tail:
+            yield self.tail[0]
+
+    def iter_values(self, spill_file) -> Iterator[bytes]:
+        """Raw values of every chunk, in order."""
+        for offset, count in self.chunks:
+            spill_file.seek(offset + count * 8)
+            yield spill_file.read(count * self.entry_bytes)
+        if self.tail:
+            yield self.tail[1]
+
+
+def _pack_values(raw: bytes, count: int, width: int) -> bytes:
+    """Pack sub-byte entries (signals narrower than 4 bits) several to a byte."""
+    _, per_byte = _value_layout(width)
+    if per_byte == 1:
+        return raw
+    bits = 2 * width
+    packed = bytearray((count + per_byte - 1) // per_byte)
+    for index, code in enumerate(raw):
+        packed[index // per_byte] |= code << ((index % per_byte) * bits)
+    return bytes(packed)
+
+
+def _align(f) -> int:
+    """Pad the file to the next 8-byte boundary; return the offset."""
+    padding = -f.tell() % 8
+    if padding:
+        f.write(b"\0" * padding)
+    return f.tell()
+
+
+def _write_aligned(f, data: bytes) -> int:
+    """Write data at the next 8-byte boundary; return its offset."""
+    offset = _align(f)
+    f.write(data)
+    return offset
+
+
+def _write_values(f, chunks: Iterator[bytes], width: int, kind: str) -> int:
+    """Write a column's values chunk by chunk, packing sub-byte entries across chunk boundaries."""
+    offset = _align(f)
+    if kind == "real" or _value_layout(width)[1] == 1:
+        for raw in chunks:
+            f.write(raw)
+        return offset
+    per_byte = _value_layout(width)[1]
+    pending = b""
+    for raw in chunks:
+        raw = pending + raw
+        whole = len(raw) - len(raw) % per_byte
+        f.write(_pack_values(raw[:whole], whole, width))
+        pending = raw[whole:]
+    if pending:
+        f.write(_pack_values(pending, len(pending), width))
+    return offset
+
+
+def convert_vcd(vcd_path: Path, store_path: Optional[Path] = None) -> Path:
+    """Convert a VCD into a columnar waveform store in one streaming pass."""
+    vcd_path = Path(vcd_path)
+    store_path = Path(store_path) if store_path else store_path_for(vcd_path)
+    stat = os.stat(vcd_path)
+    columns = {}
+    start_time = end_time = None
+    buffered = 0
+
+    with VCDReader(vcd_path) as reader, tempfile.TemporaryFile(dir=store_path.parent) as spill_file:
+        for code, bindings in reader.signals.items():
+            kind = "real" if bindings[0]["type"] == "real" else "bits"
+            columns[code] = _Column(max(binding["width"] for binding in bindings), kind)
+        for time, code, value in reader.iter_changes():
+            column = columns.get(code)
+            if column is None:
+                # Changes of undeclared id codes are kept with the width of their first value
+                column = columns[code] = _Column(max(len(value), 1), "bits")
+            column.append(time, value)
+            if start_time is None:
+                start_time = time
+            end_time = time
+            buffered += 1
+            if buffered >= SPILL_ENTRIES:
+                for column in columns.values():
+                    column.spill(spill_file)
+                buffered = 0
+
+        signals = {}
+        partial_path = store_path.with_name(store_path.name + ".partial")
+        with open(partial_path, "wb") as f:
+            for code, column in columns.items():
+                # Stream the spilled chunks of the column straight into the store
+                column.finish()
+                delta_type = next(code for size, code in _DELTA_TYPES if column.largest_delta < 1 << (8 * size))
+                anchors = _write_aligned(f, column.anchors.tobytes())
+                deltas = _align(f)
+                for chunk in column.iter_deltas(spill_file):
+                    f.write(array.array(delta_type, chunk).tobytes())
+                signals[code] = {
+                    "bindings": reader.signals.get(code, [{"type": "wire", "width": column.width, "scope": "",
+                                                            "name": code, "range": ""}]),
+                    "width": column.width,
+                    "kind": column.kind,
+                    "count": column.count,
+                    "delta_type": delta_type,
+                    "anchors": anchors,
+                    "deltas": deltas,
+                    "values": _write_values(f, column.iter_values(spill_file), column.width, column.kind)
+                }
+                column.tail = None
+            footer = json.dumps({
+                "version": STORE_VERSION,
+                "byteorder": sys.byteorder,
+                "block": BLOCK,
+                "vcd": vcd_path.name,
+                "vcd_size": stat.st_size,
+                "vcd_mtime_ns": stat.st_mtime_ns,
+                "timescale_s": reader.timescale,
+                "scopes": reader.scopes,
+                "start_time": start_time,
+                "end_time": end_time,
+                "signals": signals
+            }, separators=(",", ":")).encode("utf-8")
+            f.write(footer)
+            f.write(_FOOTER.pack(len(footer), MAGIC))
+    os.replace(partial_path, store_path)
+    return store_path
+
+
+class WaveSignal:
+    """Memory-mapped value changes of one VCD id code."""
+
+    def __init__(self, store: "WaveStore", code: str, meta: Dict[str, Any]):
+        self.code = code
+        self.width = meta["width"]
+        self.kind = meta["kind"]
+        self.count = meta["count"]
+        self.bindings = meta["bindings"]
+        self._block = store.block
+        buffer = store._buffer
+        anchors = (self.count + self._block - 1) // self._block
+        self._anchors = buffer[meta["anchors"]:meta["anchors"] + anchors * 8].cast("Q")
+        delta_size = array.array(meta["delta_type"]).itemsize
+        self._deltas = buffer[meta["deltas"]:meta["deltas"] + self.count * delta_size].cast(meta["delta_type"])
+        if self.kind == "real":
+            self._entry_bytes, self._per_byte = 8, 1
+        else:
+            self._entry_bytes, self._per_byte = _value_layout(self.width)
+        size = (self.count + self._per_byte - 1) // self._per_byte * self._entry_bytes
+        self._values = buffer[meta["values"]:meta["values"] + size]
+        # Whole-byte entries of a native integer size are read as one array
+        native = {1: "B", 2: "H", 4: "I", 8: "Q"}.get(self._entry_bytes)
+        self._entries = (self._values.cast(native) if self.kind != "real" and self._per_byte == 1 and native
+                         and sys.byteorder == "little" else None)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _code(self, index: int) -> Union[int, float]:
+        """Packed value of change `index`."""
+        if self.kind == "real":
+            return _DOUBLE.unpack_from(self._values, index * 8)[0]
+        if self._per_byte > 1:
+            bits = 2 * self.width
+            return (self._values[index // self._per_byte] >> ((index % self._per_byte) * bits)) & ((1 << bits) - 1)
+        start = index * self._entry_bytes
+        return int.from_bytes(self._values[start:start + self._entry_bytes], "little")
+
+    def _iter_codes(self, start: int, stop: int) -> Iterator[Union[int, float]]:
+        """Packed values of changes [start, stop)."""
+        if self._entries is not None:
+            yield from self._entries[start:stop]
+        elif self._per_byte > 1:
+            bits = 2 * self.width
+            mask = (1 << bits) - 1
+            shifts = range(0, self._per_byte * bits, bits)
+            first_byte = start // self._per_byte
+            codes = ((byte >> shift) & mask
+                     for byte in self._values[first_byte:(stop + self._per_byte - 1) // self._per_byte]
+                     for shift in shifts)
+            yield from islice(codes, start - first_byte * self._per_byte, stop - first_byte * self._per_byte)
+        else:
+            for index in range(start, stop):
+                yield self._code(index)
+
+    def _decode(self, code: Union[int, float]) -> Union[str, float]:
+        """VCD value of a packed value (floats for real variables)."""
+        return code if self.kind == "real" else decode_bits(code, self.width)
+
+    def _iter_times(self, start: int, stop: int) -> Iterator[int]:
+        """Absolute times of changes [start, stop)."""
+        block = start // self._block
+        while start < stop:
+            block_start = block * self._block
+            block_stop = min(block_start + self._block, stop)
+            times = accumulate(self._deltas[block_start + 1:block_stop], initial=self._anchors[block])
+            for index, time in enumerate(times, block_start):
+                if index >= start:
+                    yield time
+            start = block_stop
+            block += 1
+
+    def index_at(self, time: int) -> int:
+        """Index of the last change at or before `time` (-1 if none)."""
+        block = bisect.bisect_right(self._anchors, time) - 1
+        if block < 0:
+            return -1
+        index = block * self._block
+        stop = min(index + self._block, self.count)
+        current = self._anchors[block]
+        while index + 1 < stop:
+            current += self._deltas[index + 1]
+            if current > time:
+                break
+            index += 1
+        return index
+
+    def value_at(self, time: int) -> Optional[Union[str, float]]:
+        """Value at `time` (None before the first change)."""
+        index = self.index_at(time)
+        return self._decode(self._code(index)) if index >= 0 else None
+
+    def _range(self, start: Optional[int], end: Optional[int]) -> Tuple[int, int]:
+        """Change indexes [first, stop) with start <= time <= end."""
+        first = 0 if start is None else self.index_at(start - 1) + 1
+        stop = self.count if end is None else self.index_at(end) + 1
+        return first, max(first, stop)
+
+    def changes(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Tuple[int, Union[str, float]]]:
+        """Yield (time, value) for the changes with start <= time <= end."""
+        first, stop = self._range(start, end)
+        for time, code in zip(self._iter_times(first, stop), self._iter_codes(first, stop)):
+            yield time, self._decode(code)
+
+    def toggle_count(self, start: Optional[int] = None, end: Optional[int] = None) -> int:
+        """Bit transitions between known (0/1) values within [start, end]."""
+        if self.kind == "real":
+            return 0
+        first, stop = self._range(start, end)
+        # The value before the range is the reference for its first change
+        first = max(first - 1, 0) if start is not None else first
+        mask = (1 << self.width) - 1
+        toggles = 0
+        previous = None
+        for code in self._iter_codes(first, stop):
+            if previous is not None and code != previous:
+                toggles += bin((previous ^ code) & ~((previous | code) >> self.width) & mask).count("1")
+            previous = code
+        return toggles
+
+    def rising_edges(self) -> int:
+        """0 -> 1 transitions of a 1-bit signal."""
+        edges = 0
+        previous = None
+        for code in self._iter_codes(0, self.count):
+            if previous == 0 and code == 1:
+                edges += 1
+            previous = code
+        return edges
+
+
+class WaveStore:
+    """Read-only, memory-mapped columnar waveform store."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._mmap = None
+        self._buffer = None
+        self.meta = {}
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        """Map the store and read its footer."""
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.close()
+            raise WaveStoreError(f"{self.path}: empty waveform store")
+        if len(self._mmap) < _FOOTER.size:
+            self.close()
+            raise WaveStoreError(f"{self.path}: truncated waveform store")
+        length, magic = _FOOTER.unpack_from(self._mmap, len(self._mmap) - _FOOTER.size)
+        if magic != MAGIC or length > len(self._mmap) - _FOOTER.size:
+            self.close()
+            raise WaveStoreError(f"{self.path}: not a waveform store")
+        start = len(self._mmap) - _FOOTER.size - length
+        self.meta = json.loads(self._mmap[start:start + length].decode("utf-8"))
+        if self.meta.get("version") != STORE_VERSION or self.meta.get("byteorder") != sys.byteorder:
+            self.close()
+            raise WaveStoreError(f"{self.path}: unsupported store version or byte order")
+        self._buffer = memoryview(self._mmap)
+
+    def close(self):
+        """Unmap the store."""
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Signals still hold views; the mapping is released with them
+                pass
+            self._mmap = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @property
+    def block(self) -> int:
+        return self.meta["block"]
+
+    @property
+    def timescale(self) -> float:
+        return self.meta["timescale_s"]
+
+    @property
+    def start_time(self) -> Optional[int]:
+        return self.meta["start_time"]
+
+    @property
+    def end_time(self) -> Optional[int]:
+        return self.meta["end_time"]
+
+    @property
+    def signals(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Signal bindings per id code, as in VCDReader.signals."""
+        return {code: meta["bindings"] for code, meta in self.meta["signals"].items()}
+
+    def is_current(self, vcd_path: Path) -> bool:
+        """Whether the store was converted from the VCD as it is now."""
+        stat = os.stat(vcd_path)
+        return self.meta["vcd_size"] == stat.st_size and self.meta["vcd_mtime_ns"] == stat.st_mtime_ns
+
+    def by_code(self, code: str) -> WaveSignal:
+        """Signal of a VCD id code."""
+        return WaveSignal(self, code, self.meta["signals"][code])
+
+    def find(self, name: str) -> List[str]:
+        """Id codes of signals matching a hierarchical or leaf name."""
+        codes = []
+        for code, meta in self.meta["signals"].items():
+            for binding in meta["bindings"]:
+                full_name = f"{binding['scope']}.{binding['name']}" if binding["scope"] else binding["name"]
+                if name in (full_name, binding["name"]):
+                    codes.append(code)
+                    break
+        return codes
+
+    def signal(self, name: str) -> WaveSignal:
+        """Signal by hierarchical name (or unique leaf name)."""
+        codes = self.find(name)
+        if not codes:
+            raise KeyError(f"No signal named {name}")
+        if len(codes) > 1:
+            raise KeyError(f"Signal name {name} is ambiguous ({len(codes)} matches)")
+        return self.by_code(codes[0])
+
+
+def open_store(vcd_path: Path, convert: bool = False) -> Optional[WaveStore]:
+    """Open the current store of a VCD; convert it first if `convert`, else None when missing or stale."""
+    store_path = store_path_for(vcd_path)
+    if store_path.exists():
+        store = WaveStore(store_path)
+        try:
+            store.open()
+        except (OSError, ValueError, WaveStoreError):
+            store = None
+        else:
+            if store.is_current(vcd_path):
+                cache_lookup("wave_store", True)
+                return store
+            store.close()
+    cache_lookup("wave_store", False)
+    if not convert:
+        return None
+    convert_vcd(vcd_path, store_path)
+    store = WaveStore(store_path)
+    store.open()
+    return store
+
+
+def _open_for_query(path: str) -> WaveStore:
+    """Open a store given the store file or its VCD (converting when needed)."""
+    if path.endswith(STORE_SUFFIX):
+        store = WaveStore(Path(path))
+        store.open()
+        return store
+    return open_store(Path(path), convert=True)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Convert VCDs to a columnar, memory-mapped waveform store and query it")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="Convert a VCD (skipped while the store is current)")
+    convert_parser.add_argument("vcd", help="VCD file")
+    convert_parser.add_argument("--force", action="store_true", help="Convert even if the store is current")
+    info_parser = subparsers.add_parser("info", help="Summarize a store")
+    value_parser = subparsers.add_parser("value", help="Print a signal's value at a time")
+    changes_parser = subparsers.add_parser("changes", help="Print a signal's changes in a time range")
+    toggles_parser = subparsers.add_parser("toggles", help="Print toggle counts")
+    for sub in (info_parser, value_parser, changes_parser, toggles_parser):
+        sub.add_argument("store", help="Store file, or the VCD it was converted from")
+    value_parser.add_argument("signal", help="Signal name")
+    value_parser.add_argument("time", type=int, help="Time (VCD time units)")
+    changes_parser.add_argument("signal", help="Signal name")
+    toggles_parser.add_argument("signals", nargs="*", help="Signal names (default: all)")
+    for sub in (changes_parser, toggles_parser):
+        sub.add_argument("--start", type=int, help="Range start (VCD time units)")
+        sub.add_argument("--end", type=int, help="Range end (VCD time units)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "convert":
+            vcd_path = Path(args.vcd)
+            store = None if args.force else open_store(vcd_path)
+            if store:
+                store.close()
+                print(f"✅ {store_path_for(vcd_path)} is current")
+            else:
+                store_path = convert_vcd(vcd_path)
+                print(f"✅ {store_path}: {os.path.getsize(store_path):,} bytes "
+                      f"({os.path.getsize(store_path) / max(os.path.getsize(vcd_path), 1):.1%} of the VCD)")
+            return 0
+
+        with _open_for_query(args.store) as store:
+            if args.command == "info":
+                print(f"vcd: {store.meta['vcd']}")
+                print(f"timescale_s: {store.timescale}")
+                print(f"time: {store.start_time}..{store.end_time}")
+                print(f"id_codes: {len(store.meta['signals'])}")
+                print(f"value_changes: {sum(s['count'] for s in store.meta['signals'].values()):,}")
+            elif args.command == "value":
+                print(store.signal(args.signal).value_at(args.time))
+            elif args.command == "changes":
+                for time, value in store.signal(args.signal).changes(args.start, args.end):
+                    print(f"{time} {value}")
+            else:
+                codes = [code for name in args.signals for code in store.find(name)] if args.signals else list(store.signals)
+                for code in codes:
+                    signal = store.by_code(code)
+                    binding = signal.bindings[0]
+                    name = f"{binding['scope']}.{binding['name']}" if binding["scope"] else binding["name"]
+                    print(f"{name} {signal.toggle_count(args.start, args.end)}")
+    except (OSError, WaveStoreError, KeyError) as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Vyges Yosys Statistics Parser
+
+Parses the output of the Yosys `stat` command from synthesis logs, in both
+the classic text layout and the newer column layout, as well as
+`stat -json` output. For each module it extracts the cell-type table, cell,
+wire and wire-bit counts, memory bits and chip area (when a liberty file
+was given), plus the design hierarchy totals.
+
+Parsed results are cached per log file in `build/.cache/yosys_stat/` and
+reused while the file's mtime and size are unchanged, so the synthesis numbers
+are available to every report (and later runs) without re-parsing the logs.
+
+Usage:
+    python scripts/yosys_stat.py [--output text|json] [log ...]
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from profiler import cache_lookup
+
+
+# Logs searched for `stat` output (the Makefile `synth` target writes the
+# full Yosys log to synthesis.log and its console output to synthesis_output.log)
+STAT_LOG_PATTERNS = ["synthesis.log", "synthesis_output.log",
+                     "*synth*stat*.log", "*synth*stat*.txt", "*synth*stat*.json"]
+
+# Statistic labels (classic "Number of ..." and newer "<n> ..." layouts) -> keys
+STAT_FIELDS = {
+    "wires": "wires",
+    "wire bits": "wire_bits",
+    "public wires": "public_wires",
+    "public wire bits": "public_wire_bits",
+    "ports": "ports",
+    "port bits": "port_bits",
+    "memories": "memories",
+    "memory bits": "memory_bits",
+    "processes": "processes",
+    "cells": "cells"
+}
+
+# `stat -json` field names -> keys
+JSON_FIELDS = {
+    "num_wires": "wires",
+    "num_wire_bits": "wire_bits",
+    "num_pub_wires": "public_wires",
+    "num_pub_wire_bits": "public_wire_bits",
+    "num_ports": "ports",
+    "num_port_bits": "port_bits",
+    "num_memories": "memories",
+    "num_memory_bits": "memory_bits",
+    "num_processes": "processes",
+    "num_cells": "cells",
+    "area": "area"
+}
+
+DESIGN_HIERARCHY = "design hierarchy"
+
+_MODULE_HEADER_RE = re.compile(r'^=== (.+) ===\s*$')
+_NUMBER_OF_RE = re.compile(r'^\s+Number of ([a-z ]+?):\s+(\d+)\s*$')
+_COUNT_FIRST_RE = re.compile(r'^\s+(\d+)\s+([a-z ]+?)\s*$')
+_CELL_ROW_RE = re.compile(r'^\s+(\S+)\s+(\d+)\s*$')
+_CELL_ROW_COUNT_FIRST_RE = re.compile(r'^\s+(\d+)\s+(\S+)\s*$')
+_AREA_RE = re.compile(r'^\s+Chip area for (?:top )?module .*?:\s*([\d.]+)')
+_AREA_COUNT_FIRST_RE = re.compile(r'^\s+([\d.]+)\s+chip area\s*$')
+
+# On-disk cache of parsed stat logs, one JSON file per log
+DEFAULT_CACHE_DIR = "build/.cache"
+
+# Bump when the parsed result format changes so stale cache entries are not reused
+CACHE_VERSION = 1
+
+# Parsed stat cache: absolute path -> (mtime_ns, size, result)
+_STAT_CACHE = {}
+
+
+def clean_module_name(name: str) -> str:
+    """Strip the RTLIL escape from a module name (\\top -> top)."""
+    name = name.strip()
+    return name[1:] if name.startswith("\\") else name
+
+
+def _empty_stats() -> Dict[str, Any]:
+    """Statistics record for one module."""
+    stats = {key: 0 for key in STAT_FIELDS.values()}
+    stats["area"] = None
+    stats["cell_types"] = {}
+    return stats
+
+
+def parse_stat_text(lines) -> Dict[str, Any]:
+    """Parse Yosys `stat` text output; later `stat` runs override earlier ones."""
+    modules = {}
+    design = None
+    current = None
+    in_cells = False
+
+    for line in lines:
+        header = _MODULE_HEADER_RE.match(line)
+        if header:
+            name = header.group(1).strip()
+            current = _empty_stats()
+            if name == DESIGN_HIERARCHY:
+                design = current
+            else:
+                modules[clean_module_name(name)] = current
+            in_cells = False
+            continue
+        if current is None:
+            continue
+
+        match = _NUMBER_OF_RE.match(line) or _COUNT_FIRST_RE.match(line)
+        if match:
+            if match.re is _NUMBER_OF_RE:
+                label, value = match.group(1), match.group(2)
+            else:
+                value, label = match.group(1), match.group(2)
+            key = STAT_FIELDS.get(label)
+            if key:
+                current[key] = int(value)
+                in_cells = key == "cells"
+                continue
+
+        match = _AREA_RE.match(line) or _AREA_COUNT_FIRST_RE.match(line)
+        if match:
+            current["area"] = float(match.group(1))
+            in_cells = False
+            continue
+
+        if in_cells:
+            match = _CELL_ROW_RE.match(line)
+            if match and not match.group(1).isdigit():
+                current["cell_types"][match.group(1)] = int(match.group(2))
+                continue
+            match = _CELL_ROW_COUNT_FIRST_RE.match(line)
+            if match:
+                current["cell_types"][match.group(2)] = int(match.group(1))
+                continue
+            if line.strip():
+                in_cells = False
+
+    return {"modules": modules, "design": design}
+
+
+def parse_stat_json(data: Any) -> Optional[Dict[str, Any]]:
+    """Parse `stat -json` output (None if the JSON is not stat output)."""
+    if not isinstance(data, dict) or not isinstance(data.get("modules", {}), dict):
+        return None
+    if "modules" not in data and "design" not in data:
+        return None
+
+    def convert(entry: Dict[str, Any]) -> Dict[str, Any]:
+        stats = _empty_stats()
+        for field, key in JSON_FIELDS.items():
+            if field in entry:
+                stats[key] = entry[field]
+        stats["cell_types"] = dict(entry.get("num_cells_by_type", {}))
+        return stats
+
+    modules = {clean_module_name(name): convert(entry) for name, entry in data.get("modules", {}).items()
+               if isinstance(entry, dict)}
+    design = convert(data["design"]) if isinstance(data.get("design"), dict) else None
+    return {"modules": modules, "design": design}
+
+
+def _cache_file(path: str, cache_dir: str) -> Path:
+    """On-disk cache entry for a stat log, named after its absolute path."""
+    digest = hashlib.sha256(path.encode("utf-8")).hexdigest()
+    return Path(cache_dir) / "yosys_stat" / f"{digest[:16]}.json"
+
+
+def _read_cache(cache_file: Path, path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Return the cached result if it was parsed from this path, mtime and size."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (isinstance(entry, dict) and entry.get("version") == CACHE_VERSION and entry.get("path") == path
+            and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size):
+        return entry.get("result")
+    return None
+
+
+def _write_cache(cache_file: Path, path: str, stat: os.stat_result, result: Dict[str, Any]):
+    """Store a parsed result; the cache is best effort."""
+    entry = {"version": CACHE_VERSION, "path": path, "mtime_ns": stat.st_mtime_ns,
+             "size": stat.st_size, "result": result}
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        pass
+
+
+def load_stat(stat_log: Path, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Dict[str, Any]:
+    """Parse a stat log (text or JSON), reusing the cached result while it is unchanged."""
+    path = os.path.abspath(stat_log)
+    stat = os.stat(path)
+    cached = _STAT_CACHE.get(path)
+    hit = bool(cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size)
+    if not hit and cache_dir:
+        result = _read_cache(_cache_file(path, cache_dir), path, stat)
+        if result is not None:
+            result["log"] = str(stat_log)
+            cached = (stat.st_mtime_ns, stat.st_size, result)
+            _STAT_CACHE[path] = cached
+            hit = True
+    cache_lookup("yosys_stat", hit)
+    if hit:
+        return cached[2]
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "{":
+            try:
+                result = parse_stat_json(json.load(f)) or {"modules": {}, "design": None}
+            except json.JSONDecodeError:
+                f.seek(0)
+                result = parse_stat_text(f)
+        else:
+            result = parse_stat_text(f)
+
+    result["log"] = str(stat_log)
+    _STAT_CACHE[path] = (stat.st_mtime_ns, stat.st_size, result)
+    if cache_dir:
+        _write_cache(_cache_file(path, cache_dir), path, stat, result)
+    return result
+
+
+def find_stat_logs(project_root: Path) -> List[Path]:
+    """Find Yosys stat output logs in the project."""
+    files = set()
+    for pattern in STAT_LOG_PATTERNS:
+        for file_path in project_root.rglob(pattern):
+            if ".git" not in str(file_path) and file_path.is_file():
+                files.add(file_path)
+    return sorted(files)
+
+
+def collect_stats(stat_logs: List[Path], cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Dict[str, Any]:
+    """Merge the stat output of several logs (later logs win per module)."""
+    merged = {"logs": [], "modules": {}, "design": None}
+    for stat_log in stat_logs:
+        try:
+            result = load_stat(stat_log, cache_dir)
+        except (UnicodeDecodeError, OSError):
+            continue
+        if not result["modules"]:
+            continue
+        merged["logs"].append(str(stat_log))
+        merged["modules"].update(result["modules"])
+        if result["design"]:
+            merged["design"] = result["design"]
+    return merged
+
+
+def cell_inventory(stats: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """Per-module primitive cell counts; submodule instances and empty modules are dropped."""
+    inventory = {}
+    for name, module in stats["modules"].items():
+        cells = {cell_type: count for cell_type, count in module["cell_types"].items()
+                 if clean_module_name(cell_type) not in stats["modules"]}
+        if cells:
+            inventory[name] = cells
+    return inventory
+
+
+def analyze_synthesis(project_root: Path, stat_logs: Optional[List[Path]] = None) -> Dict[str, Any]:
+    """Summarize synthesized gate counts for the KPI report."""
+    project_root = Path(project_root)
+    if stat_logs is None:
+        stat_logs = find_stat_logs(project_root)
+    stats = collect_stats(stat_logs, str(project_root / DEFAULT_CACHE_DIR))
+
+    synthesis = {
+        "synthesis_stats_available": bool(stats["modules"]),
+        "stat_logs": stats["logs"],
+        "synthesis_modules_count": len(stats["modules"]),
+        "total_gate_count": 0,
+        "module_gate_counts": {name: module["cells"] for name, module in stats["modules"].items()},
+        "cell_types": {},
+        "wires": 0,
+        "wire_bits": 0,
+        "memory_bits": 0,
+        "area": None,
+        "modules": stats["modules"]
+    }
+    if not stats["modules"]:
+        return synthesis
+
+    # The hierarchy section flattens submodule instances; without it the
+    # design is the sum of its modules
+    totals = stats["design"]
+    if totals is None or not totals["cells"]:
+        totals = _empty_stats()
+        for module in stats["modules"].values():
+            for key in ("cells", "wires", "wire_bits", "memory_bits"):
+                totals[key] += module[key]
+            for cell_type, count in module["cell_types"].items():
+                totals["cell_types"][cell_type] = totals["cell_types"].get(cell_type, 0) + count
+            if module["area"] is not None:
+                totals["area"] = (totals["area"] or 0.0) + module["area"]
+
+    synthesis["total_gate_count"] = totals["cells"]
+    synthesis["cell_types"] = dict(sorted(totals["cell_types"].items(), key=lambda item: -item[1]))
+    synthesis["wires"] = totals["wires"]
+    synthesis["wire_bits"] = totals["wire_bits"]
+    synthesis["memory_bits"] = totals["memory_bits"]
+    synthesis["area"] = totals["area"]
+    return synthesis
+
+
+def print_synthesis_report(synthesis: Dict[str, Any]):
+    """Print a human-readable synthesis statistics report."""
+    print("=" * 60)
+    print("🔧 YOSYS SYNTHESIS STATISTICS")
+    print("=" * 60)
+    if not synthesis["synthesis_stats_available"]:
+        print("\n⚠️  No Yosys stat output found (run `make synth` first)")
+        return
+
+    print(f"\n📄 Logs: {', '.join(synthesis['stat_logs'])}")
+    print(f"   Total Cells: {synthesis['total_gate_count']:,}")
+    print(f"   Wires: {synthesis['wires']:,} ({synthesis['wire_bits']:,} bits)")
+    print(f"   Memory Bits: {synthesis['memory_bits']:,}")
+    if synthesis["area"] is not None:
+        print(f"   Chip Area: {synthesis['area']:.2f}")
+
+    print(f"\n📦 MODULES:")
+    for name, module in synthesis["modules"].items():
+        print(f"   {name}: {module['cells']:,} cells, {module['wire_bits']:,} wire bits, "
+              f"{module['memory_bits']:,} memory bits")
+        for cell_type, count in sorted(module["cell_types"].items(), key=lambda item: -item[1])[:10]:
+            print(f"     {cell_type:<24} {count:>8,}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Parse Yosys stat output")
+    parser.add_argument("logs", nargs="*", help="Yosys logs or stat -json files (default: discover)")
+    parser.add_argument("--project-root", default=".", help="Project root directory")
+    parser.add_argument("--output", choices=["text", "json"], default="text", help="Output format")
+    args = parser.parse_args()
+
+    synthesis = analyze_synthesis(Path(args.project_root),
+                                  [Path(p) for p in args.logs] if args.logs else None)
+    if args.output == "json":
+        print(json.dumps(synthesis, indent=2))
+    else:
+        print_synthesis_report(synthesis)
+    return 0 if synthesis["synthesis_stats_available"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+//=============================================================================
+// Bulk-Stepping C ABI for the Verilated example_core
+//=============================================================================
+// Description: Thin extern "C" wrapper around the Verilator model of
+//              example_core, built as a shared library and driven from Python
+//              (verilator_bulk.py) with ctypes. One call steps many cycles
+//              from preallocated input/output arrays, so there is no per-cycle
+//              crossing between Python and the simulator.
+// Author: Vyges Team
+// License: Apache-2.0
+//=============================================================================
+//
+// Cycle convention (same as the cocotb tests and example_core_model.py):
+// for cycle n the outputs are sampled with the clock low, then inputs[n] are
+// applied, then one rising and one falling clock edge are evaluated.
+//
+// Arrays are passed port by port in the order of ec_input_names() and
+// ec_output_names(), one uint64_t per cycle (ports are at most 64 bits wide).
+//
+// The model is Verilated with --savable: ec_save()/ec_restore() write and
+// read the complete simulation state (plus the simulation time), so runs can
+// fork from a checkpoint taken after reset and configuration.
+//=============================================================================
+
+#include <cstdint>
+
+#include "verilated.h"
+#include "verilated_save.h"
+#include "Vexample_core.h"
+
+#define EC_ABI_VERSION 2
+
+namespace {
+
+struct Core {
+    VerilatedContext context;
+    Vexample_core* top;
+};
+
+const uint64_t HALF_PERIOD = 5;
+
+void half_cycle(Core* core, uint8_t clk) {
+    core->top->clk_i = clk;
+    core->top->eval();
+    core->context.timeInc(HALF_PERIOD);
+}
+
+}  // namespace
+
+extern "C" {
+
+int ec_abi_version() { return EC_ABI_VERSION; }
+
+// Must match INPUTS and OUTPUTS in example_core_model.py
+const char* ec_input_names() {
+    return "reset_n_i,enable_i,start_i,clear_i,data_in_i,valid_in_i,ready_out_i,"
+           "config_addr_i,config_data_i,config_valid_i";
+}
+
+const char* ec_output_names() {
+    return "busy_o,done_o,error_o,ready_in_o,data_out_o,valid_out_o,config_ready_o,status_o";
+}
+
+void* ec_create() {
+    Core* core = new Core;
+    core->top = new Vexample_core{&core->context, "example_core"};
+    core->top->clk_i = 0;
+    core->top->reset_n_i = 1;
+    core->top->eval();
+    return core;
+}
+
+void ec_destroy(void* handle) {
+    Core* core = static_cast<Core*>(handle);
+    core->top->final();
+    delete core->top;
+    delete core;
+}
+
+// Hold reset (all other inputs low) for `cycles` clock cycles, then release it with the clock low
+void ec_reset(void* handle, uint64_t cycles) {
+    Core* core = static_cast<Core*>(handle);
+    Vexample_core* top = core->top;
+    top->enable_i = 0;
+    top->start_i = 0;
+    top->clear_i = 0;
+    top->data_in_i = 0;
+    top->valid_in_i = 0;
+    top->ready_out_i = 0;
+    top->config_addr_i = 0;
+    top->config_data_i = 0;
+    top->config_valid_i = 0;
+    top->reset_n_i = 0;
+    half_cycle(core, 0);
+    for (uint64_t n = 0; n < cycles; n++) {
+        half_cycle(core, 1);
+        half_cycle(core, 0);
+    }
+    top->reset_n_i = 1;
+    top->eval();
+}
+
+// Step `cycles` cycles: out[port][n] is sampled before in[port][n] is applied
+void ec_step(void* handle, uint64_t cycles, const uint64_t* const* in, uint64_t* const* out) {
+    Core* core = static_cast<Core*>(handle);
+    Vexample_core* top = core->top;
+    for (uint64_t n = 0; n < cycles; n++) {
+        out[0][n] = top->busy_o;
+        out[1][n] = top->done_o;
+        out[2][n] = top->error_o;
+        out[3][n] = top->ready_in_o;
+        out[4][n] = top->data_out_o;
+        out[5][n] = top->valid_out_o;
+        out[6][n] = top->config_ready_o;
+        out[7][n] = top->status_o;
+
+        top->reset_n_i = in[0][n];
+        top->enable_i = in[1][n];
+        top->start_i = in[2][n];
+        top->clear_i = in[3][n];
+        top->data_in_i = in[4][n];
+        top->valid_in_i = in[5][n];
+        top->ready_out_i = in[6][n];
+        top->config_addr_i = in[7][n];
+        top->config_data_i = in[8][n];
+        top->config_valid_i = in[9][n];
+        top->eval();
+
+        half_cycle(core, 1);
+        half_cycle(core, 0);
+    }
+}
+
+uint64_t ec_time(void* handle) { return static_cast<Core*>(handle)->context.time(); }
+
+// Save the complete model state to a file; returns 0 on success
+int ec_save(void* handle, const char* path) {
+    Core* core = static_cast<Core*>(handle);
+    VerilatedSave os;
+    os.open(path);
+    if (!os.isOpen()) return -1;
+    uint64_t time = core->context.time();
+    os << time;
+    os << *core->top;
+    os.close();
+    return 0;
+}
+
+// Restore a state written by ec_save() with the same library; returns 0 on success
+int ec_restore(void* handle, const char* path) {
+    Core* core = static_cast<Core*>(handle);
+    VerilatedRestore os;
+    os.open(path);
+    if (!os.isOpen()) return -1;
+    uint64_t time;
+    os >> time;
+    os >> *core->top;
+    os.close();
+    core->context.time(time);
+    return 0;
+}
+
+}  // extern "C"
@@ -0,0 +1,128 @@
+#=============================================================================
+# Warm-up Snapshots for the example_core cocotb Tests
+#=============================================================================
+# Description: Capture the register state of example_core after a warm-up
+#              (reset + configuration) once, then restore it in later tests
+#              instead of simulating the warm-up again
+# Author: Vyges Team
+# License: Apache-2.0
+#=============================================================================
+#
+# A snapshot holds every state register of the RTL (read through the cocotb
+# hierarchy) together with the reference model's registers at the same
+# point, so the model can continue from it as well. Capturing cross-checks
+# the DUT registers against the model. Restoring resets the DUT for one cycle
+# and deposits the registers; the Scoreboard of the test that follows then
+# verifies the restored state cycle by cycle.
+#
+# Snapshots are stored as JSON in build/checkpoints/, keyed by the RTL
+# source, the parameters, the simulator and the warm-up stimulus, and are
+# reused by later test runs until one of them changes. The compiled Verilator
+# flow (verilator_bulk.py) checkpoints with Verilator's --savable instead.
+#=============================================================================
+
+import json
+
+import numpy as np
+
+import cocotb
+from cocotb.triggers import FallingEdge, Timer
+from cocotb.clock import Clock
+
+from example_core_model import INPUTS
+from example_core_scenarios import CHECKPOINT_DIR, warmup_key
+
+SNAPSHOT_VERSION = 1
+
+# State registers of rtl/example_core.sv
+SCALAR_REGISTERS = ["current_state", "buffer_count", "buffer_wr_ptr", "buffer_rd_ptr", "data_out_o", "valid_out_o",
+                    "busy_o", "done_o", "error_o", "processing_active", "status_reg"]
+ARRAY_REGISTERS = ["data_buffer", "config_reg"]
+
+
+async def reset_dut(dut, cycles=2):
+    """Start the clock and hold reset for a few cycles; returns on a falling edge with reset released"""
+    cocotb.start_soon(Clock(dut.clk_i, 10, units="ns").start())
+    for name in INPUTS:
+        getattr(dut, name).value = 0
+    await FallingEdge(dut.clk_i)
+    for _ in range(cycles):
+        await FallingEdge(dut.clk_i)
+    dut.reset_n_i.value = 1
+
+
+def model_registers(model, registers):
+    """RTL register values implied by a model register snapshot"""
+    state, count, valid_out, busy, done, error = model.control_states[registers["control"]]
+    return {
+        "current_state": state, "buffer_count": count, "buffer_wr_ptr": registers["wr_ptr"],
+        "buffer_rd_ptr": registers["rd_ptr"], "data_out_o": registers["data_out"], "valid_out_o": valid_out,
+        "busy_o": busy, "done_o": done, "error_o": error, "status_reg": registers["status"],
+        "data_buffer": [int(value) for value in registers["buffer"]]
+    }
+
+
+def read_registers(dut):
+    """Current value of every state register"""
+    registers = {name: int(getattr(dut, name).value) for name in SCALAR_REGISTERS}
+    for name in ARRAY_REGISTERS:
+        handle = getattr(dut, name)
+        registers[name] = [int(handle[index].value) for index in range(len(handle))]
+    return registers
+
+
+def write_registers(dut, registers):
+    """Deposit state register values"""
+    for name in SCALAR_REGISTERS:
+        getattr(dut, name).value = registers[name]
+    for name in ARRAY_REGISTERS:
+        handle = getattr(dut, name)
+        for index, value in enumerate(registers[name]):
+            handle[index].value = value
+
+
+def snapshot_path(model, warmup):
+    """Snapshot file of a warm-up for the running simulator"""
+    return CHECKPOINT_DIR / f"cocotb_{warmup}_{warmup_key(model, warmup, 'cocotb', cocotb.SIM_NAME)}.json"
+
+
+def capture_snapshot(dut, model, warmup, registers):
+    """Snapshot the DUT after a warm-up; registers is the model snapshot at the same cycle"""
+    dut_registers = read_registers(dut)
+    expected = model_registers(model, registers)
+    mismatched = [name for name, value in expected.items() if dut_registers[name] != value]
+    assert not mismatched, f"Registers after warm-up {warmup} differ from the model: {', '.join(mismatched)}"
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "warmup": warmup,
+        "registers": dut_registers,
+        "model": {name: [int(v) for v in value] if name == "buffer" else int(value) for name, value in registers.items()}
+    }
+    path = snapshot_path(model, warmup)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(snapshot, f)
+    return snapshot
+
+
+def load_snapshot(model, warmup):
+    """Stored snapshot of a warm-up, or None"""
+    try:
+        with open(snapshot_path(model, warmup), 'r') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return snapshot if snapshot.get("version") == SNAPSHOT_VERSION else None
+
+
+def snapshot_model_registers(snapshot):
+    """Model registers of a snapshot (pass as initial= to ExampleCoreModel.run)"""
+    return {**snapshot["model"], "buffer": np.array(snapshot["model"]["buffer"], dtype=np.uint64)}
+
+
+async def restore_snapshot(dut, snapshot):
+    """Reset for one cycle and load a snapshot; returns with the clock low, ready for the first cycle"""
+    await reset_dut(dut, cycles=1)
+    write_registers(dut, snapshot["registers"])
+    # Let the deposits and the combinational outputs settle before the first sample
+    await Timer(1, "ns")
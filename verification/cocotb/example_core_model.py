@@ -0,0 +1,332 @@
+#=============================================================================
+# Reference Model for example_core
+#=============================================================================
+# Description: Bit-accurate, cycle-accurate Python model of rtl/example_core.sv
+#              (state_t FSM, configuration interface, data buffer and the
+#              valid/ready handshakes) used as a scoreboard by the cocotb tests.
+# Author: Vyges Team
+# License: Apache-2.0
+#=============================================================================
+#
+# Cycle convention: the testbench samples the outputs and then drives the
+# inputs on each falling clock edge. For cycle n, outputs[n] are the values
+# sampled before inputs[n] are applied; the rising edge that follows updates
+# the registers from inputs[n]. reset_n_i low in cycle n resets the registers
+# seen in cycle n+1. Cycle 0 starts from the reset state.
+#
+# All outputs of example_core are functions of its registers. The model splits
+# them into two parts:
+#   - control: FSM state, buffer count, valid_out_o, busy_o/done_o/error_o.
+#     This is a small finite state machine over six input bits. It is compiled
+#     once into a transition table, so the only per-cycle Python work is one
+#     table lookup.
+#   - data: data_out_o and status_o. These are computed for all cycles at once
+#     with NumPy from the write/read/load events of the control trajectory.
+#=============================================================================
+
+import numpy as np
+
+# state_t encoding
+ST_IDLE = 0
+ST_CONFIG = 1
+ST_PROCESS = 2
+ST_OUTPUT = 3
+ST_ERROR = 4
+
+STATE_NAMES = {ST_IDLE: "IDLE", ST_CONFIG: "CONFIG", ST_PROCESS: "PROCESS", ST_OUTPUT: "OUTPUT", ST_ERROR: "ERROR"}
+
+INPUTS = ["reset_n_i", "enable_i", "start_i", "clear_i", "data_in_i", "valid_in_i", "ready_out_i",
+          "config_addr_i", "config_data_i", "config_valid_i"]
+
+OUTPUTS = ["busy_o", "done_o", "error_o", "ready_in_o", "data_out_o", "valid_out_o", "config_ready_o", "status_o"]
+
+# Control input bits
+_RESET = 1
+_START = 2          # start_i && enable_i
+_CONFIG_VALID = 4
+_CLEAR = 8
+_VALID_IN = 16
+_READY_OUT = 32
+_CODES = 64
+
+
+class ExampleCoreModel:
+    """Reference model of example_core for a given parameterization"""
+
+    def __init__(self, data_width=32, addr_width=8, buffer_depth=16):
+        if not 1 <= data_width <= 64:
+            raise ValueError(f"DATA_WIDTH must be 1..64 for the NumPy model, got {data_width}")
+        if buffer_depth > (1 << addr_width):
+            raise ValueError(f"BUFFER_DEPTH {buffer_depth} does not fit ADDR_WIDTH {addr_width} pointers")
+        self.data_width = data_width
+        self.addr_width = addr_width
+        self.buffer_depth = buffer_depth
+        self.data_mask = np.uint64((1 << data_width) - 1)
+        self._build_control_table()
+
+    #-------------------------------------------------------------------------
+    # Control FSM
+    #-------------------------------------------------------------------------
+
+    # Control registers: (current_state, buffer_count, valid_out_o, busy_o, done_o, error_o)
+    RESET_CONTROL = (ST_IDLE, 0, 0, 0, 0, 0)
+
+    def _control_step(self, regs, code):
+        """One rising edge of the control registers; returns (next regs, write, read, load, config_write)"""
+        if code & _RESET:
+            return self.RESET_CONTROL, False, False, False, False
+        state, count, valid_out, busy, done, error = regs
+        full = count == self.buffer_depth
+        empty = count == 0
+        ready_in = state == ST_PROCESS and not full
+        valid_in = bool(code & _VALID_IN)
+        ready_out = bool(code & _READY_OUT)
+
+        # Next-state logic
+        next_state = state
+        if state == ST_IDLE:
+            if code & _START:
+                next_state = ST_CONFIG
+        elif state == ST_CONFIG:
+            if code & _CONFIG_VALID:
+                next_state = ST_PROCESS
+            elif code & _CLEAR:
+                next_state = ST_IDLE
+        elif state == ST_PROCESS:
+            if valid_in and not full:
+                next_state = ST_PROCESS
+            elif count > 0:
+                next_state = ST_OUTPUT
+            elif done:
+                next_state = ST_IDLE
+        elif state == ST_OUTPUT:
+            if ready_out and valid_out:
+                next_state = ST_OUTPUT if count > 1 else ST_PROCESS
+        elif state == ST_ERROR:
+            if code & _CLEAR:
+                next_state = ST_IDLE
+        else:
+            next_state = ST_IDLE
+
+        # Data buffer: the read's count update is the last nonblocking assignment and wins
+        write = valid_in and ready_in and not full
+        read = ready_out and bool(valid_out) and not empty
+        next_count = count - 1 if read else count + 1 if write else count
+
+        # Output register and control outputs
+        load = state == ST_OUTPUT and not empty
+        next_valid_out = 1 if load else 0
+        next_busy = 1 if state in (ST_CONFIG, ST_PROCESS, ST_OUTPUT) else 0
+        next_error = 1 if state == ST_ERROR else 0
+        config_write = bool(code & _CONFIG_VALID) and state == ST_CONFIG
+        return (next_state, next_count, next_valid_out, next_busy, 0, next_error), write, read, load, config_write
+
+    def _build_control_table(self):
+        """Enumerate the reachable control states and tabulate transitions and outputs"""
+        index = {self.RESET_CONTROL: 0}
+        states = [self.RESET_CONTROL]
+        transitions = []
+        flags = []
+        pending = 0
+        while pending < len(states):
+            regs = states[pending]
+            pending += 1
+            for code in range(_CODES):
+                nxt, write, read, load, config_write = self._control_step(regs, code)
+                if nxt not in index:
+                    index[nxt] = len(states)
+                    states.append(nxt)
+                transitions.append(index[nxt])
+                flags.append((write, read, load, config_write))
+        self.control_states = states
+        self._next = transitions
+        flags = np.array(flags, dtype=bool)
+        self._write, self._read, self._load, self._config_write = flags.T
+        table = np.array(states, dtype=np.int64)
+        self._state = table[:, 0].astype(np.uint8)
+        self._count = table[:, 1]
+        self._valid_out = table[:, 2].astype(np.uint64)
+        self._busy = table[:, 3].astype(np.uint64)
+        self._done = table[:, 4].astype(np.uint64)
+        self._error = table[:, 5].astype(np.uint64)
+        self._ready_in = ((table[:, 0] == ST_PROCESS) & (table[:, 1] < self.buffer_depth)).astype(np.uint64)
+        self._config_ready = (table[:, 0] == ST_CONFIG).astype(np.uint64)
+
+    #-------------------------------------------------------------------------
+    # Batched evaluation
+    #-------------------------------------------------------------------------
+
+    def _inputs(self, stimulus, cycles):
+        """Stimulus arrays with defaults for undriven inputs"""
+        unknown = set(stimulus) - set(INPUTS)
+        if unknown:
+            raise KeyError(f"Unknown example_core inputs: {', '.join(sorted(unknown))}")
+        inputs = {}
+        for name in INPUTS:
+            default = 1 if name == "reset_n_i" else 0
+            value = np.asarray(stimulus.get(name, default), dtype=np.uint64)
+            inputs[name] = np.broadcast_to(value, (cycles,)) if value.ndim == 0 else value
+            if len(inputs[name]) != cycles:
+                raise ValueError(f"{name} has {len(inputs[name])} cycles, expected {cycles}")
+        return inputs
+
+    @staticmethod
+    def _last_before(events):
+        """For each cycle n, the last cycle < n with an event (-1 if none)"""
+        marks = np.where(events, np.arange(len(events)), -1)
+        return np.concatenate(([-1], np.maximum.accumulate(marks)[:-1]))
+
+    @staticmethod
+    def _count_before(events):
+        """For each cycle n, the number of events in cycles < n"""
+        return np.concatenate(([0], np.cumsum(events, dtype=np.int64)[:-1]))
+
+    def reset_registers(self):
+        """Register snapshot right after reset (see run(initial=...))"""
+        return {"control": 0, "wr_ptr": 0, "rd_ptr": 0, "buffer": np.zeros(self.buffer_depth, dtype=np.uint64),
+                "data_out": 0, "status": 0}
+
+    def run(self, stimulus, cycles=None, initial=None):
+        """Expected outputs (and FSM state) for every cycle of a stimulus.
+
+        stimulus maps input port names to per-cycle arrays (or scalars held for
+        the whole run). Returns a dict of per-cycle NumPy arrays for every
+        output port plus "state" (state_t) and "buffer_count", and under
+        "final" the register snapshot after the last cycle. Passing that
+        snapshot as initial continues a run where the previous one ended.
+        """
+        if cycles is None:
+            lengths = {len(np.atleast_1d(v)) for v in stimulus.values() if np.ndim(v) > 0}
+            if len(lengths) != 1:
+                raise ValueError("Pass cycles= or per-cycle arrays of one length")
+            cycles = lengths.pop()
+        inputs = self._inputs(stimulus, cycles)
+        initial = initial or self.reset_registers()
+
+        codes = ((inputs["reset_n_i"] == 0) * _RESET
+                 | ((inputs["start_i"] != 0) & (inputs["enable_i"] != 0)) * _START
+                 | (inputs["config_valid_i"] != 0) * _CONFIG_VALID
+                 | (inputs["clear_i"] != 0) * _CLEAR
+                 | (inputs["valid_in_i"] != 0) * _VALID_IN
+                 | (inputs["ready_out_i"] != 0) * _READY_OUT).astype(np.int64)
+
+        # Control trajectory: one table lookup per cycle
+        trajectory = [0] * cycles
+        transitions = self._next
+        current = initial["control"]
+        for n, code in enumerate(codes.tolist()):
+            trajectory[n] = current
+            current = transitions[current * _CODES + code]
+        control = np.array(trajectory, dtype=np.int64)
+
+        # Register events per cycle; one extra idle entry yields the registers after the last cycle
+        events = control * _CODES + codes
+        write = np.append(self._write[events], False)
+        read = np.append(self._read[events], False)
+        load = np.append(self._load[events], False)
+        config_write = np.append(self._config_write[events], False)
+        reset = np.append((codes & _RESET) != 0, False)
+        data_in = inputs["data_in_i"] & self.data_mask
+
+        # Registers written before the last reset no longer exist; before any reset they start from initial
+        last_reset = self._last_before(reset)
+        carried = last_reset < 0
+        writes_before = self._count_before(write)
+        reads_before = self._count_before(read)
+        epoch = last_reset + 1
+        wr_ptr = (writes_before - writes_before[epoch] + carried * initial["wr_ptr"]) % self.buffer_depth
+        rd_ptr = (reads_before - reads_before[epoch] + carried * initial["rd_ptr"]) % self.buffer_depth
+
+        # Value loaded into data_out_o: the last write to the slot at rd_ptr in the current epoch
+        write_cycles = np.flatnonzero(write)
+        load_cycles = np.flatnonzero(load)
+        slots = rd_ptr[load_cycles]
+        stride = cycles + 1
+        write_keys = wr_ptr[write_cycles] * stride + write_cycles
+        order = np.argsort(write_keys, kind="stable")
+        write_keys = write_keys[order]
+        write_cycles = write_cycles[order]
+        loaded = np.where(carried[load_cycles], initial["buffer"][slots], np.uint64(0))
+        if len(write_cycles):
+            found = (np.searchsorted(write_keys, slots * stride + load_cycles) - 1).clip(min=0)
+            source = write_cycles[found]
+            hit = (write_keys[found] // stride == slots) & (source < load_cycles) & (source > last_reset[load_cycles])
+            loaded = np.where(hit, data_in[source], loaded)
+
+        # data_out_o holds the last loaded value until a reset
+        data_out = np.where(carried, np.uint64(initial["data_out"]), np.uint64(0))
+        last_load = self._last_before(load)
+        valid = last_load > last_reset
+        data_out[valid] = loaded[np.searchsorted(load_cycles, last_load[valid])]
+
+        # status_o is the data of the last configuration write
+        status = np.where(carried, np.uint64(initial["status"]), np.uint64(0))
+        last_config = self._last_before(config_write)
+        valid = last_config > last_reset
+        status[valid] = inputs["config_data_i"][last_config[valid]] & self.data_mask
+
+        # Buffer contents after the last cycle
+        buffer = initial["buffer"].copy() if carried[cycles] else np.zeros(self.buffer_depth, dtype=np.uint64)
+        written = write_cycles[write_cycles > last_reset[cycles]]
+        if len(written):
+            written = np.sort(written)[::-1]
+            slot, latest = np.unique(wr_ptr[written], return_index=True)
+            buffer[slot] = data_in[written[latest]]
+        final = {"control": current, "wr_ptr": int(wr_ptr[cycles]), "rd_ptr": int(rd_ptr[cycles]), "buffer": buffer,
+                 "data_out": int(data_out[cycles]), "status": int(status[cycles])}
+
+        return {
+            "busy_o": self._busy[control],
+            "done_o": self._done[control],
+            "error_o": self._error[control],
+            "ready_in_o": self._ready_in[control],
+            "data_out_o": data_out[:cycles],
+            "valid_out_o": self._valid_out[control],
+            "config_ready_o": self._config_ready[control],
+            "status_o": status[:cycles],
+            "state": self._state[control],
+            "buffer_count": self._count[control],
+            "final": final
+        }
+
+
+def random_stimulus(cycles, seed=None, data_width=32, addr_width=8, rates=None):
+    """Uniform random stimulus for example_core (one reset cycle first)"""
+    rng = np.random.default_rng(seed)
+    rates = {"enable_i": 0.9, "start_i": 0.2, "clear_i": 0.02, "valid_in_i": 0.6, "ready_out_i": 0.7,
+             "config_valid_i": 0.3, **(rates or {})}
+    stimulus = {name: (rng.random(cycles) < rate).astype(np.uint64) for name, rate in rates.items()}
+    stimulus["reset_n_i"] = np.ones(cycles, dtype=np.uint64)
+    stimulus["reset_n_i"][0] = 0
+    high = np.uint64((1 << data_width) - 1)
+    stimulus["data_in_i"] = rng.integers(0, high, cycles, dtype=np.uint64, endpoint=True)
+    stimulus["config_data_i"] = rng.integers(0, high, cycles, dtype=np.uint64, endpoint=True)
+    stimulus["config_addr_i"] = rng.integers(0, 1 << addr_width, cycles, dtype=np.uint64)
+    return stimulus
+
+
+class Scoreboard:
+    """Compares sampled DUT outputs against the reference model, all cycles at once"""
+
+    def __init__(self, expected, signals=OUTPUTS):
+        self.expected = expected
+        self.signals = list(signals)
+        self.mismatches = []
+
+    def compare(self, observed, max_reported=10):
+        """Record mismatching (cycle, signal, expected, observed); returns True when all match"""
+        self.mismatches = []
+        for name in self.signals:
+            got = np.asarray(observed[name], dtype=np.uint64)
+            want = self.expected[name][:len(got)]
+            for cycle in np.flatnonzero(got != want)[:max_reported]:
+                self.mismatches.append((int(cycle), name, int(want[cycle]), int(got[cycle])))
+        self.mismatches.sort()
+        return not self.mismatches
+
+    def report(self):
+        """Human-readable list of the first mismatches"""
+        states = self.expected["state"]
+        return "\n".join(f"cycle {cycle} [{STATE_NAMES.get(int(states[cycle]), states[cycle])}] {name}: "
+                         f"expected 0x{want:x}, got 0x{got:x}"
+                         for cycle, name, want, got in self.mismatches)
@@ -0,0 +1,163 @@
+#=============================================================================
+# Test Scenarios for example_core
+#=============================================================================
+# Description: Stimulus and checks shared by the cocotb tests and the
+#              Verilator bulk driver
+# Author: Vyges Team
+# License: Apache-2.0
+#=============================================================================
+#
+# A scenario is a stimulus (per-cycle input arrays) plus a check of the
+# expected outputs. Each execution path drives the stimulus its own way,
+# compares the DUT against the reference model with the Scoreboard and then
+# runs the scenario's check:
+#
+#   scenario = SCENARIOS["data_flow"](model)
+#   expected = model.run(scenario.stimulus)
+#   ... drive the DUT, Scoreboard(expected).compare(observed) ...
+#   scenario.check(expected)
+#
+# The stimulus starts right after reset, or, when the scenario has a warmup
+# (a stimulus shared by several scenarios, such as start + configuration),
+# right after the warmup. Execution paths run a warmup once, checkpoint the
+# DUT and the model (example_core_checkpoint.py) and start every scenario
+# with the same warmup from that checkpoint.
+#=============================================================================
+
+import hashlib
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from example_core_model import INPUTS, random_stimulus
+from example_core_coverage import CoverageDirectedStimulus, example_core_covergroup
+
+Scenario = namedtuple("Scenario", ["name", "stimulus", "check", "warmup"], defaults=(None,))
+
+DATA_FLOW_WORDS = [0x12, 0x34, 0x56, 0x78, 0x9A, 0xBC, 0xDE, 0xF0]
+CONFIG_DATA = 0xC0FFEE
+
+
+def stimulus_from(steps):
+    """Per-cycle stimulus arrays from a list of {input: value} dicts (undriven inputs idle)"""
+    stimulus = {name: np.zeros(len(steps), dtype=np.uint64) for name in INPUTS}
+    stimulus["reset_n_i"][:] = 1
+    for cycle, step in enumerate(steps):
+        for name, value in step.items():
+            stimulus[name][cycle] = value
+    return stimulus
+
+
+def configure_steps(config_data=CONFIG_DATA):
+    """start -> one configuration write (leaves the FSM in PROCESS)"""
+    return [{"enable_i": 1, "start_i": 1},
+            {"enable_i": 1, "config_valid_i": 1, "config_addr_i": 0x10, "config_data_i": config_data}]
+
+
+def stream_steps(words):
+    """Stream words into the buffer, then drain it"""
+    steps = [{"enable_i": 1, "valid_in_i": 1, "data_in_i": word} for word in words]
+    steps += [{"enable_i": 1, "ready_out_i": 1} for _ in range(2 * len(words) + 4)]
+    return steps
+
+
+def data_flow_steps(words, config_data=CONFIG_DATA):
+    """start -> configure -> stream words in -> drain them"""
+    return configure_steps(config_data) + stream_steps(words)
+
+
+# Warm-ups shared by several scenarios: name -> stimulus factory (model -> stimulus)
+CONFIGURED = "configured"
+WARMUPS = {CONFIGURED: lambda model: stimulus_from(configure_steps())}
+
+RTL_SOURCES = [Path(__file__).resolve().parents[2] / "rtl" / "example_core.sv"]
+
+# Python sources whose behaviour is baked into a checkpoint (model state, warm-up stimulus, snapshot layout)
+MODEL_SOURCES = [Path(__file__).resolve().with_name(name)
+                 for name in ("example_core_model.py", "example_core_scenarios.py", "example_core_checkpoint.py")]
+
+# Where warm-up checkpoints are kept between runs
+CHECKPOINT_DIR = Path(__file__).resolve().parents[2] / "build" / "checkpoints"
+
+
+def warmup_key(model, warmup, *context):
+    """Digest identifying a warm-up checkpoint: RTL and model sources, parameters, warm-up stimulus and caller context"""
+    digest = hashlib.sha256()
+    for source in RTL_SOURCES + MODEL_SOURCES:
+        digest.update(source.read_bytes())
+    digest.update(repr((model.data_width, model.addr_width, model.buffer_depth, warmup) + context).encode())
+    stimulus = WARMUPS[warmup](model)
+    for name in INPUTS:
+        digest.update(np.ascontiguousarray(stimulus[name], dtype=np.uint64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def transfers(expected, stimulus):
+    """Data words accepted downstream (valid_out_o && ready_out_i)"""
+    taken = (expected["valid_out_o"] != 0) & (stimulus["ready_out_i"] != 0)
+    return expected["data_out_o"][taken].tolist()
+
+
+def reset_scenario(model, seed=None, cycles=None):
+    """Idle after reset, then a reset in the middle of an operation"""
+    steps = [{}] * 4 + data_flow_steps([0x12, 0x34])[:4] + [{"reset_n_i": 0}] + [{}] * 3
+
+    def check(expected):
+        assert not expected["busy_o"][:4].any() and not expected["valid_out_o"][:4].any(), "Not idle after reset"
+        assert expected["busy_o"][7], "Operation did not start"
+        assert not expected["busy_o"][-3:].any() and expected["status_o"][-1] == 0, "Reset did not return to idle"
+    return Scenario("reset", stimulus_from(steps), check)
+
+
+def data_flow_scenario(model, seed=None, cycles=None):
+    """Data flow through the buffer of a configured core"""
+    stimulus = stimulus_from(stream_steps(DATA_FLOW_WORDS))
+
+    def check(expected):
+        assert expected["status_o"][-1] == CONFIG_DATA & ((1 << model.data_width) - 1), "status_o not configured"
+        delivered = transfers(expected, stimulus)
+        assert all(word in delivered for word in DATA_FLOW_WORDS), f"Not all words were delivered: {delivered}"
+    return Scenario("data_flow", stimulus, check, CONFIGURED)
+
+
+def edge_case_scenario(model, seed=None, cycles=None):
+    """Edge-case data values, filling past BUFFER_DEPTH for the full flag and back-pressure"""
+    mask = (1 << model.data_width) - 1
+    edge_cases = [0x00, mask, 0x5555555555555555 & mask, 0xAAAAAAAAAAAAAAAA & mask]
+    words = (edge_cases * model.buffer_depth)[:model.buffer_depth + 4]
+    stimulus = stimulus_from(stream_steps(words))
+
+    def check(expected):
+        assert (expected["buffer_count"] == model.buffer_depth).any(), "Buffer never reached full"
+        delivered = transfers(expected, stimulus)
+        assert all(word in delivered for word in edge_cases), f"Edge case values missing: {delivered}"
+    return Scenario("edge_cases", stimulus, check, CONFIGURED)
+
+
+def coverage_scenario(model, seed=None, cycles=20000, covered=None):
+    """Coverage-directed random stimulus until the covergroup closes (covered: hits already collected)"""
+    generator = CoverageDirectedStimulus(model, example_core_covergroup(model), seed=seed)
+    if covered is not None:
+        generator.group.merge(covered)
+    stimulus = generator.generate(cycles)
+
+    def check(expected):
+        assert generator.group.closed(), \
+            f"Coverage not closed in {len(expected['state'])} cycles:\n{generator.group.report()}"
+    return Scenario("coverage_closure", stimulus, check)
+
+
+def random_scenario(model, seed=None, cycles=20000):
+    """Unconstrained-random soak"""
+    stimulus = random_stimulus(cycles, seed, model.data_width, model.addr_width)
+    return Scenario("random", stimulus, lambda expected: None)
+
+
+SCENARIOS = {
+    "reset": reset_scenario,
+    "data_flow": data_flow_scenario,
+    "edge_cases": edge_case_scenario,
+    "coverage_closure": coverage_scenario,
+    "random": random_scenario
+}
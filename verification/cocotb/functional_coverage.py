@@ -0,0 +1,265 @@
+#=============================================================================
+# Functional Coverage
+#=============================================================================
+# Description: SystemVerilog-style covergroups, coverpoints and crosses for
+#              cocotb testbenches, with bin hits counted in NumPy arrays
+# Author: Vyges Team
+# License: Apache-2.0
+#=============================================================================
+#
+# Covergroups are sampled with whole arrays of cycles at a time: a sample is
+# a dict of equal-length arrays (ports, model state, ...). Each coverpoint
+# maps its values to bin indices with one vectorized lookup and adds them to
+# a hit-count array with np.bincount, so the per-cycle cost is a few array
+# operations shared by all bins.
+#
+#   group = Covergroup("example_core")
+#   group.coverpoint("state", {"IDLE": 0, "CONFIG": 1})
+#   group.coverpoint("data", value_bins(32), key="data_in_i", iff="write")
+#   group.cross("state_x_data", "state", "data")
+#   group.sample({"state": states, "data_in_i": data, "write": writes})
+#
+# Bins are values, inclusive (lo, hi) ranges or lists of them. When bins
+# overlap, a value counts toward the first bin declared that contains it.
+#
+# write_report() stores the covergroup summaries as JSON under
+# build/reports/functional_coverage/, where scripts/code_kpis.py picks them up
+# for the test_metrics KPIs.
+#=============================================================================
+
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Where coverage reports are collected for the KPI pipeline
+REPORT_DIR = Path(os.environ.get("FUNCTIONAL_COVERAGE_DIR",
+                                 Path(__file__).resolve().parents[2] / "build" / "reports" / "functional_coverage"))
+
+_MAX_VALUE = (1 << 64) - 1
+
+
+def value_bins(width):
+    """Common data bins for a width-bit value: corners, alternating patterns and magnitude ranges"""
+    top = (1 << width) - 1
+    if width < 4:
+        return {str(value): value for value in range(top + 1)}
+    if width < 8:
+        return {"zero": 0, "all_ones": top, "low": (1, top >> 1), "high": ((top >> 1) + 1, top)}
+    low = top >> (width * 3 // 4)
+    return {
+        "zero": 0,
+        "all_ones": top,
+        "alt_01": int("01" * width, 2) & top,
+        "alt_10": int("10" * width, 2) & top,
+        "one_hot": [1 << bit for bit in range(width)],
+        "low": (1, low),
+        "mid": (low + 1, top >> 1),
+        "high": ((top >> 1) + 1, top)
+    }
+
+
+def _intervals(spec):
+    """Normalize a bin spec (value, (lo, hi) or list of them) to [(lo, hi), ...]"""
+    if isinstance(spec, tuple):
+        return [(int(spec[0]), int(spec[1]))]
+    if isinstance(spec, (list, range)):
+        return [interval for item in spec for interval in _intervals(item)]
+    return [(int(spec), int(spec))]
+
+
+class Coverpoint:
+    """Named bins over one sampled value"""
+
+    def __init__(self, name, bins, key=None, iff=None):
+        if not bins:
+            raise ValueError(f"Coverpoint {name} has no bins")
+        self.name = name
+        self.labels = list(bins)
+        self.key = key or name
+        self.iff = iff
+        self.hits = np.zeros(len(self.labels), dtype=np.int64)
+
+        # Elementary segments between all bin boundaries, each owned by the first bin covering it
+        intervals = [(index, lo, hi) for index, spec in enumerate(bins.values()) for lo, hi in _intervals(spec)]
+        for index, lo, hi in intervals:
+            if not 0 <= lo <= hi <= _MAX_VALUE:
+                raise ValueError(f"Coverpoint {name}: invalid bin range {lo}..{hi} in {self.labels[index]}")
+        bounds = sorted({lo for _, lo, _ in intervals} | {hi + 1 for _, _, hi in intervals if hi < _MAX_VALUE})
+        owners = [next((index for index, lo, hi in intervals if lo <= start <= hi), -1) for start in bounds]
+        self._bounds = np.array(bounds, dtype=np.uint64)
+        self._owners = np.array(owners, dtype=np.int64)
+        ends = bounds[1:] + [_MAX_VALUE + 1]
+        self._segments = [[(start, end - 1) for start, end, owner in zip(bounds, ends, owners) if owner == index]
+                          for index in range(len(self.labels))]
+        shadowed = [label for label, segments in zip(self.labels, self._segments) if not segments]
+        if shadowed:
+            raise ValueError(f"Coverpoint {name}: bins covered entirely by earlier bins: {', '.join(shadowed)}")
+
+    def bin_index(self, sample):
+        """Bin index of every sampled cycle (-1: no bin or not sampled)"""
+        values = self.key(sample) if callable(self.key) else sample[self.key]
+        values = np.asarray(values, dtype=np.uint64)
+        segment = np.searchsorted(self._bounds, values, side="right") - 1
+        index = np.where(segment >= 0, self._owners[segment.clip(min=0)], -1)
+        if self.iff is not None:
+            enabled = self.iff(sample) if callable(self.iff) else sample[self.iff]
+            index = np.where(np.asarray(enabled) != 0, index, -1)
+        return index
+
+    def count(self, index):
+        """Hits per bin of a bin_index() result"""
+        return np.bincount(index[index >= 0], minlength=len(self.labels))
+
+    def draw(self, rng, size, weights=None):
+        """Random values spread over the bins (weights per bin, default uniform)"""
+        weights = np.ones(len(self.labels)) if weights is None else np.asarray(weights, dtype=float)
+        picks = rng.choice(len(self.labels), size=size, p=weights / weights.sum())
+        lows = np.empty(size, dtype=np.uint64)
+        highs = np.empty(size, dtype=np.uint64)
+        for index, segments in enumerate(self._segments):
+            chosen = np.flatnonzero(picks == index)
+            if not len(chosen) or not segments:
+                continue
+            segment = rng.integers(0, len(segments), len(chosen))
+            lows[chosen] = np.array([lo for lo, _ in segments], dtype=np.uint64)[segment]
+            highs[chosen] = np.array([hi for _, hi in segments], dtype=np.uint64)[segment]
+        return rng.integers(lows, highs, dtype=np.uint64, endpoint=True)
+
+
+class Cross:
+    """Cross coverage of two or more coverpoints"""
+
+    def __init__(self, name, points):
+        self.name = name
+        self.points = points
+        self.shape = tuple(len(point.labels) for point in points)
+        self.labels = [" x ".join(point.labels[i] for point, i in zip(points, combo))
+                       for combo in np.ndindex(*self.shape)]
+        self.hits = np.zeros(len(self.labels), dtype=np.int64)
+
+    def bin_index(self, indices):
+        """Cross bin of every cycle from the coverpoints' bin indices"""
+        columns = [indices[point.name] for point in self.points]
+        valid = np.logical_and.reduce([column >= 0 for column in columns])
+        flat = np.ravel_multi_index([column.clip(min=0) for column in columns], self.shape)
+        return np.where(valid, flat, -1)
+
+    def count(self, index):
+        """Hits per bin of a bin_index() result"""
+        return np.bincount(index[index >= 0], minlength=len(self.labels))
+
+
+class Covergroup:
+    """A set of coverpoints and crosses sampled together"""
+
+    def __init__(self, name, goal=100.0):
+        self.name = name
+        self.goal = goal
+        self.points = {}
+        self.crosses = {}
+        self.samples = 0
+
+    def coverpoint(self, name, bins, key=None, iff=None):
+        """Add a coverpoint; key is a sample field or callable(sample), iff gates sampling"""
+        if name in self.points or name in self.crosses:
+            raise ValueError(f"Duplicate coverage item {name} in {self.name}")
+        self.points[name] = Coverpoint(name, bins, key, iff)
+        return self.points[name]
+
+    def cross(self, name, *points):
+        """Add a cross of previously declared coverpoints"""
+        if name in self.points or name in self.crosses:
+            raise ValueError(f"Duplicate coverage item {name} in {self.name}")
+        self.crosses[name] = Cross(name, [self.points[point] for point in points])
+        return self.crosses[name]
+
+    def items(self):
+        """All coverpoints and crosses"""
+        return list(self.points.values()) + list(self.crosses.values())
+
+    def counts(self, sample):
+        """Hits per bin of every item for a sample, without recording them"""
+        indices = {name: point.bin_index(sample) for name, point in self.points.items()}
+        counts = {name: self.points[name].count(index) for name, index in indices.items()}
+        for name, cross in self.crosses.items():
+            counts[name] = cross.count(cross.bin_index(indices))
+        return counts
+
+    def sample(self, sample):
+        """Record the hits of a sample (dict of per-cycle arrays)"""
+        for name, hits in self.counts(sample).items():
+            item = self.points.get(name) or self.crosses[name]
+            item.hits += hits
+        self.samples += len(next(iter(sample.values()))) if sample else 0
+
+    def merge(self, other):
+        """Add the hits of a covergroup with the same items"""
+        for item in self.items():
+            other_item = other.points.get(item.name) or other.crosses[item.name]
+            item.hits += other_item.hits
+        self.samples += other.samples
+
+    def new_bins(self, sample):
+        """Number of bins a sample would hit for the first time"""
+        total = 0
+        for name, hits in self.counts(sample).items():
+            item = self.points.get(name) or self.crosses[name]
+            total += int(np.count_nonzero((hits > 0) & (item.hits == 0)))
+        return total
+
+    def coverage(self):
+        """Covergroup coverage in percent (mean of the coverpoint and cross coverages)"""
+        items = self.items()
+        return float(np.mean([100.0 * np.count_nonzero(item.hits) / len(item.hits) for item in items])) if items else 0.0
+
+    def closed(self):
+        """Whether every bin has been hit"""
+        return all(item.hits.all() for item in self.items())
+
+    def summary(self):
+        """JSON-friendly coverage summary"""
+        items = {}
+        for item in self.items():
+            hit = int(np.count_nonzero(item.hits))
+            items[item.name] = {
+                "kind": "cross" if isinstance(item, Cross) else "coverpoint",
+                "bins": len(item.hits),
+                "hit_bins": hit,
+                "coverage": round(100.0 * hit / len(item.hits), 2),
+                "unhit": [label for label, count in zip(item.labels, item.hits) if not count]
+            }
+        return {
+            "name": self.name,
+            "coverage": round(self.coverage(), 2),
+            "goal": self.goal,
+            "bins": sum(item["bins"] for item in items.values()),
+            "hit_bins": sum(item["hit_bins"] for item in items.values()),
+            "samples": self.samples,
+            "items": items
+        }
+
+    def report(self):
+        """Human-readable coverage table"""
+        summary = self.summary()
+        lines = [f"Covergroup {self.name}: {summary['coverage']:.1f}% "
+                 f"({summary['hit_bins']}/{summary['bins']} bins, {self.samples} samples)"]
+        for name, item in summary["items"].items():
+            line = f"  {name:<24} {item['coverage']:6.1f}%  {item['hit_bins']}/{item['bins']}"
+            if item["unhit"]:
+                line += f"  unhit: {', '.join(item['unhit'][:6])}{' ...' if len(item['unhit']) > 6 else ''}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def write_report(groups, name, report_dir=None, **context):
+    """Write covergroup summaries to <report_dir>/<name>.json; returns the path"""
+    path = Path(report_dir or REPORT_DIR) / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {"name": name, "generated_at": datetime.now().isoformat(), **context,
+              "covergroups": [group.summary() for group in groups]}
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
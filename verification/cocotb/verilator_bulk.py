@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+#=============================================================================
+# Verilator Bulk Driver for example_core
+#=============================================================================
+# Description: Builds the Verilated example_core as a shared library with the
+#              bulk-stepping C ABI in example_core_bulk.cpp and drives it from
+#              NumPy buffers through ctypes, N cycles per call
+# Author: Vyges Team
+# License: Apache-2.0
+#=============================================================================
+#
+# cocotb crosses the VPI boundary on every clock edge; for long soak and
+# performance runs this driver instead steps whole chunks of cycles inside the
+# simulator. It runs the same scenarios (example_core_scenarios.py) with the
+# same reference-model Scoreboard and checks as the cocotb tests. Scenarios
+# sharing a warm-up start from a checkpoint of it (Verilator --savable) that
+# is written once to build/checkpoints/ and reused until the library changes.
+#
+# Usage:
+#   python verification/cocotb/verilator_bulk.py build
+#   python verification/cocotb/verilator_bulk.py run [--scenario NAME ...] [--cycles N] [--seed S]
+#=============================================================================
+
+import os
+import sys
+import glob
+import time
+import ctypes
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+from example_core_model import ExampleCoreModel, Scoreboard, INPUTS, OUTPUTS, random_stimulus
+from example_core_scenarios import SCENARIOS, WARMUPS, CHECKPOINT_DIR, warmup_key
+
+ROOT = Path(__file__).resolve().parents[2]
+RTL_SOURCES = [ROOT / "rtl" / "example_core.sv"]
+WRAPPER = Path(__file__).resolve().parent / "example_core_bulk.cpp"
+BUILD_DIR = ROOT / "build" / "verilator_bulk"
+
+ABI_VERSION = 2
+
+# Cycles stepped per call (bounds the preallocated buffers)
+DEFAULT_CHUNK = 1 << 16
+
+# Default soak length of the random scenario
+DEFAULT_SOAK_CYCLES = 1_000_000
+
+
+def _library_path(build_dir, data_width, addr_width, buffer_depth):
+    """Shared library of one parameterization"""
+    return Path(build_dir) / f"libexample_core_bulk_d{data_width}_a{addr_width}_b{buffer_depth}.so"
+
+
+def build_library(data_width=32, addr_width=8, buffer_depth=16, build_dir=BUILD_DIR, force=False):
+    """Verilate example_core and link it with the C ABI into a shared library (reused while up to date)"""
+    library = _library_path(build_dir, data_width, addr_width, buffer_depth)
+    sources = RTL_SOURCES + [WRAPPER]
+    if not force and library.exists() and library.stat().st_mtime >= max(p.stat().st_mtime for p in sources):
+        return library
+    verilator = shutil.which("verilator")
+    if not verilator:
+        raise RuntimeError("verilator not found in PATH (required to build the bulk-stepping library)")
+
+    obj_dir = library.with_suffix("")
+    root = subprocess.run([verilator, "--getenv", "VERILATOR_ROOT"], capture_output=True, text=True,
+                          check=True).stdout.strip()
+    subprocess.run([verilator, "--cc", "--build", "--savable", "-j", "0", "-O3", "-Wno-fatal",
+                    "--top-module", "example_core", "--Mdir", str(obj_dir),
+                    f"-GDATA_WIDTH={data_width}", f"-GADDR_WIDTH={addr_width}", f"-GBUFFER_DEPTH={buffer_depth}",
+                    "-CFLAGS", "-fPIC -O2"] + [str(p) for p in RTL_SOURCES], check=True)
+
+    # Verilator 5 names the archives libVexample_core.a/libverilated.a, Verilator 4 Vexample_core__ALL.a
+    archives = sorted(glob.glob(str(obj_dir / "*.a")), key=lambda a: "verilated" in Path(a).name)
+    if not archives:
+        raise RuntimeError(f"Verilator produced no static libraries in {obj_dir}")
+    cxx = os.environ.get("CXX", "g++")
+    subprocess.run([cxx, "-shared", "-fPIC", "-O2", "-std=c++17",
+                    f"-I{obj_dir}", f"-I{root}/include", f"-I{root}/include/vltstd",
+                    str(WRAPPER), *archives, "-pthread", "-o", str(library)], check=True)
+    return library
+
+
+class VerilatedExampleCore:
+    """The Verilated example_core stepped in bulk from NumPy arrays"""
+
+    def __init__(self, library=None, data_width=32, addr_width=8, buffer_depth=16, chunk=DEFAULT_CHUNK):
+        library = library or build_library(data_width, addr_width, buffer_depth)
+        self.lib = ctypes.CDLL(str(library))
+        self.lib.ec_abi_version.restype = ctypes.c_int
+        self.lib.ec_input_names.restype = ctypes.c_char_p
+        self.lib.ec_output_names.restype = ctypes.c_char_p
+        self.lib.ec_create.restype = ctypes.c_void_p
+        self.lib.ec_destroy.argtypes = [ctypes.c_void_p]
+        self.lib.ec_reset.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+        self.lib.ec_step.argtypes = [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_void_p, ctypes.c_void_p]
+        self.lib.ec_time.argtypes = [ctypes.c_void_p]
+        self.lib.ec_time.restype = ctypes.c_uint64
+        self.lib.ec_save.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        self.lib.ec_restore.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+
+        if self.lib.ec_abi_version() != ABI_VERSION:
+            raise RuntimeError(f"{library}: ABI version {self.lib.ec_abi_version()}, expected {ABI_VERSION}")
+        ports = (self.lib.ec_input_names().decode().split(","), self.lib.ec_output_names().decode().split(","))
+        if ports != (INPUTS, OUTPUTS):
+            raise RuntimeError(f"{library}: port order does not match example_core_model.py")
+
+        self.widths = {name: 1 for name in INPUTS}
+        self.widths.update({"data_in_i": data_width, "config_data_i": data_width, "config_addr_i": addr_width})
+        self.chunk = chunk
+        self._outputs = np.zeros((len(OUTPUTS), chunk), dtype=np.uint64)
+        self._output_pointers = (ctypes.c_void_p * len(OUTPUTS))(
+            *[row.ctypes.data for row in self._outputs])
+        self.handle = self.lib.ec_create()
+
+    def close(self):
+        """Finish the simulation and free the model"""
+        if self.handle:
+            self.lib.ec_destroy(self.handle)
+            self.handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def reset(self, cycles=2):
+        """Hold reset for a few cycles (like the cocotb reset_dut) and release it"""
+        self.lib.ec_reset(self.handle, cycles)
+
+    def save(self, path):
+        """Checkpoint the complete simulation state to a file"""
+        if self.lib.ec_save(self.handle, str(path).encode()) != 0:
+            raise OSError(f"Cannot write checkpoint {path}")
+
+    def restore(self, path):
+        """Continue from a checkpoint written by save() with the same library"""
+        if self.lib.ec_restore(self.handle, str(path).encode()) != 0:
+            raise OSError(f"Cannot read checkpoint {path}")
+
+    def run(self, stimulus):
+        """Step every cycle of a stimulus; returns the sampled outputs as per-cycle arrays"""
+        cycles = len(stimulus["reset_n_i"])
+        inputs = np.empty((len(INPUTS), cycles), dtype=np.uint64)
+        for row, name in enumerate(INPUTS):
+            default = 1 if name == "reset_n_i" else 0
+            mask = np.uint64((1 << self.widths[name]) - 1)
+            inputs[row] = np.asarray(stimulus.get(name, default), dtype=np.uint64) & mask
+        observed = np.empty((len(OUTPUTS), cycles), dtype=np.uint64)
+
+        row_bytes = inputs.strides[0]
+        for start in range(0, cycles, self.chunk):
+            count = min(self.chunk, cycles - start)
+            base = inputs.ctypes.data + start * inputs.itemsize
+            input_pointers = (ctypes.c_void_p * len(INPUTS))(*[base + row * row_bytes for row in range(len(INPUTS))])
+            self.lib.ec_step(self.handle, count, input_pointers, self._output_pointers)
+            observed[:, start:start + count] = self._outputs[:, :count]
+        return dict(zip(OUTPUTS, observed))
+
+
+def run_checked(core, model, stimulus, initial=None):
+    """Step a stimulus on the Verilated core and compare it with the model; returns (expected, scoreboard)"""
+    expected = model.run(stimulus, initial=initial)
+    scoreboard = Scoreboard(expected)
+    scoreboard.compare(core.run(stimulus))
+    return expected, scoreboard
+
+
+def warm_start(core, model, warmup, library, checkpoints):
+    """Restore a warm-up checkpoint, running the warm-up and saving it first if needed; returns the model registers
+
+    checkpoints caches, per warm-up, the checkpoint file and the model registers at its end.
+    """
+    if warmup not in checkpoints:
+        key = warmup_key(model, warmup, "verilator", library.name, library.stat().st_mtime_ns)
+        path = CHECKPOINT_DIR / f"verilator_{warmup}_{key}.bin"
+        stimulus = WARMUPS[warmup](model)
+        if path.exists():
+            registers = model.run(stimulus)["final"]
+        else:
+            core.reset()
+            expected, scoreboard = run_checked(core, model, stimulus)
+            if scoreboard.mismatches:
+                raise RuntimeError(f"Warm-up {warmup} diverged from the reference model:\n{scoreboard.report()}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            core.save(path)
+            registers = expected["final"]
+        checkpoints[warmup] = (path, registers)
+    path, registers = checkpoints[warmup]
+    core.restore(path)
+    return registers
+
+
+def soak(core, model, cycles, seed=None, chunk=DEFAULT_CHUNK):
+    """Unconstrained-random run of any length, generated and checked chunk by chunk"""
+    rng = np.random.default_rng(seed)
+    registers = None
+    done = 0
+    while done < cycles:
+        count = min(chunk, cycles - done)
+        stimulus = random_stimulus(count, rng.integers(1 << 63), model.data_width, model.addr_width)
+        if done:
+            stimulus["reset_n_i"][0] = 1     # only the first chunk starts with a reset cycle
+        expected, scoreboard = run_checked(core, model, stimulus, registers)
+        if scoreboard.mismatches:
+            return done, scoreboard
+        registers = expected["final"]
+        done += count
+    return done, None
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Build and run the bulk-stepping Verilator driver for example_core")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build the shared library")
+    build_parser.add_argument("--force", action="store_true", help="Rebuild even if up to date")
+    run_parser = subparsers.add_parser("run", help="Run scenarios checked against the reference model")
+    run_parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                            help="Scenario to run (repeatable, default: all)")
+    run_parser.add_argument("--cycles", type=int, default=DEFAULT_SOAK_CYCLES,
+                            help=f"Cycle budget of the random scenarios (default {DEFAULT_SOAK_CYCLES:,})")
+    run_parser.add_argument("--seed", type=int, help="Seed of the random scenarios")
+    run_parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Cycles stepped per call")
+    run_parser.add_argument("--library", help="Use a prebuilt shared library instead of building one")
+    for sub in (build_parser, run_parser):
+        sub.add_argument("--data-width", type=int, default=32, help="DATA_WIDTH")
+        sub.add_argument("--addr-width", type=int, default=8, help="ADDR_WIDTH")
+        sub.add_argument("--buffer-depth", type=int, default=16, help="BUFFER_DEPTH")
+    args = parser.parse_args()
+
+    params = (args.data_width, args.addr_width, args.buffer_depth)
+    try:
+        library = Path(args.library) if getattr(args, "library", None) else \
+            build_library(*params, force=getattr(args, "force", False))
+    except (RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"❌ Build failed: {e}")
+        return 1
+    if args.command == "build":
+        print(f"✅ {library}")
+        return 0
+
+    seed = args.seed if args.seed is not None else int(np.random.default_rng().integers(1 << 32))
+    model = ExampleCoreModel(*params)
+    failed = 0
+    checkpoints = {}
+    print(f"🔧 {library.name} (seed {seed})")
+    with VerilatedExampleCore(library, *params, chunk=args.chunk) as core:
+        for name in args.scenario or list(SCENARIOS):
+            error = None
+            if name == "random":
+                core.reset()
+                start = time.perf_counter()
+                cycles, scoreboard = soak(core, model, args.cycles, seed, args.chunk)
+            else:
+                scenario = SCENARIOS[name](model, seed=seed, cycles=args.cycles)
+                initial = None
+                if scenario.warmup:
+                    try:
+                        initial = warm_start(core, model, scenario.warmup, library, checkpoints)
+                    except (RuntimeError, OSError) as e:
+                        failed += 1
+                        print(f"❌ {name}: {e}")
+                        continue
+                else:
+                    core.reset()
+                start = time.perf_counter()
+                expected, scoreboard = run_checked(core, model, scenario.stimulus, initial)
+                cycles = 0
+                if not scoreboard.mismatches:
+                    cycles = len(expected["state"])
+                    try:
+                        scenario.check(expected)
+                    except AssertionError as e:
+                        error = str(e)
+                scoreboard = scoreboard if scoreboard.mismatches else None
+            elapsed = time.perf_counter() - start
+            rate = f"{cycles / elapsed:,.0f} cycles/s" if elapsed > 0 else "-"
+            if scoreboard or error:
+                failed += 1
+                print(f"❌ {name}: {error or f'diverged from the reference model (cycles counted from {cycles:,})'}")
+                if scoreboard:
+                    print(scoreboard.report())
+            else:
+                print(f"✅ {name}: {cycles:,} cycles checked ({rate}, model included)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())